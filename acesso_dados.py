@@ -0,0 +1,834 @@
+"""
+Camada única de acesso aos bancos SQLite do dashboard.
+
+Cada fonte (Positivador, Transferências, FeeBased, NPS, AUC Mesa RV, Produtos)
+é descrita uma única vez em FONTES. A descoberta de tabela e o mapeamento das
+colunas para os nomes canônicos são resolvidos uma vez por (arquivo, mtime);
+os loaders devolvem DataFrames já tipados e com colunas canônicas.
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from normalizacao import (
+    _norm_colname,
+    _norm_upper_noaccents_series,
+    _parse_money_like_series,
+    _qident,
+    extract_assessor_codes,
+)
+from cache_versao import marcar_versao
+from rastreamento import cache_rastreado
+from registro_versoes import avisar_carga, depende_de, mtime_vigente
+from snapshot_colunar import carregar_com_snapshot
+from tipos_compactos import compactar
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Bancos gravados pelo etl_ingestao.py registram a versão do esquema tipado
+# nesta tabela; quando a versão confere, os loaders pulam o parsing defensivo.
+TABELA_META_ETL = "_etl_meta"
+VERSAO_ESQUEMA_TIPADO = 1
+
+# =====================================================
+# NPS - Column mapping
+# =====================================================
+_EXPECTED_KEYS = {
+    "survey_id": {"survey id"},
+    "user_id": {"id do usuario", "id usuario", "usuario id"},
+    "customer_id": {"costumer id", "customer id", "cliente id"},
+    "data_resposta": {"data de resposta", "data resposta", "data"},
+    "pesquisa_relacionamento": {"pesquisa relacionamento"},
+    "nps_assessor": {"xp relacionamento aniversario nps assessor", "nps assessor"},
+    "status": {"status"},
+    "codigo_assessor": {"codigo assessor", "cod assessor", "codigo do assessor"},
+    "notificacao": {"notificacao", "notificacao ?"},
+}
+_POSSIBLE_NOTA_KEYS = {
+    "nota",
+    "nota nps",
+    "score",
+    "pontuacao",
+    "resposta nota",
+    "nps",
+    "xp relacionamento aniversario nps assessor",
+}
+
+# =====================================================
+# REGISTRO DAS FONTES
+# =====================================================
+# arquivos:        nomes candidatos (procurados na raiz do projeto e no diretório atual)
+# tabelas:         nomes preferidos de tabela, em ordem de prioridade
+# tabela_contem:   trechos aceitos no nome da tabela (quando não há nome preferido)
+# fallback_primeira: usa a primeira tabela se nada casar
+# colunas:         nome canônico -> nomes aceitos (normalizados por _norm_colname)
+# contem:          nome canônico -> trechos aceitos (busca por similaridade)
+# pontuacao:       colunas canônicas usadas para pontuar tabelas candidatas
+FONTES: Dict[str, Dict[str, Any]] = {
+    "positivador": {
+        "arquivos": ["DBV Capital_Positivador.db"],
+        "tabelas": ["capital_positivador", "Relatório_Positivador", "positivador", "positivador_mtd"],
+        "colunas": {},
+    },
+    "positivador_mtd": {
+        "arquivos": [
+            "DBV Capital_Positivador (MTD).db",
+            "DBV Capital_Positivador_MTD.db",
+            "DBV Capital_Positivador.db",
+        ],
+        "tabelas": ["positivador_mtd", "positivador", "Relatório_Positivador"],
+        "colunas": {
+            "Data_Posicao": ("data posicao",),
+            "Net_Em_M": ("net em m",),
+            "Captacao_Liquida_em_M": ("captacao liquida em m", "captacao liq em m"),
+            "Assessor": ("assessor",),
+            "Cliente": ("cliente",),
+        },
+    },
+    # Histórico particionado por mês (historico_particionado.py)
+    "positivador_historico": {
+        "arquivos": ["DBV Capital_Positivador (Histórico).db"],
+        "tabelas": ["_particoes"],
+        "colunas": {},
+    },
+    "transferencias": {
+        "arquivos": ["DBV Capital_Transferências.db", "DBV Capital_Transferencias.db"],
+        "tabelas": ["transferencias", "transferencia"],
+        "colunas": {
+            "cliente": ("cliente",),
+            "pl": ("pl",),
+            "data_solic": ("data solicitacao", "data solicit", "data solicitacao transferencia"),
+            "data_transf": ("data transferencia", "data transf"),
+            "tipo": ("tipo",),
+            "status": ("status",),
+            "cod_origem": ("codigo assessor origem", "cod assessor origem", "assessor origem"),
+            "nome_origem": ("nome assessor origem", "assessor origem nome", "nome origem"),
+            "cod_destino": ("codigo assessor destino", "cod assessor destino", "assessor destino"),
+            "nome_destino": ("nome assessor destino", "assessor destino nome", "nome destino"),
+        },
+        "pontuacao": ("pl", "data_solic", "data_transf", "cod_destino"),
+    },
+    "feebased": {
+        "arquivos": [
+            "pages/DBV Capital_FeeBased.db",
+            "DBV Capital_FeeBased.db",
+            "DBV Capital_FeeBased (MTD).db",
+        ],
+        # 'Sheet1' / 'Planilha1' são os nomes comuns em imports de Excel
+        "tabelas": ["feebased", "fee_based", "base_fee", "carteira_feebased", "sheet1", "planilha1"],
+        "colunas": {
+            # Nota: 'p/l' normalizado vira 'p l'
+            "pl": ("p l", "pl", "pnl", "p n l", "resultado", "lucro prejuizo", "lucro", "prejuizo", "valor"),
+            "status": ("status", "situacao"),
+            "assessor": ("assessor", "assessor code", "codigo assessor", "cod assessor", "codigo do assessor"),
+            "cliente": ("cliente", "customer", "nome cliente"),
+            "data": (
+                "data", "data contratacao", "data de contratacao",
+                "data posicao", "data atualizacao",
+            ),
+        },
+    },
+    "nps": {
+        "arquivos": ["DBV Capital_NPS.db"],
+        "tabelas": [],
+        "colunas": {
+            **{k: tuple(sorted(v)) for k, v in _EXPECTED_KEYS.items()},
+            "nota": tuple(sorted(_POSSIBLE_NOTA_KEYS)),
+        },
+        "pontuacao": ("pesquisa_relacionamento", "codigo_assessor", "data_resposta", "nota"),
+    },
+    "auc_mesa_rv": {
+        "arquivos": ["DBV Capital_AUC Mesa RV.db"],
+        "tabelas": ["auc_mesa_rv"],
+        "colunas": {
+            "data": ("data",),
+            "cliente": ("cliente",),
+            "assessor": ("assessor",),
+            "tipo": ("tipo",),
+            "auc": ("auc",),
+        },
+    },
+    "objetivos_pj1": {
+        "arquivos": ["DBV Capital_Objetivos.db"],
+        "tabelas": ["Objetivos_PJ1"],
+        "fallback_primeira": False,
+        "colunas": {
+            "data": ("data",),
+        },
+    },
+    "produtos": {
+        "arquivos": ["DBV Capital_Produtos.db"],
+        "tabelas": [],
+        "tabela_contem": ("produtos", "planilha"),
+        "fallback_primeira": False,
+        "colunas": {
+            "data": ("data",),
+            "valor_negocio": ("valor negocio r", "valor negocio"),
+            "linha_receita": ("linha receita",),
+            "codigo_assessor": ("codigo assessor",),
+        },
+        "contem": {
+            "data": ("data", "dt"),
+            "valor_negocio": ("valor", "negocio", "negócio", "venda"),
+            "linha_receita": ("linha receita", "linha", "receita", "categoria"),
+            "codigo_assessor": ("código assessor", "cod", "assessor"),
+        },
+    },
+}
+
+
+# =====================================================
+# LOCALIZAÇÃO / ESQUEMA
+# =====================================================
+def localizar_banco(fonte: str) -> Optional[Path]:
+    """Retorna o primeiro arquivo existente da fonte (raiz do projeto, depois diretório atual)."""
+    for nome in FONTES[fonte]["arquivos"]:
+        for p in (BASE_DIR / nome, Path(nome)):
+            if p.exists():
+                return p
+    return None
+
+
+def _escolher_tabela(spec: Dict[str, Any], colunas_por_tabela: Dict[str, List[str]]) -> Optional[str]:
+    tabelas = list(colunas_por_tabela)
+    if not tabelas:
+        return None
+
+    norm = {_norm_colname(t): t for t in tabelas}
+    for pref in spec.get("tabelas", []):
+        if pref in colunas_por_tabela:
+            return pref
+        if _norm_colname(pref) in norm:
+            return norm[_norm_colname(pref)]
+
+    trechos = spec.get("tabela_contem", ())
+    if trechos:
+        for t in tabelas:
+            if any(trecho in t.lower() for trecho in trechos):
+                return t
+
+    if not spec.get("fallback_primeira", True):
+        return None
+
+    pontuacao = spec.get("pontuacao", ())
+    best_t, best_score = None, -1
+    for t in tabelas:
+        mapa = _mapear_colunas(colunas_por_tabela[t], spec.get("colunas", {}))
+        score = sum(int(mapa.get(c) is not None) for c in pontuacao)
+        if score > best_score:
+            best_t, best_score = t, score
+    return best_t or tabelas[0]
+
+
+def _mapear_colunas(
+    colunas: List[str],
+    aliases: Dict[str, Tuple[str, ...]],
+    contem: Optional[Dict[str, Tuple[str, ...]]] = None,
+) -> Dict[str, Optional[str]]:
+    """Mapeia nomes canônicos -> nomes reais das colunas da tabela."""
+    cols_norm = {_norm_colname(c): c for c in colunas}
+
+    mapa: Dict[str, Optional[str]] = {}
+    for canon, chaves in aliases.items():
+        mapa[canon] = next((cols_norm[k] for k in chaves if k in cols_norm), None)
+
+    # Busca por similaridade para as colunas que ainda faltam
+    usadas = {v for v in mapa.values() if v}
+    for canon, trechos in (contem or {}).items():
+        if mapa.get(canon):
+            continue
+        for c in colunas:
+            if c not in usadas and any(t in c.lower() for t in trechos):
+                mapa[canon] = c
+                usadas.add(c)
+                break
+    return mapa
+
+
+@cache_rastreado()
+def resolver_esquema(db_path_str: str, mtime: float, fonte: str) -> Dict[str, Any]:
+    """
+    Resolve tabela e mapeamento canônico de colunas de uma fonte.
+    Executado uma única vez por (arquivo, mtime); o resultado fica em cache.
+
+    Returns:
+        dict com 'tabela', 'colunas' (nomes reais), 'mapa' (canônico -> real)
+        e 'tipado' (True quando a tabela foi gravada pelo ETL tipado atual)
+    """
+    spec = FONTES[fonte]
+    colunas_por_tabela: Dict[str, List[str]] = {}
+    meta: Dict[str, str] = {}
+    with sqlite3.connect(db_path_str) as conn:
+        tabelas = [
+            r[0]
+            for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';"
+            )
+        ]
+        if TABELA_META_ETL in tabelas:
+            tabelas.remove(TABELA_META_ETL)
+            try:
+                meta = dict(conn.execute(f"SELECT chave, valor FROM {TABELA_META_ETL};").fetchall())
+            except sqlite3.Error:
+                meta = {}
+        for t in tabelas:
+            try:
+                colunas_por_tabela[t] = [r[1] for r in conn.execute(f"PRAGMA table_info({_qident(t)});")]
+            except sqlite3.Error:
+                colunas_por_tabela[t] = []
+
+    tabela = _escolher_tabela(spec, colunas_por_tabela)
+    if tabela is None:
+        return {
+            "tabela": None,
+            "colunas": [],
+            "mapa": {k: None for k in spec.get("colunas", {})},
+            "tipado": False,
+        }
+
+    colunas = colunas_por_tabela[tabela]
+    return {
+        "tabela": tabela,
+        "colunas": colunas,
+        "mapa": _mapear_colunas(colunas, spec.get("colunas", {}), spec.get("contem")),
+        "tipado": (
+            meta.get("versao_esquema") == str(VERSAO_ESQUEMA_TIPADO)
+            and meta.get("tabela") == tabela
+        ),
+    }
+
+
+def obter_esquema(fonte: str) -> Optional[Dict[str, Any]]:
+    """Localiza o banco da fonte e devolve o esquema resolvido (com 'caminho' e 'mtime')."""
+    dbp = localizar_banco(fonte)
+    if dbp is None:
+        return None
+    mtime = mtime_vigente(dbp)
+    esquema = dict(resolver_esquema(str(dbp), mtime, fonte))
+    esquema["caminho"] = str(dbp)
+    esquema["mtime"] = mtime
+    return esquema
+
+
+def _select_mapeado(esquema: Dict[str, Any], colunas: Optional[Tuple[str, ...]] = None) -> str:
+    """SELECT com as colunas mapeadas já renomeadas para o nome canônico (só `colunas`, se informado)."""
+    partes = [
+        f"{_qident(orig)} AS {_qident(canon)}" if orig else f"NULL AS {_qident(canon)}"
+        for canon, orig in esquema["mapa"].items()
+        if colunas is None or canon in colunas
+    ]
+    return f'SELECT {", ".join(partes)} FROM {_qident(esquema["tabela"])}'
+
+
+# =====================================================
+# Janela de datas no SQL (predicate pushdown)
+# =====================================================
+# As datas ficam como texto: 'dd/mm/aaaa[ hh:mm:ss]' nos bancos originais e
+# ISO nos gravados pelo ETL tipado. A expressão abaixo leva as duas formas a
+# 'aaaa-mm-dd', comparável como texto. Linhas em outro formato não são
+# descartadas no SQL: passam adiante e o filtro exato em pandas decide.
+_GLOB_ISO = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+
+
+def expr_data_iso(coluna: str) -> str:
+    """Expressão SQL 'aaaa-mm-dd' de uma coluna de data em texto (dd/mm/aaaa ou ISO)."""
+    c = _qident(coluna)
+    return (
+        f"(CASE WHEN substr({c}, 3, 1) = '/' AND substr({c}, 6, 1) = '/' "
+        f"THEN substr({c}, 7, 4) || '-' || substr({c}, 4, 2) || '-' || substr({c}, 1, 2) "
+        f"ELSE substr({c}, 1, 10) END)"
+    )
+
+
+def filtro_janela(
+    coluna: str, data_ini: Any = None, data_fim: Any = None, tipado: bool = False
+) -> Tuple[str, List[str]]:
+    """
+    Cláusula WHERE (com parâmetros) da janela [data_ini, data_fim], inclusiva,
+    sobre a coluna de data. Sem janela devolve ("", []).
+
+    Com tipado=True (banco do ETL tipado, datas sempre ISO) a comparação é
+    feita direto na coluna, para o SQLite usar o índice de data; o limite
+    superior é o dia seguinte a data_fim, exclusivo (cobre 'aaaa-mm-dd hh:mm:ss').
+    """
+    if data_ini is None and data_fim is None:
+        return "", []
+    if tipado:
+        c = _qident(coluna)
+        condicoes, params = [], []
+        if data_ini is not None:
+            condicoes.append(f"{c} >= ?")
+            params.append(pd.Timestamp(data_ini).strftime("%Y-%m-%d"))
+        if data_fim is not None:
+            condicoes.append(f"{c} < ?")
+            params.append((pd.Timestamp(data_fim).normalize() + pd.Timedelta(days=1)).strftime("%Y-%m-%d"))
+        return f" WHERE {' AND '.join(condicoes)}", params
+    expr = expr_data_iso(coluna)
+    condicoes, params = [], []
+    if data_ini is not None:
+        condicoes.append(f"{expr} >= ?")
+        params.append(pd.Timestamp(data_ini).strftime("%Y-%m-%d"))
+    if data_fim is not None:
+        condicoes.append(f"{expr} <= ?")
+        params.append(pd.Timestamp(data_fim).strftime("%Y-%m-%d"))
+    return f" WHERE ({' AND '.join(condicoes)}) OR {expr} NOT GLOB '{_GLOB_ISO}'", params
+
+
+def filtrar_janela(df: pd.DataFrame, coluna: str, data_ini: Any = None, data_fim: Any = None) -> pd.DataFrame:
+    """Filtro exato da janela (por dia, inclusivo) sobre a coluna já convertida para datetime."""
+    if (data_ini is None and data_fim is None) or coluna not in df.columns:
+        return df
+    dias = df[coluna].dt.normalize()
+    mascara = dias.notna()
+    if data_ini is not None:
+        mascara &= dias >= pd.Timestamp(data_ini).normalize()
+    if data_fim is not None:
+        mascara &= dias <= pd.Timestamp(data_fim).normalize()
+    return df[mascara].reset_index(drop=True)
+
+
+def data_maxima_sql(db_path_str: str, tabela: str, coluna: str) -> Optional[pd.Timestamp]:
+    """Maior data (formatos reconhecidos) da coluna, calculada no SQLite."""
+    expr = expr_data_iso(coluna)
+    try:
+        with sqlite3.connect(db_path_str) as conn:
+            (maxima,) = conn.execute(
+                f"SELECT MAX({expr}) FROM {_qident(tabela)} WHERE {expr} GLOB '{_GLOB_ISO}'"
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+    return pd.to_datetime(maxima, errors="coerce") if maxima else None
+
+
+# =====================================================
+# POSITIVADOR MTD
+# =====================================================
+def _construir_positivador_mtd(
+    db_path_str: str,
+    mtime: float,
+    colunas: Optional[Tuple[str, ...]] = None,
+    data_ini: Any = None,
+    data_fim: Any = None,
+) -> pd.DataFrame:
+    """
+    Positivador MTD tipado. `colunas` (nomes canônicos) e a janela
+    [data_ini, data_fim] sobre Data_Posicao vão para o SQL: só as linhas e
+    colunas pedidas saem do SQLite.
+    """
+    try:
+        esquema = resolver_esquema(db_path_str, mtime, "positivador_mtd")
+        if not esquema["tabela"]:
+            return pd.DataFrame()
+
+        col_data = esquema["mapa"].get("Data_Posicao")
+        where, params = filtro_janela(col_data, data_ini, data_fim, esquema["tipado"]) if col_data else ("", [])
+        with sqlite3.connect(db_path_str) as conn:
+            if any(esquema["mapa"].values()):
+                df = pd.read_sql_query(_select_mapeado(esquema, colunas) + where, conn, params=params)
+            else:
+                # Se não encontrou nenhuma coluna conhecida, retorna todas
+                df = pd.read_sql_query(f'SELECT * FROM {_qident(esquema["tabela"])}', conn)
+    except Exception:
+        return pd.DataFrame()
+
+    # Banco gravado pelo ETL tipado: datas ISO, valores REAL e códigos A#####
+    tipado = esquema["tipado"]
+
+    if "Data_Posicao" in df.columns:
+        if tipado:
+            df["Data_Posicao"] = pd.to_datetime(df["Data_Posicao"], errors="coerce", format="ISO8601")
+        else:
+            df["Data_Posicao"] = pd.to_datetime(df["Data_Posicao"], errors="coerce", dayfirst=True)
+
+    for c in ["Net_Em_M", "Captacao_Liquida_em_M"]:
+        if c in df.columns:
+            if df[c].dtype == "object" and not tipado:
+                df[c] = _parse_money_like_series(df[c])
+            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0)
+
+    if "Assessor" in df.columns:
+        df["Assessor"] = df["Assessor"].astype(str)
+        if tipado:
+            df["assessor_code"] = df["Assessor"].where(df["Assessor"].str.match(r"^A\d{5}$"), pd.NA)
+        else:
+            df["assessor_code"] = extract_assessor_codes(df["Assessor"])
+        df["assessor_code"] = df["assessor_code"].where(
+            df["assessor_code"].notna() & (df["assessor_code"] != ""), pd.NA
+        )
+
+    df = filtrar_janela(df, "Data_Posicao", data_ini, data_fim)
+    return compactar(df, "positivador_mtd")
+
+
+@depende_de("positivador_mtd")
+@cache_rastreado()
+def _carregar_positivador_mtd_cached(
+    db_path_str: str,
+    mtime: float,
+    colunas: Optional[Tuple[str, ...]] = None,
+    data_ini: Any = None,
+    data_fim: Any = None,
+) -> pd.DataFrame:
+    if colunas is None and data_ini is None and data_fim is None:
+        return carregar_com_snapshot(db_path_str, mtime, "positivador_mtd", _construir_positivador_mtd)
+    # Recortes vão direto ao SQLite (o snapshot .arrow guarda só a tabela inteira)
+    return _construir_positivador_mtd(db_path_str, mtime, colunas, data_ini, data_fim)
+
+
+def carregar_positivador_mtd(
+    colunas: Optional[Tuple[str, ...]] = None, data_ini: Any = None, data_fim: Any = None
+) -> pd.DataFrame:
+    """Positivador MTD; `colunas` (canônicas) e a janela de Data_Posicao são aplicadas no SQL."""
+    dbp = localizar_banco("positivador_mtd")
+    if dbp is None:
+        return pd.DataFrame()
+    colunas = tuple(colunas) if colunas is not None else None
+    return marcar_versao(
+        _carregar_positivador_mtd_cached(str(dbp), mtime_vigente(dbp), colunas, data_ini, data_fim),
+        dbp,
+        (colunas, data_ini, data_fim),
+    )
+
+
+# =====================================================
+# TRANSFERÊNCIAS
+# =====================================================
+def _construir_transferencias(db_path_str: str, mtime: float) -> pd.DataFrame:
+    try:
+        esquema = resolver_esquema(db_path_str, mtime, "transferencias")
+        if not esquema["tabela"]:
+            return pd.DataFrame()
+        with sqlite3.connect(db_path_str) as conn:
+            df = pd.read_sql_query(f'SELECT * FROM {_qident(esquema["tabela"])};', conn)
+    except Exception:
+        return pd.DataFrame()
+    return compactar(df, "transferencias")
+
+
+@depende_de("transferencias")
+@cache_rastreado()
+def _carregar_transferencias_cached(db_path_str: str, mtime: float) -> pd.DataFrame:
+    return carregar_com_snapshot(db_path_str, mtime, "transferencias", _construir_transferencias)
+
+
+def carregar_transferencias() -> pd.DataFrame:
+    dbp = localizar_banco("transferencias")
+    if dbp is None:
+        return pd.DataFrame()
+    return marcar_versao(_carregar_transferencias_cached(str(dbp), mtime_vigente(dbp)), dbp)
+
+
+# =====================================================
+# FEEBASED
+# =====================================================
+def _construir_feebased(db_path_str: str, mtime: float) -> pd.DataFrame:
+    try:
+        esquema = resolver_esquema(db_path_str, mtime, "feebased")
+        mp = esquema["mapa"]
+
+        # Validação mínima
+        if not esquema["tabela"] or not mp["pl"] or not mp["status"]:
+            return pd.DataFrame()
+
+        with sqlite3.connect(db_path_str) as conn:
+            df = pd.read_sql_query(_select_mapeado(esquema) + ";", conn)
+
+        if df is None or df.empty:
+            return pd.DataFrame()
+
+        out = pd.DataFrame()
+
+        tipado = esquema["tipado"]
+
+        # Processa P/L com tratamento de erro para strings como "Não encontrado"
+        if tipado:
+            out["pl_value"] = pd.to_numeric(df["pl"], errors="coerce")
+        else:
+            out["pl_value"] = _parse_money_like_series(df["pl"])
+
+        out["status_raw"] = df["status"].astype(str)
+        out["status_norm"] = _norm_upper_noaccents_series(out["status_raw"])
+
+        # Data (Opcional)
+        if mp["data"] and tipado:
+            out["data_ref"] = pd.to_datetime(df["data"], errors="coerce", format="ISO8601")
+        elif mp["data"]:
+            out["data_ref"] = pd.to_datetime(df["data"], errors="coerce", dayfirst=True)
+        else:
+            out["data_ref"] = pd.NaT
+
+        # Assessor (Opcional)
+        if mp["assessor"]:
+            out["assessor_raw"] = df["assessor"].astype(str).str.strip()
+            if tipado:
+                # O ETL já gravou 'A#####' (ou o texto original quando não havia código)
+                out["assessor_code"] = out["assessor_raw"]
+            else:
+                out["assessor_code"] = extract_assessor_codes(out["assessor_raw"])
+                out["assessor_code"] = out["assessor_code"].where(
+                    out["assessor_code"].notna() & (out["assessor_code"] != ""),
+                    out["assessor_raw"]
+                )
+        else:
+            out["assessor_raw"] = ""
+            out["assessor_code"] = ""
+
+        # Cliente (Opcional)
+        if mp["cliente"]:
+            out["cliente"] = df["cliente"].astype(str).str.strip()
+        else:
+            out["cliente"] = ""
+
+        # Garante numérico final
+        out["pl_value"] = pd.to_numeric(out["pl_value"], errors="coerce").fillna(0.0)
+
+        return compactar(out, "feebased")
+    except Exception:
+        return pd.DataFrame()
+
+
+@depende_de("feebased")
+@cache_rastreado()
+def _carregar_feebased_cached(db_path_str: str, mtime: float) -> pd.DataFrame:
+    return carregar_com_snapshot(db_path_str, mtime, "feebased", _construir_feebased)
+
+
+def carregar_feebased() -> pd.DataFrame:
+    dbp = localizar_banco("feebased")
+    if dbp is None:
+        return pd.DataFrame()
+    return marcar_versao(_carregar_feebased_cached(str(dbp), mtime_vigente(dbp)), dbp)
+
+
+# =====================================================
+# NPS
+# =====================================================
+def _rename_columns_to_canonical(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+
+    norm_map = {_norm_colname(c): c for c in df.columns}
+    rename_dict: Dict[str, str] = {}
+    for canonical, variants in _EXPECTED_KEYS.items():
+        for v in variants:
+            if v in norm_map:
+                rename_dict[norm_map[v]] = canonical
+                break
+    df = df.rename(columns=rename_dict)
+
+    nota_col = None
+    for c in df.columns:
+        if _norm_colname(c) in _POSSIBLE_NOTA_KEYS:
+            nota_col = c
+            break
+
+    if nota_col is None:
+        best_col, best_cnt = None, -1
+        for c in df.columns:
+            s = pd.to_numeric(df[c], errors="coerce")
+            if s.notna().any():
+                cnt = int(s.between(0, 10, inclusive="both").sum())
+                if cnt > best_cnt and cnt > 0:
+                    best_col, best_cnt = c, cnt
+        nota_col = best_col
+
+    if nota_col:
+        df = df.rename(columns={nota_col: "nota"})
+
+    if "data_resposta" in df.columns:
+        df["data_resposta"] = pd.to_datetime(df["data_resposta"], errors="coerce", dayfirst=True)
+    if "codigo_assessor" in df.columns:
+        df["codigo_assessor"] = df["codigo_assessor"].astype(str).str.strip().str.upper()
+    if "pesquisa_relacionamento" in df.columns:
+        df["pesquisa_relacionamento_norm"] = _norm_upper_noaccents_series(
+            df["pesquisa_relacionamento"]
+        )
+    if "nota" in df.columns:
+        df["nota"] = pd.to_numeric(df["nota"], errors="coerce")
+    return df
+
+
+def _construir_nps(db_path_str: str, mtime: float) -> pd.DataFrame:
+    try:
+        esquema = resolver_esquema(db_path_str, mtime, "nps")
+        if not esquema["tabela"]:
+            avisar_carga("❌ Nenhuma tabela encontrada no banco NPS.", st.error)
+            return pd.DataFrame()
+        with sqlite3.connect(db_path_str) as conn:
+            df_all = pd.read_sql_query(f'SELECT * FROM {_qident(esquema["tabela"])};', conn)
+        return compactar(_rename_columns_to_canonical(df_all), "nps")
+    except Exception as e:
+        avisar_carga(f"Erro ao carregar NPS: {e}", st.error)
+        return pd.DataFrame()
+
+
+@depende_de("nps")
+@cache_rastreado()
+def _carregar_nps_cached(db_path_str: str, mtime: float) -> pd.DataFrame:
+    return carregar_com_snapshot(db_path_str, mtime, "nps", _construir_nps)
+
+
+def carregar_nps() -> pd.DataFrame:
+    dbp = localizar_banco("nps")
+    if dbp is None:
+        avisar_carga("❌ Banco NPS não encontrado.", st.error)
+        return pd.DataFrame()
+    return marcar_versao(_carregar_nps_cached(str(dbp), mtime_vigente(dbp)), dbp)
+
+
+# =====================================================
+# AUC MESA RV
+# =====================================================
+def _parse_money_series_rv(s: pd.Series) -> pd.Series:
+    s = s.astype(str).str.strip()
+    s = s.str.replace("R$", "", regex=False).str.replace(" ", "", regex=False)
+
+    def conv(x: str) -> Any:
+        if x in ("", "nan", "NaN", "None"):
+            return np.nan
+        if re.match(r"^\d{1,3}(\.\d{3})+(,\d+)?$", x):
+            return float(x.replace(".", "").replace(",", "."))
+        if re.match(r"^\d{1,3}(,\d{3})+(\.\d+)?$", x):
+            return float(x.replace(",", ""))
+        if "," in x and "." not in x:
+            return float(x.replace(",", "."))
+        return float(x)
+
+    out = s.map(lambda v: conv(v) if v not in (None, "") else None)
+    return pd.to_numeric(out, errors="coerce").fillna(0.0)
+
+
+def _construir_auc_mesa_rv(db_path_str: str, mtime: float) -> pd.DataFrame:
+    esquema = resolver_esquema(db_path_str, mtime, "auc_mesa_rv")
+    if not esquema["tabela"]:
+        return pd.DataFrame()
+    with sqlite3.connect(db_path_str) as conn:
+        df = pd.read_sql_query(_select_mapeado(esquema) + ";", conn)
+
+    mp = esquema["mapa"]
+    out = pd.DataFrame()
+    out["data_parsed"] = pd.to_datetime(df["data"], dayfirst=True, errors="coerce") if mp["data"] else pd.NaT
+    out["cliente"] = df["cliente"].astype(str).str.strip() if mp["cliente"] else ""
+    out["assessor"] = df["assessor"].astype(str).str.strip() if mp["assessor"] else ""
+    out["tipo"] = df["tipo"].astype(str).str.strip() if mp["tipo"] else ""
+    out["auc_reais"] = _parse_money_series_rv(df["auc"]) if mp["auc"] else 0.0
+    out = out.dropna(subset=["data_parsed"])
+    return out
+
+
+@depende_de("auc_mesa_rv")
+@cache_rastreado()
+def _carregar_auc_mesa_rv_cached(db_path_str: str, mtime: float) -> pd.DataFrame:
+    return carregar_com_snapshot(db_path_str, mtime, "auc_mesa_rv", _construir_auc_mesa_rv)
+
+
+def carregar_auc_mesa_rv() -> pd.DataFrame:
+    dbp = localizar_banco("auc_mesa_rv")
+    if dbp is None:
+        return pd.DataFrame()
+    return marcar_versao(_carregar_auc_mesa_rv_cached(str(dbp), mtime_vigente(dbp)), dbp)
+
+
+# =====================================================
+# PRODUTOS (Dashboard Salão Life)
+# =====================================================
+def _parse_datas_robusto(serie):
+    s = pd.Series(serie).copy()
+
+    def _parse_one(x):
+        t = ("" if x is None else str(x)).strip()
+        if t == "" or t.lower() in ("nat", "nan", "none", "-"):
+            return pd.NaT
+
+        # serial Excel
+        try:
+            test = t.replace(".", "", 1).replace("-", "", 1)
+            if test.isdigit():
+                v = float(t)
+                if 1 <= v <= 60000:
+                    return pd.to_datetime(v, origin="1899-12-30", unit="D", errors="coerce")
+        except Exception:
+            pass
+
+        # ISO estrito
+        if re.match(r"^\d{4}[-/]\d{2}[-/]\d{2}$", t):
+            return pd.to_datetime(t.replace("/", "-"), format="%Y-%m-%d", errors="coerce")
+
+        # MM/YYYY
+        mmyyyy = re.match(r"^(\d{1,2})/(\d{4})$", t)
+        if mmyyyy:
+            m, y = int(mmyyyy.group(1)), int(mmyyyy.group(2))
+            if 1 <= m <= 12:
+                return pd.to_datetime(f"{y:04d}-{m:02d}-01", format="%Y-%m-%d", errors="coerce")
+
+        # BR
+        if re.match(r"^\d{1,2}/\d{1,2}/\d{4}$", t) or re.match(r"^\d{1,2}-\d{1,2}-\d{4}$", t):
+            return pd.to_datetime(t, dayfirst=True, errors="coerce")
+
+        return pd.to_datetime(t, errors="coerce")
+
+    dt = s.apply(_parse_one)
+    dt = pd.to_datetime(dt, errors="coerce")
+    try:
+        dt = dt.dt.tz_localize(None).dt.normalize()
+    except Exception:
+        pass
+    return dt
+
+
+@depende_de("produtos")
+@cache_rastreado()
+def _carregar_produtos_cached(db_path_str: str, mtime: float) -> Tuple[pd.DataFrame, str]:
+    try:
+        esquema = resolver_esquema(db_path_str, mtime, "produtos")
+        if not esquema["tabela"]:
+            avisar_carga("Nenhuma tabela de produtos encontrada no banco de dados.", st.error)
+            return pd.DataFrame(), "N/A"
+
+        # Verificar se encontramos todas as colunas necessárias
+        mapa = {canon: orig for canon, orig in esquema["mapa"].items() if orig}
+        if set(mapa) != {"data", "valor_negocio", "linha_receita", "codigo_assessor"}:
+            avisar_carga(
+                "Não foi possível mapear todas as colunas necessárias. "
+                f"Colunas encontradas: {esquema['colunas']}. Colunas mapeadas: {mapa}",
+                st.error,
+            )
+            return pd.DataFrame(), "N/A"
+
+        # Carregar os dados com as colunas renomeadas
+        with sqlite3.connect(db_path_str) as conn:
+            df = pd.read_sql_query(_select_mapeado(esquema), conn)
+    except Exception as e:
+        avisar_carga(f"Erro ao acessar o banco de dados: {str(e)}", st.error)
+        return pd.DataFrame(), "N/A"
+
+    if df.empty:
+        return df, "N/A"
+
+    df["data"] = _parse_datas_robusto(df["data"])
+    df = df.dropna(subset=["data"]).reset_index(drop=True)
+
+    df["valor_negocio"] = df["valor_negocio"].astype(str).str.replace(r"[^\d.-]", "", regex=True)
+    df["valor_negocio"] = pd.to_numeric(df["valor_negocio"], errors="coerce").fillna(0.0)
+    df = compactar(df, "produtos")
+
+    data_mais_recente = (
+        df["data"].max().strftime("%d/%m/%Y")
+        if not df.empty and not df["data"].empty
+        else "N/A"
+    )
+    return df, data_mais_recente
+
+
+def carregar_produtos() -> Tuple[pd.DataFrame, str]:
+    dbp = localizar_banco("produtos")
+    if dbp is None:
+        avisar_carga(f"Arquivo do banco de dados não encontrado em: {BASE_DIR / FONTES['produtos']['arquivos'][0]}", st.error)
+        return pd.DataFrame(), "N/A"
+    return _carregar_produtos_cached(str(dbp), mtime_vigente(dbp))
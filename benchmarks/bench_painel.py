@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_painel.py
+----------------------------------------
+Suíte de benchmark do dashboard sobre os bancos sintéticos
+(gerar_dados_sinteticos.py) em várias escalas (ex.: 10x, 100x, 1000x).
+
+Para cada escala monta uma cópia do app (código + bancos sintéticos) num
+diretório temporário e, num processo separado, mede:
+
+- Loaders (acesso_dados / correcao_final): Positivador MTD, Transferências,
+  FeeBased, NPS, Produtos e Objetivos_PJ1, em três modos:
+    frio ....... sem snapshot .arrow e sem st.cache_data (lê o SQLite)
+    snapshot ... sem st.cache_data, com o .arrow já gravado
+    quente ..... tudo em cache
+- Páginas (Salão Atualizado e Salão Life via AppTest, com o rastreamento
+  ligado): tempo por seção de tratar_dados_positivador_mtd,
+  calcular_indicadores_objetivos, top3_mes_cap/top3_ano_cap, métricas NPS,
+  _calc_block, render dos cards e a execução total. Cada repetição limpa o
+  st.cache_data e o painel_compartilhado, então mede o recálculo completo;
+  a execução "quente" em seguida mede o rerun servido do cache.
+
+Os tempos são o melhor de N repetições (soma das chamadas da seção numa
+execução). Resultado em tabela e, com --json, em arquivo (base para os
+limites do gate de regressão).
+
+Uso:
+  python benchmarks/bench_painel.py --escalas 10
+  python benchmarks/bench_painel.py --escalas 10 100 1000 --repeticoes 3 --json /tmp/bench.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(Path(__file__).resolve().parent))
+from gerar_dados_sinteticos import SAIDA_PADRAO, gerar
+
+PAGINAS = {
+    "atualizado": "pages/Dashboard_Salão_Atualizado.py",
+    "life": "pages/Dashboard_Salão_Life.py",
+}
+
+# Seções do rastreamento reportadas por página (prefixo do nome da seção)
+SECOES = {
+    "atualizado": [
+        "tratar_dados_positivador_mtd",
+        "calcular_indicadores_objetivos",
+        "top3_mes_cap",
+        "top3_ano_cap",
+        "_calcular_metricas_nps",
+        "construir_indicadores_nps",
+        "nó indicadores",
+        "card ",
+        "execucao total",
+    ],
+    "life": [
+        "carregar_dados_produtos",
+        "_filter_area",
+        "_calc_block",
+        "render_area_card",
+        "execucao total",
+    ],
+}
+
+IGNORAR_NA_COPIA = shutil.ignore_patterns(
+    "*.db", "*.arrow", "*.arrow.*.tmp", ".git", "benchmarks", "__pycache__", "logs", "*.xlsx"
+)
+
+
+# =====================================================
+# Processo filho: mede dentro da cópia do app
+# =====================================================
+def _melhor(fn: Callable[[], Any], repeticoes: int, preparar: Callable[[], None] = lambda: None) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        preparar()
+        t0 = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return round(melhor * 1000, 2)
+
+
+def medir_loaders(repeticoes: int) -> Dict[str, Dict[str, float]]:
+    import streamlit as st
+
+    from acesso_dados import (
+        carregar_feebased,
+        carregar_nps,
+        carregar_positivador_mtd,
+        carregar_produtos,
+        carregar_transferencias,
+    )
+    from correcao_final import carregar_dados_objetivos_pj1_robusto
+
+    loaders = {
+        "carregar_positivador_mtd": carregar_positivador_mtd,
+        "carregar_transferencias": carregar_transferencias,
+        "carregar_feebased": carregar_feebased,
+        "carregar_nps": carregar_nps,
+        "carregar_produtos": carregar_produtos,
+        "carregar_dados_objetivos_pj1": carregar_dados_objetivos_pj1_robusto,
+    }
+
+    def frio() -> None:
+        for arq in Path.cwd().glob("*.arrow"):
+            arq.unlink()
+        st.cache_data.clear()
+
+    out: Dict[str, Dict[str, float]] = {}
+    for nome, fn in loaders.items():
+        out[nome] = {
+            "frio": _melhor(fn, repeticoes, frio),
+            "snapshot": _melhor(fn, repeticoes, st.cache_data.clear),
+            "quente": _melhor(fn, repeticoes),
+        }
+    return out
+
+
+def _ler_log(caminho: Path) -> List[Dict[str, Any]]:
+    if not caminho.exists():
+        return []
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(l) for l in f if l.strip()]
+
+
+def _somar_secoes(registros: List[Dict[str, Any]], prefixos: List[str]) -> Dict[str, float]:
+    """
+    ms por seção numa execução (soma das chamadas). Nome terminado em espaço
+    é prefixo ("card " soma todos os cards); senão casa o nome exato e as
+    variantes com rótulo ("nome [valor]").
+    """
+    out: Dict[str, float] = {}
+    for prefixo in prefixos:
+        if prefixo.endswith(" "):
+            casados = [r for r in registros if r["secao"].startswith(prefixo)]
+        else:
+            casados = [r for r in registros if r["secao"] == prefixo or r["secao"].startswith(prefixo + " [")]
+        if not casados:
+            continue
+        raso = min(r["profundidade"] for r in casados)
+        out[prefixo.strip()] = round(sum(r["ms"] for r in casados if r["profundidade"] == raso), 2)
+    return out
+
+
+def medir_paginas(repeticoes: int) -> Dict[str, Dict[str, Any]]:
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    import painel_compartilhado
+
+    log = Path(tempfile.mkdtemp()) / "rastreamento.jsonl"
+    os.environ["DBV_RASTREAMENTO_LOG"] = str(log)
+
+    def executar(pagina: str) -> List[Dict[str, Any]]:
+        if log.exists():
+            log.unlink()
+        at = AppTest.from_file(str(Path.cwd() / PAGINAS[pagina]), default_timeout=3600)
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{pagina}: {at.exception[0].value}")
+        # Fragmentos gravam a própria execução; fica a da página (a que tem mais seções)
+        execucoes: Dict[str, List[Dict[str, Any]]] = {}
+        for r in _ler_log(log):
+            execucoes.setdefault(r["execucao"], []).append(r)
+        return max(execucoes.values(), key=len) if execucoes else []
+
+    def limpar() -> None:
+        st.cache_data.clear()
+        painel_compartilhado._SNAPSHOTS.clear()
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for pagina, prefixos in SECOES.items():
+        melhores: Dict[str, float] = {}
+        for _ in range(repeticoes):
+            limpar()
+            for secao, ms in _somar_secoes(executar(pagina), prefixos).items():
+                melhores[secao] = min(ms, melhores.get(secao, float("inf")))
+        quente = _somar_secoes(executar(pagina), ["execucao total"])
+        out[pagina] = {"secoes_ms": melhores, "quente_ms": quente.get("execucao total")}
+    return out
+
+
+def executar_filho(diretorio: Path, repeticoes: int, saida: Path) -> None:
+    os.chdir(diretorio)
+    sys.path.insert(0, str(diretorio))
+    resultado = {"loaders_ms": medir_loaders(repeticoes), "paginas": medir_paginas(repeticoes)}
+    saida.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+# =====================================================
+# Processo principal
+# =====================================================
+def preparar_copia(dados: Path) -> Path:
+    destino = Path(tempfile.mkdtemp(prefix="dbv_bench_")) / "app"
+    shutil.copytree(RAIZ, destino, ignore=IGNORAR_NA_COPIA)
+    for db in dados.glob("*.db"):
+        shutil.copy2(db, destino / db.name)
+    return destino
+
+
+def medir_escala(escala: float, repeticoes: int, data_ref: date, gerar_sempre: bool) -> Dict[str, Any]:
+    dados = SAIDA_PADRAO / f"x{escala:g}"
+    if gerar_sempre or not any(dados.glob("*.db")):
+        print(f"Gerando dados sintéticos {escala:g}x em {dados}")
+        gerar(escala, dados, data_ref)
+
+    copia = preparar_copia(dados)
+    saida = copia / "_resultado_bench.json"
+    try:
+        cmd = [sys.executable, __file__, "--filho", str(copia), "--repeticoes", str(repeticoes), "--json", str(saida)]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(proc.stdout[-5000:], proc.stderr[-5000:], sep="\n")
+            raise RuntimeError(f"Falha ao medir a escala {escala:g}x (código {proc.returncode})")
+        return json.loads(saida.read_text(encoding="utf-8"))
+    finally:
+        shutil.rmtree(copia.parent, ignore_errors=True)
+
+
+def imprimir(escalas: Dict[str, Dict[str, Any]]) -> None:
+    nomes = list(escalas)
+    print()
+    print(f"{'Loader (ms)':<44}" + "".join(f"{n:>24}" for n in nomes))
+    print(f"{'':<44}" + "".join(f"{'frio/snapshot/quente':>24}" for _ in nomes))
+    primeiro = escalas[nomes[0]]
+    for loader in primeiro["loaders_ms"]:
+        linha = f"{loader:<44}"
+        for n in nomes:
+            t = escalas[n]["loaders_ms"][loader]
+            linha += f"{t['frio']:>10.0f}{t['snapshot']:>8.0f}{t['quente']:>6.0f}"
+        print(linha)
+    for pagina in primeiro["paginas"]:
+        print(f"\n{'Página ' + pagina + ' (ms)':<44}" + "".join(f"{n:>24}" for n in nomes))
+        secoes = list(primeiro["paginas"][pagina]["secoes_ms"]) + ["rerun quente"]
+        for secao in secoes:
+            linha = f"{secao:<44}"
+            for n in nomes:
+                p = escalas[n]["paginas"][pagina]
+                v = p["quente_ms"] if secao == "rerun quente" else p["secoes_ms"].get(secao)
+                linha += f"{v:>24.0f}" if v is not None else f"{'-':>24}"
+            print(linha)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark dos loaders e das páginas sobre dados sintéticos.")
+    ap.add_argument("--escalas", type=float, nargs="+", default=[10], help="Escalas a medir (padrão: 10)")
+    ap.add_argument("--repeticoes", type=int, default=3, help="Repetições (usa o melhor tempo)")
+    ap.add_argument("--data-ref", default=None, help="Data de referência dos dados gerados dd/mm/aaaa (padrão: hoje)")
+    ap.add_argument("--regerar", action="store_true", help="Gera os dados mesmo que já existam")
+    ap.add_argument("--json", type=Path, default=None, help="Grava o resultado em JSON")
+    ap.add_argument("--filho", type=Path, default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.filho:
+        executar_filho(args.filho, args.repeticoes, args.json)
+        sys.exit(0)
+
+    import pandas as pd
+
+    data_ref = pd.to_datetime(args.data_ref, dayfirst=True).date() if args.data_ref else date.today()
+    resultado = {}
+    for escala in args.escalas:
+        t0 = time.perf_counter()
+        resultado[f"{escala:g}x"] = medir_escala(escala, args.repeticoes, data_ref, args.regerar)
+        print(f"Escala {escala:g}x medida em {time.perf_counter() - t0:.0f}s")
+
+    imprimir(resultado)
+    if args.json:
+        args.json.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nResultado gravado em {args.json}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_parse_money.py
+----------------------------------------
+Micro-benchmark do parser monetário (normalizacao._parse_money_like_series)
+contra a implementação anterior (Series.map + re.match por linha).
+
+- Gera N valores misturando os formatos reais das bases
+  ('R$ 1.234,56', '1,234.56', '42911', '12,5', 'Não encontrado', nulos)
+- Confere que os dois resultados são idênticos
+- Mostra o tempo de cada um e o ganho
+
+Uso:
+  python benchmarks/bench_parse_money.py
+  python benchmarks/bench_parse_money.py --linhas 200000 --repeticoes 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from normalizacao import _conv_money_text, _parse_money_like_series
+
+
+def _parse_money_legado(s: pd.Series) -> pd.Series:
+    """Implementação anterior: uma closure com regex por linha."""
+    s = s.astype(str).fillna("nan").str.strip()
+    s = s.str.replace("R$", "", regex=False).str.replace(" ", "", regex=False)
+    out = s.map(lambda v: _conv_money_text(v) if v is not None else np.nan)
+    return pd.to_numeric(out, errors="coerce").fillna(0.0)
+
+
+def gerar_valores(n: int, seed: int = 42) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    v = rng.random(n) * 1e7
+    tipo = rng.integers(0, 6, n)
+
+    br = pd.Series(v).map(lambda x: f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+    us = pd.Series(v).map(lambda x: f"{x:,.2f}")
+    inteiro = pd.Series(v.astype(np.int64).astype(str))
+    virgula = pd.Series(np.round(v, 2).astype(str)).str.replace(".", ",", regex=False)
+
+    out = br.astype(object)
+    out[tipo == 1] = us[tipo == 1]
+    out[tipo == 2] = inteiro[tipo == 2]
+    out[tipo == 3] = virgula[tipo == 3]
+    out[tipo == 4] = "Não encontrado"
+    out[tipo == 5] = None
+    return out
+
+
+def _medir(fn, s: pd.Series, repeticoes: int):
+    melhor, res = float("inf"), None
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        res = fn(s)
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor, res
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark do parser monetário vetorizado.")
+    ap.add_argument("--linhas", type=int, default=1_000_000, help="Número de valores (padrão: 1M)")
+    ap.add_argument("--repeticoes", type=int, default=3, help="Repetições (usa o melhor tempo)")
+    args = ap.parse_args()
+
+    s = gerar_valores(args.linhas)
+    print(f"Linhas: {len(s):,}")
+
+    t_leg, r_leg = _medir(_parse_money_legado, s, args.repeticoes)
+    t_vet, r_vet = _medir(_parse_money_like_series, s, args.repeticoes)
+
+    iguais = r_leg.equals(r_vet)
+    print(f"Legado (map + regex): {t_leg:8.3f}s")
+    print(f"Vetorizado:           {t_vet:8.3f}s")
+    print(f"Ganho:                {t_leg / t_vet:8.1f}x")
+    print(f"Resultados idênticos: {'sim' if iguais else 'NÃO'}")
+    sys.exit(0 if iguais else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+gate_regressao.py
+----------------------------------------
+Gate de regressão de desempenho sobre os dados sintéticos: roda a suíte
+(bench_painel.py) e compara os tempos com as linhas de base gravadas em
+benchmarks/baselines.json. Sai com código 1 se algum item monitorado
+ficar mais lento que a base além do limite.
+
+Itens monitorados (por escala):
+- _carregar_feebased_cached ........ loader do FeeBased a frio (SQLite)
+- tratar_dados_positivador_mtd ..... Salão Atualizado
+- calcular_indicadores_objetivos ... Salão Atualizado
+- carregar_dados_produtos .......... Salão Life
+
+Os tempos variam com a máquina: junto da base fica o tempo de uma carga de
+referência fixa (pandas/numpy), medida de novo a cada comparação; a base é
+ajustada pela razão entre as duas antes de aplicar o limite. A suíte roda
+--rodadas vezes (os dados são gerados só na primeira) e cada item, assim
+como a referência, usa a mediana das rodadas: uma rodada lenta isolada não
+reprova o gate. Um item só reprova se piorar mais que --limite (%) e mais
+que --minimo-ms em valor absoluto (ruído em tempos muito curtos; o piso
+padrão de 5 ms fica bem abaixo dos itens mais rápidos, para que o limite
+percentual valha para todos). Item monitorado sem medição na execução
+atual (seção renomeada, loader que falhou) também reprova; "sem base" fica
+só para item ausente da base.
+
+Uso:
+  python benchmarks/gate_regressao.py                 # compara com a base
+  python benchmarks/gate_regressao.py --atualizar     # regrava a base
+  python benchmarks/gate_regressao.py --escalas 10 100 --limite 30
+  python benchmarks/gate_regressao.py --rodadas 5      # mediana de 5 rodadas
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from bench_painel import medir_escala
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+
+# Mesma data de referência e semente em toda medição (dados idênticos)
+DATA_REF_PADRAO = "15/10/2026"
+
+RODADAS_PADRAO = 3
+# Piso de ruído: pequeno diante dos itens monitorados (15 ms a 80 ms em 10x)
+MINIMO_MS_PADRAO = 5.0
+
+# nome -> caminho no resultado do bench_painel
+MONITORADOS: Dict[str, Tuple[str, ...]] = {
+    "_carregar_feebased_cached": ("loaders_ms", "carregar_feebased", "frio"),
+    "tratar_dados_positivador_mtd": ("paginas", "atualizado", "secoes_ms", "tratar_dados_positivador_mtd"),
+    "calcular_indicadores_objetivos": ("paginas", "atualizado", "secoes_ms", "calcular_indicadores_objetivos"),
+    "carregar_dados_produtos": ("paginas", "life", "secoes_ms", "carregar_dados_produtos"),
+}
+
+
+# =====================================================
+# Medição
+# =====================================================
+def medir_referencia(repeticoes: int = 5) -> float:
+    """Carga fixa (groupby, ordenação e texto) para normalizar a velocidade da máquina."""
+    rng = np.random.default_rng(0)
+    n = 500_000
+    df = pd.DataFrame({
+        "chave": rng.integers(0, 5_000, n),
+        "valor": rng.random(n),
+        "texto": rng.integers(0, 100_000, n).astype(str),
+    })
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        df.groupby("chave")["valor"].sum()
+        df.sort_values(["chave", "valor"])
+        df["texto"].str.zfill(8).str[:4]
+        melhor = min(melhor, time.perf_counter() - t0)
+    return round(melhor * 1000, 2)
+
+
+def _extrair(resultado: Dict[str, Any], caminho: Tuple[str, ...]) -> Any:
+    valor: Any = resultado
+    for chave in caminho:
+        if not isinstance(valor, dict) or chave not in valor:
+            return None
+        valor = valor[chave]
+    return valor
+
+
+def _mediana(valores: List[Any]) -> Any:
+    validos = [v for v in valores if v is not None]
+    return round(statistics.median(validos), 2) if validos else None
+
+
+def medir(escalas: List[float], repeticoes: int, data_ref: date, rodadas: int = RODADAS_PADRAO) -> Dict[str, Any]:
+    """Mediana, por item, de `rodadas` execuções da suíte (a referência é medida em cada rodada)."""
+    referencias: List[float] = []
+    tempos: Dict[str, Dict[str, List[Any]]] = {f"{e:g}x": {nome: [] for nome in MONITORADOS} for e in escalas}
+    for rodada in range(max(1, rodadas)):
+        referencias.append(medir_referencia())
+        for escala in escalas:
+            resultado = medir_escala(escala, repeticoes, data_ref, gerar_sempre=rodada == 0)
+            for nome, caminho in MONITORADOS.items():
+                tempos[f"{escala:g}x"][nome].append(_extrair(resultado, caminho))
+    return {
+        "referencia_ms": _mediana(referencias),
+        "escalas": {escala: {nome: _mediana(v) for nome, v in itens.items()} for escala, itens in tempos.items()},
+    }
+
+
+# =====================================================
+# Comparação
+# =====================================================
+def comparar(
+    base: Dict[str, Any], atual: Dict[str, Any], limite_pct: float, minimo_ms: float
+) -> List[Dict[str, Any]]:
+    fator = atual["referencia_ms"] / base["referencia_ms"] if base.get("referencia_ms") else 1.0
+    linhas = []
+    for escala, itens in atual["escalas"].items():
+        base_escala = base["escalas"].get(escala, {})
+        for nome, ms in itens.items():
+            ms_base = base_escala.get(nome)
+            if ms is None:
+                linhas.append({"escala": escala, "item": nome, "base_ms": ms_base, "atual_ms": None, "status": "SEM MEDIÇÃO"})
+                continue
+            if ms_base is None:
+                linhas.append({"escala": escala, "item": nome, "base_ms": None, "atual_ms": ms, "status": "sem base"})
+                continue
+            esperado = ms_base * fator
+            variacao = (ms / esperado - 1) * 100 if esperado else 0.0
+            regrediu = variacao > limite_pct and (ms - esperado) > minimo_ms
+            linhas.append({
+                "escala": escala,
+                "item": nome,
+                "base_ms": round(esperado, 2),
+                "atual_ms": ms,
+                "variacao_pct": round(variacao, 1),
+                "status": "REGRESSÃO" if regrediu else "ok",
+            })
+    return linhas
+
+
+def imprimir(linhas: List[Dict[str, Any]], fator: float) -> None:
+    print(f"\nFator da máquina (referência atual / base): {fator:.2f}")
+    print(f"{'escala':<8}{'item':<34}{'base (ms)':>12}{'atual (ms)':>12}{'var %':>9}  status")
+    for l in linhas:
+        base = "-" if l["base_ms"] is None else f"{l['base_ms']:.1f}"
+        atual = "-" if l["atual_ms"] is None else f"{l['atual_ms']:.1f}"
+        var = f"{l['variacao_pct']:+.1f}" if "variacao_pct" in l else "-"
+        print(f"{l['escala']:<8}{l['item']:<34}{base:>12}{atual:>12}{var:>9}  {l['status']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Gate de regressão de desempenho com linhas de base em JSON.")
+    ap.add_argument("--escalas", type=float, nargs="+", default=None, help="Escalas (padrão: as da base, ou 10)")
+    ap.add_argument("--repeticoes", type=int, default=3, help="Repetições (usa o melhor tempo)")
+    ap.add_argument("--rodadas", type=int, default=None, help=f"Rodadas da suíte; usa a mediana (padrão: o da base, ou {RODADAS_PADRAO})")
+    ap.add_argument("--limite", type=float, default=None, help="Piora máxima tolerada em %% (padrão: o da base, ou 25)")
+    ap.add_argument("--minimo-ms", type=float, default=None, help=f"Piora absoluta mínima para reprovar (padrão: o da base, ou {MINIMO_MS_PADRAO:g} ms)")
+    ap.add_argument("--atualizar", action="store_true", help="Grava a medição atual como nova base")
+    ap.add_argument("--base", type=Path, default=BASELINES, help="Arquivo de linhas de base")
+    args = ap.parse_args()
+
+    base = json.loads(args.base.read_text(encoding="utf-8")) if args.base.exists() else None
+    if base is None and not args.atualizar:
+        print(f"Sem linhas de base em {args.base}. Rode com --atualizar para criá-las.")
+        sys.exit(2)
+
+    config = (base or {}).get("config", {})
+    escalas = args.escalas or [float(e.rstrip("x")) for e in (base or {}).get("escalas", {})] or [10.0]
+    limite = args.limite if args.limite is not None else config.get("limite_pct", 25.0)
+    minimo = args.minimo_ms if args.minimo_ms is not None else config.get("minimo_ms", MINIMO_MS_PADRAO)
+    rodadas = args.rodadas if args.rodadas is not None else config.get("rodadas", RODADAS_PADRAO)
+    data_ref = pd.to_datetime(config.get("data_ref", DATA_REF_PADRAO), dayfirst=True).date()
+
+    atual = medir(escalas, args.repeticoes, data_ref, rodadas)
+
+    faltando = [f"{e} {n}" for e, itens in atual["escalas"].items() for n, ms in itens.items() if ms is None]
+    if args.atualizar:
+        if faltando:
+            print(f"Sem medição para: {', '.join(faltando)}. Base não gravada.")
+            sys.exit(1)
+        atual["config"] = {
+            "limite_pct": limite,
+            "minimo_ms": minimo,
+            "data_ref": data_ref.strftime("%d/%m/%Y"),
+            "repeticoes": args.repeticoes,
+            "rodadas": rodadas,
+        }
+        atual["gerado_em"] = datetime.now().isoformat(timespec="seconds")
+        args.base.write_text(json.dumps(atual, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"Linhas de base gravadas em {args.base}")
+        for escala, itens in atual["escalas"].items():
+            for nome, ms in itens.items():
+                print(f"  {escala:<8}{nome:<34}{ms if ms is not None else '-':>12}")
+        sys.exit(0)
+
+    linhas = comparar(base, atual, limite, minimo)
+    imprimir(linhas, atual["referencia_ms"] / base["referencia_ms"] if base.get("referencia_ms") else 1.0)
+    regressoes = [l for l in linhas if l["status"] == "REGRESSÃO"]
+    sem_medicao = [l for l in linhas if l["status"] == "SEM MEDIÇÃO"]
+    if regressoes:
+        print(f"\n{len(regressoes)} regressão(ões) acima de {limite:g}% (e {minimo:g} ms).")
+    if sem_medicao:
+        print(f"\n{len(sem_medicao)} item(ns) monitorado(s) sem medição na execução atual.")
+    if regressoes or sem_medicao:
+        sys.exit(1)
+    print(f"\nSem regressões acima de {limite:g}%.")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
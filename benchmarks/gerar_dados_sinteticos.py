@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+gerar_dados_sinteticos.py
+----------------------------------------
+Gera versões falsas (mesmo esquema, mesmos formatos de texto) de todos os
+bancos DBV Capital_*.db do dashboard, em múltiplos do tamanho atual:
+
+- Positivador (MTD) ........ clientes x escala (uma posição, data de referência)
+- Positivador (FULL) ....... mesmos clientes, uma posição por mês de histórico
+- Transferências ........... transferências x escala
+- FeeBased ................. contratos x escala
+- NPS ...................... pesquisas e clientes x escala
+- Produtos ................. negócios x escala (vários anos de histórico)
+- Objetivos ................ tabela 'objetivos' e Objetivos_PJ1 diária do ano
+
+Escala 1 reproduz o volume das bases reais; assessores crescem junto com
+os clientes (mesma carteira média). Os textos seguem os formatos que os
+loaders tratam hoje: datas 'dd/mm/aaaa' e ISO misturadas, P/L como texto
+com 'Não encontrado', notas NPS '10'/'-'/'nan', colunas 'Unnamed: N' etc.
+
+Tamanho aproximado do Positivador FULL: 1.560 x escala x meses linhas
+(44 colunas). Em 1000x com 3 anos são ~50M linhas: use --anos para limitar.
+
+Uso:
+  python benchmarks/gerar_dados_sinteticos.py --escala 10
+  python benchmarks/gerar_dados_sinteticos.py --escala 100 --saida /tmp/dbv_x100 --anos 2
+"""
+
+import argparse
+import math
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parent.parent
+SAIDA_PADRAO = Path(__file__).resolve().parent / "dados_sinteticos"
+
+# Volumes das bases reais (escala 1)
+BASE = {
+    "assessores": 30,
+    "clientes": 1_560,
+    "transferencias": 1_890,
+    "feebased": 250,
+    "nps": 910,
+    "nps_clientes": 1_450,
+    "produtos": 1_620,
+}
+
+LINHAS_POR_LOTE = 200_000
+
+PRIMEIROS_NOMES = [
+    "ANA", "BRUNO", "CAROLINA", "DIEGO", "EDUARDO", "FERNANDA", "GABRIEL", "HELENA", "IGOR", "JULIANA",
+    "LUIZ", "MARIANA", "MATHEUS", "NATALIA", "PAULO", "RAFAEL", "SAMUEL", "TATIANA", "VINICIUS", "ALICE",
+]
+SOBRENOMES = [
+    "SILVA", "SOUZA", "OLIVEIRA", "PEREIRA", "MONTEIRO", "RAMOS", "RODRIGUES", "ALMEIDA", "COSTA", "MACEDO",
+    "FREITAS", "MARQUES", "PEDRO", "DUARTE", "GOMES", "BARCELLOS", "LINHARES", "MORAES", "SANTOS", "LIMA",
+]
+PROFISSOES = [
+    "OUTROS", "EMPRESARIO", "MEDICO", "ADMINISTRADOR", "ADVOGADO", "ENGENHEIRO", "ESTUDANTE",
+    "APOSENTADO (EXCETO FUNCIONARIO PUBLICO)", "ODONTOLOGO E DENTISTA",
+]
+
+# (Linha Receita, Categoria, Produto, Mesa, Empresa, Fonte Receita, peso)
+PRODUTOS = [
+    ("Câmbio", "Câmbio", "Câmbio Merc. Inter.", "Mesa Câmbio", "PJ1", "Banco XP", 555),
+    ("Crédito", "Crédito", "Resgate Express", "Mesa Crédito/Consórcio", "PJ1", "Banco XP", 251),
+    ("Crédito", "Crédito", "Crédito Colateralizado", "Mesa Crédito/Consórcio", "PJ1", "Banco XP", 172),
+    ("Câmbio", "Câmbio", "Câmbio Remessa", "Mesa Câmbio", "PJ1", "Banco XP", 73),
+    ("Auto/RE", "Auto/RE", "Seguro Auto", "Mesa AutoRE/Saúde", "PJ2", "Tokio Marine", 53),
+    ("Consórcio", "Consórcio", "Consórcio Imóvel", "Mesa Crédito/Consórcio", "PJ2", "Porto Seguros", 44),
+    ("Seguros", "Vida/R.C.", "Seguro Vida", "Mesa Vida", "PJ2", "MAG", 44),
+    ("Auto/RE", "Vida/R.C.", "Seguro Resp. Civil", "Mesa AutoRE/Saúde", "PJ2", "Unimed", 41),
+    ("Crédito", "Crédito", "Crédito Pessoal", "Mesa Crédito/Consórcio", "PJ1", "Banco XP", 33),
+    ("Seguros", "Vida/R.C.", "Seguro Vida", "Mesa Vida", "PJ2", "Prudential", 27),
+    ("Consórcio", "Consórcio", "Consórcio Automóvel", "Mesa Crédito/Consórcio", "PJ2", "Porto Seguros", 25),
+    ("Saúde", "Saúde", "Plano Saúde", "Mesa AutoRE/Saúde", "PJ2", "Saúde DBV", 21),
+    ("Auto/RE", "Auto/RE", "Seguro Residencial", "Mesa AutoRE/Saúde", "PJ2", "Allianz", 19),
+    ("Seguros", "AutoRE", "Seguro Residencial", "Mesa AutoRE/Saúde", "PJ2", "Allianz", 17),
+    ("Câmbio", "Câmbio", "Câmbio Conta Global", "Mesa Câmbio", "PJ1", "Banco XP", 10),
+    ("Crédito", "Financiamento", "Financiamento Imóvel", "Mesa Crédito/Consórcio", "PJ2", "Financiei", 4),
+    ("Saúde", "Saúde", "Plano Saúde", "Mesa Saúde", "PJ2", "Amil", 4),
+]
+
+COLUNAS_POSITIVADOR = [
+    ("Assessor", "INTEGER"), ("Cliente", "INTEGER"), ("Profissão", "TEXT"), ("Sexo", "TEXT"),
+    ("Segmento", "TEXT"), ("Data de Cadastro", "TEXT"), ("Fez Segundo Aporte?", "TEXT"),
+    ("Data de Nascimento", "TEXT"), ("Status", "TEXT"), ("Ativou em M?", "TEXT"), ("Evadiu em M?", "TEXT"),
+    ("Operou Bolsa?", "TEXT"), ("Operou Fundo?", "TEXT"), ("Operou Renda Fixa?", "TEXT"),
+    ("Aplicação Financeira Declarada Ajustada", "REAL"), ("Receita no Mês", "REAL"), ("Receita Bovespa", "REAL"),
+    ("Receita Futuros", "REAL"), ("Receita RF Bancários", "REAL"), ("Receita RF Privados", "REAL"),
+    ("Receita RF Públicos", "REAL"), ("Captação Bruta em M", "REAL"), ("Resgate em M", "REAL"),
+    ("Captação Líquida em M", "REAL"), ("Captação TED", "REAL"), ("Captação ST", "REAL"), ("Captação OTA", "REAL"),
+    ("Captação RF", "REAL"), ("Captação TD", "REAL"), ("Captação PREV", "REAL"), ("Net em M 1", "REAL"),
+    ("Net Em M", "REAL"), ("Net Renda Fixa", "REAL"), ("Net Fundos Imobiliários", "REAL"),
+    ("Net Renda Variável", "REAL"), ("Net Fundos", "REAL"), ("Net Financeiro", "REAL"), ("Net Previdência", "REAL"),
+    ("Net Outros", "REAL"), ("Receita Aluguel", "REAL"), ("Receita Complemento Pacote Corretagem", "REAL"),
+    ("Tipo Pessoa", "TEXT"), ("Data Posição", "TEXT"), ("Data Atualização", "TEXT"),
+]
+
+
+# =====================================================
+# Utilitários
+# =====================================================
+def _qident(nome: str) -> str:
+    return '"' + nome.replace('"', '""') + '"'
+
+
+def _criar_tabela(conn: sqlite3.Connection, tabela: str, colunas: Sequence[tuple]) -> None:
+    defs = ", ".join(f"{_qident(c)} {t}" for c, t in colunas)
+    conn.execute(f"DROP TABLE IF EXISTS {_qident(tabela)}")
+    conn.execute(f"CREATE TABLE {_qident(tabela)} ({defs})")
+
+
+def _inserir(conn: sqlite3.Connection, tabela: str, df: pd.DataFrame) -> None:
+    marcadores = ", ".join("?" * len(df.columns))
+    cols = ", ".join(_qident(c) for c in df.columns)
+    # None no lugar de NaN/NaT para o SQLite gravar NULL
+    linhas = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    conn.executemany(f"INSERT INTO {_qident(tabela)} ({cols}) VALUES ({marcadores})", linhas)
+
+
+def _abrir(caminho: Path) -> sqlite3.Connection:
+    if caminho.exists():
+        caminho.unlink()
+    conn = sqlite3.connect(str(caminho))
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    return conn
+
+
+def _gravar(caminho: Path, tabelas: Dict[str, tuple]) -> None:
+    """tabelas: nome -> (colunas [(nome, tipo)], iterável de DataFrames)."""
+    conn = _abrir(caminho)
+    try:
+        for tabela, (colunas, lotes) in tabelas.items():
+            _criar_tabela(conn, tabela, colunas)
+            for lote in lotes:
+                _inserir(conn, tabela, lote)
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def _escolha(rng: np.random.Generator, valores: Sequence, n: int, pesos: Optional[Sequence[float]] = None) -> np.ndarray:
+    p = None
+    if pesos is not None:
+        p = np.asarray(pesos, dtype=float)
+        p = p / p.sum()
+    return np.asarray(valores, dtype=object)[rng.choice(len(valores), size=n, p=p)]
+
+
+def _nomes(rng: np.random.Generator, n: int) -> np.ndarray:
+    a = _escolha(rng, PRIMEIROS_NOMES, n)
+    b = _escolha(rng, SOBRENOMES, n)
+    c = _escolha(rng, SOBRENOMES, n)
+    return a + " " + b + " " + c
+
+
+def _fmt_br(datas: pd.DatetimeIndex, com_hora: bool = False) -> np.ndarray:
+    return np.asarray(datas.strftime("%d/%m/%Y %H:%M:%S" if com_hora else "%d/%m/%Y"), dtype=object)
+
+
+def _datas_entre(rng: np.random.Generator, inicio: date, fim: date, n: int) -> pd.DatetimeIndex:
+    dias = max(1, (fim - inicio).days)
+    segundos = rng.integers(0, dias * 86_400, n)
+    return pd.DatetimeIndex(pd.Timestamp(inicio) + pd.to_timedelta(segundos, unit="s"))
+
+
+def _talvez_nulo(rng: np.random.Generator, valores: np.ndarray, frac_nulos: float) -> np.ndarray:
+    out = valores.astype(object)
+    out[rng.random(len(out)) < frac_nulos] = None
+    return out
+
+
+def _ultimo_dia_util(ano: int, mes: int) -> date:
+    d = (date(ano + (mes == 12), mes % 12 + 1, 1) - timedelta(days=1))
+    while d.weekday() >= 5:
+        d -= timedelta(days=1)
+    return d
+
+
+# =====================================================
+# Carteira (assessores e clientes comuns às bases)
+# =====================================================
+def gerar_carteira(rng: np.random.Generator, escala: float) -> Dict[str, np.ndarray]:
+    n_assessores = max(5, int(round(BASE["assessores"] * escala)))
+    n_clientes = max(50, int(round(BASE["clientes"] * escala)))
+    numeros = rng.choice(np.arange(10_000, 100_000), size=min(n_assessores, 90_000), replace=False)
+    if n_assessores > len(numeros):
+        numeros = np.concatenate([numeros, np.arange(100_000, 100_000 + n_assessores - len(numeros))])
+    # Carteiras de tamanho desigual (poucos assessores concentram clientes)
+    pesos = rng.pareto(1.5, n_assessores) + 1
+    assessor_cliente = numeros[rng.choice(n_assessores, size=n_clientes, p=pesos / pesos.sum())]
+    return {
+        "assessores": numeros,
+        "codigos": np.array([f"A{n}" for n in numeros], dtype=object),
+        "nomes_assessores": _nomes(rng, n_assessores),
+        "clientes": rng.choice(np.arange(1_000_000, 30_000_000), size=n_clientes, replace=False),
+        "assessor_cliente": assessor_cliente,
+    }
+
+
+# =====================================================
+# Positivador (MTD e FULL)
+# =====================================================
+def _lote_positivador(
+    rng: np.random.Generator, clientes: np.ndarray, assessores: np.ndarray, data_pos: date, crescimento: float
+) -> pd.DataFrame:
+    n = len(clientes)
+    net = rng.lognormal(11.5, 1.6, n) * crescimento
+    net[rng.random(n) < 0.02] = 0.0  # contas zeradas
+    bruta = _talvez_nulo(rng, np.round(rng.lognormal(10.5, 1.8, n), 2), 0.8)
+    resgate = _talvez_nulo(rng, -np.round(rng.lognormal(9.5, 1.5, n), 2), 0.82)
+    liq = np.nan_to_num(pd.to_numeric(pd.Series(bruta), errors="coerce").to_numpy()) + np.nan_to_num(
+        pd.to_numeric(pd.Series(resgate), errors="coerce").to_numpy()
+    )
+    liq = np.where(rng.random(n) < 0.55, np.nan, np.round(liq, 2))
+    data_txt = data_pos.strftime("%d/%m/%Y")
+    nascimento = _datas_entre(rng, date(1940, 1, 1), date(2005, 12, 31), n)
+    cadastro = _datas_entre(rng, date(2015, 1, 1), data_pos, n)
+    sim_nao = ["Sim", "Não"]
+
+    df = pd.DataFrame({
+        "Assessor": assessores,
+        "Cliente": clientes,
+        "Profissão": _escolha(rng, PROFISSOES, n),
+        "Sexo": _talvez_nulo(rng, _escolha(rng, ["M", "F"], n, [0.55, 0.45]), 0.05),
+        "Segmento": _escolha(rng, ["NÃO DISPONÍVEL", "Express", "Plus", "Unique", "Private"], n, [969, 541, 25, 21, 7]),
+        "Data de Cadastro": _fmt_br(cadastro),
+        "Fez Segundo Aporte?": _escolha(rng, sim_nao, n, [0.75, 0.25]),
+        "Data de Nascimento": _fmt_br(nascimento),
+        "Status": _escolha(rng, ["ATIVO", "INATIVO"], n, [0.69, 0.31]),
+        "Ativou em M?": _escolha(rng, sim_nao, n, [0.013, 0.987]),
+        "Evadiu em M?": _escolha(rng, sim_nao, n, [0.008, 0.992]),
+        "Operou Bolsa?": _escolha(rng, sim_nao, n, [0.18, 0.82]),
+        "Operou Fundo?": _escolha(rng, sim_nao, n, [0.2, 0.8]),
+        "Operou Renda Fixa?": _escolha(rng, sim_nao, n, [0.3, 0.7]),
+        "Aplicação Financeira Declarada Ajustada": np.round(rng.lognormal(12, 1.5, n), -3),
+        "Receita no Mês": _talvez_nulo(rng, np.round(rng.lognormal(4.5, 1.5, n), 6), 0.73),
+    })
+    for col in ("Receita Bovespa", "Receita Futuros", "Receita RF Bancários", "Receita RF Privados", "Receita RF Públicos"):
+        df[col] = _talvez_nulo(rng, np.round(rng.lognormal(3.5, 1.5, n), 6), 0.85)
+    df["Captação Bruta em M"] = bruta
+    df["Resgate em M"] = resgate
+    df["Captação Líquida em M"] = liq
+    for col in ("Captação TED", "Captação ST", "Captação OTA", "Captação RF", "Captação TD", "Captação PREV"):
+        df[col] = _talvez_nulo(rng, np.round(rng.lognormal(9, 1.8, n), 2), 0.9)
+    df["Net em M 1"] = _talvez_nulo(rng, np.round(net * rng.uniform(0.9, 1.05, n), 2), 0.16)
+    df["Net Em M"] = np.round(net, 2)
+    for col in ("Net Renda Fixa", "Net Fundos Imobiliários", "Net Renda Variável", "Net Fundos", "Net Financeiro",
+                "Net Previdência", "Net Outros"):
+        df[col] = _talvez_nulo(rng, np.round(net * rng.uniform(0.05, 0.6, n), 2), 0.5)
+    for col in ("Receita Aluguel", "Receita Complemento Pacote Corretagem"):
+        df[col] = _talvez_nulo(rng, np.round(rng.lognormal(2.5, 1.2, n), 6), 0.95)
+    df["Tipo Pessoa"] = _escolha(rng, ["PESSOA FÍSICA", "PESSOA JURÍDICA"], n, [0.953, 0.047])
+    df["Data Posição"] = data_txt
+    df["Data Atualização"] = data_txt
+    return df
+
+
+def lotes_positivador_mtd(rng: np.random.Generator, carteira: Dict[str, np.ndarray], data_ref: date) -> Iterable[pd.DataFrame]:
+    clientes, assessores = carteira["clientes"], carteira["assessor_cliente"]
+    for i in range(0, len(clientes), LINHAS_POR_LOTE):
+        fatia = slice(i, i + LINHAS_POR_LOTE)
+        yield _lote_positivador(rng, clientes[fatia], assessores[fatia], data_ref, 1.0)
+
+
+def lotes_positivador_full(
+    rng: np.random.Generator, carteira: Dict[str, np.ndarray], data_ref: date, anos: int
+) -> Iterable[pd.DataFrame]:
+    """Uma posição por mês (último dia útil; o mês corrente na data de referência)."""
+    meses = []
+    ano, mes = data_ref.year - anos + 1, 1
+    while (ano, mes) <= (data_ref.year, data_ref.month):
+        meses.append((ano, mes))
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+
+    clientes, assessores = carteira["clientes"], carteira["assessor_cliente"]
+    for k, (ano, mes) in enumerate(meses):
+        data_pos = data_ref if (ano, mes) == (data_ref.year, data_ref.month) else _ultimo_dia_util(ano, mes)
+        # Base de clientes cresce ao longo do histórico
+        ativos = int(len(clientes) * (0.6 + 0.4 * (k + 1) / len(meses)))
+        crescimento = 0.7 + 0.3 * (k + 1) / len(meses)
+        for i in range(0, ativos, LINHAS_POR_LOTE):
+            fatia = slice(i, min(i + LINHAS_POR_LOTE, ativos))
+            yield _lote_positivador(rng, clientes[fatia], assessores[fatia], data_pos, crescimento)
+
+
+# =====================================================
+# Transferências
+# =====================================================
+def gerar_transferencias(rng: np.random.Generator, carteira: Dict[str, np.ndarray], escala: float, data_ref: date) -> pd.DataFrame:
+    n = max(20, int(round(BASE["transferencias"] * escala)))
+    cods, nomes = carteira["codigos"], carteira["nomes_assessores"]
+    destino = rng.integers(0, len(cods), n)
+    tem_origem = rng.random(n) < 0.15
+    origem = rng.integers(0, len(cods), n)
+    datas = _datas_entre(rng, date(data_ref.year - 1, 1, 1), data_ref, n)
+    data_transf = np.asarray(datas.normalize().strftime("%Y-%m-%d %H:%M:%S"), dtype=object)
+    formato_br = rng.random(n) < 0.02
+    data_transf[formato_br] = _fmt_br(datas[formato_br], com_hora=True)
+    data_transf[rng.random(n) < 0.13] = None
+    data_transf[rng.random(n) < 0.01] = "-"
+    solicitacao = np.asarray((datas - pd.to_timedelta(rng.integers(1, 10, n), unit="D")).normalize()
+                             .strftime("%Y-%m-%d %H:%M:%S"), dtype=object)
+    solicitacao[tem_origem] = None
+    externo = rng.random(n) < 0.15
+    cliente = np.asarray(rng.integers(1_000_000, 9_000_000, n).astype(str), dtype=object)
+    cliente[externo] = "Externo"
+    cliente[tem_origem] = None
+    pl = _talvez_nulo(rng, np.round(rng.lognormal(11.5, 1.4, n), 4), 0.13)
+    pl[tem_origem] = None
+    return pd.DataFrame({
+        "Código": rng.integers(100_000, 999_999, n).astype(str),
+        "Código Assessor Origem": np.where(tem_origem, cods[origem], None),
+        "Nome Assessor Origem": np.where(tem_origem, nomes[origem], None),
+        "Código Assessor Destino": cods[destino],
+        "Nome Assessor Destino": nomes[destino],
+        "Data Solicitação": solicitacao,
+        "Data Transferência": data_transf,
+        "Origem Solicitação": _talvez_nulo(
+            rng, _escolha(rng, ["PORTAL", "Portal de Clientes", "CARTEIRA.ADMINISTRADA", "ROBO.CADASTRO", "LUIZ.A28215"], n,
+                          [0.3, 0.1, 0.05, 0.05, 0.5]), 0.27),
+        "Tipo": _escolha(rng, ["Entrada", "Saída"], n, [0.97, 0.03]),
+        "Status": _escolha(rng, ["Concluído", "Aprovado Assessor Destino", "APROVADO ASSESSOR DESTINO",
+                                 "EM ANDAMENTO", "Cancelado"], n, [0.47, 0.48, 0.02, 0.02, 0.01]),
+        "Código Solicitação": np.where(tem_origem, "0", rng.integers(4_000_000, 6_000_000, n).astype(str)),
+        "Cliente": cliente,
+        "PL": pl,
+    })
+
+
+# =====================================================
+# FeeBased
+# =====================================================
+def gerar_feebased(rng: np.random.Generator, carteira: Dict[str, np.ndarray], escala: float, data_ref: date) -> pd.DataFrame:
+    n = max(10, int(round(BASE["feebased"] * escala)))
+    idx = rng.choice(len(carteira["clientes"]), size=min(n, len(carteira["clientes"])), replace=False)
+    idx = np.resize(idx, n)
+    datas = _datas_entre(rng, date(data_ref.year - 1, 1, 1), data_ref, n)
+    data_txt = _fmt_br(datas, com_hora=True)
+    data_txt[rng.random(n) < 0.02] = "01/01/0001 00:00:00"
+    pl = np.asarray(np.round(rng.lognormal(11.5, 1.7, n)).astype(np.int64).astype(str), dtype=object)
+    pl[rng.random(n) < 0.1] = "Não encontrado"
+    return pd.DataFrame({
+        "Código Cliente": carteira["clientes"][idx],
+        "Nome Cliente": _nomes(rng, n),
+        "Data Contratação": data_txt,
+        "Taxa Contratação": np.round(_escolha(rng, [0.006, 0.007, 0.008, 0.01], n).astype(float), 6),
+        "Exceção RV": _escolha(rng, ["Sim", "Não"], n, [0.74, 0.26]),
+        "Resgate em fundo": _escolha(rng, ["Sim", "Não"], n, [0.66, 0.34]),
+        "Código Assessor": np.array([f"A{a}" for a in carteira["assessor_cliente"][idx]], dtype=object),
+        "Status": _escolha(rng, ["Ativo", "Pendente", "Aprovado", "Recusado"], n, [209, 26, 11, 1]),
+        "P/L": pl,
+    })
+
+
+# =====================================================
+# NPS
+# =====================================================
+COLUNAS_NPS = [
+    "Survey ID", "Id do Usuário", "Customer ID", "Data da Resposta", "Unnamed: 4", "Pesquisa Relacionamento",
+    "XP - Relacionamento - Aniversário - NPS Assessor", "Status", "Código Assessor", "Notificação?",
+] + [f"Unnamed: {i}" for i in range(10, 19)]
+
+
+def gerar_nps(rng: np.random.Generator, carteira: Dict[str, np.ndarray], escala: float, data_ref: date) -> Dict[str, pd.DataFrame]:
+    n = max(20, int(round(BASE["nps"] * escala)))
+    envio = _datas_entre(rng, date(data_ref.year - 1, 5, 1), data_ref, n)
+    status = _escolha(rng, ["Não Respondido", "Respondido", " Respondido", "NOT_SAMPLED"], n, [833, 52, 26, 2])
+    respondido = np.char.strip(status.astype(str)) == "Respondido"
+    resposta = np.asarray((envio + pd.to_timedelta(rng.integers(1, 8 * 86_400, n), unit="s"))
+                          .strftime("%Y-%m-%d %H:%M:%S.000"), dtype=object)
+    resposta[~respondido] = "NaT"
+    nota = _escolha(rng, ["10", "9", "8", "6", "5", "-"], n, [82, 2, 1, 1, 1, 10]).astype(object)
+    nota[~respondido] = _escolha(rng, ["nan", "-"], int((~respondido).sum()), [0.92, 0.08])
+    df = pd.DataFrame({
+        "Survey ID": rng.integers(120_000_000, 121_000_000, n).astype(str),
+        "Id do Usuário": [f"{a:08x}-{b:04x}-40d1-a989-{c:012x}" for a, b, c in zip(
+            rng.integers(0, 16**8, n), rng.integers(0, 16**4, n), rng.integers(0, 16**12, n))],
+        "Customer ID": _nomes(rng, n),
+        "Data da Resposta": resposta,
+        "Unnamed: 4": np.asarray(envio.strftime("%Y-%m-%d %H:%M:%S.000"), dtype=object),
+        "Pesquisa Relacionamento": _escolha(rng, ["XP aniversario", "XP onboarding"], n, [770, 143]),
+        "XP - Relacionamento - Aniversário - NPS Assessor": nota,
+        "Status": status,
+        "Código Assessor": _escolha(rng, carteira["codigos"], n),
+        "Notificação?": _escolha(rng, ["Sim", "Não", "não"], n, [909, 3, 1]),
+    })
+    for i in range(10, 18):
+        df[f"Unnamed: {i}"] = ""
+    df["Unnamed: 18"] = np.where(respondido, nota, "nan")
+
+    m = max(20, int(round(BASE["nps_clientes"] * escala)))
+    clientes = pd.DataFrame({
+        "Código Cliente": rng.integers(100_000, 30_000_000, m).astype(str),
+        "Nome Cliente": _nomes(rng, m),
+    })
+    return {"nps_planilha1": df[COLUNAS_NPS], "nps_clientes": clientes}
+
+
+# =====================================================
+# Produtos
+# =====================================================
+def gerar_produtos(rng: np.random.Generator, carteira: Dict[str, np.ndarray], escala: float, data_ref: date) -> pd.DataFrame:
+    n = max(20, int(round(BASE["produtos"] * escala)))
+    combos = rng.choice(len(PRODUTOS), size=n, p=np.array([p[-1] for p in PRODUTOS]) / sum(p[-1] for p in PRODUTOS))
+    tab = np.array([p[:-1] for p in PRODUTOS], dtype=object)[combos]
+    # Histórico desde 2019 (data no 1º do mês, ISO) e o mês corrente em 'dd/mm/aaaa'
+    datas = _datas_entre(rng, date(2019, 5, 1), data_ref, n)
+    data_txt = np.asarray(datas.to_period("M").to_timestamp().strftime("%Y-%m-%d %H:%M:%S"), dtype=object)
+    mes_corrente = (datas.year == data_ref.year) & (datas.month == data_ref.month)
+    data_txt[mes_corrente] = _fmt_br(datas[mes_corrente])
+    idx = rng.integers(0, len(carteira["clientes"]), n)
+    codigo_assessor = np.array([f"A{a}" for a in carteira["assessor_cliente"][idx]], dtype=object)
+    codigo_assessor[rng.random(n) < 0.05] = "DBV999"
+    return pd.DataFrame({
+        "Data": data_txt,
+        "Produto": tab[:, 2],
+        "Apólice/Grupo/Cota": rng.integers(100_000_000, 999_999_999, n).astype(str),
+        "Valor Negócio (R$)": np.round(rng.lognormal(8, 1.4, n), 2),
+        "Fonte Receita": tab[:, 5],
+        "Linha Receita": tab[:, 0],
+        "Categoria": tab[:, 1],
+        "Nome Cliente": _nomes(rng, n),
+        "Código DBV": np.array([f"C{i:06d}" for i in rng.integers(0, 999_999, n)], dtype=object),
+        "Código XP": carteira["clientes"][idx].astype(float),
+        "Código Assessor": codigo_assessor,
+        "Mesa": tab[:, 3],
+        "Empresa": tab[:, 4],
+    })
+
+
+# =====================================================
+# Objetivos
+# =====================================================
+def gerar_objetivos(escala: float, data_ref: date) -> Dict[str, pd.DataFrame]:
+    cab = ["Objetivo", "Ref", "AUC Inicial", "AUC Objetivo", "Cap. Liq Objetivo", "Receita Objetivo", "Contas Ativadas",
+           "Rentabilidade Ano", "Qtd Dias Ano", "Verificação AUC", "Verificação Cap", "Verificação Receita",
+           "Verificação Contas"]
+    anos = [
+        (data_ref.year - 1, 340_000_000, 560_217_582.04, 152_700_000, 1_777_098.8, 300),
+        (data_ref.year, 453_052_907, 694_000_000, 183_600_000, 2_514_314.17, 400),
+        (data_ref.year + 1, 800_000_000, 1_000_000_000, 200_000_000, 6_000_000, 500),
+    ]
+    linhas = [cab] + [
+        [str(a), "0", f"{ini * escala:.0f}", f"{obj * escala:.2f}", f"{cap * escala:.0f}", f"{rec * escala:.2f}",
+         str(int(contas * escala)), "10000000", "365", "True", "True", "True", "True"]
+        for a, ini, obj, cap, rec, contas in anos
+    ]
+    objetivos = pd.DataFrame(linhas, columns=[f"col_{i}" for i in range(13)])
+
+    dias = pd.date_range(date(data_ref.year, 1, 1), data_ref, freq="D")
+    cap_obj, auc_obj, auc_ini = 183_600_000 * escala, 694_000_000 * escala, 453_052_907 * escala
+    cap_diario = np.full(len(dias), cap_obj / 365) * np.random.default_rng(7).uniform(0.8, 1.2, len(dias))
+    pj1 = pd.DataFrame({
+        "Data": dias.strftime("%d/%m/%Y"),
+        "Cap Objetivo (ano)": int(cap_obj),
+        "Cap Acumulado": np.cumsum(cap_diario),
+        "AUC Objetivo (Ano)": int(auc_obj),
+        "AUC Acumulado": auc_ini + np.cumsum(cap_diario) * 1.3,
+        "Cap Diário (ANO)": cap_diario,
+    })
+    return {"objetivos": objetivos, "Objetivos_PJ1": pj1}
+
+
+# =====================================================
+# Principal
+# =====================================================
+def _colunas(df: pd.DataFrame) -> List[tuple]:
+    # Pelo conteúdo: colunas object com floats e None (ex.: PL) continuam REAL
+    afinidade = {"integer": "INTEGER", "floating": "REAL", "mixed-integer-float": "REAL"}
+    return [(c, afinidade.get(pd.api.types.infer_dtype(df[c], skipna=True), "TEXT")) for c in df.columns]
+
+
+def _tabela(df: pd.DataFrame, colunas: Optional[List[tuple]] = None) -> tuple:
+    return (colunas or _colunas(df), [df])
+
+
+def anos_padrao(escala: float) -> int:
+    """Anos de histórico do Positivador FULL: 1 em 1x, 2 em 10x, 3 a partir de 100x."""
+    return int(min(3, 1 + math.floor(math.log10(max(escala, 1)))))
+
+
+def gerar(escala: float, saida: Path, data_ref: date, anos: Optional[int] = None, seed: int = 42) -> Dict[str, int]:
+    """Gera todos os bancos em `saida`; retorna linhas por arquivo."""
+    saida.mkdir(parents=True, exist_ok=True)
+    anos = anos or anos_padrao(escala)
+    rng = np.random.default_rng(seed)
+    carteira = gerar_carteira(rng, escala)
+    linhas: Dict[str, int] = {}
+
+    def contar(nome: str, lotes: Iterable[pd.DataFrame]) -> Iterable[pd.DataFrame]:
+        for lote in lotes:
+            linhas[nome] = linhas.get(nome, 0) + len(lote)
+            yield lote
+
+    etapas = [
+        ("DBV Capital_Positivador (MTD).db", lambda: {
+            "positivador_mtd": (COLUNAS_POSITIVADOR, contar("positivador_mtd", lotes_positivador_mtd(rng, carteira, data_ref))),
+        }),
+        ("DBV Capital_Positivador.db", lambda: {
+            "positivador": (COLUNAS_POSITIVADOR, contar("positivador", lotes_positivador_full(rng, carteira, data_ref, anos))),
+        }),
+        ("DBV Capital_Transferências.db", lambda: {
+            "transferencias": _tabela(gerar_transferencias(rng, carteira, escala, data_ref)),
+        }),
+        ("DBV Capital_FeeBased.db", lambda: {"feebased": _tabela(gerar_feebased(rng, carteira, escala, data_ref))}),
+        ("DBV Capital_NPS.db", lambda: {k: _tabela(v) for k, v in gerar_nps(rng, carteira, escala, data_ref).items()}),
+        ("DBV Capital_Produtos.db", lambda: {"Produtos": _tabela(gerar_produtos(rng, carteira, escala, data_ref))}),
+        ("DBV Capital_Objetivos.db", lambda: {k: _tabela(v) for k, v in gerar_objetivos(escala, data_ref).items()}),
+    ]
+    for arquivo, montar in etapas:
+        t0 = time.perf_counter()
+        tabelas = montar()
+        _gravar(saida / arquivo, tabelas)
+        for tabela, (_, lotes) in tabelas.items():
+            if isinstance(lotes, list):
+                linhas[tabela] = sum(len(l) for l in lotes)
+        total = sum(linhas.get(t, 0) for t in tabelas)
+        print(f"  {arquivo:<36} {total:>12,} linhas  {time.perf_counter() - t0:7.1f}s")
+    return linhas
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Gera bancos DBV Capital_*.db sintéticos em múltiplos do volume real.")
+    ap.add_argument("--escala", type=float, default=10, help="Multiplicador do volume real (padrão: 10)")
+    ap.add_argument("--saida", type=Path, default=None, help="Diretório de saída (padrão: benchmarks/dados_sinteticos/x<escala>)")
+    ap.add_argument("--anos", type=int, default=None, help="Anos de histórico do Positivador FULL (padrão: conforme a escala)")
+    ap.add_argument("--data-ref", default=None, help="Data de referência dd/mm/aaaa (padrão: hoje)")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    data_ref = pd.to_datetime(args.data_ref, dayfirst=True).date() if args.data_ref else date.today()
+    saida = args.saida or SAIDA_PADRAO / f"x{args.escala:g}"
+    print(f"Escala {args.escala:g}x, data de referência {data_ref:%d/%m/%Y} -> {saida}")
+    t0 = time.perf_counter()
+    gerar(args.escala, saida, data_ref, args.anos, args.seed)
+    print(f"Total: {time.perf_counter() - t0:.1f}s")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
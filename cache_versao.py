@@ -0,0 +1,85 @@
+"""
+Cache do Streamlit chaveado pela versão dos dados, e não pelo conteúdo do DataFrame.
+
+Por padrão o st.cache_data calcula o hash de todo DataFrame recebido como
+argumento a cada rerun (custo proporcional ao tamanho da tabela). Aqui os
+loaders registram o DataFrame que entregam com um token leve da origem
+(caminho do .db + tamanho + mtime_ns) e as funções decoradas com
+@cache_por_versao usam esse token como hash do argumento.
+
+O token só vale para o próprio objeto registrado. O registro guarda uma
+referência fraca (weakref) ao DataFrame e não usa df.attrs: cópias e
+recortes são outro objeto, não herdam a marca e caem no hash completo do
+conteúdo; quando o DataFrame marcado é coletado a entrada sai do registro,
+então um objeto novo que reaproveite o mesmo id() não herda o token.
+"""
+
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from registro_versoes import versao_vigente
+
+# id(df) -> (referência fraca ao DataFrame marcado, token da versão)
+_MARCADOS: Dict[int, Tuple["weakref.ref[pd.DataFrame]", str]] = {}
+
+
+def token_versao(db_path: Path) -> str:
+    """Token da versão (vigente) de um arquivo de dados: caminho + tamanho + mtime_ns."""
+    db_path = Path(db_path)
+    return f"{db_path.resolve()}|{versao_vigente(db_path)[1]}"
+
+
+def marcar_versao(
+    df: Optional[pd.DataFrame], db_path: Optional[Path], recorte: Optional[Tuple[Any, ...]] = None
+) -> Optional[pd.DataFrame]:
+    """
+    Registra o DataFrame entregue por um loader com a versão da origem.
+    Loaders que devolvem recortes (colunas, janela de datas) passam os
+    argumentos do recorte em `recorte`, que entram no token: um recorte
+    nunca tem o mesmo hash da tabela inteira nem de outro recorte.
+    """
+    if isinstance(df, pd.DataFrame) and db_path is not None:
+        try:
+            token = token_versao(db_path)
+        except OSError:
+            return df
+        if recorte is not None and any(r is not None for r in recorte):
+            token = f"{token}|{recorte!r}"
+        chave = id(df)
+
+        def _descartar(ref: "weakref.ref[pd.DataFrame]") -> None:
+            if _MARCADOS.get(chave, (None,))[0] is ref:
+                del _MARCADOS[chave]
+
+        _MARCADOS[chave] = (weakref.ref(df, _descartar), token)
+    return df
+
+
+def versao_de(df: pd.DataFrame) -> Any:
+    """Hash usado pelo cache: o token da origem quando o objeto é o marcado, senão o conteúdo."""
+    marcado = _MARCADOS.get(id(df))
+    if marcado is not None and marcado[0]() is df:
+        return marcado[1]
+    try:
+        conteudo = int(pd.util.hash_pandas_object(df, index=True).sum())
+        return ("conteudo", tuple(map(str, df.columns)), df.shape, conteudo)
+    except TypeError:
+        # Células não-hasheáveis (listas, dicts...): não reaproveita cache
+        return ("sem_versao", id(df), time.perf_counter_ns())
+
+
+def cache_por_versao(func: Optional[Callable] = None, **kwargs):
+    """
+    Equivalente a @st.cache_data(show_spinner=False), mas com DataFrames
+    hasheados por versao_de. Aceita os mesmos argumentos do st.cache_data.
+    """
+    kwargs.setdefault("show_spinner", False)
+    hash_funcs = {pd.DataFrame: versao_de}
+    hash_funcs.update(kwargs.pop("hash_funcs", None) or {})
+    decorador = st.cache_data(hash_funcs=hash_funcs, **kwargs)
+    return decorador(func) if func is not None else decorador
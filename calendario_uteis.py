@@ -0,0 +1,149 @@
+"""
+Calendário de dias úteis (padrão ANBIMA) pré-calculado.
+
+Os feriados nacionais fixos e móveis (Carnaval, Sexta-feira Santa e Corpus
+Christi, derivados da Páscoa) são gerados uma única vez para o intervalo
+[ANO_INICIAL, ANO_FINAL] e materializados em uma tabela numpy:
+
+- _ACUMULADO[i]: quantidade de dias úteis em [_INICIO, _INICIO + i)
+- _UTEIS: datas dos dias úteis, em ordem
+
+Com isso contagens e deslocamentos em dias úteis são O(1) (uma subtração
+ou uma indexação). Datas fora do intervalo caem para np.busday_* com o
+mesmo calendário.
+"""
+
+from datetime import date
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+
+ANO_INICIAL = 2000
+ANO_FINAL = 2100
+
+
+# =====================================================
+# Feriados
+# =====================================================
+def _pascoa(ano: int) -> date:
+    """Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher, calendário gregoriano)."""
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+def feriados_anbima(ano: int) -> List[date]:
+    """Feriados nacionais considerados pela ANBIMA no ano (inclui os que caem no fim de semana)."""
+    pascoa = np.datetime64(_pascoa(ano), "D")
+    moveis = [
+        pascoa - 48,  # Carnaval (segunda)
+        pascoa - 47,  # Carnaval (terça)
+        pascoa - 2,   # Sexta-feira Santa
+        pascoa + 60,  # Corpus Christi
+    ]
+    fixos = [
+        (1, 1),    # Confraternização Universal
+        (4, 21),   # Tiradentes
+        (5, 1),    # Dia do Trabalho
+        (9, 7),    # Independência
+        (10, 12),  # Nossa Senhora Aparecida
+        (11, 2),   # Finados
+        (11, 15),  # Proclamação da República
+        (12, 25),  # Natal
+    ]
+    if ano >= 2024:
+        fixos.append((11, 20))  # Dia Nacional de Zumbi e da Consciência Negra (Lei 14.759/2023)
+
+    datas = [date(ano, m, d) for m, d in fixos] + [d.astype(date) for d in moveis]
+    return sorted(datas)
+
+
+# =====================================================
+# Tabela pré-calculada
+# =====================================================
+FERIADOS = np.array(
+    [d for ano in range(ANO_INICIAL, ANO_FINAL + 1) for d in feriados_anbima(ano)],
+    dtype="datetime64[D]",
+)
+CALENDARIO = np.busdaycalendar(weekmask="1111100", holidays=FERIADOS)
+
+_INICIO = np.datetime64(f"{ANO_INICIAL}-01-01", "D")
+_FIM = np.datetime64(f"{ANO_FINAL}-12-31", "D")
+_DIAS = np.arange(_INICIO, _FIM + 1, dtype="datetime64[D]")
+_EH_UTIL = np.is_busday(_DIAS, busdaycal=CALENDARIO)
+_ACUMULADO = np.concatenate(([0], np.cumsum(_EH_UTIL, dtype=np.int64)))
+_UTEIS = _DIAS[_EH_UTIL]
+
+
+def _para_dia(d: Any) -> np.ndarray:
+    """Converte data/Timestamp/string (ou array deles) para datetime64[D]."""
+    if isinstance(d, (pd.Series, pd.Index)):
+        return d.to_numpy(dtype="datetime64[D]")
+    if isinstance(d, (str, date, pd.Timestamp, np.datetime64)):
+        return np.datetime64(pd.Timestamp(d).date(), "D")
+    return np.asarray(pd.to_datetime(d), dtype="datetime64[D]")
+
+
+def _dentro(d: np.ndarray) -> bool:
+    return bool(np.all((d >= _INICIO) & (d <= _FIM)))
+
+
+def _escalar(x):
+    return x.item() if isinstance(x, (np.ndarray, np.generic)) and np.ndim(x) == 0 else x
+
+
+# =====================================================
+# Consultas
+# =====================================================
+def eh_dia_util(d: Any):
+    dia = _para_dia(d)
+    if _dentro(dia):
+        return _escalar(_EH_UTIL[(dia - _INICIO).astype(np.int64)])
+    return _escalar(np.is_busday(dia, busdaycal=CALENDARIO))
+
+
+def dias_uteis_entre(inicio: Any, fim: Any):
+    """
+    Dias úteis em [inicio, fim], contando as duas pontas (mesma convenção de
+    len(pd.bdate_range(inicio, fim))). Retorna 0 quando fim < inicio.
+    Aceita escalares ou arrays (broadcast).
+    """
+    ini, fi = _para_dia(inicio), _para_dia(fim)
+    if _dentro(ini) and _dentro(fi):
+        i = (ini - _INICIO).astype(np.int64)
+        j = (fi - _INICIO).astype(np.int64) + 1
+        n = _ACUMULADO[j] - _ACUMULADO[i]
+    else:
+        n = np.busday_count(ini, fi + 1, busdaycal=CALENDARIO)
+    return _escalar(np.maximum(n, 0))
+
+
+def dias_uteis_ano(ano: int) -> int:
+    return int(dias_uteis_entre(date(ano, 1, 1), date(ano, 12, 31)))
+
+
+def dias_uteis_mes(ano: int, mes: int) -> int:
+    inicio = pd.Timestamp(ano, mes, 1)
+    return int(dias_uteis_entre(inicio, inicio + pd.offsets.MonthEnd(1)))
+
+
+def somar_dias_uteis(d: Any, n: int) -> pd.Timestamp:
+    """
+    Desloca `d` em `n` dias úteis (n < 0 volta). Se `d` não for dia útil,
+    parte do próximo dia útil (roll='forward' do numpy).
+    """
+    dia = _para_dia(d)
+    if _dentro(dia):
+        pos = _ACUMULADO[(dia - _INICIO).astype(np.int64)] + n
+        if 0 <= pos < len(_UTEIS):
+            return pd.Timestamp(_UTEIS[pos])
+    return pd.Timestamp(np.busday_offset(dia, n, roll="forward", busdaycal=CALENDARIO))
@@ -0,0 +1,198 @@
+"""
+Plano de carga de uma execução (rerun) da página.
+
+O script da página chamava os mesmos loaders várias vezes por rerun
+(Positivador FULL, Positivador MTD, Objetivos_PJ1...). Mesmo com o
+st.cache_data cada chamada devolve uma cópia nova do DataFrame
+(desserialização), e os derivados (tratamento das colunas, data de
+referência, indicadores) eram refeitos em cada ponto de uso.
+
+Aqui cada conjunto de dados e cada métrica derivada é declarado uma única
+vez, com as dependências pelo nome e as fontes (.db) que lê diretamente:
+
+    execucao = nova_execucao()
+    declarar(execucao, "positivador_mtd", carregar_dados_positivador_mtd,
+             fontes=("positivador_mtd",))
+    declarar(execucao, "positivador_mtd_tratado", tratar_dados_positivador_mtd,
+             depende=("positivador_mtd",))
+    df = obter(execucao, "positivador_mtd_tratado")
+
+obter() resolve o grafo de dependências (ciclos e nomes não declarados são
+erro), constrói cada item uma única vez e devolve o mesmo objeto nas
+chamadas seguintes da execução. Os itens são somente leitura: quem precisa
+alterar um DataFrame deve trabalhar numa cópia.
+
+Grafo incremental: as fontes de um nó são as declaradas nele mais as de
+todos os nós acima dele. Nós declarados com compartilhado=True (KPIs,
+rankings, figuras) ficam no painel_compartilhado chaveados só pela versão
+dessas fontes: quando um banco muda, apenas os nós abaixo dele são
+recalculados e os demais saem do cache, sem nem carregar as dependências.
+
+A execução é um dicionário comum guardado pela própria página (um por
+rerun). As versões das fontes são lidas no início da execução;
+atualizar() as relê (rerun de um fragmento) e descarta só os valores
+abaixo das fontes alteradas.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from painel_compartilhado import item_compartilhado, snapshot_painel
+from rastreamento import anotar_resultado, secao
+from registro_versoes import impressoes_digitais, versao_fontes
+
+
+def nova_execucao() -> Dict[str, Any]:
+    """Contexto vazio de uma execução da página, com as versões vigentes das fontes."""
+    return {
+        "plano": {},
+        "valores": {},
+        "acessos": {},
+        "tempos": {},
+        "origem": {},
+        "resolvendo": set(),
+        "impressoes": impressoes_digitais(),
+        "lock": threading.RLock(),
+    }
+
+
+def declarar(
+    execucao: Dict[str, Any],
+    nome: str,
+    construir: Callable[..., Any],
+    depende: Iterable[str] = (),
+    fontes: Iterable[str] = (),
+    compartilhado: bool = False,
+) -> None:
+    """
+    Declara o item `nome`: construir(*valores das dependências, na ordem de `depende`).
+    `fontes`: bancos lidos pelo próprio item (as dos itens de `depende` já contam).
+    compartilhado=True guarda o valor entre execuções e sessões, por versão das fontes.
+    Cada nome só pode ser declarado uma vez por execução.
+    """
+    if nome in execucao["plano"]:
+        raise ValueError(f"'{nome}' já foi declarado nesta execução")
+    execucao["plano"][nome] = {
+        "construir": construir,
+        "depende": tuple(depende),
+        "fontes": tuple(fontes),
+        "compartilhado": compartilhado,
+    }
+
+
+def ordem_resolucao(execucao: Dict[str, Any], nome: str) -> List[str]:
+    """Dependências de `nome` (transitivas) em ordem de construção, terminando em `nome`."""
+    plano = execucao["plano"]
+    ordem: List[str] = []
+    visitados = set()
+
+    def visitar(atual: str, caminho: List[str]) -> None:
+        if atual in visitados:
+            return
+        if atual in caminho:
+            ciclo = " -> ".join(caminho[caminho.index(atual):] + [atual])
+            raise ValueError(f"Dependência circular no plano de carga: {ciclo}")
+        if atual not in plano:
+            origem = f" (dependência de '{caminho[-1]}')" if caminho else ""
+            raise KeyError(f"'{atual}' não foi declarado no plano de carga{origem}")
+        for dep in plano[atual]["depende"]:
+            visitar(dep, caminho + [atual])
+        visitados.add(atual)
+        ordem.append(atual)
+
+    visitar(nome, [])
+    return ordem
+
+
+def fontes_no(execucao: Dict[str, Any], nome: str) -> Tuple[str, ...]:
+    """Fontes das quais o item depende, direta ou indiretamente."""
+    plano = execucao["plano"]
+    fontes = {f for etapa in ordem_resolucao(execucao, nome) for f in plano[etapa]["fontes"]}
+    return tuple(sorted(fontes))
+
+
+def versao_no(execucao: Dict[str, Any], nome: str) -> str:
+    """Token da versão das fontes do item, nas versões lidas pela execução."""
+    return versao_fontes(*fontes_no(execucao, nome), impressoes=execucao["impressoes"])
+
+
+def _resolver(execucao: Dict[str, Any], nome: str) -> Any:
+    valores = execucao["valores"]
+    if nome in valores:
+        return valores[nome]
+
+    with execucao["lock"]:
+        if nome in valores:
+            return valores[nome]
+        if nome in execucao["resolvendo"]:
+            # construir() de um item pedindo, direta ou indiretamente, o próprio item
+            raise ValueError(f"'{nome}' depende de si mesmo durante a construção")
+        item = execucao["plano"][nome]
+
+        execucao["resolvendo"].add(nome)
+        try:
+            with secao(f"nó {nome}", "no") as info:
+
+                def construir() -> Any:
+                    inicio = time.perf_counter()
+                    args = [_resolver(execucao, dep) for dep in item["depende"]]
+                    valor = item["construir"](*args)
+                    execucao["tempos"][nome] = time.perf_counter() - inicio
+                    execucao["origem"][nome] = "construído"
+                    info["cache"] = "miss"
+                    return valor
+
+                if item["compartilhado"]:
+                    # Dependências só são resolvidas se o nó não estiver pronto nesta versão
+                    execucao["origem"][nome] = "cache"
+                    info["cache"] = "hit"
+                    snapshot = snapshot_painel(versao=versao_no(execucao, nome), grupo=nome)
+                    valores[nome] = item_compartilhado(snapshot, nome, construir)
+                else:
+                    valores[nome] = construir()
+                anotar_resultado(info, valores[nome])
+        finally:
+            execucao["resolvendo"].discard(nome)
+    return valores[nome]
+
+
+def obter(execucao: Dict[str, Any], nome: str) -> Any:
+    """Valor do item `nome`, construído (com as dependências) uma única vez por execução."""
+    execucao["acessos"][nome] = execucao["acessos"].get(nome, 0) + 1
+    if nome not in execucao["valores"]:
+        ordem_resolucao(execucao, nome)  # valida o grafo antes de construir
+    return _resolver(execucao, nome)
+
+
+def atualizar(execucao: Dict[str, Any]) -> List[str]:
+    """
+    Relê as versões das fontes e descarta os valores dos itens abaixo das
+    fontes alteradas (os demais continuam valendo). Retorna as fontes alteradas.
+    """
+    atuais = impressoes_digitais()
+    with execucao["lock"]:
+        anteriores = execucao["impressoes"]
+        alteradas = sorted(f for f in set(atuais) | set(anteriores) if atuais.get(f) != anteriores.get(f))
+        if alteradas:
+            execucao["impressoes"] = atuais
+            for nome in list(execucao["valores"]):
+                if set(fontes_no(execucao, nome)) & set(alteradas):
+                    execucao["valores"].pop(nome, None)
+                    execucao["origem"].pop(nome, None)
+    return alteradas
+
+
+def resumo(execucao: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Por item declarado: fontes, se foi obtido (e de onde), quantas vezes foi pedido e o tempo de construção."""
+    return [
+        {
+            "item": nome,
+            "depende": ", ".join(item["depende"]),
+            "fontes": ", ".join(fontes_no(execucao, nome)),
+            "origem": execucao["origem"].get(nome, "-"),
+            "acessos": execucao["acessos"].get(nome, 0),
+            "tempo_s": round(execucao["tempos"].get(nome, 0.0), 4),
+        }
+        for nome, item in execucao["plano"].items()
+    ]
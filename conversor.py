@@ -1,5 +1,6 @@
 import pandas as pd
-import sqlite3
+
+from etl_ingestao import gravar_fonte_tipada
 
 # Ler o arquivo Excel
 df_transferencias = pd.read_excel('c:\\Users\\techb_gc46061\\Downloads\\Dash_Salão_Capital_Life\\DBV Capital_Transferências.xlsx')
@@ -7,10 +8,8 @@ df_transferencias = pd.read_excel('c:\\Users\\techb_gc46061\\Downloads\\Dash_Sal
 # Salvar como CSV
 df_transferencias.to_csv('c:\\Users\\techb_gc46061\\Downloads\\Dash_Salão_Capital_Life\\DBV Capital_Transferências.csv', index=False, encoding='utf-8-sig')
 
-# Criar banco de dados SQLite
-conn = sqlite3.connect('c:\\Users\\techb_gc46061\\Downloads\\Dash_Salão_Capital_Life\\DBV Capital_Transferências.db')
-df_transferencias.to_sql('transferencias', conn, if_exists='replace', index=False)
-conn.close()
+# Criar banco de dados SQLite (datas ISO, PL REAL, códigos A#####)
+gravar_fonte_tipada(df_transferencias, 'c:\\Users\\techb_gc46061\\Downloads\\Dash_Salão_Capital_Life\\DBV Capital_Transferências.db', 'transferencias')
 
 print(f'Arquivo convertido com sucesso!')
 print(f'Linhas: {len(df_transferencias)}')
@@ -24,10 +23,8 @@ df_feebased = pd.read_excel('c:\\Users\\techb_gc46061\\Downloads\\Dash_Salão_Ca
 # Salvar como CSV
 df_feebased.to_csv('c:\\Users\\techb_gc46061\\Downloads\\Dash_Salão_Capital_Life\\DBV Capital_FeeBased.csv', index=False, encoding='utf-8-sig')
 
-# Criar banco de dados SQLite
-conn = sqlite3.connect('c:\\Users\\techb_gc46061\\Downloads\\Dash_Salão_Capital_Life\\DBV Capital_FeeBased.db')
-df_feebased.to_sql('feebased', conn, if_exists='replace', index=False)
-conn.close()
+# Criar banco de dados SQLite (datas ISO, P/L REAL, códigos A#####)
+gravar_fonte_tipada(df_feebased, 'c:\\Users\\techb_gc46061\\Downloads\\Dash_Salão_Capital_Life\\DBV Capital_FeeBased.db', 'feebased')
 
 print(f'Arquivo convertido com sucesso!')
 print(f'Linhas: {len(df_feebased)}')
@@ -3,6 +3,9 @@ import sqlite3
 import os
 from pathlib import Path
 
+from etl_ingestao import gravar_fonte_tipada
+from historico_particionado import registrar_mtd
+
 def converter_positivador_mtd():
     """
     Converte arquivo Excel para CSV e depois para SQLite DB
@@ -45,11 +48,18 @@ def converter_positivador_mtd():
             
             # Passo 3: Converter para SQLite
             print("💾 Convertendo para SQLite...")
-            conn = sqlite3.connect(db_file)
             
-            # Salvar no banco de dados mantendo estrutura original
-            df.to_sql('positivador_mtd', conn, if_exists='replace', index=False)
+            # Salvar no banco de dados com tipos normalizados
+            # (datas ISO, valores REAL, Assessor como A#####) + versão do esquema
+            gravar_fonte_tipada(df, db_file, 'positivador_mtd')
+
+            # Mês aberto do histórico particionado (fecha o mês anterior na virada)
+            mes_aberto = registrar_mtd(Path(db_file))
+            if mes_aberto:
+                print(f"✅ Histórico: mês aberto {mes_aberto} atualizado")
             
+            conn = sqlite3.connect(db_file)
+
             # Verificar dados salvos
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM positivador_mtd")
@@ -117,7 +127,7 @@ def converter_positivador_mtd():
         if os.path.exists(db_file):
             conn = sqlite3.connect(db_file)
             cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name != '_etl_meta'")
             tables = cursor.fetchall()
             print(f"   - DB: {len(tables)} tabela(s)")
             
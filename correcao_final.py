@@ -3,18 +3,16 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 import streamlit as st
+from pathlib import Path
+
+from cache_versao import cache_por_versao, marcar_versao
+from rastreamento import cache_rastreado
+from registro_versoes import avisar_carga, depende_de, mtime_vigente
+from calendario_uteis import dias_uteis_ano
 
 def calcular_dias_uteis(ano: int) -> int:
-    """Calcula dias úteis no ano (simplificado)"""
-    try:
-        dias_uteis = 252  # padrão aproximado
-        if ano == 2026:
-            dias_uteis = 252
-        elif ano == 2027:
-            dias_uteis = 252
-        return dias_uteis
-    except:
-        return 252
+    """Calcula dias úteis no ano (calendário ANBIMA)"""
+    return dias_uteis_ano(ano)
 
 def calcular_valor_projetado_auc_2026_local(auc_initial: float, meta_2026: float, data_ref: datetime) -> float:
     """
@@ -66,22 +64,17 @@ def calcular_valor_projetado_rumo_1bi_local(auc_initial: float, data_ref: dateti
     except Exception:
         return 0.0
 
-@st.cache_data(show_spinner=False)
-def carregar_dados_objetivos_pj1_robusto() -> Optional[pd.DataFrame]:
-    """
-    Carrega os dados da tabela Objetivos_PJ1 do banco de dados DBV Capital_Objetivos.db
-    
-    Returns:
-        DataFrame com os dados ou None se houver erro
-    """
+@depende_de("objetivos_pj1")
+@cache_rastreado()
+def _carregar_dados_objetivos_pj1_cached(db_path_str: str, mtime: float) -> Optional[pd.DataFrame]:
     try:
-        conn = sqlite3.connect('DBV Capital_Objetivos.db')
+        conn = sqlite3.connect(db_path_str)
         
         # Verificar se a tabela existe
         cursor = conn.cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='Objetivos_PJ1'")
         if not cursor.fetchone():
-            st.error("Tabela Objetivos_PJ1 não encontrada no banco de dados")
+            avisar_carga("Tabela Objetivos_PJ1 não encontrada no banco de dados", st.error)
             conn.close()
             return None
         
@@ -92,15 +85,12 @@ def carregar_dados_objetivos_pj1_robusto() -> Optional[pd.DataFrame]:
         
         # Verificar se o DataFrame está vazio
         if df.empty:
-            st.warning("DataFrame vazio após carregar dados da Objetivos_PJ1")
+            avisar_carga("DataFrame vazio após carregar dados da Objetivos_PJ1", st.warning)
             return None
         
-        # Debug: mostrar colunas encontradas
-        print(f"Colunas encontradas: {list(df.columns)}")
-        
         # Verificar se a coluna 'Data' existe
         if 'Data' not in df.columns:
-            st.error(f"Coluna 'Data' não encontrada. Colunas disponíveis: {list(df.columns)}")
+            avisar_carga(f"Coluna 'Data' não encontrada. Colunas disponíveis: {list(df.columns)}", st.error)
             return None
         
         # Converter coluna Data para datetime
@@ -111,16 +101,34 @@ def carregar_dados_objetivos_pj1_robusto() -> Optional[pd.DataFrame]:
         
         # Verificar se ainda há dados após limpeza
         if df.empty:
-            st.warning("DataFrame vazio após limpeza de datas inválidas")
+            avisar_carga("DataFrame vazio após limpeza de datas inválidas", st.warning)
             return None
         
         return df
         
     except Exception as e:
-        st.error(f"Erro ao carregar dados da Objetivos_PJ1: {str(e)}")
+        avisar_carga(f"Erro ao carregar dados da Objetivos_PJ1: {str(e)}", st.error)
         return None
 
-@st.cache_data(show_spinner=False)
+def carregar_dados_objetivos_pj1_robusto() -> Optional[pd.DataFrame]:
+    """
+    Carrega os dados da tabela Objetivos_PJ1 do banco de dados DBV Capital_Objetivos.db
+    
+    O DataFrame sai marcado com a versão do banco, que é a chave de cache
+    das funções obter_dados_*_robusto (elas consultam o próprio banco), e
+    com a coluna Data já em datetime (linhas sem data válida descartadas):
+    quem o recebe não converte nem altera o DataFrame.
+    
+    Returns:
+        DataFrame com os dados ou None se houver erro
+    """
+    db = Path('DBV Capital_Objetivos.db')
+    mtime = mtime_vigente(db) if db.exists() else 0.0
+    df = _carregar_dados_objetivos_pj1_cached(str(db), mtime)
+    return marcar_versao(df, db if db.exists() else None)
+
+@depende_de("objetivos_pj1")
+@cache_rastreado(cache=cache_por_versao)
 def obter_dados_captacao_mes_robusto(df_objetivos: pd.DataFrame, data_ref: datetime) -> Tuple[float, float]:
     """
     Obtém dados de captação do mês específico usando a tabela Objetivos_PJ1
@@ -184,7 +192,8 @@ def obter_dados_captacao_mes_robusto(df_objetivos: pd.DataFrame, data_ref: datet
         st.error(f"Erro ao obter dados de captação do mês: {str(e)}")
         return 0.0, 0.0
 
-@st.cache_data(show_spinner=False)
+@depende_de("objetivos_pj1")
+@cache_rastreado(cache=cache_por_versao)
 def obter_dados_captacao_ano_robusto(df_objetivos: pd.DataFrame, data_ref: datetime) -> Tuple[float, float]:
     """
     Obtém dados de captação do ano específico usando a tabela Objetivos_PJ1
@@ -249,7 +258,8 @@ def obter_dados_captacao_ano_robusto(df_objetivos: pd.DataFrame, data_ref: datet
         st.error(f"Erro ao obter dados de captação do ano: {str(e)}")
         return 0.0, 0.0
 
-@st.cache_data(show_spinner=False)
+@depende_de("objetivos_pj1", versionado=False)
+@cache_rastreado()
 def obter_dados_captacao_acumulado_robusto(data_ref: datetime) -> Optional[pd.DataFrame]:
     """
     Obtém dados de captação acumulados até a data de referência
@@ -318,7 +328,8 @@ def formatar_valor_monetario(valor: float) -> str:
     except:
         return "R$ 0,00"
 
-@st.cache_data(show_spinner=False)
+@depende_de("objetivos_pj1")
+@cache_rastreado(cache=cache_por_versao)
 def obter_dados_auc_2026_robusto(df_objetivos: pd.DataFrame, data_ref: datetime = None) -> Tuple[float, float]:
     """
     Obtém dados do AUC 2026 usando a tabela Objetivos_PJ1
@@ -383,7 +394,8 @@ def obter_dados_auc_2026_robusto(df_objetivos: pd.DataFrame, data_ref: datetime
         st.error(f"Erro ao obter dados AUC 2026: {str(e)}")
         return 0.0, 0.0
 
-@st.cache_data(show_spinner=False)
+@depende_de("objetivos_pj1")
+@cache_rastreado(cache=cache_por_versao)
 def obter_dados_rumo_1bi_robusto(df_objetivos: pd.DataFrame, data_ref: datetime = None) -> Tuple[float, float]:
     """
     Obtém dados do Rumo a 1bi usando a tabela Objetivos_PJ1
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+etl_ingestao.py
+----------------------------------------
+Ingestão tipada das planilhas/bancos para SQLite:
+- Datas gravadas como texto ISO-8601 ('YYYY-MM-DD' ou 'YYYY-MM-DD HH:MM:SS')
+- Valores monetários gravados como REAL (textos inválidos viram NULL)
+- Códigos de assessor normalizados para 'A#####'
+- Versão do esquema registrada na tabela _etl_meta; quando ela confere com
+  acesso_dados.VERSAO_ESQUEMA_TIPADO o dashboard pula o parsing defensivo.
+- Índices (inclusive de expressão/cobertura) nas colunas de data, status e
+  assessor usadas pelos filtros do dashboard.
+
+Uso:
+  python etl_ingestao.py                      # migra os bancos encontrados na raiz
+  python etl_ingestao.py --fonte feebased     # migra só uma fonte
+  python etl_ingestao.py --db arquivo.db --fonte transferencias
+  python etl_ingestao.py --indices            # só índices (inclui NPS, Produtos, Objetivos)
+"""
+
+import argparse
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from acesso_dados import (
+    FONTES,
+    TABELA_META_ETL,
+    VERSAO_ESQUEMA_TIPADO,
+    _mapear_colunas,
+    localizar_banco,
+    resolver_esquema,
+)
+from normalizacao import _norm_colname, _parse_money_like_series, _qident, extract_assessor_codes
+
+# Colunas canônicas (ver acesso_dados.FONTES) tratadas por tipo em cada fonte
+TIPOS_POR_FONTE: Dict[str, Dict[str, List[str]]] = {
+    "transferencias": {
+        "datas": ["data_solic", "data_transf"],
+        "dinheiro": ["pl"],
+        "assessor": ["cod_origem", "cod_destino"],
+    },
+    "positivador_mtd": {
+        "datas": ["Data_Posicao"],
+        "dinheiro": ["Net_Em_M", "Captacao_Liquida_em_M"],
+        "assessor": ["Assessor"],
+    },
+    "feebased": {
+        "datas": ["data"],
+        "dinheiro": ["pl"],
+        "assessor": ["assessor"],
+    },
+}
+
+# Tabela gravada por cada fonte (mesmos nomes que o dashboard já procura)
+TABELA_POR_FONTE = {
+    "transferencias": "transferencias",
+    "positivador_mtd": "positivador_mtd",
+    "feebased": "feebased",
+}
+
+# Índices mantidos pelo ETL: (sufixo do nome, expressões). As expressões usam
+# nomes canônicos entre chaves; índices com colunas ausentes são ignorados.
+# As expressões de status/data de transferências são as mesmas usadas nas
+# consultas do dashboard, para que o SQLite consiga usar o índice.
+EXPR_DATA_EFETIVA = "DATE(COALESCE({data_solic}, {data_transf}))"
+EXPR_STATUS_NORM = "LOWER(TRIM(CAST({status} AS TEXT)))"
+
+INDICES_POR_FONTE: Dict[str, List[Tuple[str, List[str]]]] = {
+    "transferencias": [
+        # Cobre as consultas de transferências líquidas do mês/ano
+        ("status_data", [EXPR_STATUS_NORM, EXPR_DATA_EFETIVA, "{tipo}", "{pl}", "{cod_origem}", "{cod_destino}"]),
+        ("data", [EXPR_DATA_EFETIVA]),
+        ("cod_origem", ["{cod_origem}"]),
+        ("cod_destino", ["{cod_destino}"]),
+    ],
+    "positivador_mtd": [
+        ("data_posicao", ["{Data_Posicao}"]),
+        ("assessor", ["{Assessor}", "{Data_Posicao}"]),
+    ],
+    "feebased": [
+        ("status", ["{status}"]),
+        ("assessor", ["{assessor}"]),
+    ],
+    "nps": [
+        ("codigo_assessor", ["{codigo_assessor}"]),
+    ],
+    "produtos": [
+        ("data", ["{data}"]),
+        ("assessor", ["{codigo_assessor}", "{data}"]),
+    ],
+    "objetivos_pj1": [
+        ("data", ["{data}"]),
+    ],
+}
+
+
+# =====================================================
+# CONVERSÕES
+# =====================================================
+def _para_iso(s: pd.Series, estrito: bool = True) -> Optional[pd.Series]:
+    """
+    Converte uma coluna de datas para texto ISO-8601.
+
+    Aceita valores ISO ('2025-02-28 00:00:00') e BR ('30/10/2025 11:45:43')
+    misturados na mesma coluna, como nas exportações do Excel.
+    Com estrito=True retorna None se algum valor não-nulo não puder ser
+    interpretado; caso contrário esses valores viram NULL.
+    """
+    txt = s.astype("string").str.strip()
+    txt = txt.where(~txt.isin(["", "-", "NaT", "nan", "None"]))
+    validos = txt.notna()
+    if not validos.any():
+        return None
+
+    iso = validos & txt.str.match(r"^\d{4}-\d{2}-\d{2}", na=False)
+    br = validos & ~iso
+    dt = pd.Series(pd.NaT, index=s.index, dtype="datetime64[us]")
+    if iso.any():
+        dt[iso] = pd.to_datetime(txt[iso], errors="coerce", format="ISO8601")
+    if br.any():
+        dt[br] = pd.to_datetime(txt[br], errors="coerce", dayfirst=True, format="mixed")
+    # '01/01/0001' e afins são datas vazias do Excel
+    dt = dt.where(dt.dt.year >= 1900)
+
+    invalidos = int((validos & dt.isna()).sum())
+    if invalidos and estrito:
+        return None
+    if invalidos:
+        print(f"⚠️  {s.name}: {invalidos} data(s) inválida(s) gravada(s) como NULL")
+
+    ok = dt.notna()
+    so_data = bool((dt[ok] == dt[ok].dt.normalize()).all())
+    fmt = "%Y-%m-%d" if so_data else "%Y-%m-%d %H:%M:%S"
+    return dt.dt.strftime(fmt).astype(object).where(ok, None)
+
+
+def _dinheiro_real(s: pd.Series) -> pd.Series:
+    """Texto monetário -> float; valores sem nenhum dígito (ex.: 'Não encontrado') viram NULL."""
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    tem_digito = s.astype(str).str.contains(r"\d", regex=True) & s.notna()
+    return _parse_money_like_series(s).where(tem_digito)
+
+
+def _codigos_assessor(s: pd.Series) -> pd.Series:
+    """Normaliza códigos para 'A#####'; mantém o texto original quando não há código."""
+    raw = s.astype(object).where(s.notna(), None)
+    codes = extract_assessor_codes(raw)
+    return codes.where(codes.notna(), raw.map(lambda v: str(v).strip() if v is not None else None))
+
+
+def tipar_dataframe(df: pd.DataFrame, fonte: str) -> pd.DataFrame:
+    """Aplica as conversões de tipo da fonte, preservando nomes e ordem das colunas."""
+    out = df.copy()
+    tipos = TIPOS_POR_FONTE[fonte]
+    mapa = _mapear_colunas(list(out.columns), FONTES[fonte]["colunas"], FONTES[fonte].get("contem"))
+
+    # Datas canônicas: sempre ISO (o dashboard confia nelas sem reconverter)
+    colunas_data = [mapa[c] for c in tipos["datas"] if mapa.get(c)]
+    for c in colunas_data:
+        iso = _para_iso(out[c], estrito=False)
+        if iso is not None:
+            out[c] = iso
+
+    # Demais colunas 'Data ...': só quando inteiramente interpretáveis
+    for c in out.columns:
+        if c not in colunas_data and _norm_colname(c).startswith("data "):
+            iso = _para_iso(out[c])
+            if iso is not None:
+                out[c] = iso
+
+    for c in tipos["dinheiro"]:
+        if mapa.get(c):
+            out[mapa[c]] = _dinheiro_real(out[mapa[c]])
+
+    for c in tipos["assessor"]:
+        if mapa.get(c):
+            out[mapa[c]] = _codigos_assessor(out[mapa[c]])
+
+    return out
+
+
+# =====================================================
+# GRAVAÇÃO
+# =====================================================
+def registrar_versao(conn: sqlite3.Connection, fonte: str, tabela: str) -> None:
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {TABELA_META_ETL} (chave TEXT PRIMARY KEY, valor TEXT)"
+    )
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {TABELA_META_ETL} (chave, valor) VALUES (?, ?)",
+        [
+            ("versao_esquema", str(VERSAO_ESQUEMA_TIPADO)),
+            ("fonte", fonte),
+            ("tabela", tabela),
+            ("gerado_em", datetime.now().isoformat(timespec="seconds")),
+        ],
+    )
+
+
+def criar_indices(conn: sqlite3.Connection, fonte: str, tabela: str, colunas: List[str]) -> List[str]:
+    """
+    Cria (se ainda não existirem) os índices da fonte e atualiza as estatísticas.
+
+    Returns:
+        List[str]: nomes dos índices presentes na tabela
+    """
+    mapa = _mapear_colunas(colunas, FONTES[fonte]["colunas"], FONTES[fonte].get("contem"))
+    quoted = {canon: _qident(orig) for canon, orig in mapa.items() if orig}
+
+    criados = []
+    for sufixo, exprs in INDICES_POR_FONTE.get(fonte, []):
+        try:
+            partes = [e.format(**quoted) for e in exprs]
+        except KeyError:
+            continue  # coluna ausente nesta tabela
+        nome = f"idx_{_norm_colname(tabela).replace(' ', '_')}_{sufixo}"
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {_qident(nome)} ON {_qident(tabela)} ({', '.join(partes)})"
+        )
+        criados.append(nome)
+    conn.execute(f"ANALYZE {_qident(tabela)}")
+    return criados
+
+
+def indexar_banco(db_path: Path, fonte: str) -> List[str]:
+    """Cria os índices da fonte em um banco existente, sem regravar os dados."""
+    esquema = resolver_esquema(str(db_path), db_path.stat().st_mtime, fonte)
+    if not esquema["tabela"]:
+        raise ValueError(f"Nenhuma tabela encontrada em {db_path}")
+    with sqlite3.connect(str(db_path)) as conn:
+        return criar_indices(conn, fonte, esquema["tabela"], esquema["colunas"])
+
+
+def gravar_fonte_tipada(
+    df: pd.DataFrame, db_file: str, fonte: str, tabela: Optional[str] = None
+) -> int:
+    """
+    Grava o DataFrame tipado no SQLite (substituindo a tabela) e registra a versão.
+
+    Returns:
+        int: número de linhas gravadas
+    """
+    tabela = tabela or TABELA_POR_FONTE[fonte]
+    tipado = tipar_dataframe(df, fonte)
+
+    mapa = _mapear_colunas(list(tipado.columns), FONTES[fonte]["colunas"])
+    dtype = {mapa[c]: "REAL" for c in TIPOS_POR_FONTE[fonte]["dinheiro"] if mapa.get(c)}
+
+    with sqlite3.connect(db_file) as conn:
+        tipado.to_sql(tabela, conn, if_exists="replace", index=False, dtype=dtype)
+        # 'replace' descarta os índices junto com a tabela: recria sempre
+        criar_indices(conn, fonte, tabela, list(tipado.columns))
+        registrar_versao(conn, fonte, tabela)
+    return len(tipado)
+
+
+def migrar_banco(db_path: Path, fonte: str) -> int:
+    """Relê a tabela atual de um banco já existente e a regrava no formato tipado."""
+    esquema = resolver_esquema(str(db_path), db_path.stat().st_mtime, fonte)
+    if not esquema["tabela"]:
+        raise ValueError(f"Nenhuma tabela encontrada em {db_path}")
+    with sqlite3.connect(str(db_path)) as conn:
+        df = pd.read_sql_query(f"SELECT * FROM {_qident(esquema['tabela'])}", conn)
+    return gravar_fonte_tipada(df, str(db_path), fonte, tabela=esquema["tabela"])
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Regrava bancos SQLite com datas ISO, valores REAL e códigos A#####.")
+    ap.add_argument("--fonte", choices=sorted(INDICES_POR_FONTE), help="Fonte a processar (padrão: todas)")
+    ap.add_argument("--db", help="Caminho do .db (exige --fonte)")
+    ap.add_argument("--indices", action="store_true", help="Só cria/atualiza os índices, sem regravar os dados")
+    args = ap.parse_args()
+
+    if args.db and not args.fonte:
+        ap.error("--db exige --fonte")
+
+    todas = INDICES_POR_FONTE if args.indices else TIPOS_POR_FONTE
+    if args.fonte and args.fonte not in todas:
+        ap.error(f"a fonte '{args.fonte}' não tem ETL tipado; use --indices")
+    fontes = [args.fonte] if args.fonte else sorted(todas)
+    for fonte in fontes:
+        dbp = Path(args.db) if args.db else localizar_banco(fonte)
+        if dbp is None or not dbp.exists():
+            print(f"⚠️  {fonte}: banco não encontrado")
+            continue
+        try:
+            if args.indices:
+                indices = indexar_banco(dbp, fonte)
+                print(f"✅ {fonte}: {len(indices)} índice(s) em {dbp}")
+            else:
+                linhas = migrar_banco(dbp, fonte)
+                print(f"✅ {fonte}: {linhas} linhas gravadas em {dbp}")
+        except Exception as e:
+            print(f"❌ {fonte}: {e}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
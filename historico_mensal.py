@@ -0,0 +1,166 @@
+"""
+Agregação mensal do histórico do Positivador FULL, em blocos.
+
+O gráfico de crescimento do AUC carregava o FULL inteiro (uma linha por
+cliente por mês, vários anos) só para somar o Net e contar clientes
+distintos por mês. Aqui o SQLite devolve as linhas já ordenadas pelo mês
+(só as colunas de data, Net e cliente) e o resultado é lido em blocos de
+`tamanho_bloco` linhas; cada bloco é dobrado nos acumuladores do mês:
+
+- soma do Net e quantidade de linhas;
+- conjunto de clientes, só enquanto o mês está aberto: como as linhas
+  chegam em ordem, um mês anterior ao último do bloco não recebe mais
+  linhas e vira só a contagem;
+- primeiro dia de posição do mês e o Net somado nesse dia (AUC inicial
+  do ano, ver auc_inicial_ano).
+
+A memória fica limitada ao bloco e aos clientes do mês aberto, qualquer
+que seja o tamanho do histórico.
+
+Datas em texto dd/mm/aaaa ou ISO viram o mês no SQL; as de outro formato
+chegam antes das demais (nulo ordena primeiro) e são convertidas pelo
+pandas, bloco a bloco, como no loader. Net é convertido com
+to_numeric (nulo/inválido = 0). O cliente vira texto no próprio SQL
+(_expr_cliente), com a mesma forma em todos os blocos: 123, 123.0, "123"
+e " 123 " são o mesmo cliente e vazio conta como sem cliente.
+"""
+
+import sqlite3
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from acesso_dados import _GLOB_ISO, expr_data_iso
+from normalizacao import _qident
+
+TAMANHO_BLOCO = 50_000
+
+COLUNAS_MENSAL = ["ano_mes", "Net_Em_M", "clientes_unicos", "linhas", "primeiro_dia", "net_primeiro_dia", "data"]
+
+
+def historico_vazio() -> pd.DataFrame:
+    """Agregado mensal sem meses (mesmas colunas de agregar_mensal)."""
+    return pd.DataFrame(columns=COLUNAS_MENSAL)
+
+
+def _expr_cliente(coluna: str) -> str:
+    """Expressão SQL do cliente como texto: inteiro sem casas decimais, texto sem espaços nas pontas, vazio = NULL."""
+    c = _qident(coluna)
+    return (
+        f"CASE WHEN typeof({c}) IN ('integer', 'real') AND {c} = CAST({c} AS INTEGER) "
+        f"THEN CAST(CAST({c} AS INTEGER) AS TEXT) ELSE NULLIF(TRIM(CAST({c} AS TEXT)), '') END"
+    )
+
+
+def _novo_mes() -> Dict[str, Any]:
+    return {"net": 0.0, "linhas": 0, "clientes": set(), "n_clientes": None, "primeiro_dia": None, "net_primeiro_dia": 0.0}
+
+
+def _dobrar_bloco(bloco: pd.DataFrame, meses: Dict[str, Dict[str, Any]]) -> None:
+    """Soma um bloco (colunas mes, dia, valor, cliente) nos acumuladores por mês."""
+    if bloco.empty:
+        return
+    por_mes = bloco.groupby("mes", sort=False)
+    somas = por_mes["valor"].sum()
+    linhas = por_mes.size()
+    primeiro = por_mes["dia"].min()
+    no_primeiro = bloco[bloco["dia"].eq(bloco["mes"].map(primeiro))].groupby("mes", sort=False)["valor"].sum()
+    clientes = bloco.dropna(subset=["cliente"]).groupby("mes", sort=False)["cliente"].unique()
+
+    for mes in somas.index:
+        acc = meses.setdefault(mes, _novo_mes())
+        acc["net"] += float(somas[mes])
+        acc["linhas"] += int(linhas[mes])
+        dia = primeiro[mes]
+        if acc["primeiro_dia"] is None or dia < acc["primeiro_dia"]:
+            acc["primeiro_dia"], acc["net_primeiro_dia"] = dia, float(no_primeiro.get(mes, 0.0))
+        elif dia == acc["primeiro_dia"]:
+            acc["net_primeiro_dia"] += float(no_primeiro.get(mes, 0.0))
+        if mes in clientes.index:
+            acc["clientes"].update(clientes[mes].tolist())
+
+
+def _fechar_meses(meses: Dict[str, Dict[str, Any]], ate: str) -> None:
+    """Troca o conjunto de clientes pela contagem nos meses anteriores a `ate` (não recebem mais linhas)."""
+    for mes, acc in meses.items():
+        if mes < ate and acc["n_clientes"] is None:
+            acc["n_clientes"] = len(acc["clientes"])
+            acc["clientes"] = set()
+
+
+def agregar_mensal(
+    db_path_str: str,
+    tabela: str,
+    col_data: str,
+    col_valor: Optional[str] = None,
+    col_cliente: Optional[str] = None,
+    tamanho_bloco: int = TAMANHO_BLOCO,
+) -> pd.DataFrame:
+    """
+    Net somado, clientes distintos, linhas e primeiro dia (com o Net do dia)
+    por mês da tabela, lendo em blocos. Linhas sem data válida são ignoradas.
+    Sem `col_valor` o Net é 0; sem `col_cliente` a contagem de clientes é 0.
+    Devolve as colunas de COLUNAS_MENSAL, em ordem de mês.
+    """
+    iso = expr_data_iso(col_data)
+    valor = _qident(col_valor) if col_valor else "0"
+    cliente = _expr_cliente(col_cliente) if col_cliente else "NULL"
+    query = (
+        f"SELECT CASE WHEN {iso} GLOB '{_GLOB_ISO}' THEN {iso} END AS dia_sql, "
+        f"{_qident(col_data)} AS bruto, {valor} AS valor, {cliente} AS cliente "
+        f"FROM {_qident(tabela)} ORDER BY dia_sql"
+    )
+
+    meses: Dict[str, Dict[str, Any]] = {}
+    with sqlite3.connect(db_path_str) as conn:
+        for bloco in pd.read_sql_query(query, conn, chunksize=tamanho_bloco):
+            reconhecida = bloco["dia_sql"].notna()
+            dia = pd.to_datetime(bloco["dia_sql"], format="%Y-%m-%d", errors="coerce")
+            mes = bloco["dia_sql"].astype("str").str[:7]
+            if not reconhecida.all():
+                outros = pd.to_datetime(bloco.loc[~reconhecida, "bruto"], errors="coerce").dt.normalize()
+                dia[~reconhecida] = outros
+                mes[~reconhecida] = outros.dt.strftime("%Y-%m")
+
+            dados = pd.DataFrame({
+                "mes": mes,
+                "dia": dia,
+                "valor": pd.to_numeric(bloco["valor"], errors="coerce").fillna(0.0),
+                "cliente": bloco["cliente"],
+            }).dropna(subset=["mes"])
+            _dobrar_bloco(dados, meses)
+
+            if reconhecida.any():
+                _fechar_meses(meses, mes.iloc[-1])
+
+    _fechar_meses(meses, "9999-99")
+    if not meses:
+        return historico_vazio()
+
+    out = pd.DataFrame(
+        [
+            {
+                "ano_mes": mes,
+                "Net_Em_M": acc["net"],
+                "clientes_unicos": acc["n_clientes"],
+                "linhas": acc["linhas"],
+                "primeiro_dia": acc["primeiro_dia"],
+                "net_primeiro_dia": acc["net_primeiro_dia"],
+            }
+            for mes, acc in sorted(meses.items())
+        ],
+        columns=COLUNAS_MENSAL[:-1],
+    )
+    out["data"] = pd.to_datetime(out["ano_mes"] + "-01")
+    return out
+
+
+def auc_inicial_ano(df_mensal: pd.DataFrame, ano: int) -> float:
+    """Net no primeiro dia de posição do ano, a partir do agregado mensal."""
+    if df_mensal is None or df_mensal.empty:
+        return 0.0
+    do_ano = df_mensal[df_mensal["data"].dt.year == ano]
+    if do_ano.empty:
+        return 0.0
+    primeiro = do_ano.loc[do_ano["primeiro_dia"].idxmin()]
+    return float(primeiro["net_primeiro_dia"] or 0.0)
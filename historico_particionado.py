@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+historico_particionado.py
+----------------------------------------
+Histórico do Positivador particionado por mês, em
+"DBV Capital_Positivador (Histórico).db":
+
+- uma tabela por mês (positivador_aaaa_mm) com as posições do mês;
+- o catálogo _particoes: estado de cada mês e, para os meses fechados, os
+  agregados (Net, clientes distintos, linhas, primeiro dia e Net do
+  primeiro dia), calculados uma única vez no fechamento
+  (historico_mensal.agregar_mensal).
+
+Meses fechados são imutáveis: gravar_particao() recusa regravá-los. O mês
+aberto é o do Positivador MTD: converter_positivador_mtd.py o substitui a
+cada carga (registrar_mtd) e, quando chega um MTD de um mês novo, o mês
+aberto anterior é fechado.
+
+O dashboard lê só o catálogo (agregados_fechados) para o gráfico de
+crescimento do AUC e o AUC_BASE_2025; o mês aberto continua vindo do MTD.
+Sem o banco de histórico, a página agrega o FULL como antes.
+
+Uso:
+  python historico_particionado.py                  # lista as partições
+  python historico_particionado.py --importar-full  # meses do FULL viram partições (fechadas até o mês anterior)
+  python historico_particionado.py --mtd            # registra o MTD atual como mês aberto
+"""
+
+import argparse
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from acesso_dados import (
+    BASE_DIR,
+    FONTES,
+    _GLOB_ISO,
+    _mapear_colunas,
+    expr_data_iso,
+    localizar_banco,
+    resolver_esquema,
+)
+from etl_ingestao import _para_iso
+from historico_mensal import COLUNAS_MENSAL, TAMANHO_BLOCO, agregar_mensal, historico_vazio
+from normalizacao import _qident
+
+ARQUIVO_HISTORICO = FONTES["positivador_historico"]["arquivos"][0]
+TABELA_PARTICOES = "_particoes"
+
+FECHADO = "fechado"
+ABERTO = "aberto"
+
+
+# =====================================================
+# Catálogo
+# =====================================================
+def nome_particao(ano_mes: str) -> str:
+    """'2025-01' -> 'positivador_2025_01'."""
+    return "positivador_" + ano_mes.replace("-", "_")
+
+
+def _criar_catalogo(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {TABELA_PARTICOES} ("
+        "ano_mes TEXT PRIMARY KEY, tabela TEXT, estado TEXT, linhas INTEGER, net REAL, "
+        "clientes_unicos INTEGER, primeiro_dia TEXT, net_primeiro_dia REAL, atualizado_em TEXT)"
+    )
+
+
+def particoes(db_hist: Path) -> pd.DataFrame:
+    """Catálogo das partições (uma linha por mês, em ordem)."""
+    if not Path(db_hist).exists():
+        return pd.DataFrame(columns=["ano_mes", "tabela", "estado", "linhas", "net", "clientes_unicos",
+                                     "primeiro_dia", "net_primeiro_dia", "atualizado_em"])
+    with sqlite3.connect(str(db_hist)) as conn:
+        _criar_catalogo(conn)
+        return pd.read_sql_query(f"SELECT * FROM {TABELA_PARTICOES} ORDER BY ano_mes", conn)
+
+
+def _mapa_colunas(colunas: List[str]) -> Dict[str, Optional[str]]:
+    """Data_Posicao, Net_Em_M e Cliente nas colunas da partição (nomes do FULL ou do MTD)."""
+    return _mapear_colunas(colunas, FONTES["positivador_mtd"]["colunas"])
+
+
+def _colunas_tabela(conn: sqlite3.Connection, tabela: str) -> List[str]:
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({_qident(tabela)})")]
+
+
+def _registrar(conn: sqlite3.Connection, ano_mes: str, estado: str, agregado: Optional[pd.Series]) -> None:
+    valores = (None,) * 5
+    if agregado is not None:
+        valores = (
+            int(agregado["linhas"]),
+            float(agregado["Net_Em_M"]),
+            int(agregado["clientes_unicos"]),
+            pd.Timestamp(agregado["primeiro_dia"]).strftime("%Y-%m-%d"),
+            float(agregado["net_primeiro_dia"]),
+        )
+    conn.execute(
+        f"INSERT OR REPLACE INTO {TABELA_PARTICOES} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (ano_mes, nome_particao(ano_mes), estado, *valores, datetime.now().isoformat(timespec="seconds")),
+    )
+
+
+def _fechado(conn: sqlite3.Connection, ano_mes: str) -> bool:
+    """Mês fechado com agregados gravados (fechado sem agregados conta como aberto)."""
+    linha = conn.execute(f"SELECT estado, linhas FROM {TABELA_PARTICOES} WHERE ano_mes = ?", (ano_mes,)).fetchone()
+    return linha is not None and linha[0] == FECHADO and linha[1] is not None
+
+
+def _agregar_particao(db_hist: Path, conn: sqlite3.Connection, ano_mes: str) -> Optional[pd.Series]:
+    tabela = nome_particao(ano_mes)
+    mapa = _mapa_colunas(_colunas_tabela(conn, tabela))
+    if not mapa.get("Data_Posicao"):
+        return None
+    conn.commit()  # agregar_mensal lê por outra conexão
+    agregado = agregar_mensal(str(db_hist), tabela, mapa["Data_Posicao"], mapa.get("Net_Em_M"), mapa.get("Cliente"))
+    agregado = agregado[agregado["ano_mes"] == ano_mes]
+    return None if agregado.empty else agregado.iloc[0]
+
+
+# =====================================================
+# Gravação
+# =====================================================
+def fechar_mes(db_hist: Path, ano_mes: str) -> bool:
+    """
+    Fecha a partição do mês: calcula e grava os agregados (uma única vez).
+    Sem agregados (partição sem coluna de data ou sem linhas do mês) o mês
+    continua aberto, para não sumir do gráfico como fechado sem números.
+    Retorna se o mês está fechado.
+    """
+    with sqlite3.connect(str(db_hist)) as conn:
+        _criar_catalogo(conn)
+        if _fechado(conn, ano_mes):
+            return True
+        agregado = _agregar_particao(db_hist, conn, ano_mes)
+        if agregado is None:
+            print(f"⚠️  {ano_mes} sem linhas com data de posição; partição continua aberta")
+            _registrar(conn, ano_mes, ABERTO, None)
+            return False
+        _registrar(conn, ano_mes, FECHADO, agregado)
+        return True
+
+
+def gravar_particao(db_hist: Path, ano_mes: str, df: pd.DataFrame, estado: str = ABERTO, forcar: bool = False) -> int:
+    """
+    Substitui as linhas da partição do mês. Mês fechado só é regravado com
+    forcar=True. Com estado=FECHADO a partição já sai fechada (agregados gravados).
+    """
+    with sqlite3.connect(str(db_hist)) as conn:
+        _criar_catalogo(conn)
+        if _fechado(conn, ano_mes) and not forcar:
+            raise ValueError(f"A partição {ano_mes} está fechada (imutável)")
+        df.to_sql(nome_particao(ano_mes), conn, if_exists="replace", index=False)
+        _registrar(conn, ano_mes, ABERTO, None)
+    if estado == FECHADO:
+        fechar_mes(db_hist, ano_mes)
+    return len(df)
+
+
+def registrar_mtd(db_mtd: Path, db_hist: Optional[Path] = None) -> Optional[str]:
+    """
+    Grava o Positivador MTD como partição do mês aberto (substituindo a anterior
+    do mesmo mês) e fecha os meses abertos anteriores. Retorna o mês gravado;
+    None se o MTD não tem datas ou se o mês dele já está fechado.
+    """
+    db_hist = Path(db_hist) if db_hist else BASE_DIR / ARQUIVO_HISTORICO
+    esquema = resolver_esquema(str(db_mtd), Path(db_mtd).stat().st_mtime, "positivador_mtd")
+    col_data = esquema["mapa"].get("Data_Posicao") if esquema["tabela"] else None
+    if not col_data:
+        return None
+    with sqlite3.connect(str(db_mtd)) as conn:
+        df = pd.read_sql_query(f"SELECT * FROM {_qident(esquema['tabela'])}", conn)
+
+    iso = _para_iso(df[col_data], estrito=False)  # mesmas regras do ETL (ISO e dd/mm/aaaa)
+    if iso is None:
+        return None
+    validas = iso.notna()
+    if not validas.any():
+        return None
+    # linhas sem data (ex.: linha em branco no fim do Excel) não entram em mês nenhum
+    df = df[validas]
+    meses = iso[validas].str[:7]
+    ano_mes = meses.max()
+
+    catalogo = particoes(db_hist)
+    fechados = catalogo["estado"].eq(FECHADO) & catalogo["linhas"].notna()
+    if ano_mes in set(catalogo.loc[fechados, "ano_mes"]):
+        print(f"⚠️  {ano_mes} já está fechado no histórico; MTD não registrado")
+        return None
+    for anterior in catalogo.loc[~fechados & (catalogo["ano_mes"] < ano_mes), "ano_mes"]:
+        fechar_mes(db_hist, anterior)
+    gravar_particao(db_hist, ano_mes, df[meses.eq(ano_mes)])
+    return ano_mes
+
+
+def importar_full(
+    db_full: Path,
+    db_hist: Optional[Path] = None,
+    mes_aberto: Optional[str] = None,
+    tamanho_bloco: int = TAMANHO_BLOCO,
+) -> List[str]:
+    """
+    Copia os meses do Positivador FULL para partições, em blocos ordenados por
+    data. Os meses anteriores a `mes_aberto` ('aaaa-mm', padrão: o mês atual)
+    são fechados; dali em diante ficam abertos, para o MTD substituir. Meses
+    já presentes no histórico não são tocados. Retorna os meses importados.
+    """
+    db_hist = Path(db_hist) if db_hist else BASE_DIR / ARQUIVO_HISTORICO
+    mes_aberto = mes_aberto or datetime.now().strftime("%Y-%m")
+    esquema = resolver_esquema(str(db_full), Path(db_full).stat().st_mtime, "positivador")
+    if not esquema["tabela"]:
+        raise ValueError(f"Nenhuma tabela encontrada em {db_full}")
+    col_data = _mapa_colunas(esquema["colunas"]).get("Data_Posicao")
+    if not col_data:
+        raise ValueError(f"Coluna de data de posição não encontrada em {db_full}")
+
+    existentes = set(particoes(db_hist)["ano_mes"])
+    iso = expr_data_iso(col_data)
+    query = (
+        f"SELECT CASE WHEN {iso} GLOB '{_GLOB_ISO}' THEN substr({iso}, 1, 7) END AS _ano_mes, * "
+        f"FROM {_qident(esquema['tabela'])} ORDER BY _ano_mes"
+    )
+
+    importados: List[str] = []
+    with sqlite3.connect(str(db_full)) as origem, sqlite3.connect(str(db_hist)) as destino:
+        _criar_catalogo(destino)
+        for bloco in pd.read_sql_query(query, origem, chunksize=tamanho_bloco):
+            sem_mes = bloco["_ano_mes"].isna()
+            if sem_mes.any():
+                datas = pd.to_datetime(bloco.loc[sem_mes, col_data], errors="coerce")
+                bloco.loc[sem_mes, "_ano_mes"] = datas.dt.strftime("%Y-%m")
+            for ano_mes, linhas in bloco.dropna(subset=["_ano_mes"]).groupby("_ano_mes", sort=True):
+                if ano_mes in existentes:
+                    continue
+                primeira_vez = ano_mes not in importados
+                linhas.drop(columns="_ano_mes").to_sql(
+                    nome_particao(ano_mes), destino, if_exists="replace" if primeira_vez else "append", index=False
+                )
+                if primeira_vez:
+                    importados.append(ano_mes)
+                    _registrar(destino, ano_mes, ABERTO, None)
+
+    for ano_mes in importados:
+        if ano_mes < mes_aberto:
+            fechar_mes(db_hist, ano_mes)
+    return importados
+
+
+# =====================================================
+# Leitura
+# =====================================================
+def agregados_fechados(db_hist: Path) -> pd.DataFrame:
+    """
+    Agregados mensais dos meses fechados, direto do catálogo (sem ler as
+    partições), com as colunas de historico_mensal.agregar_mensal.
+    """
+    catalogo = particoes(db_hist)
+    fechados = catalogo[(catalogo["estado"] == FECHADO) & catalogo["linhas"].notna()] if not catalogo.empty else catalogo
+    if fechados.empty:
+        return historico_vazio()
+    out = pd.DataFrame({
+        "ano_mes": fechados["ano_mes"].astype(str),
+        "Net_Em_M": fechados["net"].astype(float),
+        "clientes_unicos": fechados["clientes_unicos"].astype("int64"),
+        "linhas": fechados["linhas"].astype("int64"),
+        "primeiro_dia": pd.to_datetime(fechados["primeiro_dia"]),
+        "net_primeiro_dia": fechados["net_primeiro_dia"].astype(float),
+    }).reset_index(drop=True)
+    out["data"] = pd.to_datetime(out["ano_mes"] + "-01")
+    return out[COLUNAS_MENSAL]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Histórico do Positivador particionado por mês.")
+    ap.add_argument("--historico", type=Path, default=None, help=f"Banco do histórico (padrão: {ARQUIVO_HISTORICO})")
+    ap.add_argument("--importar-full", action="store_true", help="Importa os meses do Positivador FULL como partições")
+    ap.add_argument("--mes-aberto", default=None, help="Primeiro mês ainda aberto na importação, aaaa-mm (padrão: o mês atual)")
+    ap.add_argument("--full", type=Path, default=None, help="Banco do Positivador FULL (padrão: o da raiz)")
+    ap.add_argument("--mtd", action="store_true", help="Registra o Positivador MTD atual como mês aberto")
+    args = ap.parse_args()
+
+    db_hist = args.historico or BASE_DIR / ARQUIVO_HISTORICO
+    if args.importar_full:
+        db_full = args.full or localizar_banco("positivador")
+        if db_full is None or not Path(db_full).exists():
+            print("❌ Positivador FULL não encontrado", file=sys.stderr)
+            sys.exit(1)
+        meses = importar_full(Path(db_full), db_hist, args.mes_aberto)
+        print(f"✅ {len(meses)} mês(es) importado(s) do FULL: {', '.join(meses) or '-'}")
+    if args.mtd:
+        db_mtd = localizar_banco("positivador_mtd")
+        if db_mtd is None:
+            print("❌ Positivador MTD não encontrado", file=sys.stderr)
+            sys.exit(1)
+        ano_mes = registrar_mtd(db_mtd, db_hist)
+        print(f"✅ MTD registrado como mês aberto: {ano_mes}" if ano_mes else "⚠️  MTD não registrado")
+
+    catalogo = particoes(db_hist)
+    if catalogo.empty:
+        print(f"Sem partições em {db_hist}")
+        return
+    print(catalogo.drop(columns=["tabela"]).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
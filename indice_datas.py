@@ -0,0 +1,90 @@
+"""
+Índice de somas prefixadas por data (total e por chave, ex.: assessor).
+
+As linhas são ordenadas por data uma única vez e as somas acumuladas ficam
+em arrays numpy. Qualquer soma em [ini, fim] sai de duas buscas binárias
+(np.searchsorted) e uma subtração, sem máscaras booleanas sobre o
+DataFrame inteiro. O índice é um dict de arrays (serializável), para ser
+guardado no st.cache_data uma vez por versão dos dados.
+
+Por chave o layout é o de uma matriz esparsa (CSR): as linhas com chave
+são reordenadas por (chave, posição na ordem por data) e há uma única
+soma acumulada nessa ordem. Cada linha recebe o código
+`chave * (n + 1) + posição`, crescente nessa ordem; a fatia da chave em
+[ini, fim] sai de um searchsorted por chave sobre esse código, todas as
+chaves de uma vez. A memória é proporcional às linhas, não a linhas x
+chaves.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def construir_indice(
+    datas: pd.Series,
+    valores: pd.Series,
+    chaves: Optional[pd.Series] = None,
+) -> Dict[str, Any]:
+    """
+    Monta o índice a partir de colunas alinhadas. Linhas sem data (NaT) são
+    descartadas; valores nulos contam como 0; linhas com chave nula entram
+    apenas no total.
+    """
+    d = pd.to_datetime(pd.Series(datas).reset_index(drop=True), errors="coerce")
+    v = pd.to_numeric(pd.Series(valores).reset_index(drop=True), errors="coerce").fillna(0.0)
+    ok = d.notna().to_numpy()
+    ordem = np.argsort(d.to_numpy(dtype="datetime64[ns]")[ok], kind="stable")
+
+    datas_ns = d.to_numpy(dtype="datetime64[ns]")[ok][ordem].astype(np.int64)
+    vals = v.to_numpy(dtype="float64")[ok][ordem]
+
+    indice: Dict[str, Any] = {
+        "datas": datas_ns,
+        "acum": np.concatenate(([0.0], np.cumsum(vals))),
+        "chaves": np.array([], dtype=object),
+        "codigo_chaves": np.array([], dtype=np.int64),
+        "acum_chaves": np.zeros(1),
+    }
+
+    if chaves is not None:
+        c = pd.Series(chaves).reset_index(drop=True)[ok].iloc[ordem]
+        codigos, uniques = pd.factorize(c, use_na_sentinel=True)
+        linhas = np.flatnonzero(codigos >= 0)
+        por_chave = linhas[np.argsort(codigos[linhas], kind="stable")]
+
+        indice["chaves"] = np.asarray(uniques, dtype=object)
+        indice["codigo_chaves"] = codigos[por_chave].astype(np.int64) * (len(vals) + 1) + por_chave
+        indice["acum_chaves"] = np.concatenate(([0.0], np.cumsum(vals[por_chave])))
+
+    return indice
+
+
+def _posicoes(indice: Dict[str, Any], ini: Any, fim: Any):
+    """Fatia [i, j) das linhas com ini <= data <= fim (duas buscas binárias)."""
+    datas = indice["datas"]
+    i = np.searchsorted(datas, pd.Timestamp(ini).value, side="left")
+    j = np.searchsorted(datas, pd.Timestamp(fim).value, side="right")
+    return i, max(i, j)
+
+
+def soma_intervalo(indice: Dict[str, Any], ini: Any, fim: Any) -> float:
+    """Soma dos valores com ini <= data <= fim (limites inclusivos)."""
+    i, j = _posicoes(indice, ini, fim)
+    return float(indice["acum"][j] - indice["acum"][i])
+
+
+def somas_por_chave(indice: Dict[str, Any], ini: Any, fim: Any) -> Dict[Any, float]:
+    """Soma por chave no intervalo; só chaves com ao menos uma linha no período."""
+    i, j = _posicoes(indice, ini, fim)
+    base = np.arange(len(indice["chaves"]), dtype=np.int64) * (len(indice["datas"]) + 1)
+    a = np.searchsorted(indice["codigo_chaves"], base + i, side="left")
+    b = np.searchsorted(indice["codigo_chaves"], base + j, side="left")
+    somas = indice["acum_chaves"][b] - indice["acum_chaves"][a]
+    return {k: float(s) for k, s, p in zip(indice["chaves"], somas, b > a) if p}
+
+
+def data_maxima(indice: Dict[str, Any]) -> Optional[pd.Timestamp]:
+    datas = indice["datas"]
+    return pd.Timestamp(datas[-1]) if len(datas) else None
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+modo_tv.py
+----------------------------------------
+Modo TV: o dashboard principal pré-renderizado como um HTML estático, uma
+vez por versão dos dados, servido por um HTTP local bem leve.
+
+As TVs do salão só exibem o painel; com o Streamlit cada uma mantém um
+websocket e dispara reruns completos do script. Aqui o script da página é
+executado uma única vez por versão (AppTest, sem navegador), os elementos
+da área principal viram HTML (os cards já são f-strings HTML; o gráfico
+Plotly vai como JSON + plotly.js local) e o documento fica em memória.
+Cada TV só baixa o HTML e, a cada poucos segundos, consulta /versao; se a
+versão mudou, recarrega a página.
+
+Rotas:
+  /               documento HTML da versão atual
+  /versao         token da versão atual (texto)
+  /plotly.min.js  plotly.js embutido no pacote plotly (sem CDN)
+
+Uso:
+  python modo_tv.py                         # http://0.0.0.0:8600
+  python modo_tv.py --porta 8080 --intervalo 15
+  python modo_tv.py --saida tv/index.html     # só gera o arquivo (com plotly.min.js ao lado)
+"""
+
+import argparse
+import html
+import re
+import threading
+import time
+import traceback
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parent
+PAGINA_PADRAO = BASE_DIR / "pages" / "Dashboard_Salão_Atualizado.py"
+PORTA_PADRAO = 8600
+INTERVALO_PADRAO = 30  # segundos entre verificações de versão (servidor e TVs)
+
+_VAZIOS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_RE_TAG = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9-]*)\b[^>]*?(/?)>")
+_RE_BLOCO_BRUTO = re.compile(r"(<(style|script)\b.*?</\2\s*>)", re.IGNORECASE | re.DOTALL)
+
+_ALERTAS = {
+    "warning": ("#feca57", "rgba(254, 202, 87, 0.12)"),
+    "error": ("#ff6b6b", "rgba(255, 107, 107, 0.12)"),
+    "info": ("#54a0ff", "rgba(84, 160, 255, 0.12)"),
+    "success": ("#2ecc71", "rgba(46, 204, 113, 0.12)"),
+}
+
+_CSS_BASE = """
+html, body { margin: 0; background: #263238; color: #FAFAFA;
+  font-family: "Source Sans Pro", "Segoe UI", Arial, sans-serif; }
+.tv-raiz { padding: 8px 16px; }
+.tv-linha { display: flex; gap: 1rem; align-items: flex-start; width: 100%; }
+.tv-coluna { min-width: 0; display: flex; flex-direction: column; gap: 0.5rem; }
+.tv-bloco { display: flex; flex-direction: column; gap: 0.5rem; }
+.tv-alerta { border-radius: 8px; padding: 12px 16px; }
+.tv-grafico { width: 100%; }
+"""
+
+
+# =====================================================
+# Elementos do Streamlit -> HTML
+# =====================================================
+def _balancear_html(trecho: str) -> str:
+    """
+    No Streamlit cada st.markdown é renderizado isolado, então um '<div>'
+    aberto num markdown e fechado em outro não afeta o resto da página.
+    Num documento único isso aninharia tudo; aqui cada trecho é fechado
+    (tags abertas recebem o fechamento, fechamentos soltos são removidos).
+    """
+    partes = _RE_BLOCO_BRUTO.split(trecho)
+    saida: List[str] = []
+    pilha: List[str] = []
+    i = 0
+    while i < len(partes):
+        parte = partes[i]
+        if i % 3 == 1:
+            saida.append(parte)  # <style>/<script> inteiro, sem olhar dentro
+            i += 2
+            continue
+
+        pos = 0
+        for m in _RE_TAG.finditer(parte):
+            saida.append(parte[pos:m.start()])
+            pos = m.end()
+            fechamento, tag, auto = m.group(1), m.group(2).lower(), m.group(3)
+            if tag in _VAZIOS or auto:
+                saida.append(m.group(0))
+            elif not fechamento:
+                pilha.append(tag)
+                saida.append(m.group(0))
+            elif tag in pilha:
+                while pilha:
+                    aberta = pilha.pop()
+                    saida.append(f"</{aberta}>")
+                    if aberta == tag:
+                        break
+            # fechamento sem abertura correspondente: descartado
+        saida.append(parte[pos:])
+        i += 1
+
+    saida.extend(f"</{tag}>" for tag in reversed(pilha))
+    return "".join(saida)
+
+
+def _html_markdown(texto: str) -> str:
+    if texto.lstrip().startswith("<"):
+        return _balancear_html(texto)
+    # Texto simples/markdown leve (st.write de strings)
+    return f"<div>{html.escape(texto).replace(chr(10), '<br>')}</div>"
+
+
+def _html_grafico(no: Any, seq: int) -> str:
+    spec = no.proto.spec or "{}"
+    config = no.proto.config or "{}"
+    return (
+        f"<div id='tv-grafico-{seq}' class='tv-grafico'></div>"
+        f"<script>(function(){{var f={spec};var c={config};"
+        f"Plotly.newPlot('tv-grafico-{seq}',f.data||[],f.layout||{{}},"
+        f"Object.assign({{responsive:true,displayModeBar:false,staticPlot:true}},c));}})();</script>"
+    )
+
+
+def _html_no(no: Any, contador: List[int]) -> str:
+    tipo = getattr(no, "type", "")
+    filhos = getattr(no, "children", None)
+
+    if tipo == "markdown":
+        return _html_markdown(no.value)
+    if tipo in _ALERTAS:
+        cor, fundo = _ALERTAS[tipo]
+        return (
+            f"<div class='tv-alerta' style='color:{cor};background:{fundo}'>"
+            f"{html.escape(str(no.value))}</div>"
+        )
+    if tipo in ("text", "caption", "code"):
+        return f"<div>{html.escape(str(no.value))}</div>"
+    if tipo == "plotly_chart":
+        contador[0] += 1
+        return _html_grafico(no, contador[0])
+    if tipo in ("expandable", "sidebar"):
+        return ""  # debug e controles não vão para a TV
+
+    if isinstance(filhos, dict):
+        internos = "".join(_html_no(filho, contador) for filho in filhos.values())
+        if tipo == "column":
+            return f"<div class='tv-coluna' style='flex:{float(no.weight or 1)} 1 0'>{internos}</div>"
+        colunas = [f for f in filhos.values() if getattr(f, "type", "") == "column"]
+        if colunas and len(colunas) == len(filhos):
+            return f"<div class='tv-linha'>{internos}</div>"
+        return f"<div class='tv-bloco'>{internos}</div>"
+    return ""
+
+
+def renderizar_pagina(pagina: Path = PAGINA_PADRAO, timeout: float = 300) -> str:
+    """Executa o script da página (sem navegador) e devolve o HTML da área principal."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(pagina), default_timeout=timeout)
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"Falha ao executar {Path(pagina).name}: {at.exception[0].value}")
+    return _html_no(at.main, [0])
+
+
+def montar_documento(corpo: str, versao: str, intervalo: int = INTERVALO_PADRAO) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Dashboard DBV Capital — TV</title>
+<style>{_CSS_BASE}</style>
+<script src="plotly.min.js"></script>
+</head>
+<body>
+<div class="tv-raiz">{corpo}</div>
+<script>
+(function() {{
+  var versao = {versao!r};
+  setInterval(function() {{
+    fetch("/versao", {{cache: "no-store"}})
+      .then(function(r) {{ return r.text(); }})
+      .then(function(v) {{ if (v.trim() && v.trim() !== versao) location.reload(); }})
+      .catch(function() {{}});
+  }}, {int(intervalo) * 1000});
+}})();
+</script>
+</body>
+</html>
+"""
+
+
+# =====================================================
+# Versão atual (trocada de uma vez)
+# =====================================================
+_ESTADO: Dict[str, Any] = {"versao": "", "html": b"", "plotlyjs": b""}
+_LOCK_RENDER = threading.Lock()
+
+
+def versao_tv() -> str:
+    """Versão do documento: versão composta dos bancos + dia (as projeções dependem da data)."""
+    from registro_versoes import versao_composta
+
+    return f"{versao_composta()}-{date.today().isoformat()}"
+
+
+def atualizar(pagina: Path = PAGINA_PADRAO, intervalo: int = INTERVALO_PADRAO, forcar: bool = False) -> bool:
+    """Renderiza de novo se a versão mudou; retorna True se um documento novo foi publicado."""
+    with _LOCK_RENDER:
+        versao = versao_tv()
+        if versao == _ESTADO["versao"] and not forcar:
+            return False
+        inicio = time.perf_counter()
+        corpo = renderizar_pagina(pagina)
+        documento = montar_documento(corpo, versao, intervalo).encode("utf-8")
+        _ESTADO.update(versao=versao, html=documento)  # as TVs passam a ver a versão nova
+        print(f"[modo_tv] versão {versao} renderizada em {time.perf_counter() - inicio:.1f}s")
+        return True
+
+
+def _laco(pagina: Path, intervalo: int, parar: threading.Event) -> None:
+    while not parar.wait(intervalo):
+        try:
+            atualizar(pagina, intervalo)
+        except Exception:
+            print(f"[modo_tv] Erro ao renderizar: {traceback.format_exc()}")
+
+
+# =====================================================
+# HTTP
+# =====================================================
+class _Handler(BaseHTTPRequestHandler):
+    def _responder(self, corpo: bytes, tipo: str, cache: str = "no-store") -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.send_header("Cache-Control", cache)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):  # noqa: N802 (API do http.server)
+        rota = self.path.split("?", 1)[0]
+        if rota in ("/", "/index.html"):
+            self._responder(_ESTADO["html"], "text/html; charset=utf-8")
+        elif rota == "/versao":
+            self._responder(_ESTADO["versao"].encode("utf-8"), "text/plain; charset=utf-8")
+        elif rota == "/plotly.min.js":
+            self._responder(_ESTADO["plotlyjs"], "application/javascript", cache="public, max-age=86400")
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):  # silencia o log por requisição (uma TV consulta /versao a cada poucos segundos)
+        pass
+
+
+def servir(porta: int = PORTA_PADRAO, pagina: Path = PAGINA_PADRAO, intervalo: int = INTERVALO_PADRAO,
+           host: str = "0.0.0.0") -> None:
+    from plotly.offline import get_plotlyjs
+
+    _ESTADO["plotlyjs"] = get_plotlyjs().encode("utf-8")
+    atualizar(pagina, intervalo, forcar=True)
+
+    parar = threading.Event()
+    threading.Thread(target=_laco, args=(pagina, intervalo, parar), name="modo_tv", daemon=True).start()
+
+    servidor = ThreadingHTTPServer((host, porta), _Handler)
+    print(f"[modo_tv] servindo {Path(pagina).name} em http://{host}:{porta}/")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        parar.set()
+        servidor.server_close()
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Serve o dashboard como HTML estático para as TVs.")
+    ap.add_argument("--porta", type=int, default=PORTA_PADRAO, help=f"Porta HTTP (padrão: {PORTA_PADRAO})")
+    ap.add_argument("--host", default="0.0.0.0", help="Interface (padrão: todas)")
+    ap.add_argument("--intervalo", type=int, default=INTERVALO_PADRAO,
+                    help=f"Segundos entre verificações de versão (padrão: {INTERVALO_PADRAO})")
+    ap.add_argument("--pagina", default=str(PAGINA_PADRAO), help="Script da página a renderizar")
+    ap.add_argument("--saida", help="Só renderiza uma vez e grava o HTML neste arquivo")
+    args = ap.parse_args(argv)
+
+    pagina = Path(args.pagina).resolve()
+    if args.saida:
+        documento = montar_documento(renderizar_pagina(pagina), versao_tv(), args.intervalo)
+        from plotly.offline import get_plotlyjs
+
+        saida = Path(args.saida)
+        saida.parent.mkdir(parents=True, exist_ok=True)
+        saida.write_text(documento, encoding="utf-8")
+        saida.with_name("plotly.min.js").write_text(get_plotlyjs(), encoding="utf-8")
+        print(f"✅ HTML gravado em {args.saida}")
+        return
+    servir(args.porta, pagina, args.intervalo, args.host)
+
+
+if __name__ == "__main__":
+    main()
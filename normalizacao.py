@@ -0,0 +1,183 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+# =====================================================
+# Mapeamento de Assessores
+# =====================================================
+ASSESSORES_MAP = {
+    "A92300": "Adil Amorim",
+    "A95715": "André Norat",
+    "A87867": "Arthur Linhares",
+    "A95796": "Artur Vaz",
+    "A96676": "Artur Vaz",  # Código alternativo para o mesmo assessor
+    "A95642": "Bruna Lewis",
+    "A26892": "Carlos Monteiro",
+    "A71490": "Cesar Lima",
+    "A93081": "Daniel Morone",
+    "A23594": "Diego Monteiro",
+    "A23454": "Eduardo Monteiro",
+    "A91619": "Eduardo Parente",
+    "A95635": "Enzo Rei",
+    "A50825": "Fabiane Souza",
+    "A46886": "Fábio Tomaz",
+    "A96625": "Gustavo Levy",
+    "A95717": "Henrique Vieira",
+    "A94115": "Israel Oliveira Moraes",
+    "A97328": "João Goldenberg ",
+    "A41471": "João Georg ",
+    "A69453": "Guilherme Peçanha",
+    "A51586": "Luiz Eduardo Mesquita",
+    "A28215": "Luiz Coimbra",
+    "A92301": "Marcus Faria",
+    "A38061": "Paulo Pinho",
+    "A69265": "Paulo Gomes",
+    "A25214": "Renato Zanin",
+    "A21652": "Rodrigo Teísta",
+    "A93282": "Samuel Monteiro",
+    "A72213": "Thiago Cordeiro",
+    "A26914": "Victor Garrido",
+}
+NOME_TO_COD = {v.upper(): k for k, v in ASSESSORES_MAP.items()}
+
+
+# =====================================================
+# Helpers de texto / nomes de colunas
+# =====================================================
+def _strip_accents(txt: str) -> str:
+    if txt is None:
+        return ""
+    return "".join(
+        ch for ch in unicodedata.normalize("NFKD", str(txt)) if not unicodedata.combining(ch)
+    )
+
+
+def _norm_upper_noaccents_series(s: pd.Series) -> pd.Series:
+    return s.astype(str).map(_strip_accents).str.upper().str.strip().fillna("")
+
+
+def _norm_colname(c: str) -> str:
+    s = _strip_accents(str(c)).lower().strip()
+    s = re.sub(r"[^a-z0-9]+", " ", s)
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def _qident(name: str) -> str:
+    """Quote seguro para identificadores SQLite (colunas/tabelas)."""
+    return f'"{str(name).replace(chr(34), chr(34)*2)}"'
+
+
+# =====================================================
+# Código do assessor
+# =====================================================
+def extract_assessor_code(x: Any) -> Optional[str]:
+    s = str(x or "").strip()
+    if not s:
+        return None
+    up = re.sub(r"\s+", " ", s).upper()
+
+    m = re.search(r"A\s*?(\d{5})", up)
+    if m:
+        return f"A{m.group(1)}"
+
+    m2 = re.search(r"(^|\D)(\d{5})(\D|$)", up)
+    if m2:
+        return f"A{m2.group(2)}"
+
+    if up in NOME_TO_COD:
+        return NOME_TO_COD[up]
+
+    return None
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _extract_assessor_code_memo(x: Any) -> Optional[str]:
+    return extract_assessor_code(x)
+
+
+def extract_assessor_codes(s: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de extract_assessor_code para uma coluna inteira.
+
+    A coluna é fatorada; cada valor distinto é resolvido uma única vez (com
+    memória entre chamadas) e o resultado é replicado para as linhas.
+    Nulos viram None, como no .map(extract_assessor_code).
+    """
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    resolvidos = np.empty(len(uniques) + 1, dtype=object)
+    for i, u in enumerate(uniques):
+        try:
+            resolvidos[i] = _extract_assessor_code_memo(u)
+        except TypeError:  # valor não-hasheável
+            resolvidos[i] = extract_assessor_code(u)
+    resolvidos[-1] = None  # sentinela -1 (nulos)
+    return pd.Series(resolvidos[codes], index=s.index, name=s.name)
+
+
+# =====================================================
+# Valores monetários
+# =====================================================
+_MONEY_VAZIOS = ("", "nan", "NaN", "None", "NULL", "Não encontrado", "N/A")
+_RE_MONEY_BR = r"^\d{1,3}(?:\.\d{3})+(?:,\d+)?$"   # 1.234,56
+_RE_MONEY_US = r"^\d{1,3}(?:,\d{3})+(?:\.\d+)?$"   # 1,234.56
+_RE_FLOAT_SIMPLES = r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$"
+
+
+def _conv_money_text(x: str):
+    """Conversão de um único texto (já sem 'R$' e espaços) para float."""
+    if x in _MONEY_VAZIOS:
+        return np.nan
+    try:
+        # Tenta converter padrões numéricos comuns
+        if re.match(r"^\d{1,3}(\.\d{3})+(,\d+)?$", x):
+            return float(x.replace(".", "").replace(",", "."))
+        if re.match(r"^\d{1,3}(,\d{3})+(\.\d+)?$", x):
+            return float(x.replace(",", ""))
+        if "," in x and "." not in x:
+            return float(x.replace(",", "."))
+        return float(x)
+    except ValueError:
+        # Se não conseguir converter (ex: "Não encontrado"), retorna NaN
+        return np.nan
+
+
+def _parse_money_like_series(s: pd.Series) -> pd.Series:
+    """
+    Converte textos monetários BR/US para float (inválidos -> 0.0), vetorizado.
+
+    Os padrões são reconhecidos com operações de string sobre a coluna inteira;
+    só os valores que não casam com nenhum padrão simples (raros) passam pela
+    conversão valor-a-valor de _conv_money_text, uma vez por valor distinto.
+    """
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return pd.to_numeric(s, errors="coerce").astype("float64").fillna(0.0)
+
+    # Nulos contam como vazios (no pandas 3 astype(str) preserva NA)
+    s = s.astype(str).fillna("nan").str.strip()
+    s = s.str.replace("R$", "", regex=False).str.replace(" ", "", regex=False)
+
+    is_br = s.str.match(_RE_MONEY_BR)
+    is_us = s.str.match(_RE_MONEY_US) & ~is_br
+    so_virgula = s.str.contains(",", regex=False) & ~s.str.contains(".", regex=False) & ~is_us
+
+    # '1.234,56' e '12,5' -> troca vírgula por ponto; '1,234.56' -> remove vírgulas
+    br = s.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    cand = br.where(is_br | so_virgula, s.str.replace(",", "", regex=False).where(is_us, s))
+
+    vazio = s.isin(_MONEY_VAZIOS)
+    simples = cand.str.match(_RE_FLOAT_SIMPLES) & ~vazio
+    # Conversão texto -> float feita em bloco (arrow), com o mesmo arredondamento de float()
+    out = cand.where(simples).astype("float64").to_numpy(copy=True)
+
+    # Demais formatos aceitos por float() (ex.: '1_000', 'inf'): um valor distinto por vez
+    resto = (~simples & ~vazio).to_numpy()
+    if resto.any():
+        valores = s.to_numpy(dtype=object)[resto]
+        conv = {u: _conv_money_text(u) for u in pd.unique(valores)}
+        out[resto] = pd.Series(valores).map(conv).to_numpy(dtype="float64")
+
+    return pd.Series(out, index=s.index).fillna(0.0)
@@ -0,0 +1,142 @@
+"""
+Observador em segundo plano dos bancos DBV Capital_*.db.
+
+Uma thread daemon (uma por processo do Streamlit) faz stat() das fontes a
+cada INTERVALO_PADRAO segundos. Quando algum arquivo muda:
+
+1. roda a função de aquecimento registrada pela página enxergando a versão
+   nova (registro_versoes.aquecer_versao): loaders, cubo/índices de
+   transferências etc. são recalculados fora do rerun dos usuários;
+2. publica a versão nova de uma vez (registro_versoes.publicar). Até aqui
+   os reruns continuam lendo a versão anterior, ainda em cache.
+
+Assim nenhuma TV fica presa no spinner "Carregando dados..." depois de uma
+carga do ETL. Se o ETL ainda estiver escrevendo (arquivo mudou de novo
+durante o aquecimento), a publicação espera a próxima volta.
+
+Os caches aquecidos são st.cache_data, que precisam de um ScriptRunContext:
+a thread recebe o contexto do rerun que chamou iniciar_observador() por
+último (trocado a cada rerun, para não ficar preso a uma sessão encerrada).
+Nada do que o aquecimento alcança desenha na tela: os loaders reportam
+erros por registro_versoes.avisar_carga(). Se o aquecimento falhar, a
+versão anterior continua publicada e a nova é aquecida de novo na volta
+seguinte; depois de TENTATIVAS_AQUECIMENTO falhas seguidas ela é publicada
+assim mesmo (os reruns carregam o que faltou). A falha da última volta fica
+em ultima_falha() para a página exibir.
+"""
+
+import os
+import threading
+import traceback
+from typing import Callable, Dict, Optional, Tuple
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from registro_versoes import (
+    aquecer_versao,
+    despublicar,
+    estados_fontes,
+    publicar,
+)
+
+INTERVALO_PADRAO = float(os.getenv("DBV_OBSERVADOR_INTERVALO", "5") or 5)
+TENTATIVAS_AQUECIMENTO = int(os.getenv("DBV_OBSERVADOR_TENTATIVAS", "3") or 3)
+
+_LOCK = threading.Lock()
+_ESTADO: Dict[str, object] = {"thread": None, "parar": None, "aquecer": None, "falha": None, "tentativas": None}
+
+
+def _aquecer_registrado() -> None:
+    aquecer = _ESTADO.get("aquecer")
+    if callable(aquecer):
+        aquecer()
+
+
+def _ciclo(estados_publicados: Dict[str, Tuple[float, str]]) -> Dict[str, Tuple[float, str]]:
+    """Uma volta do observador; devolve a versão publicada ao final."""
+    atuais = estados_fontes()
+    if atuais == estados_publicados:
+        return estados_publicados
+
+    falhou = False
+    try:
+        aquecer_versao(atuais, _aquecer_registrado)
+        _ESTADO["falha"] = None
+    except Exception as e:
+        falhou = True
+        _ESTADO["falha"] = str(e)
+        print(f"[observador] Falha ao aquecer a versão nova: {traceback.format_exc()}")
+
+    if estados_fontes() != atuais:
+        # ETL ainda gravando: aquece de novo na próxima volta
+        return estados_publicados
+
+    if falhou:
+        # (versão, falhas seguidas): a contagem recomeça quando a versão muda
+        anterior = _ESTADO.get("tentativas")
+        falhas = anterior[1] + 1 if isinstance(anterior, tuple) and anterior[0] == atuais else 1
+        _ESTADO["tentativas"] = (atuais, falhas)
+        if falhas < TENTATIVAS_AQUECIMENTO:
+            print(f"[observador] Versão anterior mantida; nova tentativa na próxima volta ({falhas}/{TENTATIVAS_AQUECIMENTO})")
+            return estados_publicados
+    _ESTADO["tentativas"] = None
+
+    alteradas = publicar(atuais)
+    if alteradas:
+        print(f"[observador] Nova versão publicada: {', '.join(alteradas)}")
+    return atuais
+
+
+def _executar(parar: threading.Event, intervalo: float) -> None:
+    publicados = estados_fontes()
+    publicar(publicados)
+    while not parar.wait(intervalo):
+        try:
+            publicados = _ciclo(publicados)
+        except Exception:
+            print(f"[observador] Erro: {traceback.format_exc()}")
+
+
+def iniciar_observador(aquecer: Optional[Callable[[], None]] = None, intervalo: float = INTERVALO_PADRAO) -> bool:
+    """
+    Garante uma única thread observadora no processo e atualiza a função de
+    aquecimento e o contexto do script (a página chama a cada rerun).
+    Retorna True se a thread foi criada nesta chamada.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    with _LOCK:
+        if aquecer is not None:
+            _ESTADO["aquecer"] = aquecer
+        thread = _ESTADO.get("thread")
+        if isinstance(thread, threading.Thread) and thread.is_alive():
+            if ctx is not None:
+                add_script_run_ctx(thread, ctx)
+            return False
+
+        parar = threading.Event()
+        thread = threading.Thread(
+            target=_executar, args=(parar, intervalo), name="observador_bancos", daemon=True
+        )
+        if ctx is not None:
+            add_script_run_ctx(thread, ctx)
+        _ESTADO.update(thread=thread, parar=parar, falha=None, tentativas=None)
+        thread.start()
+        return True
+
+
+def ultima_falha() -> Optional[str]:
+    """Erro do último aquecimento (None se a última versão aqueceu sem falhas)."""
+    falha = _ESTADO.get("falha")
+    return str(falha) if falha else None
+
+
+def parar_observador(timeout: float = 5.0) -> None:
+    """Encerra a thread e volta a usar o stat() atual dos arquivos."""
+    with _LOCK:
+        parar, thread = _ESTADO.get("parar"), _ESTADO.get("thread")
+        _ESTADO.update(thread=None, parar=None)
+    if isinstance(parar, threading.Event):
+        parar.set()
+    if isinstance(thread, threading.Thread):
+        thread.join(timeout)
+    despublicar()
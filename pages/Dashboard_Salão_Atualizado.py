@@ -6,10 +6,9 @@ import sqlite3
 
 # Controle de escala para ajuste de tamanho
 TV_SCALE = 1.25  # 20% menor (valores menores = elementos menores)
-import unicodedata
 import traceback
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from textwrap import dedent
 
@@ -28,6 +27,46 @@ from correcao_final import (
     obter_dados_auc_2026_robusto as obter_dados_auc_2026,
     obter_dados_rumo_1bi_robusto as obter_dados_rumo_1bi
 )
+from normalizacao import (
+    ASSESSORES_MAP,
+    _norm_colname,
+    _parse_money_like_series,
+    _qident,
+    extract_assessor_codes,
+)
+from acesso_dados import (
+    carregar_auc_mesa_rv,
+    carregar_feebased,
+    carregar_nps,
+    carregar_positivador_mtd,
+    carregar_transferencias,
+    data_maxima_sql,
+    filtrar_janela,
+    filtro_janela,
+    localizar_banco,
+    resolver_esquema,
+)
+from snapshot_colunar import carregar_com_snapshot
+from calendario_uteis import dias_uteis_ano, dias_uteis_entre
+from projecao import BASE_CORRIDOS, desvio_pace, periodos_decorridos, valor_projetado
+from indice_datas import construir_indice, data_maxima, soma_intervalo, somas_por_chave
+from historico_mensal import agregar_mensal, auc_inicial_ano, historico_vazio
+from historico_particionado import agregados_fechados
+from cache_versao import cache_por_versao
+from registro_versoes import (
+    FalhaAquecimento,
+    avisar_carga,
+    depende_de,
+    mtime_vigente,
+    verificar_alteracoes,
+    versao_composta,
+    versao_fontes,
+)
+from observador_bancos import iniciar_observador, ultima_falha
+from contexto_execucao import atualizar, declarar, nova_execucao, obter, resumo
+import rastreamento
+from rastreamento import cache_rastreado, rastrear, secao
+from tipos_compactos import aplicar_texto, compactar, converter
 
 # Variável global para garantir consistência entre os cards Rumo a 1bi e AUC-2026
 valor_base_auc_2026 = None
@@ -42,6 +81,15 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# Rastreamento por seção desta execução (overlay com ?desempenho=1 ou pelo toggle na sidebar)
+rastreamento.iniciar("Dashboard_Salão_Atualizado")
+overlay_desempenho = st.sidebar.toggle(
+    "⏱️ Overlay de desempenho", value=st.query_params.get("desempenho") == "1", key="overlay_desempenho"
+)
+
+# Invalida apenas os caches das fontes cujo .db mudou desde o último rerun
+verificar_alteracoes()
+
 # Estilos CSS para compactar o dashboard
 st.markdown("""
     <style>
@@ -92,7 +140,8 @@ st.markdown("""
 # =====================================================
 # FUNÇÃO PARA DEBUG
 # =====================================================
-@st.cache_data(show_spinner=False)
+@depende_de(versionado=False)
+@cache_rastreado()
 def debug_data_loading() -> Dict[str, Any]:
     """
     Função para depuração do carregamento de dados.
@@ -142,6 +191,8 @@ with st.sidebar.expander("🔍 Debug Info", expanded=False):
             "\n- " + "\n- ".join(debug_info.get("db_files", [])),
         )
 
+        st.write(f"Versão dos dados: `{versao_composta()}`")
+
         st.write("\n### Status dos Bancos de Dados")
         for db in ["positivador", "objetivos"]:
             exists = debug_info.get(f"{db}_exists", False)
@@ -157,45 +208,6 @@ with st.sidebar.expander("🔍 Debug Info", expanded=False):
         st.text(traceback.format_exc())
 
 
-def detectar_tabela_positivador(conn: sqlite3.Connection) -> str:
-    """
-    Detecta o nome correto da tabela no banco de dados.
-
-    Ordem de prioridade:
-    1. capital_positivador
-    2. Relatório_Positivador (com acento)
-    3. positivador
-    4. positivador_mtd
-    5. Primeira tabela disponível
-
-    Args:
-        conn: Conexão com o banco de dados SQLite
-
-    Returns:
-        str: Nome da tabela encontrada, entre aspas se contiver espaços
-    """
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-        )
-        tabelas = [row[0] for row in cursor.fetchall()]
-
-        for tabela in [
-            "capital_positivador",
-            "Relatório_Positivador",
-            "positivador",
-            "positivador_mtd",
-        ]:
-            if tabela in tabelas:
-                return f'"{tabela}"' if (" " in tabela or "-" in tabela) else tabela
-
-        return f'"{tabelas[0]}"' if tabelas else ""
-    except Exception as e:
-        st.error(f"Erro ao detectar tabela: {e}")
-        return ""
-
-
 # =====================================================
 # DEBUG - Funções para captação e transferências
 # =====================================================
@@ -214,28 +226,11 @@ def _sum_captacao_positivador(df_in: pd.DataFrame, data_ini: datetime, data_fim:
 
 
 def _sum_transferencias(data_ini: datetime, data_fim: datetime) -> float:
-    df_t = carregar_transferencias_intervalo_net(data_ini, data_fim)
-    if df_t is None or df_t.empty or "pl_num_signed" not in df_t.columns:
+    """PL líquido (com sinal DBV) das transferências entre os dias data_ini e data_fim."""
+    indice = _obter_indices_transferencias()["net"]
+    if indice is None:
         return 0.0
-    return float(pd.to_numeric(df_t["pl_num_signed"], errors="coerce").fillna(0.0).sum() or 0.0)
-
-
-def _garantir_data(df: pd.DataFrame, col_data: str) -> pd.DataFrame:
-    """Garante que a coluna de data está no formato datetime e remove linhas inválidas."""
-    df = df.copy()
-    df[col_data] = pd.to_datetime(df[col_data], errors="coerce")
-    return df.dropna(subset=[col_data])
-
-
-def _periodo_mes_mais_recente(df: pd.DataFrame, col_data: str) -> tuple:
-    """
-    Encontra o período do mês mais recente nos dados.
-    Retorna (inicio_mes, fim_mes, data_mais_recente)
-    """
-    dt_max = df[col_data].max()
-    inicio_mes = dt_max.to_period("M").start_time
-    fim_mes = (dt_max.to_period("M") + 1).start_time  # exclusive
-    return inicio_mes, fim_mes, dt_max
+    return soma_intervalo(indice, pd.Timestamp(data_ini).normalize(), pd.Timestamp(data_fim).normalize())
 
 
 def _sum_transferencias_por_mes_mais_recente() -> tuple[float, float]:
@@ -245,28 +240,16 @@ def _sum_transferencias_por_mes_mais_recente() -> tuple[float, float]:
     - transf_mes: soma do mês mais recente
     - transf_ano: soma do ano do mês mais recente
     """
-    # Carrega todos os dados de transferências
-    dbp = _find_transfer_db_path()
-    if dbp is None:
-        return 0.0, 0.0
-    
-    # Usa um intervalo amplo para pegar todos os dados disponíveis
-    df = carregar_transferencias_intervalo_net(
-        datetime(2000, 1, 1),  # Data inicial antiga
-        datetime(2100, 1, 1)   # Data futura distante
-    )
-    
-    if df is None or df.empty or "data_efetiva" not in df.columns:
-        return 0.0, 0.0
-    
-    # Garante que temos a coluna de data
-    df = _garantir_data(df, "data_efetiva")
-    if df.empty:
+    # Data mais recente direto do índice (sem carregar as transferências)
+    indice = _obter_indices_transferencias()["net"]
+    dt_max = data_maxima(indice) if indice is not None else None
+    if dt_max is None:
         return 0.0, 0.0
     
     try:
         # Encontra o período do mês mais recente
-        inicio_mes, fim_mes, dt_max = _periodo_mes_mais_recente(df, "data_efetiva")
+        inicio_mes = dt_max.to_period("M").start_time
+        fim_mes = (dt_max.to_period("M") + 1).start_time  # exclusive
         ano = dt_max.year
         
         # Calcula transferências do mês
@@ -287,85 +270,117 @@ def _sum_transferencias_por_mes_mais_recente() -> tuple[float, float]:
 # =====================================================
 # CARREGAR POSITIVADOR (DBV Capital_Positivador.db) - compat
 # =====================================================
-@st.cache_data(show_spinner=False)
-def carregar_dados_positivador(db_path_str: str, mtime: float) -> pd.DataFrame:
+def mapear_colunas_positivador(colunas: List[str]) -> Dict[str, str]:
+    """Nome canônico (Data_Posicao, Net_Em_M, Cliente...) -> coluna da tabela do Positivador."""
+    # Mapeamento de colunas esperadas para possíveis variações
+    mapeamento_colunas = {
+        'Data_Posicao': ['Data Posição', 'Data_Posicao', 'Data', 'DataPosicao', 'DataPosição'],
+        'Net_Em_M': ['Net Em M', 'Net_Em_M', 'Net', 'NetM', 'NetEmM'],
+        'Captacao_Liquida_em_M': ['Captação Líquida em M', 'Captacao_Liquida_em_M', 'Captação', 'Captacao', 'CaptacaoLiquida'],
+        'Assessor': ['Assessor', 'Consultor', 'Assessor/Consultor'],
+        'Cliente': ['Cliente', 'Nome Cliente', 'Nome_Cliente'],
+        'Status': ['Status', 'Situação', 'Situacao'],
+        'Data_Cadastro': ['Data de Cadastro', 'Data_Cadastro', 'DataCadastro'],
+        'Data_Atualizacao': ['Data Atualização', 'Data_Atualizacao', 'DataAtualizacao', 'Atualização'],
+        'Tipo_Pessoa': ['Tipo Pessoa', 'Tipo_Pessoa', 'TipoPessoa'],
+        'Segmento': ['Segmento', 'Categoria'],
+        'Sexo': ['Sexo', 'Gênero', 'Genero']
+    }
+
+    # Encontra os mapeamentos reais
+    mapeamento_real = {}
+    for col_dest, possiveis_colunas in mapeamento_colunas.items():
+        for col in colunas:
+            if col in possiveis_colunas or col.lower() in [c.lower() for c in possiveis_colunas]:
+                mapeamento_real[col_dest] = col
+                break
+
+    # Se não encontrou todas as colunas necessárias, tenta encontrar por similaridade
+    colunas_necessarias = ['Data_Posicao', 'Net_Em_M', 'Captacao_Liquida_em_M', 'Assessor']
+    colunas_faltando = [col for col in colunas_necessarias if col not in mapeamento_real]
+
+    if colunas_faltando:
+        print(f"Aviso: Colunas faltando no mapeamento: {colunas_faltando}")
+        for col in colunas_faltando:
+            # Tenta encontrar por similaridade
+            for coluna_tabela in colunas:
+                if col.lower() in coluna_tabela.lower():
+                    mapeamento_real[col] = coluna_tabela
+                    break
+
+    return mapeamento_real
+
+
+@depende_de("positivador", "positivador_mtd")
+@cache_rastreado()
+def carregar_dados_positivador(
+    db_path_str: str,
+    mtime: float,
+    colunas: Optional[Tuple[str, ...]] = None,
+    data_ini: Any = None,
+    data_fim: Any = None,
+) -> pd.DataFrame:
     """
     Carrega os dados do Positivador do banco de dados SQLite.
     Retorna um DataFrame com as colunas Data_Posicao e Net_Em_M.
+    `colunas` (nomes canônicos) e a janela [data_ini, data_fim] de
+    Data_Posicao são aplicadas no SQL. A tabela inteira (sem recorte) usa o
+    snapshot colunar ao lado do .db quando ele estiver atualizado.
     """
+    # Se for o banco de dados MTD, usa a função específica
+    if "MTD" in Path(db_path_str).name:
+        if colunas is None and data_ini is None and data_fim is None:
+            return carregar_dados_positivador_mtd()
+        return carregar_positivador_mtd(colunas, data_ini, data_fim)
+    if colunas is None and data_ini is None and data_fim is None:
+        return carregar_com_snapshot(db_path_str, mtime, "positivador", _construir_positivador)
+    return _construir_positivador(db_path_str, mtime, colunas, data_ini, data_fim)
+
+
+def _construir_positivador(
+    db_path_str: str,
+    mtime: float,
+    colunas_pedidas: Optional[Tuple[str, ...]] = None,
+    data_ini: Any = None,
+    data_fim: Any = None,
+) -> pd.DataFrame:
     try:
         db_path = Path(db_path_str)
-        
-        # Se for o banco de dados MTD, usa a função específica
-        if "MTD" in db_path.name:
-            return carregar_dados_positivador_mtd()
-            
-        conn = sqlite3.connect(str(db_path))
 
-        tabela = detectar_tabela_positivador(conn)
+        esquema = resolver_esquema(db_path_str, mtime, "positivador")
+        tabela = esquema["tabela"]
         if not tabela:
-            st.error("Nenhuma tabela encontrada no banco de dados.")
+            avisar_carga("Nenhuma tabela encontrada no banco de dados.", st.error)
             return pd.DataFrame()
-            
-        # Primeiro, obtém os nomes das colunas
-        cursor = conn.cursor()
-        cursor.execute(f'SELECT * FROM "{tabela}" LIMIT 1;')
-        colunas = [desc[0] for desc in cursor.description]
-        cursor.close()
-        
-        # Log para debug
-        print(f"Colunas encontradas na tabela {tabela}:\n- " + "\n- ".join(colunas))
-        
-        # Mapeamento de colunas esperadas para possíveis variações
-        mapeamento_colunas = {
-            'Data_Posicao': ['Data Posição', 'Data_Posicao', 'Data', 'DataPosicao', 'DataPosição'],
-            'Net_Em_M': ['Net Em M', 'Net_Em_M', 'Net', 'NetM', 'NetEmM'],
-            'Captacao_Liquida_em_M': ['Captação Líquida em M', 'Captacao_Liquida_em_M', 'Captação', 'Captacao', 'CaptacaoLiquida'],
-            'Assessor': ['Assessor', 'Consultor', 'Assessor/Consultor'],
-            'Cliente': ['Cliente', 'Nome Cliente', 'Nome_Cliente'],
-            'Status': ['Status', 'Situação', 'Situacao'],
-            'Data_Cadastro': ['Data de Cadastro', 'Data_Cadastro', 'DataCadastro'],
-            'Data_Atualizacao': ['Data Atualização', 'Data_Atualizacao', 'DataAtualizacao', 'Atualização'],
-            'Tipo_Pessoa': ['Tipo Pessoa', 'Tipo_Pessoa', 'TipoPessoa'],
-            'Segmento': ['Segmento', 'Categoria'],
-            'Sexo': ['Sexo', 'Gênero', 'Genero']
-        }
-        
-        # Encontra os mapeamentos reais
-        mapeamento_real = {}
-        for col_dest, possiveis_colunas in mapeamento_colunas.items():
-            for col in colunas:
-                if col in possiveis_colunas or col.lower() in [c.lower() for c in possiveis_colunas]:
-                    mapeamento_real[col_dest] = col
-                    break
-        
-        # Se não encontrou todas as colunas necessárias, tenta encontrar por similaridade
-        colunas_necessarias = ['Data_Posicao', 'Net_Em_M', 'Captacao_Liquida_em_M', 'Assessor']
-        colunas_faltando = [col for col in colunas_necessarias if col not in mapeamento_real]
-        
-        if colunas_faltando:
-            print(f"Aviso: Colunas faltando no mapeamento: {colunas_faltando}")
-            for col in colunas_faltando:
-                # Tenta encontrar por similaridade
-                for coluna_tabela in colunas:
-                    if col.lower() in coluna_tabela.lower():
-                        mapeamento_real[col] = coluna_tabela
-                        break
+        colunas = esquema["colunas"]
+
+        conn = sqlite3.connect(str(db_path))
         
-        # Constrói a consulta SQL dinâmica
+        mapeamento_real = mapear_colunas_positivador(colunas)
+
+        # Constrói a consulta SQL dinâmica (projeção: só as colunas pedidas)
+        pedidas = set(colunas_pedidas) if colunas_pedidas is not None else None
         colunas_select = []
         for col_dest, col_orig in mapeamento_real.items():
-            colunas_select.append(f'"{col_orig}" as "{col_dest}"')
+            if pedidas is None or col_dest in pedidas:
+                colunas_select.append(f'"{col_orig}" as "{col_dest}"')
         
         # Adiciona colunas adicionais que não estão no mapeamento
         for col in colunas:
             if col not in mapeamento_real.values() and all(c not in col for c in ['Data_Posicao', 'Net_Em_M', 'Assessor']):
-                colunas_select.append(f'"{col}"')
+                if pedidas is None or col in pedidas:
+                    colunas_select.append(f'"{col}"')
         
-        query = f'SELECT {", ".join(colunas_select)} FROM "{tabela}"'
-        print(f"Executando consulta: {query}")
+        # Janela de datas no SQL (o filtro exato é refeito abaixo, já com datetime)
+        where, params = ("", [])
+        if 'Data_Posicao' in mapeamento_real:
+            where, params = filtro_janela(
+                mapeamento_real['Data_Posicao'], data_ini, data_fim, esquema["tipado"]
+            )
+
+        query = f'SELECT {", ".join(colunas_select)} FROM {_qident(tabela)}{where}'
         
-        df = pd.read_sql_query(query, conn)
+        df = pd.read_sql_query(query, conn, params=params)
         conn.close()
 
         # Converte tipos de dados
@@ -430,30 +445,218 @@ def carregar_dados_positivador(db_path_str: str, mtime: float) -> pd.DataFrame:
         
         # Garante que as colunas necessárias existam, mesmo que vazias
         for col in ['Net_Em_M', 'Captacao_Liquida_em_M']:
-            if col not in df.columns:
+            if col not in df.columns and (pedidas is None or col in pedidas):
                 df[col] = 0.0
                 
+        df = filtrar_janela(df, 'Data_Posicao', data_ini, data_fim)
+
         # Ordena por Data_Posicao se existir
         if 'Data_Posicao' in df.columns:
             df = df.sort_values('Data_Posicao', ascending=False)
         
-        return df
+        return compactar(df, "positivador")
         
     except Exception as e:
-        st.error(f"Erro ao carregar dados do Positivador: {e}")
+        avisar_carga(f"Erro ao carregar dados do Positivador: {e}", st.error)
         import traceback
         print(f"Erro detalhado: {traceback.format_exc()}")
         return pd.DataFrame()
 
 
-# DataFrame usado pelos gráficos de AUC
-_pos_path = Path(__file__).parent.parent / "DBV Capital_Positivador.db"
-df_positivador = (
-    carregar_dados_positivador(str(_pos_path), _pos_path.stat().st_mtime)
-    if _pos_path.exists()
-    else pd.DataFrame()
+# =====================================================
+# PLANO DE CARGA DA EXECUÇÃO (GRAFO DE MÉTRICAS)
+# =====================================================
+# Cada base e cada derivado usado pela página é declarado uma vez aqui e
+# construído no máximo uma vez por rerun (ver contexto_execucao). Os
+# valores são compartilhados entre os pontos de uso: não altere in-place.
+# Fluxo: fonte (.db) -> base -> tratamento/agregação -> KPI/ranking/figura.
+# Os nós compartilhados só são recalculados quando muda uma fonte acima
+# deles; os demais saem do cache da versão.
+# Colunas do FULL que a base YTD usa (projeção feita no SQL)
+COLUNAS_YTD = ("Data_Posicao", "Captacao_Liquida_em_M", "Net_Em_M", "Assessor", "Cliente")
+
+
+def carregar_positivador_full(
+    colunas: Optional[Tuple[str, ...]] = None, data_ini: Any = None, data_fim: Any = None
+) -> pd.DataFrame:
+    """Positivador FULL (DBV Capital_Positivador.db) bruto; vazio se o arquivo não existir."""
+    caminho = Path(__file__).parent.parent / "DBV Capital_Positivador.db"
+    if not caminho.exists():
+        return pd.DataFrame()
+    return carregar_dados_positivador(str(caminho), mtime_vigente(caminho), colunas, data_ini, data_fim)
+
+
+@depende_de("positivador")
+@cache_rastreado()
+def carregar_positivador_mensal(db_path_str: str, mtime: float) -> pd.DataFrame:
+    """
+    Histórico do FULL agregado por mês (Net, clientes distintos, primeiro dia),
+    dobrado em blocos a partir do SQLite sem carregar as linhas (historico_mensal).
+    """
+    esquema = resolver_esquema(db_path_str, mtime, "positivador")
+    mapa = mapear_colunas_positivador(esquema["colunas"]) if esquema["tabela"] else {}
+    if "Data_Posicao" not in mapa:
+        return historico_vazio()
+    return agregar_mensal(db_path_str, esquema["tabela"], mapa["Data_Posicao"], mapa.get("Net_Em_M"), mapa.get("Cliente"))
+
+
+@depende_de("positivador_historico")
+@cache_rastreado()
+def carregar_historico_particionado(db_path_str: str, mtime: float) -> pd.DataFrame:
+    """Agregados dos meses fechados, lidos do catálogo do histórico particionado."""
+    return agregados_fechados(Path(db_path_str))
+
+
+def positivador_mensal() -> pd.DataFrame:
+    """
+    Agregado mensal do histórico (gráfico de crescimento e AUC_BASE_2025):
+    os meses fechados do histórico particionado, ou o FULL agregado em blocos
+    quando não há histórico; vazio se nenhum dos dois existir.
+    """
+    historico = localizar_banco("positivador_historico")
+    if historico is not None:
+        fechados = carregar_historico_particionado(str(historico), mtime_vigente(historico))
+        if not fechados.empty:
+            return fechados
+    caminho = Path(__file__).parent.parent / "DBV Capital_Positivador.db"
+    if not caminho.exists():
+        return historico_vazio()
+    return carregar_positivador_mensal(str(caminho), mtime_vigente(caminho))
+
+
+def carregar_positivador_ano() -> pd.DataFrame:
+    """FULL do ano da última posição (1º de janeiro até a última data), colunas do YTD."""
+    caminho = Path(__file__).parent.parent / "DBV Capital_Positivador.db"
+    if not caminho.exists():
+        return pd.DataFrame()
+    esquema = resolver_esquema(str(caminho), mtime_vigente(caminho), "positivador")
+    col_data = mapear_colunas_positivador(esquema["colunas"]).get("Data_Posicao")
+    ultima = data_maxima_sql(str(caminho), esquema["tabela"], col_data) if esquema["tabela"] and col_data else None
+    if ultima is None or pd.isna(ultima):
+        return carregar_positivador_full(COLUNAS_YTD)
+    return carregar_positivador_full(COLUNAS_YTD, pd.Timestamp(ultima.year, 1, 1), ultima)
+
+
+def preparar_top3_ano(df_mtd: pd.DataFrame, df_ytd: pd.DataFrame) -> pd.DataFrame:
+    """Base do Top 3 do ano: o MTD tratado, ou o FULL quando o MTD não existe/está vazio."""
+    mtd_path = Path(__file__).parent.parent / "DBV Capital_Positivador (MTD).db"
+    if mtd_path.exists() and not df_mtd.empty:
+        return preparar_df_para_top3_com_transferencias(df_mtd)
+    return preparar_df_para_top3_com_transferencias(df_ytd)  # Fallback para FULL
+
+
+def realizado_feebased(df_fb: pd.DataFrame) -> Optional[float]:
+    """FeeBased realizado (soma de P/L dos ativos); None quando não há dados."""
+    if df_fb is None or df_fb.empty:
+        return None
+    # Filtra apenas status ATIVO (já normalizado no loader)
+    df_ativos = df_fb[df_fb["status_norm"].eq("ATIVO")]
+    # Soma os valores de P/L (já tratados no carregamento)
+    return float(df_ativos["pl_value"].sum() if not df_ativos.empty else 0.0)
+
+
+def top3_feebased(df_fb: pd.DataFrame) -> Optional[List[Tuple[str, float]]]:
+    """Top 3 assessores por PL ativo no FeeBased; None quando não há código de assessor."""
+    if df_fb is None or df_fb.empty or "assessor_code" not in df_fb.columns:
+        return None
+    df_ativos = df_fb[df_fb["status_norm"] == "ATIVO"]
+    if df_ativos.empty:
+        return []
+    # Agrupa por assessor e soma o PL
+    top_assessores = df_ativos.groupby("assessor_code", observed=True)["pl_value"].sum().sort_values(ascending=False).head(3)
+    return [(k, v) for k, v in top_assessores.items()]
+
+
+def normalizar_positivador_ytd(df: pd.DataFrame) -> pd.DataFrame:
+    """Cópia do Positivador FULL com Data_Posicao e Captacao_Liquida_em_M tipadas (base YTD)."""
+    if df is None or df.empty:
+        return df
+    df = df.copy()
+    if "Data_Posicao" in df.columns:
+        df["Data_Posicao"] = pd.to_datetime(df["Data_Posicao"], errors="coerce")
+    if "Captacao_Liquida_em_M" in df.columns:
+        df["Captacao_Liquida_em_M"] = pd.to_numeric(df["Captacao_Liquida_em_M"], errors="coerce").fillna(0.0)
+    return df
+
+
+# (nome, construir, depende, fontes, compartilhado)
+PLANO_CARGA: Tuple[Tuple[str, Callable[..., Any], Tuple[str, ...], Tuple[str, ...], bool], ...] = (
+    # Bases (fontes lidas diretamente)
+    ("positivador_mensal", positivador_mensal, (), ("positivador", "positivador_historico"), False),
+    ("positivador_ano", carregar_positivador_ano, (), ("positivador",), False),
+    ("positivador_mtd", lambda: carregar_dados_positivador_mtd(), (), ("positivador_mtd",), False),
+    ("objetivos", lambda: carregar_dados_objetivos(), (), ("objetivos_pj1",), False),
+    ("objetivos_pj1", lambda: carregar_dados_objetivos_pj1(), (), ("objetivos_pj1",), False),
+    ("feebased", lambda: carregar_dados_feebased(), (), ("feebased",), False),
+    # Tratamento / agregação
+    ("positivador_mtd_tratado", lambda df: tratar_dados_positivador_mtd(df), ("positivador_mtd",), (), False),
+    ("positivador_ytd", normalizar_positivador_ytd, ("positivador_ano",), (), False),
+    ("ultima_data_posicao", lambda df: obter_ultima_data_posicao(df), ("positivador_mtd",), (), False),
+    ("data_referencia", lambda d: pd.Timestamp(d).normalize(), ("ultima_data_posicao",), (), False),
+    # Top 3 de captação incluindo transferências como captação (não usar em KPIs)
+    (
+        "top3_base_mes",
+        lambda df: preparar_df_para_top3_com_transferencias(df),
+        ("positivador_mtd_tratado",),
+        ("transferencias",),
+        False,
+    ),
+    ("top3_base_ano", preparar_top3_ano, ("positivador_mtd_tratado", "positivador_ytd"), ("transferencias",), False),
+    # KPIs, rankings e figuras (compartilhados entre sessões, por versão das fontes)
+    (
+        "indicadores",
+        lambda df_pos, df_obj, hoje: calcular_indicadores_objetivos(df_pos, df_obj, hoje=hoje),
+        ("positivador_mtd_tratado", "objetivos_pj1", "data_referencia"),
+        ("transferencias",),  # transferências líquidas do mês/ano (lidas dentro da função)
+        True,
+    ),
+    (
+        "top3_captacao_mes",
+        lambda df, mets: top3_mes_cap(
+            df, date_col="Data_Posicao", value_col="Captacao_Liquida_em_M", group_col="assessor_code",
+            transferencias_por_assessor=mets.get("capliq_mes", {}).get("transferencias_por_assessor", {}),
+        ),
+        ("top3_base_mes", "indicadores"),
+        (),
+        True,
+    ),
+    (
+        "top3_captacao_ano",
+        lambda df, mets: top3_ano_cap(
+            df, transferencias_por_assessor=mets.get("capliq_ano", {}).get("transferencias_por_assessor", {}),
+        ),
+        ("top3_base_ano", "indicadores"),
+        (),
+        True,
+    ),
+    ("top3_auc", lambda df: top3_mes_cap(df, value_col="Net_Em_M"), ("positivador_mtd_tratado",), (), True),
+    (
+        "grafico_crescimento_auc",
+        lambda df_mensal, df_mtd: construir_grafico_crescimento_auc(df_mensal, df_mtd),
+        ("positivador_mensal", "positivador_mtd"),
+        (),
+        True,
+    ),
+    ("indicadores_nps", lambda: construir_indicadores_nps(), (), ("nps",), True),
+    ("feebased_realizado", realizado_feebased, ("feebased",), (), True),
+    ("top3_feebased", top3_feebased, ("feebased",), (), True),
 )
 
+
+def montar_execucao() -> Dict[str, Any]:
+    """Execução nova com o PLANO_CARGA declarado, nas versões vigentes das fontes."""
+    nova = nova_execucao()
+    for nome, construir, depende, fontes, compartilhado in PLANO_CARGA:
+        declarar(nova, nome, construir, depende, fontes=fontes, compartilhado=compartilhado)
+    return nova
+
+
+execucao = montar_execucao()
+
+
+# Histórico mensal usado pelos gráficos de AUC
+df_positivador_mensal = obter(execucao, "positivador_mensal")
+
 # =====================================================
 # CONTROLE DE SEÇÕES
 # =====================================================
@@ -1175,6 +1378,15 @@ div[data-testid="stVerticalBlock"]:has(.metric-card-kpi) {
     box-shadow: 0 10px 24px rgba(0,0,0,0.45);
 }
 
+/* Cards em st.fragment: o container do fragmento fica dentro do bloco da coluna; só o externo desenha o card */
+[data-testid="stColumn"] [data-testid="stVerticalBlock"] [data-testid="stVerticalBlock"]:has(.metric-card-kpi) {
+    background: transparent !important;
+    border: none !important;
+    padding: 0 !important;
+    margin: 0 !important;
+    box-shadow: none !important;
+}
+
 .col-tv-inner .top3-h-wrap {
     margin-top: 10px !important;
     margin-bottom: 0 !important;
@@ -1190,42 +1402,6 @@ div[data-testid="stVerticalBlock"]:has(.metric-card-kpi) {
 YELLOW = "#948161"
 GREEN = "#2ecc71"
 
-ASSESSORES_MAP = {
-    "A92300": "Adil Amorim",
-    "A95715": "André Norat",
-    "A87867": "Arthur Linhares",
-    "A95796": "Artur Vaz",
-    "A96676": "Artur Vaz",  # Código alternativo para o mesmo assessor
-    "A95642": "Bruna Lewis",
-    "A26892": "Carlos Monteiro",
-    "A71490": "Cesar Lima",
-    "A93081": "Daniel Morone",
-    "A23594": "Diego Monteiro",
-    "A23454": "Eduardo Monteiro",
-    "A91619": "Eduardo Parente",
-    "A95635": "Enzo Rei",
-    "A50825": "Fabiane Souza",
-    "A46886": "Fábio Tomaz",
-    "A96625": "Gustavo Levy",
-    "A95717": "Henrique Vieira",
-    "A94115": "Israel Oliveira Moraes",
-    "A97328": "João Goldenberg ",
-    "A41471": "João Georg ",
-    "A69453": "Guilherme Peçanha",
-    "A51586": "Luiz Eduardo Mesquita",
-    "A28215": "Luiz Coimbra",
-    "A92301": "Marcus Faria",
-    "A38061": "Paulo Pinho",
-    "A69265": "Paulo Gomes",
-    "A25214": "Renato Zanin",
-    "A21652": "Rodrigo Teísta",
-    "A93282": "Samuel Monteiro",
-    "A72213": "Thiago Cordeiro",
-    "A26914": "Victor Garrido",
-}
-NOME_TO_COD = {v.upper(): k for k, v in ASSESSORES_MAP.items()}
-
-
 def obter_nome_assessor(codigo: str) -> str:
     if not codigo:
         return "-"
@@ -1324,6 +1500,8 @@ def _mes_pt(m: int) -> str:
     return meses[m-1] if 1 <= int(m) <= 12 else "-"
 
 
+@depende_de("nps")
+@cache_rastreado(cache=cache_por_versao)
 def filtrar_nps_a_partir_de_junho(df_nps: pd.DataFrame) -> tuple:
     """
     Mantém somente respostas cuja data_resposta esteja no ciclo:
@@ -1387,26 +1565,6 @@ def ultima_data(
     return s.max()
 
 
-def extract_assessor_code(x: Any) -> Optional[str]:
-    s = str(x or "").strip()
-    if not s:
-        return None
-    up = re.sub(r"\s+", " ", s).upper()
-
-    m = re.search(r"A\s*?(\d{5})", up)
-    if m:
-        return f"A{m.group(1)}"
-
-    m2 = re.search(r"(^|\D)(\d{5})(\D|$)", up)
-    if m2:
-        return f"A{m2.group(2)}"
-
-    if up in NOME_TO_COD:
-        return NOME_TO_COD[up]
-
-    return None
-
-
 def _primeiro_nome_sobrenome(nome_completo: str) -> str:
     if not nome_completo:
         return "-"
@@ -1429,119 +1587,15 @@ def _primeiro_nome_sobrenome(nome_completo: str) -> str:
     return f"{nome} {sobrenome}"
 
 
-def _strip_accents(txt: str) -> str:
-    if txt is None:
-        return ""
-    return "".join(
-        ch for ch in unicodedata.normalize("NFKD", str(txt)) if not unicodedata.combining(ch)
-    )
-
-
-def _norm_upper_noaccents_series(s: pd.Series) -> pd.Series:
-    return s.astype(str).map(_strip_accents).str.upper().str.strip().fillna("")
-
-
 # =====================================================
 # Transferências
 # =====================================================
 def _find_transfer_db_path() -> Optional[Path]:
-    base_dir = Path(__file__).parent.parent
-    candidates = [
-        base_dir / "DBV Capital_Transferências.db",
-        base_dir / "DBV Capital_Transferencias.db",
-        Path("DBV Capital_Transferências.db"),
-        Path("DBV Capital_Transferencias.db"),
-    ]
-    for p in candidates:
-        if p.exists():
-            return p
-    return None
-
-
-def _norm_colname(c: str) -> str:
-    s = _strip_accents(str(c)).lower().strip()
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    return re.sub(r"\s+", " ", s).strip()
-
-
-def _pick_transfers_table(conn: sqlite3.Connection) -> Optional[str]:
-    try:
-        tabs = pd.read_sql_query(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';",
-            conn,
-        )["name"].tolist()
-        if not tabs:
-            return None
-
-        preferred = {"transferencias", "transferências", "transferencia", "transferência"}
-        for t in tabs:
-            if _norm_colname(t) in preferred:
-                return t
-
-        best_t, best_score = None, -1
-        for t in tabs:
-            try:
-                cols = pd.read_sql_query(f'PRAGMA table_info("{t}");', conn)["name"].tolist()
-            except Exception:
-                continue
-            ncols = {_norm_colname(c) for c in cols}
-            score = 0
-            score += int("pl" in ncols)
-            score += int("data solicitacao" in ncols)
-            score += int("data transferencia" in ncols)
-            score += int("codigo assessor destino" in ncols or "cod assessor destino" in ncols)
-            if score > best_score:
-                best_score = score
-                best_t = t
-
-        return best_t or tabs[0]
-    except Exception:
-        return None
-
-
-def _parse_money_like_series(s: pd.Series) -> pd.Series:
-    s = s.astype(str).str.strip()
-    s = s.str.replace("R$", "", regex=False).str.replace(" ", "", regex=False)
-
-    def conv(x: str):
-        if x in ("", "nan", "NaN", "None", "NULL", "Não encontrado", "N/A"):
-            return np.nan
-        try:
-            # Tenta converter padrões numéricos comuns
-            if re.match(r"^\d{1,3}(\.\d{3})+(,\d+)?$", x):
-                return float(x.replace(".", "").replace(",", "."))
-            if re.match(r"^\d{1,3}(,\d{3})+(\.\d+)?$", x):
-                return float(x.replace(",", ""))
-            if "," in x and "." not in x:
-                return float(x.replace(",", "."))
-            return float(x)
-        except ValueError:
-            # Se não conseguir converter (ex: "Não encontrado"), retorna NaN
-            return np.nan
-
-    out = s.map(lambda v: conv(v) if v is not None else np.nan)
-    return pd.to_numeric(out, errors="coerce").fillna(0.0)
-    return pd.to_numeric(out, errors="coerce").fillna(0.0)
-
-
-@st.cache_data(show_spinner=False)
-def _carregar_dados_transferencias_cached(db_path_str: str, mtime: float) -> pd.DataFrame:
-    try:
-        with sqlite3.connect(db_path_str) as conn:
-            table = _pick_transfers_table(conn)
-            if not table:
-                return pd.DataFrame()
-            df = pd.read_sql_query(f'SELECT * FROM "{table}";', conn)
-        return df
-    except Exception:
-        return pd.DataFrame()
+    return localizar_banco("transferencias")
 
 
 def carregar_dados_transferencias() -> pd.DataFrame:
-    dbp = _find_transfer_db_path()
-    if dbp is None:
-        return pd.DataFrame()
-    return _carregar_dados_transferencias_cached(str(dbp), dbp.stat().st_mtime)
+    return carregar_transferencias()
 
 
 def tratar_dados_transferencias(df: pd.DataFrame) -> pd.DataFrame:
@@ -1570,8 +1624,8 @@ def tratar_dados_transferencias(df: pd.DataFrame) -> pd.DataFrame:
     s_solic = out[c_solic] if c_solic in out.columns else pd.Series([pd.NA] * len(out))
     s_trans = out[c_transf] if c_transf in out.columns else pd.Series([pd.NA] * len(out))
 
-    d1 = pd.to_datetime(s_solic, errors="coerce", dayfirst=True, infer_datetime_format=True)
-    d2 = pd.to_datetime(s_trans, errors="coerce", dayfirst=True, infer_datetime_format=True)
+    d1 = pd.to_datetime(s_solic, errors="coerce", dayfirst=True)
+    d2 = pd.to_datetime(s_trans, errors="coerce", dayfirst=True)
 
     out["data_efetiva"] = d1
     out.loc[out["data_efetiva"].isna(), "data_efetiva"] = d2[out["data_efetiva"].isna()]
@@ -1582,7 +1636,7 @@ def tratar_dados_transferencias(df: pd.DataFrame) -> pd.DataFrame:
         out["pl_num"] = 0.0
 
     if c_ass in out.columns:
-        out["assessor_code"] = out[c_ass].map(extract_assessor_code)
+        out["assessor_code"] = extract_assessor_codes(out[c_ass])
     else:
         out["assessor_code"] = pd.NA
 
@@ -1644,11 +1698,6 @@ def obter_periodos_referencia_por_ano(df_positivador_in: pd.DataFrame, ano_alvo:
     }
 
 
-def _qident(name: str) -> str:
-    """Quote seguro para identificadores SQLite (colunas/tabelas)."""
-    return f'"{str(name).replace(chr(34), chr(34)*2)}"'
-
-
 def _sql_date_conv_expr(col_sql: str) -> str:
     """
     Converte 'DD/MM/YYYY ...' -> 'YYYY-MM-DD' ou mantém ISO 'YYYY-MM-DD ...'
@@ -1667,165 +1716,282 @@ def _sql_date_conv_expr(col_sql: str) -> str:
     """.strip()
 
 
-def _pick_transfer_cols(df_cols: List[str]) -> Dict[str, Optional[str]]:
+_CHAVES_CUBO_TRANSF = [
+    "data_efetiva",
+    "data_liquida",
+    "externo",
+    "tipo_norm",
+    "codigo_assessor_origem",
+    "codigo_assessor_destino",
+]
+
+
+@depende_de("transferencias")
+@cache_rastreado()
+def _carregar_cubo_transferencias_cached(db_path_str: str, mtime: float) -> Dict[str, Any]:
     """
-    Mapeia nomes prováveis das colunas do seu DB de Transferências para um padrão.
+    Uma única varredura da tabela de transferências por versão do banco.
+
+    Lê as linhas válidas (pl preenchido e status 'Concluído', quando existir)
+    e agrega em um cubo pequeno por (dia, cliente externo, tipo, assessor de
+    origem/destino), com as somas de PL usadas pelos cards:
+    - pl_real: SUM(CAST(pl AS REAL)) (transferências líquidas mês/ano)
+    - pl_num / pl_num_pos: PL pelo parser monetário (todas / só positivas),
+      usados nas visões por intervalo (NET e Top 3)
+
+    Duas datas são mantidas porque as visões usam prioridades ligeiramente
+    diferentes no banco não tipado:
+    - data_efetiva: DATE(COALESCE(solicitação, transferência))
+    - data_liquida: COALESCE(DATE(solicitação), DATE(transferência))
+
+    Retorna {"cubo", "ok_intervalo", "ok_liquidas"}; todo mês/ano/assessor é
+    fatiado do cubo sem voltar ao SQLite.
     """
-    cols_norm = {_norm_colname(c): c for c in df_cols}
+    vazio = {"cubo": pd.DataFrame(), "ok_intervalo": False, "ok_liquidas": False}
+    dbp = Path(db_path_str)
+    if not dbp.exists():
+        return vazio
 
-    def get(*keys: str) -> Optional[str]:
-        for k in keys:
-            if k in cols_norm:
-                return cols_norm[k]
-        return None
+    try:
+        esquema = resolver_esquema(db_path_str, mtime, "transferencias")
+        table = esquema["tabela"]
+        if not table:
+            return vazio
 
-    return {
-        "cliente": get("cliente"),
-        "pl": get("pl"),
-        "data_solic": get("data solicitacao", "data solicit", "data solicitacao transferencia"),
-        "data_transf": get("data transferencia", "data transf"),
-        "tipo": get("tipo"),
-        "status": get("status"),
-        "cod_origem": get("codigo assessor origem", "cod assessor origem", "assessor origem"),
-        "nome_origem": get("nome assessor origem", "assessor origem nome", "nome origem"),
-        "cod_destino": get("codigo assessor destino", "cod assessor destino", "assessor destino"),
-        "nome_destino": get("nome assessor destino", "assessor destino nome", "nome destino"),
-    }
+        mp = esquema["mapa"]
+        c_cliente = mp["cliente"]
+        c_pl = mp["pl"]
+        c_solic = mp["data_solic"]
+        c_transf = mp["data_transf"]
+        c_status = mp["status"]
+        c_tipo = mp["tipo"]
+        if not c_pl:
+            return vazio
 
+        # Requisitos de cada visão (mesmos das consultas por intervalo / mês-ano)
+        ok_intervalo = bool(c_cliente and (c_solic or c_transf))
+        ok_liquidas = bool(c_tipo and c_status)
 
-@st.cache_data(show_spinner=False)
-def _carregar_transferencias_intervalo_sql_cached(
-    db_path_str: str,
-    mtime: float,
-    data_ini_iso: str,
-    data_fim_iso: str,
+        def col_or_null(c: Optional[str]) -> str:
+            return _qident(c) if c else "NULL"
+
+        c_pl_sql = _qident(c_pl)
+        c_solic_sql = col_or_null(c_solic)
+        c_transf_sql = col_or_null(c_transf)
+
+        # Banco tipado pelo ETL já guarda datas ISO: dispensa a conversão no SQL
+        if esquema["tipado"]:
+            data_efetiva = f"DATE(COALESCE({c_solic_sql}, {c_transf_sql}))"
+        else:
+            solic_conv = _sql_date_conv_expr(c_solic_sql) if c_solic else "NULL"
+            transf_conv = _sql_date_conv_expr(c_transf_sql) if c_transf else "NULL"
+            data_efetiva = f"DATE(COALESCE({solic_conv}, {transf_conv}))"
+
+        if esquema["tipado"] and c_solic and c_transf:
+            # Mesma expressão do índice idx_transferencias_status_data (etl_ingestao.py)
+            data_liquida = data_efetiva
+        else:
+            partes = [f"DATE({_sql_date_conv_expr(_qident(c))})" for c in (c_solic, c_transf) if c]
+            data_liquida = f"COALESCE({', '.join(partes)})" if partes else "NULL"
+
+        # aceita "Concluído" e "Concluido" (com/sem acento), em qualquer caixa
+        status_where = ""
+        if c_status:
+            status_where = f"AND LOWER(TRIM(CAST({_qident(c_status)} AS TEXT))) IN ('concluido', 'concluído')"
+
+        externo = f"LOWER(TRIM(CAST({_qident(c_cliente)} AS TEXT))) = 'externo'" if c_cliente else "0"
+        tipo_norm = f"LOWER(TRIM(CAST({_qident(c_tipo)} AS TEXT)))" if c_tipo else "NULL"
+
+        query = f"""
+        SELECT
+            {data_efetiva} AS data_efetiva,
+            {data_liquida} AS data_liquida,
+            CASE WHEN {externo} THEN 1 ELSE 0 END AS externo,
+            {tipo_norm} AS tipo_norm,
+            {col_or_null(mp["cod_origem"])} AS codigo_assessor_origem,
+            {col_or_null(mp["cod_destino"])} AS codigo_assessor_destino,
+            {c_pl_sql} AS pl,
+            CAST({c_pl_sql} AS REAL) AS pl_real
+        FROM {_qident(table)}
+        WHERE {c_pl_sql} IS NOT NULL
+          AND TRIM(CAST({c_pl_sql} AS TEXT)) != ''
+          AND TRIM(CAST({c_pl_sql} AS TEXT)) != '0'
+          {status_where}
+        """
+        with sqlite3.connect(str(dbp)) as conn:
+            linhas = pd.read_sql_query(query, conn)
+    except Exception:
+        return vazio
+
+    if linhas.empty:
+        return {"cubo": pd.DataFrame(columns=_CHAVES_CUBO_TRANSF), "ok_intervalo": ok_intervalo, "ok_liquidas": ok_liquidas}
+
+    linhas["pl_num"] = _parse_money_like_series(linhas["pl"])
+    linhas["pl_num_pos"] = linhas["pl_num"].where(linhas["pl_num"] > 0, 0.0)
+
+    cubo = (
+        linhas.groupby(_CHAVES_CUBO_TRANSF, dropna=False, sort=False, observed=True)[["pl_real", "pl_num", "pl_num_pos"]]
+        .sum(min_count=1)
+        .reset_index()
+    )
+    return {"cubo": cubo, "ok_intervalo": ok_intervalo, "ok_liquidas": ok_liquidas}
+
+
+def _obter_cubo_transferencias() -> Dict[str, Any]:
+    dbp = _find_transfer_db_path()
+    if dbp is None:
+        return {"cubo": pd.DataFrame(), "ok_intervalo": False, "ok_liquidas": False}
+    return _carregar_cubo_transferencias_cached(str(dbp), mtime_vigente(dbp))
+
+
+def _codigo_preenchido(s: pd.Series) -> pd.Series:
+    """Equivalente a `s IS NOT NULL AND TRIM(CAST(s AS TEXT)) != ''` do SQLite."""
+    return s.notna() & s.astype(str).str.strip(" ").ne("")
+
+
+def _fatia_intervalo_transferencias(
+    data_ini: Optional[datetime] = None,
+    data_fim: Optional[datetime] = None,
+    dados: Optional[Dict[str, Any]] = None,
 ) -> pd.DataFrame:
     """
-    Carrega transferências já filtradas no SQLite:
-    - cliente = 'Externo' (case-insensitive)
-    - status = 'Concluído' (quando existir coluna)
-    - pl válido
-    - data efetiva = COALESCE(data_solicitacao_conv, data_transferencia_conv) entre data_ini e data_fim
-      (MESMA prioridade do Dash Captação)
+    Fatia do cubo equivalente à antiga consulta por intervalo:
+    cliente 'Externo', data efetiva entre data_ini e data_fim (inclusive) e
+    ao menos um código de assessor (origem ou destino) preenchido.
+    Sem limites, devolve todas as datas.
     """
-    dbp = Path(db_path_str)
-    if not dbp.exists():
+    if dados is None:
+        dados = _obter_cubo_transferencias()
+    cubo = dados["cubo"]
+    if not dados["ok_intervalo"] or cubo.empty:
         return pd.DataFrame()
 
-    try:
-        with sqlite3.connect(str(dbp)) as conn:
-            table = _pick_transfers_table(conn)
-            if not table:
-                return pd.DataFrame()
+    datas = cubo["data_efetiva"]
+    m = (
+        cubo["externo"].eq(1)
+        & datas.notna()
+        & (
+            _codigo_preenchido(cubo["codigo_assessor_origem"])
+            | _codigo_preenchido(cubo["codigo_assessor_destino"])
+        )
+    )
+    if data_ini is not None:
+        m &= datas >= pd.Timestamp(data_ini).strftime("%Y-%m-%d")
+    if data_fim is not None:
+        m &= datas <= pd.Timestamp(data_fim).strftime("%Y-%m-%d")
+    return cubo.loc[m]
+
+
+def _sinalizar_transferencias_net(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    PL com sinal por linha do cubo: +PL quando o destino é DBV, -PL quando a
+    origem é DBV (as duas coisas se anulam). Remove linhas com resultado 0.
+    assessor_code: o assessor DBV envolvido (destino na entrada, origem na saída).
+    """
+    out = df_raw.copy()
+    out["data_efetiva"] = pd.to_datetime(out.get("data_efetiva"), errors="coerce")
 
-            cols = pd.read_sql_query(f"PRAGMA table_info({_qident(table)});", conn)["name"].tolist()
-            mp = _pick_transfer_cols(cols)
+    # extrai códigos
+    out["cod_origem"] = extract_assessor_codes(out.get("codigo_assessor_origem", pd.Series([pd.NA] * len(out), index=out.index)))
+    out["cod_destino"] = extract_assessor_codes(out.get("codigo_assessor_destino", pd.Series([pd.NA] * len(out), index=out.index)))
 
-            c_cliente = mp["cliente"]
-            c_pl = mp["pl"]
-            c_solic = mp["data_solic"]
-            c_transf = mp["data_transf"]
-            c_status = mp["status"]  # <- agora vamos usar
+    # define se é DBV (pelo seu mapa)
+    dbv_codes = set(ASSESSORES_MAP.keys())
 
-            # sem essas, não dá pra aplicar corretamente
-            if not c_cliente or not c_pl or (not c_solic and not c_transf):
-                return pd.DataFrame()
+    is_in = out["cod_destino"].isin(dbv_codes)
+    is_out = out["cod_origem"].isin(dbv_codes)
 
-            # opcionais
-            c_tipo = mp["tipo"]
-            c_cod_o = mp["cod_origem"]
-            c_nome_o = mp["nome_origem"]
-            c_cod_d = mp["cod_destino"]
-            c_nome_d = mp["nome_destino"]
+    # sinal: entrada +, saída -
+    out["pl_num_signed"] = 0.0
+    out.loc[is_in, "pl_num_signed"] = out.loc[is_in, "pl_num"]
+    out.loc[is_out, "pl_num_signed"] = out.loc[is_out, "pl_num_signed"] - out.loc[is_out, "pl_num"]
+    out["assessor_code"] = out["cod_destino"].where(is_in, out["cod_origem"])
 
-            t = _qident(table)
+    out = out.dropna(subset=["data_efetiva"])
+    out = out[out["pl_num_signed"] != 0]
 
-            def col_or_null(c: Optional[str], alias: str) -> str:
-                return f"{_qident(c)} AS {alias}" if c else f"NULL AS {alias}"
+    return out[["data_efetiva", "pl_num_signed", "assessor_code"]]
 
-            c_cliente_sql = _qident(c_cliente)
-            c_pl_sql = _qident(c_pl)
-            c_solic_sql = _qident(c_solic) if c_solic else "NULL"
-            c_transf_sql = _qident(c_transf) if c_transf else "NULL"
 
-            solic_conv = _sql_date_conv_expr(c_solic_sql) if c_solic else "NULL"
-            transf_conv = _sql_date_conv_expr(c_transf_sql) if c_transf else "NULL"
+@depende_de("transferencias")
+@cache_rastreado()
+def _carregar_indices_transferencias_cached(db_path_str: str, mtime: float) -> Dict[str, Any]:
+    """
+    Índices de somas prefixadas (indice_datas) sobre o cubo, um por visão:
+    - "liquidas": Entradas - Saídas por data_liquida, chave = código do assessor
+    - "net": PL com sinal (DBV) por data_efetiva, chave = assessor DBV
+    Qualquer intervalo sai de duas buscas binárias; o cache guarda uma
+    estrutura por versão do banco, e não um resultado por intervalo.
+    """
+    dados = _carregar_cubo_transferencias_cached(db_path_str, mtime)
+    cubo = dados["cubo"]
+    indices: Dict[str, Any] = {"liquidas": None, "net": None}
+    if cubo.empty:
+        return indices
+
+    if dados["ok_liquidas"]:
+        entrada = cubo["tipo_norm"].eq("entrada")
+        saida = cubo["tipo_norm"].eq("saída")
+        codigo = cubo["codigo_assessor_origem"].where(entrada, cubo["codigo_assessor_destino"])
+        m = (entrada | saida) & cubo["data_liquida"].notna() & codigo.notna()
+        valores = cubo["pl_real"].where(entrada, -cubo["pl_real"])
+        indices["liquidas"] = construir_indice(
+            pd.to_datetime(cubo.loc[m, "data_liquida"], errors="coerce"),
+            valores[m],
+            codigo[m],
+        )
 
-            # ---- filtro de status (igual ao Captação)
-            # aceita "Concluído" e "Concluido" (com/sem acento), em qualquer caixa
-            status_where = ""
-            if c_status:
-                status_sql = f"LOWER(TRIM(CAST({_qident(c_status)} AS TEXT)))"
-                status_where = f"AND {status_sql} IN ('concluido', 'concluído')"
-
-            # ---- prioridade de data (igual ao Captação): solicitacao > transferencia
-            data_coalesce = "COALESCE(data_solicitacao_conv, data_transferencia_conv)"
-
-            query = f"""
-            WITH t AS (
-                SELECT
-                    {col_or_null(c_cod_o, "codigo_assessor_origem")},
-                    {col_or_null(c_nome_o, "nome_assessor_origem")},
-                    {col_or_null(c_cod_d, "codigo_assessor_destino")},
-                    {col_or_null(c_nome_d, "nome_assessor_destino")},
-                    {col_or_null(c_solic, "data_solicitacao")},
-                    {col_or_null(c_transf, "data_transferencia")},
-                    {col_or_null(c_tipo, "tipo")},
-                    {col_or_null(c_status, "status")},
-                    {c_pl_sql} AS pl,
-                    LOWER(TRIM(CAST({c_cliente_sql} AS TEXT))) AS cliente_norm,
-                    {solic_conv} AS data_solicitacao_conv,
-                    {transf_conv} AS data_transferencia_conv
-                FROM {t}
-                WHERE {c_pl_sql} IS NOT NULL
-                  AND TRIM(CAST({c_pl_sql} AS TEXT)) != ''
-                  AND TRIM(CAST({c_pl_sql} AS TEXT)) != '0'
-                  {status_where}
-            )
-            SELECT
-                codigo_assessor_origem,
-                nome_assessor_origem,
-                codigo_assessor_destino,
-                nome_assessor_destino,
-                data_solicitacao,
-                data_transferencia,
-                tipo,
-                status,
-                pl,
-                DATE({data_coalesce}) AS data_efetiva
-            FROM t
-            WHERE cliente_norm = 'externo'
-              AND {data_coalesce} IS NOT NULL
-              AND DATE({data_coalesce}) BETWEEN '{data_ini_iso}' AND '{data_fim_iso}'
-              AND (
-                    (codigo_assessor_origem IS NOT NULL AND TRIM(CAST(codigo_assessor_origem AS TEXT)) != '')
-                 OR (codigo_assessor_destino IS NOT NULL AND TRIM(CAST(codigo_assessor_destino AS TEXT)) != '')
-              )
-            ;
-            """
+    net = _fatia_intervalo_transferencias(dados=dados)
+    if not net.empty:
+        net = _sinalizar_transferencias_net(net)
+        indices["net"] = construir_indice(net["data_efetiva"], net["pl_num_signed"], net["assessor_code"])
 
-            df = pd.read_sql_query(query, conn)
+    return indices
 
-        return df if df is not None else pd.DataFrame()
-    except Exception:
-        return pd.DataFrame()
+
+def _obter_indices_transferencias() -> Dict[str, Any]:
+    dbp = _find_transfer_db_path()
+    if dbp is None:
+        return {"liquidas": None, "net": None}
+    return _carregar_indices_transferencias_cached(str(dbp), mtime_vigente(dbp))
+
+
+def _transferencias_liquidas_periodo(primeiro_dia: datetime, ultimo_dia: datetime) -> Tuple[float, Dict[str, float]]:
+    """
+    Entradas - Saídas no período, no total e por assessor.
+    Assessor: código de origem nas entradas e de destino nas saídas.
+    """
+    indice = _obter_indices_transferencias()["liquidas"]
+    if indice is None:
+        return 0.0, {}
+
+    ini = pd.Timestamp(primeiro_dia).normalize()
+    fim = pd.Timestamp(ultimo_dia).normalize()
+
+    transferencias_por_assessor = {}
+    for cod, valor in somas_por_chave(indice, ini, fim).items():
+        # mesmo critério do TRIM(CAST(codigo AS TEXT)) != '' do SQLite
+        if str(cod).strip(" ") == "":
+            continue
+        cod_assessor = str(cod).strip()
+        if cod_assessor:
+            transferencias_por_assessor[cod_assessor] = valor
+
+    if not transferencias_por_assessor:
+        return 0.0, {}
+
+    return soma_intervalo(indice, ini, fim), transferencias_por_assessor
 
 
 def carregar_transferencias_intervalo_sql(data_ini: datetime, data_fim: datetime) -> pd.DataFrame:
     """
     Wrapper: retorna DataFrame tratado (data_efetiva, pl_num, assessor_code)
-    usando a lógica SQL (CTE) acima.
+    a partir do cubo de transferências (uma linha por dia/assessor).
     """
-    dbp = _find_transfer_db_path()
-    if dbp is None:
+    if _find_transfer_db_path() is None:
         return pd.DataFrame()
 
-    data_ini_iso = pd.Timestamp(data_ini).strftime("%Y-%m-%d")
-    data_fim_iso = pd.Timestamp(data_fim).strftime("%Y-%m-%d")
-
-    df_raw = _carregar_transferencias_intervalo_sql_cached(
-        str(dbp), dbp.stat().st_mtime, data_ini_iso, data_fim_iso
-    )
+    df_raw = _fatia_intervalo_transferencias(data_ini, data_fim)
     if df_raw is None or df_raw.empty:
         return pd.DataFrame(columns=["data_efetiva", "pl_num", "assessor_code"])
 
@@ -1834,12 +2000,12 @@ def carregar_transferencias_intervalo_sql(data_ini: datetime, data_fim: datetime
     # data efetiva já vem como YYYY-MM-DD, mas garante datetime
     out["data_efetiva"] = pd.to_datetime(out.get("data_efetiva"), errors="coerce")
 
-    # pl_num
-    out["pl_num"] = _parse_money_like_series(out.get("pl", pd.Series([0] * len(out))))
+    # pl_num: soma (por célula do cubo) apenas das transferências com PL positivo
+    out["pl_num"] = out["pl_num_pos"]
 
     # assessor_code: mantém a mesma regra do seu pipeline (destino)
     if "codigo_assessor_destino" in out.columns:
-        out["assessor_code"] = out["codigo_assessor_destino"].map(extract_assessor_code)
+        out["assessor_code"] = extract_assessor_codes(out["codigo_assessor_destino"])
     else:
         out["assessor_code"] = pd.NA
 
@@ -1857,41 +2023,14 @@ def carregar_transferencias_intervalo_net(data_ini: datetime, data_fim: datetime
     -PL quando origem é DBV
     (usa Data Transferência como prioridade via SQL já corrigido)
     """
-    dbp = _find_transfer_db_path()
-    if dbp is None:
+    if _find_transfer_db_path() is None:
         return pd.DataFrame(columns=["data_efetiva", "pl_num_signed"])
 
-    data_ini_iso = pd.Timestamp(data_ini).strftime("%Y-%m-%d")
-    data_fim_iso = pd.Timestamp(data_fim).strftime("%Y-%m-%d")
-
-    df_raw = _carregar_transferencias_intervalo_sql_cached(
-        str(dbp), dbp.stat().st_mtime, data_ini_iso, data_fim_iso
-    )
+    df_raw = _fatia_intervalo_transferencias(data_ini, data_fim)
     if df_raw is None or df_raw.empty:
         return pd.DataFrame(columns=["data_efetiva", "pl_num_signed"])
 
-    out = df_raw.copy()
-    out["data_efetiva"] = pd.to_datetime(out.get("data_efetiva"), errors="coerce")
-    out["pl_num"] = _parse_money_like_series(out.get("pl", pd.Series([0] * len(out))))
-
-    # extrai códigos
-    out["cod_origem"] = out.get("codigo_assessor_origem", pd.Series([pd.NA] * len(out))).map(extract_assessor_code)
-    out["cod_destino"] = out.get("codigo_assessor_destino", pd.Series([pd.NA] * len(out))).map(extract_assessor_code)
-
-    # define se é DBV (pelo seu mapa)
-    dbv_codes = set(ASSESSORES_MAP.keys())
-
-    is_in = out["cod_destino"].isin(dbv_codes)
-    is_out = out["cod_origem"].isin(dbv_codes)
-
-    # sinal: entrada +, saída -
-    out["pl_num_signed"] = 0.0
-    out.loc[is_in, "pl_num_signed"] = out.loc[is_in, "pl_num"]
-    out.loc[is_out, "pl_num_signed"] = out.loc[is_out, "pl_num_signed"] - out.loc[is_out, "pl_num"]
-
-    out = out.dropna(subset=["data_efetiva"])
-    out = out[out["pl_num_signed"] != 0]
-
+    out = _sinalizar_transferencias_net(df_raw)
     return out[["data_efetiva", "pl_num_signed"]].copy()
 
 
@@ -2010,8 +2149,8 @@ def _pace_mes_dias_uteis(data_ref_local: pd.Timestamp) -> float:
     primeiro = pd.Timestamp(data_ref_local.year, data_ref_local.month, 1)
     ultimo = primeiro + pd.offsets.MonthEnd(1)
 
-    dias_uteis_mes = len(pd.bdate_range(start=primeiro, end=ultimo))
-    dias_uteis_corridos = len(pd.bdate_range(start=primeiro, end=data_ref_local))
+    dias_uteis_mes = dias_uteis_entre(primeiro, ultimo)
+    dias_uteis_corridos = dias_uteis_entre(primeiro, data_ref_local)
 
     if dias_uteis_mes <= 0:
         return 0.0
@@ -2032,101 +2171,10 @@ def calcular_transferencias_liquidas_mes(data_atualizacao: datetime) -> Tuple[fl
     primeiro_dia = data_atualizacao.replace(day=1)
     ultimo_dia = (primeiro_dia + pd.offsets.MonthEnd(0))
     
-    dbp = _find_transfer_db_path()
-    if dbp is None:
-        return 0.0, {}
-    
     try:
-        with sqlite3.connect(str(dbp)) as conn:
-            table = _pick_transfers_table(conn)
-            if not table:
-                return 0.0, {}
-            
-            cols = pd.read_sql_query(f"PRAGMA table_info({_qident(table)});", conn)["name"].tolist()
-            mp = _pick_transfer_cols(cols)
-            
-            # Verificar colunas essenciais
-            if not all([mp.get("pl"), mp.get("tipo"), mp.get("status")]):
-                return 0.0, {}
-            
-            c_pl = _qident(mp["pl"])
-            c_tipo = _qident(mp["tipo"])
-            c_status = _qident(mp["status"])
-            c_cod_o = _qident(mp["cod_origem"]) if mp["cod_origem"] else None
-            c_cod_d = _qident(mp["cod_destino"]) if mp["cod_destino"] else None
-            c_solic = _qident(mp["data_solic"]) if mp["data_solic"] else None
-            c_transf = _qident(mp["data_transf"]) if mp["data_transf"] else None
-            
-            # Data efetiva com prioridade: Data Solicitação > Data Transferência
-            data_coalesce = "COALESCE("
-            if c_solic:
-                data_coalesce += f"DATE({_sql_date_conv_expr(c_solic)})"
-            if c_transf:
-                data_coalesce += f", DATE({_sql_date_conv_expr(c_transf)})" if c_solic else f"DATE({_sql_date_conv_expr(c_transf)})"
-            data_coalesce += ")"
-            
-            # Query para calcular transferências líquidas por assessor
-            query = f"""
-            WITH transferencias_periodo AS (
-                SELECT 
-                    {c_pl} AS pl,
-                    LOWER(TRIM(CAST({c_tipo} AS TEXT))) AS tipo_norm,
-                    CASE 
-                        WHEN LOWER(TRIM(CAST({c_tipo} AS TEXT))) = 'entrada' THEN {c_cod_o}
-                        WHEN LOWER(TRIM(CAST({c_tipo} AS TEXT))) = 'saída' THEN {c_cod_d}
-                        ELSE NULL
-                    END AS codigo_assessor
-                FROM {_qident(table)}
-                WHERE LOWER(TRIM(CAST({c_status} AS TEXT))) IN ('concluido', 'concluído')
-                  AND {c_pl} IS NOT NULL 
-                  AND TRIM(CAST({c_pl} AS TEXT)) != ''
-                  AND TRIM(CAST({c_pl} AS TEXT)) != '0'
-                  AND {data_coalesce} BETWEEN DATE('{primeiro_dia.strftime('%Y-%m-%d')}') 
-                                         AND DATE('{ultimo_dia.strftime('%Y-%m-%d')}')
-            ),
-            totais_gerais AS (
-                SELECT 
-                    SUM(CASE WHEN tipo_norm = 'entrada' THEN CAST(pl AS REAL) ELSE 0 END) AS total_entradas,
-                    SUM(CASE WHEN tipo_norm = 'saída' THEN CAST(pl AS REAL) ELSE 0 END) AS total_saidas
-                FROM transferencias_periodo
-                WHERE codigo_assessor IS NOT NULL
-            ),
-            totais_assessor AS (
-                SELECT 
-                    codigo_assessor,
-                    SUM(CASE WHEN tipo_norm = 'entrada' THEN CAST(pl AS REAL) ELSE -CAST(pl AS REAL) END) AS transferencia_liquida
-                FROM transferencias_periodo
-                WHERE codigo_assessor IS NOT NULL
-                  AND TRIM(CAST(codigo_assessor AS TEXT)) != ''
-                GROUP BY codigo_assessor
-            )
-            SELECT 
-                (SELECT total_entradas FROM totais_gerais) - (SELECT total_saidas FROM totais_gerais) AS total_liquido,
-                codigo_assessor,
-                transferencia_liquida
-            FROM totais_assessor
-            """
-            
-            df_result = pd.read_sql_query(query, conn)
-            
-            if df_result.empty:
-                return 0.0, {}
-            
-            # Extrair total líquido
-            total_liquido = float(df_result['total_liquido'].iloc[0] or 0.0)
-            
-            # Extrair transferências por assessor
-            transferencias_por_assessor = {}
-            if 'codigo_assessor' in df_result.columns and 'transferencia_liquida' in df_result.columns:
-                for _, row in df_result[['codigo_assessor', 'transferencia_liquida']].dropna().iterrows():
-                    cod_assessor = str(row['codigo_assessor']).strip()
-                    if cod_assessor:
-                        transferencias_por_assessor[cod_assessor] = float(row['transferencia_liquida'])
-            
-            return total_liquido, transferencias_por_assessor
-            
+        return _transferencias_liquidas_periodo(primeiro_dia, ultimo_dia)
     except Exception as e:
-        st.sidebar.error(f"Erro ao calcular transferências mês: {str(e)}")
+        avisar_carga(f"Erro ao calcular transferências mês: {str(e)}", st.sidebar.error)
         return 0.0, {}
 
 
@@ -2144,101 +2192,10 @@ def calcular_transferencias_liquidas_ano(data_atualizacao: datetime) -> Tuple[fl
     primeiro_dia = data_atualizacao.replace(month=1, day=1)
     ultimo_dia = data_atualizacao.replace(month=12, day=31)
     
-    dbp = _find_transfer_db_path()
-    if dbp is None:
-        return 0.0, {}
-    
     try:
-        with sqlite3.connect(str(dbp)) as conn:
-            table = _pick_transfers_table(conn)
-            if not table:
-                return 0.0, {}
-            
-            cols = pd.read_sql_query(f"PRAGMA table_info({_qident(table)});", conn)["name"].tolist()
-            mp = _pick_transfer_cols(cols)
-            
-            # Verificar colunas essenciais
-            if not all([mp.get("pl"), mp.get("tipo"), mp.get("status")]):
-                return 0.0, {}
-            
-            c_pl = _qident(mp["pl"])
-            c_tipo = _qident(mp["tipo"])
-            c_status = _qident(mp["status"])
-            c_cod_o = _qident(mp["cod_origem"]) if mp["cod_origem"] else None
-            c_cod_d = _qident(mp["cod_destino"]) if mp["cod_destino"] else None
-            c_solic = _qident(mp["data_solic"]) if mp["data_solic"] else None
-            c_transf = _qident(mp["data_transf"]) if mp["data_transf"] else None
-            
-            # Data efetiva com prioridade: Data Solicitação > Data Transferência
-            data_coalesce = "COALESCE("
-            if c_solic:
-                data_coalesce += f"DATE({_sql_date_conv_expr(c_solic)})"
-            if c_transf:
-                data_coalesce += f", DATE({_sql_date_conv_expr(c_transf)})" if c_solic else f"DATE({_sql_date_conv_expr(c_transf)})"
-            data_coalesce += ")"
-            
-            # Query para calcular transferências líquidas por assessor
-            query = f"""
-            WITH transferencias_periodo AS (
-                SELECT 
-                    {c_pl} AS pl,
-                    LOWER(TRIM(CAST({c_tipo} AS TEXT))) AS tipo_norm,
-                    CASE 
-                        WHEN LOWER(TRIM(CAST({c_tipo} AS TEXT))) = 'entrada' THEN {c_cod_o}
-                        WHEN LOWER(TRIM(CAST({c_tipo} AS TEXT))) = 'saída' THEN {c_cod_d}
-                        ELSE NULL
-                    END AS codigo_assessor
-                FROM {_qident(table)}
-                WHERE LOWER(TRIM(CAST({c_status} AS TEXT))) IN ('concluido', 'concluído')
-                  AND {c_pl} IS NOT NULL 
-                  AND TRIM(CAST({c_pl} AS TEXT)) != ''
-                  AND TRIM(CAST({c_pl} AS TEXT)) != '0'
-                  AND {data_coalesce} BETWEEN DATE('{primeiro_dia.strftime('%Y-%m-%d')}') 
-                                         AND DATE('{ultimo_dia.strftime('%Y-%m-%d')}')
-            ),
-            totais_gerais AS (
-                SELECT 
-                    SUM(CASE WHEN tipo_norm = 'entrada' THEN CAST(pl AS REAL) ELSE 0 END) AS total_entradas,
-                    SUM(CASE WHEN tipo_norm = 'saída' THEN CAST(pl AS REAL) ELSE 0 END) AS total_saidas
-                FROM transferencias_periodo
-                WHERE codigo_assessor IS NOT NULL
-            ),
-            totais_assessor AS (
-                SELECT 
-                    codigo_assessor,
-                    SUM(CASE WHEN tipo_norm = 'entrada' THEN CAST(pl AS REAL) ELSE -CAST(pl AS REAL) END) AS transferencia_liquida
-                FROM transferencias_periodo
-                WHERE codigo_assessor IS NOT NULL
-                  AND TRIM(CAST(codigo_assessor AS TEXT)) != ''
-                GROUP BY codigo_assessor
-            )
-            SELECT 
-                (SELECT total_entradas FROM totais_gerais) - (SELECT total_saidas FROM totais_gerais) AS total_liquido,
-                codigo_assessor,
-                transferencia_liquida
-            FROM totais_assessor
-            """
-            
-            df_result = pd.read_sql_query(query, conn)
-            
-            if df_result.empty:
-                return 0.0, {}
-            
-            # Extrair total líquido
-            total_liquido = float(df_result['total_liquido'].iloc[0] or 0.0)
-            
-            # Extrair transferências por assessor
-            transferencias_por_assessor = {}
-            if 'codigo_assessor' in df_result.columns and 'transferencia_liquida' in df_result.columns:
-                for _, row in df_result[['codigo_assessor', 'transferencia_liquida']].dropna().iterrows():
-                    cod_assessor = str(row['codigo_assessor']).strip()
-                    if cod_assessor:
-                        transferencias_por_assessor[cod_assessor] = float(row['transferencia_liquida'])
-            
-            return total_liquido, transferencias_por_assessor
-            
+        return _transferencias_liquidas_periodo(primeiro_dia, ultimo_dia)
     except Exception as e:
-        st.sidebar.error(f"Erro ao calcular transferências ano: {str(e)}")
+        avisar_carga(f"Erro ao calcular transferências ano: {str(e)}", st.sidebar.error)
         return 0.0, {}
 
 
@@ -2254,8 +2211,7 @@ def calcular_captacao_total_liquida(df_pos: pd.DataFrame, data_ini: datetime, da
         m = (aux["Data_Posicao"] >= pd.Timestamp(data_ini)) & (aux["Data_Posicao"] <= pd.Timestamp(data_fim))
         total_pos = float(aux.loc[m, "Captacao_Liquida_em_M"].sum() or 0.0)
 
-    df_trans_net = carregar_transferencias_intervalo_net(data_ini, data_fim)
-    total_trans = float(df_trans_net["pl_num_signed"].sum() or 0.0) if not df_trans_net.empty else 0.0
+    total_trans = _sum_transferencias(data_ini, data_fim)
 
     return total_pos + total_trans
 
@@ -2273,7 +2229,7 @@ def obter_meta_objetivo(ano_meta: int, coluna: str, fallback: float = 0.0) -> fl
     Busca um valor de objetivo na tabela Objetivos_PJ1 filtrando por ano e coluna.
     """
     try:
-        objetivos_df = carregar_dados_objetivos_pj1()
+        objetivos_df = obter(execucao, "objetivos_pj1")
         if objetivos_df.empty:
             return float(fallback)
 
@@ -2286,13 +2242,8 @@ def obter_meta_objetivo(ano_meta: int, coluna: str, fallback: float = 0.0) -> fl
         }
         coluna_real = col_mapping.get(coluna, coluna)
 
-        # Filtrar pelo ano (usando a coluna Data)
+        # Filtrar pelo ano (Data já vem em datetime do loader)
         if "Data" in objetivos_df.columns:
-            # Converter para datetime se não for
-            if not pd.api.types.is_datetime64_any_dtype(objetivos_df["Data"]):
-                objetivos_df["Data"] = pd.to_datetime(objetivos_df["Data"], errors="coerce")
-            
-            # Filtrar registros do ano especificado
             df_ano = objetivos_df[objetivos_df["Data"].dt.year == ano_meta]
             
             if not df_ano.empty and coluna_real in df_ano.columns:
@@ -2314,17 +2265,12 @@ def obter_auc_initial(ano: int) -> float:
     Para AUC Initial, usamos o valor acumulado do primeiro dia do ano.
     """
     try:
-        objetivos_df = carregar_dados_objetivos_pj1()
+        objetivos_df = obter(execucao, "objetivos_pj1")
         if objetivos_df.empty:
             return 0.0
 
-        # Filtrar pelo ano (usando a coluna Data)
+        # Filtrar pelo ano (Data já vem em datetime do loader)
         if "Data" in objetivos_df.columns:
-            # Converter para datetime se não for
-            if not pd.api.types.is_datetime64_any_dtype(objetivos_df["Data"]):
-                objetivos_df["Data"] = pd.to_datetime(objetivos_df["Data"], errors="coerce")
-            
-            # Filtrar registros do ano especificado
             df_ano = objetivos_df[objetivos_df["Data"].dt.year == ano]
             
             if not df_ano.empty and "AUC Acumulado" in df_ano.columns:
@@ -2341,54 +2287,10 @@ def obter_auc_initial(ano: int) -> float:
 def calcular_dias_uteis(ano: int) -> int:
     """
     Calcula o número de dias úteis em um ano, excluindo fins de semana.
-    Considera feriados brasileiros principais.
+    Considera o calendário de feriados nacionais ANBIMA (inclui Carnaval,
+    Sexta-feira Santa e Corpus Christi).
     """
-    try:
-        from pandas.tseries.holiday import AbstractHolidayCalendar, Holiday
-        from pandas.tseries.offsets import CustomBusinessDay
-        
-        # Feriados brasileiros principais
-        class BrazilHolidayCalendar(AbstractHolidayCalendar):
-            rules = [
-                Holiday('New Year', month=1, day=1),
-                Holiday('Tiradentes', month=4, day=21),
-                Holiday('Labor Day', month=5, day=1),
-                Holiday('Independence Day', month=9, day=7),
-                Holiday('Our Lady of Aparecida', month=10, day=12),
-                Holiday('All Souls Day', month=11, day=2),
-                Holiday('Republic Day', month=11, day=15),
-                Holiday('Christmas', month=12, day=25),
-            ]
-        
-        # Criar range de datas para o ano
-        start_date = pd.Timestamp(ano, 1, 1)
-        end_date = pd.Timestamp(ano, 12, 31)
-        date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-        
-        # Criar calendário de dias úteis
-        bday = CustomBusinessDay(calendar=BrazilHolidayCalendar())
-        
-        # Contar dias úteis
-        dias_uteis = 0
-        current_date = start_date
-        while current_date <= end_date:
-            if current_date.weekday() < 5:  # Segunda a Sexta
-                # Verificar se não é feriado
-                try:
-                    # Tentar verificar se é feriado usando o calendário
-                    if current_date not in pd.to_datetime(pd.date_range(start=current_date, periods=1, freq=bday)):
-                        pass  # É feriado
-                    else:
-                        dias_uteis += 1
-                except:
-                    # Se falhar, considera apenas fins de semana
-                    dias_uteis += 1
-            current_date += pd.Timedelta(days=1)
-        
-        return dias_uteis
-    except Exception:
-        # Fallback: estimativa aproximada (52 semanas * 5 dias úteis - feriados)
-        return 252
+    return dias_uteis_ano(ano)
 
 
 def calcular_valor_projetado_auc_2026(auc_initial: float, meta_2026: float, data_ref: pd.Timestamp) -> float:
@@ -2404,9 +2306,7 @@ def calcular_valor_projetado_auc_2026(auc_initial: float, meta_2026: float, data
         dias_uteis_2027 = calcular_dias_uteis(2027)
         dias_uteis_total_mes = dias_uteis_2026 + dias_uteis_2027
         
-        # Calcular crescimento diário necessário (mesma lógica do Rumo a 1bi)
         OBJETIVO_FINAL_RUMO = 1_000_000_000.0
-        crescimento_diario = (OBJETIVO_FINAL_RUMO - auc_initial) / dias_uteis_total_mes if dias_uteis_total_mes > 0 else 0
         
         # Calcular dias decorridos desde início do mês de referência até a data de referência
         inicio_mes = pd.Timestamp(data_ref.year, data_ref.month, 1)
@@ -2415,17 +2315,13 @@ def calcular_valor_projetado_auc_2026(auc_initial: float, meta_2026: float, data
             return 0.0
         
         # Contar TODOS os dias do mês (não apenas úteis)
-        dias_decorridos_mes = 0
-        current_date = inicio_mes
-        while current_date <= data_ref:
-            # Contar todos os dias (incluindo fins de semana)
-            dias_decorridos_mes += 1
-            current_date += pd.Timedelta(days=1)
+        dias_decorridos_mes = periodos_decorridos(inicio_mes, data_ref)
         
         # Calcular valor projetado (mesma lógica do Rumo a 1bi)
-        valor_projetado = auc_initial + (crescimento_diario * dias_decorridos_mes)
-        
-        return max(0.0, min(valor_projetado, OBJETIVO_FINAL_RUMO))
+        return valor_projetado(
+            auc_initial, OBJETIVO_FINAL_RUMO, dias_uteis_total_mes, dias_decorridos_mes,
+            piso=0.0, teto=OBJETIVO_FINAL_RUMO,
+        )
     except Exception:
         return 0.0
 
@@ -2438,23 +2334,16 @@ def calcular_valor_projetado_rumo_1bi(auc_initial: float, data_ref: pd.Timestamp
     """
     try:
         # Usar EXATAMENTE a mesma lógica do AUC-2026
-        # Calcular TODOS os dias do ano (365 dias), não apenas dias úteis
-        dias_uteis_2026 = calcular_dias_uteis(2026)
-        dias_uteis_2027 = calcular_dias_uteis(2027)
-        dias_total_ano = dias_uteis_2026 + dias_uteis_2027
-        
-        # Calcular crescimento diário necessário (mesma lógica do AUC-2026)
+        dias_total_ano = calcular_dias_uteis(2026) + calcular_dias_uteis(2027)
         OBJETIVO_FINAL_RUMO = 1_000_000_000.0
-        crescimento_diario = (OBJETIVO_FINAL_RUMO - auc_initial) / dias_total_ano if dias_total_ano > 0 else 0
         
-        # Calcular dias decorridos desde início de 2026 até a data de referência
-        inicio_2026 = pd.Timestamp(2026, 1, 1)
-        dias_decorridos = (data_ref - inicio_2026).days + 1
-        
-        # Calcular valor projetado (EXATAMENTE a mesma lógica do AUC-2026)
-        valor_projetado = auc_initial + (crescimento_diario * dias_decorridos)
+        # Dias corridos desde o início de 2026 até a data de referência
+        dias_decorridos = periodos_decorridos(pd.Timestamp(2026, 1, 1), data_ref, BASE_CORRIDOS)
         
-        return max(0.0, min(valor_projetado, OBJETIVO_FINAL_RUMO))
+        return valor_projetado(
+            auc_initial, OBJETIVO_FINAL_RUMO, dias_total_ano, dias_decorridos,
+            piso=0.0, teto=OBJETIVO_FINAL_RUMO,
+        )
     except Exception:
         return 0.0
 
@@ -2477,12 +2366,6 @@ def calcular_valor_projetado_feebased(data_ref: pd.Timestamp) -> float:
         # Calcular TODOS os dias do ano (365 dias), não apenas dias úteis
         dias_uteis_2026 = calcular_dias_uteis(2026)
         
-        # Calcular gap
-        gap = OBJETIVO_FINAL - VALOR_INICIAL
-        
-        # Calcular crescimento diário necessário
-        crescimento_diario = gap / dias_uteis_2026 if dias_uteis_2026 > 0 else 0
-        
         # Calcular dias decorridos desde início de 2026 até a data de referência
         inicio_2026 = pd.Timestamp(2026, 1, 1)
         
@@ -2490,22 +2373,19 @@ def calcular_valor_projetado_feebased(data_ref: pd.Timestamp) -> float:
             return VALOR_INICIAL
         
         # Contar TODOS os dias do ano (365 dias), não apenas úteis
-        dias_decorridos = 0
-        current_date = inicio_2026
-        while current_date <= data_ref:
-            # Contar todos os dias (incluindo fins de semana)
-            dias_decorridos += 1
-            current_date += pd.Timedelta(days=1)
+        dias_decorridos = periodos_decorridos(inicio_2026, data_ref)
         
-        # Calcular valor projetado
-        valor_projetado = VALOR_INICIAL + (crescimento_diario * dias_decorridos)
-        
-        return max(VALOR_INICIAL, min(valor_projetado, OBJETIVO_FINAL))
+        # Calcular valor projetado (gap / dias úteis por dia decorrido)
+        return valor_projetado(
+            VALOR_INICIAL, OBJETIVO_FINAL, dias_uteis_2026, dias_decorridos,
+            piso=VALOR_INICIAL, teto=OBJETIVO_FINAL,
+        )
     except Exception:
         return 119_800_000.0
 
 
-@st.cache_data(show_spinner=False)
+@depende_de("objetivos_pj1", versionado=False)
+@cache_rastreado()
 def carregar_dados_objetivos() -> pd.DataFrame:
     """
     Carrega os dados de objetivos do banco de dados.
@@ -2514,8 +2394,9 @@ def carregar_dados_objetivos() -> pd.DataFrame:
     # Primeiro tenta carregar da tabela PJ1
     df = carregar_dados_objetivos_pj1()
     
-    # Se encontrou dados na PJ1, formata e retorna
+    # Se encontrou dados na PJ1, formata (numa cópia do DataFrame marcado pelo loader) e retorna
     if not df.empty:
+        df = df.copy()
         # Garante que as colunas necessárias existam
         if "Objetivo" not in df.columns:
             df["Objetivo"] = 2026  # Ano fixo conforme solicitado
@@ -2541,7 +2422,7 @@ def carregar_dados_objetivos() -> pd.DataFrame:
             caminho_db = Path("DBV Capital_Objetivos.db")
             
         if not caminho_db.exists():
-            st.sidebar.error("❌ Arquivo de banco de dados de objetivos não encontrado")
+            avisar_carga("❌ Arquivo de banco de dados de objetivos não encontrado", st.sidebar.error)
             return pd.DataFrame()
             
         conn = sqlite3.connect(str(caminho_db))
@@ -2552,7 +2433,7 @@ def carregar_dados_objetivos() -> pd.DataFrame:
         tabs = [row[0] for row in cursor.fetchall()]
         
         if not tabs:
-            st.sidebar.error("❌ Nenhuma tabela encontrada no banco de Objetivos")
+            avisar_carga("❌ Nenhuma tabela encontrada no banco de Objetivos", st.sidebar.error)
             conn.close()
             return pd.DataFrame()
             
@@ -2564,7 +2445,7 @@ def carregar_dados_objetivos() -> pd.DataFrame:
                 break
                 
         if not table_name:
-            st.sidebar.error("❌ Nenhuma tabela de objetivos encontrada")
+            avisar_carga("❌ Nenhuma tabela de objetivos encontrada", st.sidebar.error)
             conn.close()
             return pd.DataFrame()
             
@@ -2573,7 +2454,7 @@ def carregar_dados_objetivos() -> pd.DataFrame:
         conn.close()
         
         if df.empty:
-            st.sidebar.warning("⚠️ A tabela de objetivos está vazia")
+            avisar_carga("⚠️ A tabela de objetivos está vazia", st.sidebar.warning)
             return df
             
         # Normalização de datas e tipos
@@ -2610,7 +2491,7 @@ def carregar_dados_objetivos() -> pd.DataFrame:
         return df
         
     except Exception as e:
-        st.sidebar.error(f"❌ Erro ao carregar dados de objetivos: {str(e)}")
+        avisar_carga(f"❌ Erro ao carregar dados de objetivos: {str(e)}", st.sidebar.error)
         return pd.DataFrame()
 
     return df
@@ -2619,124 +2500,16 @@ def carregar_dados_objetivos() -> pd.DataFrame:
 # =====================================================
 # POSITIVADOR MTD (loader) + NORMALIZAÇÃO
 # =====================================================
-@st.cache_data(show_spinner=False)
-def carregar_dados_positivador_mtd() -> pd.DataFrame:
-    base_dir = Path(__file__).parent.parent
-    candidate_paths = [
-        base_dir / "DBV Capital_Positivador (MTD).db",
-        Path("DBV Capital_Positivador (MTD).db"),
-        base_dir / "DBV Capital_Positivador_MTD.db",
-        Path("DBV Capital_Positivador_MTD.db"),
-        base_dir / "DBV Capital_Positivador.db",
-        Path("DBV Capital_Positivador.db"),
-    ]
-
-    # Encontra o primeiro banco de dados que existe
-    db_path = None
-    for p in candidate_paths:
-        if p.exists():
-            db_path = p
-            break
-    else:
-        return pd.DataFrame()
-    
-    try:
-        conn = sqlite3.connect(str(db_path))
-        
-        # Obtém a lista de tabelas
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
-        tabelas = [t[0] for t in cursor.fetchall()]
-        cursor.close()
-        
-        if not tabelas:
-            return pd.DataFrame()
-        
-        # Tenta encontrar a tabela correta
-        tabela_selecionada = None
-        for tabela in ["positivador_mtd", "positivador", "Relatório_Positivador"]:
-            if tabela in tabelas:
-                tabela_selecionada = tabela
-                break
-        
-        # Se não encontrar nenhuma das tabelas esperadas, usa a primeira disponível
-        if tabela_selecionada is None and tabelas:
-            tabela_selecionada = tabelas[0]
-        
-        # Primeiro, obtém os nomes das colunas
-        cursor = conn.cursor()
-        cursor.execute(f'SELECT * FROM "{tabela_selecionada}" LIMIT 1;')
-        colunas = [desc[0] for desc in cursor.description]
-        cursor.close()
-        
-        # Log para debug
-        print(f"Colunas encontradas na tabela {tabela_selecionada}: {colunas}")
-        
-        # Verifica se as colunas necessárias existem
-        colunas_necessarias = ['Data_Posicao', 'Net_Em_M', 'Captacao_Liquida_em_M', 'Assessor', 'Cliente']
-        colunas_faltando = [col for col in colunas_necessarias if col not in colunas]
-        
-        if colunas_faltando:
-            print(f"Aviso: Colunas faltando na tabela {tabela_selecionada}: {colunas_faltando}")
-            
-            # Tenta encontrar colunas com nomes alternativos
-            mapeamento_colunas = {}
-            
-            # Mapeamento específico para as colunas do Positivador MTD
-            mapeamento_especifico = {
-                'Data_Posicao': 'Data Posição',
-                'Net_Em_M': 'Net Em M', 
-                'Captacao_Liquida_em_M': 'Captação Líquida em M',
-                'Assessor': 'Assessor',
-                'Cliente': 'Cliente'
-            }
-            
-            for col in colunas_necessarias:
-                # Primeiro tenta o mapeamento específico
-                if col in mapeamento_especifico and mapeamento_especifico[col] in colunas:
-                    mapeamento_colunas[col] = mapeamento_especifico[col]
-                else:
-                    # Depois tenta encontrar por similaridade
-                    for coluna_tabela in colunas:
-                        if col.lower().replace('_', '') in coluna_tabela.lower().replace(' ', '').replace('_', ''):
-                            mapeamento_colunas[col] = coluna_tabela
-                            break
-            
-            # Se encontrou mapeamentos alternativos, renomeia as colunas na consulta
-            if mapeamento_colunas:
-                print(f"Mapeamento de colunas alternativas: {mapeamento_colunas}")
-                colunas_select = []
-                for col in colunas_necessarias:
-                    if col in mapeamento_colunas:
-                        colunas_select.append(f'"{mapeamento_colunas[col]}" as "{col}"')
-                    else:
-                        colunas_select.append(f'NULL as "{col}"')
-                
-                query = f'SELECT {", ".join(colunas_select)} FROM "{tabela_selecionada}"'
-                df = pd.read_sql_query(query, conn)
-            else:
-                # Se não encontrou nenhuma coluna, retorna todas
-                df = pd.read_sql_query(f'SELECT * FROM "{tabela_selecionada}"', conn)
-        else:
-            # Para outras tabelas, retorna todas as colunas
-            df = pd.read_sql_query(f'SELECT * FROM "{tabela_selecionada}"', conn)
-            
-        return df
-        
-    except Exception as e:
-        return pd.DataFrame()
-        
-    finally:
-        try:
-            conn.close()
-        except:
-            pass
+def carregar_dados_positivador_mtd() -> pd.DataFrame:
+    """Positivador MTD já tipado e com colunas canônicas (ver acesso_dados)."""
+    return carregar_positivador_mtd()
 
 
-def obter_ultima_data_posicao() -> datetime:
+def obter_ultima_data_posicao(df: Optional[pd.DataFrame] = None) -> datetime:
     try:
-        # Carrega os dados do Positivador MTD
-        df = carregar_dados_positivador_mtd()
+        # Positivador MTD da execução (ou o DataFrame informado)
+        if df is None:
+            df = obter(execucao, "positivador_mtd")
         
         if df is None or df.empty:
             return datetime.today()
@@ -2776,7 +2549,7 @@ def obter_ultima_data_posicao() -> datetime:
                     temp = pd.to_datetime(df[col], errors='coerce', dayfirst=True)
                     if temp.notna().any():
                         col_data = col
-                        df[col] = temp
+                        df = df.assign(**{col: temp})
                         break
                 except:
                     continue
@@ -2784,7 +2557,7 @@ def obter_ultima_data_posicao() -> datetime:
         if col_data is not None:
             # Converte para datetime se necessário
             if not pd.api.types.is_datetime64_any_dtype(df[col_data]):
-                df[col_data] = pd.to_datetime(df[col_data], errors='coerce', dayfirst=True)
+                df = df.assign(**{col_data: pd.to_datetime(df[col_data], errors='coerce', dayfirst=True)})
 
             # Remove linhas com datas inválidas e pega a data mais recente
             df = df.dropna(subset=[col_data])
@@ -2807,11 +2580,12 @@ def obter_data_atualizacao_positivador() -> datetime:
     """
     try:
         # Chama a função principal para obter a data
-        return obter_ultima_data_posicao()
+        return obter(execucao, "ultima_data_posicao")
     except Exception:
         return datetime.today()
 
 
+@rastrear()
 def tratar_dados_positivador_mtd(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normaliza as colunas do Positivador, aceitando nomes antigos e novos,
@@ -2869,160 +2643,33 @@ def tratar_dados_positivador_mtd(df: pd.DataFrame) -> pd.DataFrame:
     has_assessor_code = "assessor_code" in out.columns
     valid_codes = 0
     if has_assessor_code:
-        out["assessor_code"] = out["assessor_code"].astype(str).str.strip()
+        out["assessor_code"] = aplicar_texto(
+            out["assessor_code"], lambda codes: codes.where(codes.isna(), codes.astype(str).str.strip())
+        )
         valid_codes = int(out["assessor_code"].str.match(r"^A\d{5}$", na=False).sum())
 
     if (not has_assessor_code) or (valid_codes == 0):
         if "assessor" in out.columns:
-            out["assessor"] = out["assessor"].astype(str)
-            out["assessor_code"] = out["assessor"].map(extract_assessor_code)
+            out["assessor"] = aplicar_texto(out["assessor"], lambda s: s.astype(str))
+            out["assessor_code"] = extract_assessor_codes(out["assessor"])
             out["assessor_code"] = out["assessor_code"].where(
                 out["assessor_code"].notna() & (out["assessor_code"] != ""), pd.NA
             )
         else:
             out["assessor_code"] = pd.NA
-    else:
-        out["assessor_code"] = out["assessor_code"].astype(str).str.strip()
 
     if "Cliente" in out.columns:
-        out["Cliente"] = out["Cliente"].astype(str)
+        # ID inteiro quando todos os códigos são numéricos (ver tipos_compactos)
+        out["Cliente"] = converter(out["Cliente"], "id")
 
     return out
 
 
-# =====================================================
-# NPS / RV - Column mapping
-# =====================================================
-_EXPECTED_KEYS = {
-    "survey_id": {"survey id"},
-    "user_id": {"id do usuario", "id usuario", "usuario id"},
-    "customer_id": {"costumer id", "customer id", "cliente id"},
-    "data_resposta": {"data de resposta", "data resposta", "data"},
-    "pesquisa_relacionamento": {"pesquisa relacionamento"},
-    "nps_assessor": {"xp relacionamento aniversario nps assessor", "nps assessor"},
-    "status": {"status"},
-    "codigo_assessor": {"codigo assessor", "cod assessor", "codigo do assessor"},
-    "notificacao": {"notificacao", "notificacao ?"},
-}
-_POSSIBLE_NOTA_KEYS = {
-    "nota",
-    "nota nps",
-    "score",
-    "pontuacao",
-    "resposta nota",
-    "nps",
-    "xp relacionamento aniversario nps assessor",
-}
-
-
-def _rename_columns_to_canonical(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
-
-    def _norm_key(txt: str) -> str:
-        s = _strip_accents(str(txt)).lower()
-        s = re.sub(r"[^a-z0-9]+", " ", s).strip()
-        return re.sub(r"\s+", " ", s)
-
-    norm_map = {_norm_key(c): c for c in df.columns}
-    rename_dict: Dict[str, str] = {}
-    for canonical, variants in _EXPECTED_KEYS.items():
-        for v in variants:
-            if v in norm_map:
-                rename_dict[norm_map[v]] = canonical
-                break
-    df = df.rename(columns=rename_dict)
-
-    nota_col = None
-    for c in df.columns:
-        if _norm_key(c) in _POSSIBLE_NOTA_KEYS:
-            nota_col = c
-            break
-
-    if nota_col is None:
-        best_col, best_cnt = None, -1
-        for c in df.columns:
-            s = pd.to_numeric(df[c], errors="coerce")
-            if s.notna().any():
-                cnt = int(s.between(0, 10, inclusive="both").sum())
-                if cnt > best_cnt and cnt > 0:
-                    best_col, best_cnt = c, cnt
-        nota_col = best_col
-
-    if nota_col:
-        df = df.rename(columns={nota_col: "nota"})
-
-    if "data_resposta" in df.columns:
-        df["data_resposta"] = pd.to_datetime(
-            df["data_resposta"], errors="coerce", dayfirst=True, infer_datetime_format=True
-        )
-    if "codigo_assessor" in df.columns:
-        df["codigo_assessor"] = df["codigo_assessor"].astype(str).str.strip().str.upper()
-    if "pesquisa_relacionamento" in df.columns:
-        df["pesquisa_relacionamento_norm"] = _norm_upper_noaccents_series(
-            df["pesquisa_relacionamento"]
-        )
-    if "nota" in df.columns:
-        df["nota"] = pd.to_numeric(df["nota"], errors="coerce")
-    return df
-
-
-@st.cache_data(show_spinner=False)
 def carregar_dados_nps() -> pd.DataFrame:
-    try:
-        dbp = None
-        for p in [
-            Path(__file__).parent.parent / "DBV Capital_NPS.db",
-            Path("DBV Capital_NPS.db"),
-        ]:
-            if p.exists():
-                dbp = p
-                break
-
-        if dbp is None:
-            st.error("❌ Banco NPS não encontrado.")
-            return pd.DataFrame()
-
-        with sqlite3.connect(str(dbp)) as conn:
-            tabs = pd.read_sql_query(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';",
-                conn,
-            )["name"].tolist()
-            if not tabs:
-                st.error("❌ Nenhuma tabela encontrada no banco NPS.")
-                return pd.DataFrame()
-
-            candidate, best_score = None, -1
-            for t in tabs:
-                try:
-                    df_head = pd.read_sql_query(f'SELECT * FROM "{t}" LIMIT 200;', conn)
-                except Exception:
-                    continue
-
-                df_norm = _rename_columns_to_canonical(df_head.copy())
-                score = (
-                    int(
-                        "pesquisa_relacionamento" in df_norm.columns
-                        or "pesquisa_relacionamento_norm" in df_norm.columns
-                    )
-                    + int("codigo_assessor" in df_norm.columns)
-                    + int("data_resposta" in df_norm.columns)
-                    + int("nota" in df_norm.columns)
-                )
-                if score > best_score:
-                    best_score = score
-                    candidate = t
-
-            if not candidate:
-                candidate = tabs[0]
-            df_all = pd.read_sql_query(f'SELECT * FROM "{candidate}";', conn)
-
-        return _rename_columns_to_canonical(df_all)
-    except Exception as e:
-        st.error(f"Erro ao carregar NPS: {e}")
-        return pd.DataFrame()
+    return carregar_nps()
 
 
+@rastrear()
 def _calcular_metricas_nps(df_sub: pd.DataFrame) -> Dict[str, float]:
     total = int(df_sub.shape[0]) if not df_sub.empty else 0
     if total == 0:
@@ -3081,7 +2728,7 @@ def _top3_assessores_por_aderencia(df_sub: pd.DataFrame) -> pd.DataFrame:
 
     agg = (
         df[df["_valid"]]
-        .groupby(assessor_col)
+        .groupby(assessor_col, observed=True)
         .agg(total_respostas=(nota_col, "size"), respondidos=("_valid", "sum"))
         .reset_index()
     )
@@ -3095,169 +2742,25 @@ def _top3_assessores_por_aderencia(df_sub: pd.DataFrame) -> pd.DataFrame:
     return out[["ASSESSOR", "ADERENCIA", "RESPOSTAS"]]
 
 
-# =====================================================
-# FEEBASED (DBV Capital_FeeBased.db) — Loader + Helpers (CORRIGIDO)
-# =====================================================
-def _find_feebased_db_path() -> Optional[Path]:
-    """
-    Busca o banco de dados FeeBased.
-    Prioriza a pasta atual (onde está o script) e depois a pasta pai.
-    """
-    current_dir = Path(__file__).resolve().parent  # Pasta onde está o script
-    parent_dir = current_dir.parent                # Pasta acima
-    
-    candidates = [
-        current_dir / "DBV Capital_FeeBased.db",       # 1. Pasta atual (Nome exato)
-        Path("DBV Capital_FeeBased.db"),               # 2. Caminho relativo direto
-        parent_dir / "DBV Capital_FeeBased.db",        # 3. Pasta pai
-        current_dir / "DBV Capital_FeeBased (MTD).db", # 4. Variações...
-        parent_dir / "DBV Capital_FeeBased (MTD).db",
-    ]
-    
-    for p in candidates:
-        if p.exists():
-            return p
-    return None
-
-
-def _pick_feebased_table(conn: sqlite3.Connection) -> Optional[str]:
-    try:
-        tabs = pd.read_sql_query(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';",
-            conn,
-        )["name"].tolist()
-        
-        if not tabs:
-            return None
-
-        # Adicionado 'Sheet1' que é o nome comum em imports de Excel
-        preferred = {"feebased", "fee_based", "base_fee", "carteira_feebased", "sheet1", "planilha1"}
-        
-        for t in tabs:
-            # Normaliza o nome da tabela para comparação
-            t_norm = _norm_colname(t)
-            if t_norm in preferred:
-                return t
-
-        # Fallback: retorna a primeira tabela encontrada se não achar as preferidas
-        return tabs[0]
-    except Exception:
-        return None
-
-
-def _pick_feebased_cols(df_cols: List[str]) -> Dict[str, Optional[str]]:
-    cols_norm = {_norm_colname(c): c for c in df_cols}
-
-    def get(*keys: str) -> Optional[str]:
-        for k in keys:
-            if k in cols_norm:
-                return cols_norm[k]
-        return None
-
-    # Mapeamento de colunas
-    # Nota: 'p/l' normalizado vira 'p l'
-    c_pl = get("p l", "pl", "pnl", "p n l", "resultado", "lucro prejuizo", "lucro", "prejuizo", "valor")
-    c_status = get("status", "situacao", "situação")
-
-    # Opcionais
-    c_assessor = get("assessor", "assessor code", "codigo assessor", "cod assessor", "codigo do assessor")
-    c_cliente = get("cliente", "customer", "nome cliente")
-
-    # Datas: Adicionado 'data contratacao'
-    c_data = get(
-        "data", "data contratacao", "data de contratacao", "data contratação",
-        "data posicao", "data posição", "data_posicao", 
-        "data atualizacao", "data atualização"
-    )
-
+@rastrear()
+def construir_indicadores_nps() -> Dict[str, Any]:
+    """Métricas e Top 3 de aderência do NPS (período a partir de junho), para o snapshot do painel."""
+    df_nps, periodo_nps_label = filtrar_nps_a_partir_de_junho(carregar_dados_nps())
+    if df_nps.empty:
+        return {"vazio": True, "periodo": periodo_nps_label}
     return {
-        "pl": c_pl,
-        "status": c_status,
-        "assessor": c_assessor,
-        "cliente": c_cliente,
-        "data": c_data,
+        "vazio": False,
+        "periodo": periodo_nps_label,
+        "metricas": _calcular_metricas_nps(df_nps),
+        "top3": _top3_assessores_por_aderencia(df_nps),
     }
 
 
-@st.cache_data(show_spinner=False)
-def carregar_dados_feebased_cached(db_path_str: str, mtime: float) -> pd.DataFrame:
-    try:
-        dbp = Path(db_path_str)
-        if not dbp.exists():
-            return pd.DataFrame()
-
-        with sqlite3.connect(str(dbp)) as conn:
-            table = _pick_feebased_table(conn)
-            if not table:
-                return pd.DataFrame()
-
-            # Lê a tabela inteira
-            df = pd.read_sql_query(f'SELECT * FROM "{table}";', conn)
-
-        if df is None or df.empty:
-            return pd.DataFrame()
-
-        mp = _pick_feebased_cols(df.columns.tolist())
-        c_pl = mp["pl"]
-        c_status = mp["status"]
-
-        # Validação mínima
-        if not c_pl or not c_status:
-            # Se não achou as colunas essenciais, tenta retornar vazio mas não quebra
-            return pd.DataFrame()
-
-        out = pd.DataFrame()
-        
-        # Processa P/L com tratamento de erro para strings como "Não encontrado"
-        if c_pl in df.columns:
-            out["pl_value"] = _parse_money_like_series(df[c_pl])
-        else:
-            out["pl_value"] = 0.0
-
-        out["status_raw"] = df[c_status].astype(str) if c_status in df.columns else ""
-        out["status_norm"] = _norm_upper_noaccents_series(out["status_raw"])
-
-        # Data (Opcional)
-        c_data = mp["data"]
-        if c_data and c_data in df.columns:
-            out["data_ref"] = pd.to_datetime(df[c_data], errors="coerce", dayfirst=True)
-        else:
-            out["data_ref"] = pd.NaT
-
-        # Assessor (Opcional)
-        c_ass = mp["assessor"]
-        if c_ass and c_ass in df.columns:
-            out["assessor_raw"] = df[c_ass].astype(str).str.strip()
-            out["assessor_code"] = out["assessor_raw"].map(extract_assessor_code)
-            out["assessor_code"] = out["assessor_code"].where(
-                out["assessor_code"].notna() & (out["assessor_code"] != ""), 
-                out["assessor_raw"]
-            )
-        else:
-            out["assessor_raw"] = ""
-            out["assessor_code"] = ""
-
-        # Cliente (Opcional)
-        c_cli = mp["cliente"]
-        if c_cli and c_cli in df.columns:
-            out["cliente"] = df[c_cli].astype(str).str.strip()
-        else:
-            out["cliente"] = ""
-
-        # Garante numérico final
-        out["pl_value"] = pd.to_numeric(out["pl_value"], errors="coerce").fillna(0.0)
-
-        return out
-    except Exception as e:
-        # st.error(f"Erro debug FB: {e}") # Descomente para ver o erro na tela se necessário
-        return pd.DataFrame()
-
-
+# =====================================================
+# FEEBASED (DBV Capital_FeeBased.db) — Loader + Helpers (CORRIGIDO)
+# =====================================================
 def carregar_dados_feebased() -> pd.DataFrame:
-    dbp = _find_feebased_db_path()
-    if dbp is None:
-        return pd.DataFrame()
-    return carregar_dados_feebased_cached(str(dbp), dbp.stat().st_mtime)
+    return carregar_feebased()
 
 
 def _progress_bars_html(objetivo_hoje_val: float, realizado_val: float, max_val: float, min_val: float = 0.0) -> str:
@@ -3356,80 +2859,24 @@ def _render_top3_compacto_html(items: List[Tuple[str, float]], titulo: str, is_a
 # =====================================================
 # AUC mesa RV (mantido)
 # =====================================================
-def _parse_money_series_rv(s: pd.Series) -> pd.Series:
-    s = s.astype(str).str.strip()
-    s = s.str.replace("R$", "", regex=False).str.replace(" ", "", regex=False)
-
-    def conv(x: str) -> Any:
-        if x in ("", "nan", "NaN", "None"):
-            return np.nan
-        if re.match(r"^\d{1,3}(\.\d{3})+(,\d+)?$", x):
-            return float(x.replace(".", "").replace(",", "."))
-        if re.match(r"^\d{1,3}(,\d{3})+(\.\d+)?$", x):
-            return float(x.replace(",", ""))
-        if "," in x and "." not in x:
-            return float(x.replace(",", "."))
-        return float(x)
-
-    out = s.map(lambda v: conv(v) if v not in (None, "") else None)
-    return pd.to_numeric(out, errors="coerce").fillna(0.0)
-
-
-def _find_auc_db_path() -> Optional[Path]:
-    for p in [
-        Path(__file__).parent.parent / "DBV Capital_AUC Mesa RV.db",
-        Path("DBV Capital_AUC Mesa RV.db"),
-    ]:
-        if p.exists():
-            return p
-    return None
-
-
-@st.cache_data(show_spinner=False)
-def _load_auc_table(db_path: Path) -> pd.DataFrame:
-    if not db_path or not Path(db_path).exists():
-        return pd.DataFrame()
-    with sqlite3.connect(str(db_path)) as conn:
-        tabs = pd.read_sql_query(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';",
-            conn,
-        )["name"].tolist()
-        table = "auc_mesa_rv" if "auc_mesa_rv" in tabs else (tabs[0] if tabs else None)
-        if not table:
-            return pd.DataFrame()
-        df = pd.read_sql_query(f'SELECT * FROM "{table}";', conn)
-
-    cols = {c.lower(): c for c in df.columns}
-    c_data = cols.get("data")
-    c_cli = cols.get("cliente")
-    c_ass = cols.get("assessor")
-    c_tipo = cols.get("tipo")
-    c_auc = cols.get("auc")
-
-    out = pd.DataFrame()
-    out["data_parsed"] = pd.to_datetime(df[c_data], dayfirst=True, errors="coerce") if c_data else pd.NaT
-    out["cliente"] = df[c_cli].astype(str).str.strip() if c_cli else ""
-    out["assessor"] = df[c_ass].astype(str).str.strip() if c_ass else ""
-    out["tipo"] = df[c_tipo].astype(str).str.strip() if c_tipo else ""
-    out["auc_reais"] = _parse_money_series_rv(df[c_auc]) if c_auc else 0.0
-    out = out.dropna(subset=["data_parsed"])
-    return out
+def _load_auc_table() -> pd.DataFrame:
+    return carregar_auc_mesa_rv()
 
 
 # =====================================================
 # KPIs Objetivos (Captação / AUC)
 # =====================================================
+@rastrear()
 def calcular_indicadores_objetivos(
-    df_pos: pd.DataFrame, df_obj: pd.DataFrame, hoje: datetime, df_pos_ytd: Optional[pd.DataFrame] = None
+    df_pos: pd.DataFrame, df_obj: pd.DataFrame, hoje: datetime
 ) -> Dict[str, Dict[str, Any]]:
     """
     Calcula os indicadores de objetivos (metas) para o dashboard.
     
     Args:
         df_pos: DataFrame com os dados do Positivador
-        df_obj: DataFrame com os dados de objetivos
+        df_obj: DataFrame da Objetivos_PJ1 (item "objetivos_pj1", Data em datetime)
         hoje: Data de referência para os cálculos
-        df_pos_ytd: Dados do Positivador para o ano até a data (opcional)
         
     Returns:
         Dicionário com os indicadores calculados
@@ -3445,19 +2892,21 @@ def calcular_indicadores_objetivos(
         "auc": {"valor": 0.0, "max": 0.0, "pace_target": 0.0, "mesref": ""}
     }
     
-    # Debug: Mostra informações no sidebar
-    with st.sidebar.expander("🔍 Debug - Objetivos 2026", expanded=False):
-        st.write("### Configuração de Objetivos")
-        st.write(f"- Ano alvo: {ANO_OBJETIVO}")
-        st.write(f"- Data de referência: {hoje.strftime('%d/%m/%Y')}")
-        
-        if df_pos is not None and not df_pos.empty:
-            st.write("### Dados do Positivador")
-            st.write(f"- Período: {df_pos['Data_Posicao'].min().strftime('%d/%m/%Y')} a {df_pos['Data_Posicao'].max().strftime('%d/%m/%Y')}")
-            st.write(f"- Registros: {len(df_pos)}")
+    # Debug: informações para o sidebar (exibidas por mostrar_debug_indicadores)
+    debug_config = [
+        "### Configuração de Objetivos",
+        f"- Ano alvo: {ANO_OBJETIVO}",
+        f"- Data de referência: {hoje.strftime('%d/%m/%Y')}",
+    ]
+    if df_pos is not None and not df_pos.empty:
+        debug_config += [
+            "### Dados do Positivador",
+            f"- Período: {df_pos['Data_Posicao'].min().strftime('%d/%m/%Y')} a {df_pos['Data_Posicao'].max().strftime('%d/%m/%Y')}",
+            f"- Registros: {len(df_pos)}",
+        ]
     
-    # Carrega os dados de objetivos da tabela PJ1
-    df_objetivos = carregar_dados_objetivos_pj1()
+    # Dados de objetivos da tabela PJ1 (somente leitura: compartilhados na execução)
+    df_objetivos = df_obj if df_obj is not None else pd.DataFrame()
     
     # ==============================================================================
     # 1. DEFINIÇÃO DAS VARIÁVEIS DE TEMPO E METAS (Igual ao seu original)
@@ -3468,13 +2917,8 @@ def calcular_indicadores_objetivos(
     meta_captacao_mes = 0.0
     
     if not df_objetivos.empty:
-        # Filtra pelo ano 2026 (usando a coluna Data)
+        # Filtra pelo ano 2026 (Data já vem em datetime do loader)
         if "Data" in df_objetivos.columns:
-            # Converter para datetime se não for
-            if not pd.api.types.is_datetime64_any_dtype(df_objetivos["Data"]):
-                df_objetivos["Data"] = pd.to_datetime(df_objetivos["Data"], errors="coerce")
-            
-            # Filtrar registros do ano especificado
             df_2026 = df_objetivos[df_objetivos["Data"].dt.year == ANO_OBJETIVO].copy()
         else:
             df_2026 = pd.DataFrame()  # DataFrame vazio se não tiver coluna Data
@@ -3529,13 +2973,8 @@ def calcular_indicadores_objetivos(
     
     gap_mes = meta_captacao_mes - 0
     
-    # Calcular dias úteis do mês (função simplificada para meses)
-    total_dias_uteis_mes = 0
-    current_date = primeiro_dia_mes
-    while current_date <= ultimo_dia_mes:
-        if current_date.weekday() < 5:  # Segunda a Sexta
-            total_dias_uteis_mes += 1
-        current_date += pd.Timedelta(days=1)
+    # Calcular dias úteis do mês (calendário ANBIMA)
+    total_dias_uteis_mes = dias_uteis_entre(primeiro_dia_mes, ultimo_dia_mes)
     
     if total_dias_uteis_mes > 0:
         projetado_diario_mes = gap_mes / total_dias_uteis_mes
@@ -3588,23 +3027,35 @@ def calcular_indicadores_objetivos(
             resultado["capliq_mes"]["mesref"] = str(mes_ref)
             resultado["auc"]["mesref"] = str(mes_ref)
     
-    # Debug: Mostra os resultados no sidebar
-    with st.sidebar.expander("🔍 Debug - Resultados", expanded=False):
-        st.write("### Metas 2026")
-        st.write(f"- Captação Anual: R$ {meta_captacao_ano:,.2f} Mi")
-        st.write(f"- Captação Mensal (média): R$ {meta_captacao_mes:,.2f} Mi")
-        
-        st.write("### Valores Realizados")
-        st.write(f"- Captação Mês (sem transf): R$ {captacao_mes_sem_transf if 'captacao_mes_sem_transf' in locals() else 0:,.2f} Mi")
-        st.write(f"- Transferências Mês: R$ {transferencia_liquida_mes if 'transferencia_liquida_mes' in locals() else 0:,.2f} Mi")
-        st.write(f"- Captação Mês (com transf): R$ {resultado['capliq_mes']['valor']:,.2f} Mi")
-        st.write(f"- Captação YTD (sem transf): R$ {captacao_ano_sem_transf if 'captacao_ano_sem_transf' in locals() else 0:,.2f} Mi")
-        st.write(f"- Transferências Ano: R$ {transferencia_liquida_ano if 'transferencia_liquida_ano' in locals() else 0:,.2f} Mi")
-        st.write(f"- Captação YTD (com transf): R$ {resultado['capliq_ano']['valor']:,.2f} Mi")
-    
+    # Debug: resultados para o sidebar
+    debug_resultados = [
+        "### Metas 2026",
+        f"- Captação Anual: R$ {meta_captacao_ano:,.2f} Mi",
+        f"- Captação Mensal (média): R$ {meta_captacao_mes:,.2f} Mi",
+        "### Valores Realizados",
+        f"- Captação Mês (sem transf): R$ {captacao_mes_sem_transf if 'captacao_mes_sem_transf' in locals() else 0:,.2f} Mi",
+        f"- Transferências Mês: R$ {transferencia_liquida_mes if 'transferencia_liquida_mes' in locals() else 0:,.2f} Mi",
+        f"- Captação Mês (com transf): R$ {resultado['capliq_mes']['valor']:,.2f} Mi",
+        f"- Captação YTD (sem transf): R$ {captacao_ano_sem_transf if 'captacao_ano_sem_transf' in locals() else 0:,.2f} Mi",
+        f"- Transferências Ano: R$ {transferencia_liquida_ano if 'transferencia_liquida_ano' in locals() else 0:,.2f} Mi",
+        f"- Captação YTD (com transf): R$ {resultado['capliq_ano']['valor']:,.2f} Mi",
+    ]
+    resultado["debug"] = [
+        ("🔍 Debug - Objetivos 2026", debug_config),
+        ("🔍 Debug - Resultados", debug_resultados),
+    ]
+
     return resultado
 
 
+def mostrar_debug_indicadores(mets: Dict[str, Any]) -> None:
+    """Exibe no sidebar o debug guardado por calcular_indicadores_objetivos (vale para o snapshot compartilhado)."""
+    for titulo, linhas in mets.get("debug", []):
+        with st.sidebar.expander(titulo, expanded=False):
+            for linha in linhas:
+                st.write(linha)
+
+
 # =====================================================
 # Render Helpers (progress, top3, etc.) - mantidos
 # =====================================================
@@ -3624,30 +3075,14 @@ def projetado_acumulado_ano(base_inicio: float, meta_final: float, hoje: pd.Time
     ini = pd.Timestamp(ano, 1, 1)
     fim = pd.Timestamp(ano, 12, 31)
 
-    total_du = len(pd.bdate_range(ini, fim))
-    du_ate = len(pd.bdate_range(ini, hoje))
+    total_du = dias_uteis_entre(ini, fim)
+    du_ate = dias_uteis_entre(ini, hoje)
 
     frac = (du_ate / total_du) if total_du > 0 else 0.0
     return float(base_inicio + (meta_final - base_inicio) * frac)
 
 
-def obter_auc_inicial_ano(df: pd.DataFrame, ano: int) -> float:
-    if df is None or df.empty:
-        return 0.0
-    if "Data_Posicao" not in df.columns or "Net_Em_M" not in df.columns:
-        return 0.0
-
-    aux = df.copy()
-    aux["Data_Posicao"] = pd.to_datetime(aux["Data_Posicao"], errors="coerce")
-    aux = aux[aux["Data_Posicao"].dt.year == ano]
-    if aux.empty:
-        return 0.0
-
-    primeira_data = aux["Data_Posicao"].min()
-    return float(aux.loc[aux["Data_Posicao"] == primeira_data, "Net_Em_M"].sum() or 0.0)
-
-
-AUC_BASE_2025 = obter_auc_inicial_ano(df_positivador, 2025) if "df_positivador" in globals() else 0.0
+AUC_BASE_2025 = auc_inicial_ano(df_positivador_mensal, 2025)
 
 
 def render_custom_progress_bars(
@@ -3697,6 +3132,7 @@ def render_custom_progress_bars(
     st.markdown(dedent(html_bars), unsafe_allow_html=True)
 
 
+@rastrear()
 def top3_mes_cap(
     df: pd.DataFrame,
     date_col: str = "Data_Posicao",
@@ -3741,7 +3177,7 @@ def top3_mes_cap(
         return [], str(mesref)
 
     # Calcular captação por assessor no mês
-    serie = dmes.groupby(group_col)[value_col].sum()
+    serie = dmes.groupby(group_col, observed=True)[value_col].sum()
     
     # Integrar transferências por assessor se fornecidas
     if transferencias_por_assessor:
@@ -3760,6 +3196,7 @@ def top3_mes_cap(
     return list(serie.items())[:5], str(mesref)
 
 
+@rastrear()
 def top3_ano_cap(
     df: pd.DataFrame,
     date_col: str = "Data_Posicao",
@@ -3804,7 +3241,7 @@ def top3_ano_cap(
         return [], str(ano)
 
     # Calcular captação por assessor no ano
-    serie = dane.groupby(group_col)[value_col].sum()
+    serie = dane.groupby(group_col, observed=True)[value_col].sum()
     
     # Integrar transferências por assessor se fornecidas
     if transferencias_por_assessor:
@@ -3911,6 +3348,11 @@ def _render_top3_horizontal(items: List[Tuple[str, float]], header_text: str) ->
 # =====================================================
 # FUNÇÃO RUMO A 1BI (mantida; depende de df_pos_f/df_obj/data_ref)
 # =====================================================
+def indicadores_mtd() -> Dict[str, Dict[str, Any]]:
+    """Indicadores calculados com o MTD (card Rumo a 1bi), via snapshot compartilhado."""
+    return obter(execucao, "indicadores")
+
+
 def render_rumo_a_1bi(auc_base_inicial_2025: float = 0.0):
     """
     Renderiza o painel 'Rumo a 1BI' na coluna atual.
@@ -3920,7 +3362,7 @@ def render_rumo_a_1bi(auc_base_inicial_2025: float = 0.0):
     
     v_auc = 0.0
     try:
-        mets_local = calcular_indicadores_objetivos(df_pos_f, df_obj, hoje=data_ref)
+        mets_local = indicadores_mtd()
         if "auc" in mets_local and "valor" in mets_local["auc"]:
             v_auc = float(mets_local["auc"]["valor"] or 0.0)
     except Exception as e:
@@ -3928,7 +3370,7 @@ def render_rumo_a_1bi(auc_base_inicial_2025: float = 0.0):
         v_auc = 0.0
 
     # Carregar dados da Objetivos_PJ1
-    df_objetivos_pj1 = carregar_dados_objetivos_pj1()
+    df_objetivos_pj1 = obter(execucao, "objetivos_pj1")
     
     # NOVA LÓGICA: Usar dados da Objetivos_PJ1 apenas para o projetado
     if df_objetivos_pj1 is not None and not df_objetivos_pj1.empty:
@@ -4021,18 +3463,335 @@ def render_rumo_a_1bi(auc_base_inicial_2025: float = 0.0):
     st.markdown(cards_rumo_html, unsafe_allow_html=True)
 
     st.markdown("<div style='height: 12px;'></div>", unsafe_allow_html=True)
-    items_rumo_auc, _ = top3_mes_cap(df_pos_f, value_col="Net_Em_M")
+    items_rumo_auc, _ = obter(execucao, "top3_auc")
     _render_top3_horizontal(items_rumo_auc, header_text="Top 3 — AUC")
 
 
+# =====================================================
+# GRÁFICO: CRESCIMENTO AUC E CLIENTES ATIVOS
+# =====================================================
+def construir_grafico_crescimento_auc(df_mensal: pd.DataFrame, df_mtd_base: pd.DataFrame) -> go.Figure:
+    """
+    Figura do gráfico de crescimento (histórico mensal do Positivador + ponto
+    do MTD). Construída uma vez por versão dos dados e compartilhada entre
+    as sessões (painel_compartilhado); não deve ser alterada por quem a usa.
+    `df_mensal` é o agregado de historico_mensal.agregar_mensal.
+    """
+    # =========================
+    # LÓGICA ESTRUTURADA DE UNIFICAÇÃO DE DADOS
+    # =========================
+    
+    # 1. Histórico (DBV Capital_Positivador.db), já agregado por mês
+    if df_mensal is not None and not df_mensal.empty:
+        df_historico_mensal = df_mensal[["ano_mes", "Net_Em_M", "clientes_unicos", "data"]].sort_values("data")
+        
+        # Obter última data histórica
+        ultima_data_historica = df_historico_mensal["data"].max()
+    else:
+        df_historico_mensal = pd.DataFrame(columns=["ano_mes", "Net_Em_M", "clientes_unicos", "data"])
+        ultima_data_historica = pd.Timestamp.min
+    
+    # 2. Processar o Mês Atual (DBV Capital_Positivador (MTD).db)
+    mtd_path = Path(__file__).parent.parent / "DBV Capital_Positivador (MTD).db"
+    df_mtd_unificado = None
+    
+    if mtd_path.exists():
+        df_mtd = df_mtd_base.copy()
+        if not df_mtd.empty and "Net_Em_M" in df_mtd.columns:
+            # Converter Net_Em_M para numérico, tratando erros
+            df_mtd["Net_Em_M"] = pd.to_numeric(df_mtd["Net_Em_M"], errors="coerce")
+            df_mtd["Net_Em_M"] = df_mtd["Net_Em_M"].fillna(0)
+            
+            # Calcular soma total de net_em_m (AUC Atual)
+            auc_mtd = float(df_mtd["Net_Em_M"].sum())
+            
+            # Contar clientes únicos
+            clientes_mtd = len(df_mtd["Cliente"].unique()) if "Cliente" in df_mtd.columns else 0
+            
+            # Definir Data de Referência (data de atualização do arquivo MTD)
+            if "Data_Atualizacao" in df_mtd.columns:
+                data_ref_mtd = pd.to_datetime(df_mtd["Data_Atualizacao"], errors="coerce").max()
+                if pd.isna(data_ref_mtd):
+                    data_ref_mtd = pd.Timestamp.now()
+            else:
+                data_ref_mtd = pd.Timestamp.now()
+            
+            # Criar linha do MTD
+            df_mtd_unificado = pd.DataFrame([{
+                "ano_mes": data_ref_mtd.strftime("%Y-%m"),
+                "Net_Em_M": auc_mtd,
+                "clientes_unicos": clientes_mtd,
+                "data": data_ref_mtd
+            }])
+    
+    # 3. Regra de Unificação (O "Pulo do Gato")
+    df_final = df_historico_mensal.copy()
+    
+    if df_mtd_unificado is not None:
+        data_mtd = df_mtd_unificado["data"].iloc[0]
+        
+        # Verificar se data do MTD é posterior à última data histórica
+        if data_mtd > ultima_data_historica:
+            # Anexar linha do MTD ao final do DataFrame Histórico
+            df_final = pd.concat([df_final, df_mtd_unificado], ignore_index=True)
+            df_final = df_final.sort_values("data")
+    
+    # 4. Preparar dados para plotagem
+    df_growth_auc = df_final.copy()
+    df_growth_auc["clientes_positivo"] = df_growth_auc["clientes_unicos"]
+    
+    df_growth_auc = df_growth_auc.sort_values("data")
+
+    min_auc = float(df_growth_auc["Net_Em_M"].min() or 0.0)
+    max_auc = float(df_growth_auc["Net_Em_M"].max() or 0.0)
+    if max_auc <= min_auc:
+        max_auc = min_auc + 50_000_000
+
+    nice_min = math.floor(min_auc / 50_000_000.0) * 50_000_000.0
+    nice_max = math.ceil(max_auc / 50_000_000.0) * 50_000_000.0
+    nice_max = max(nice_max, max_auc * 1.05)
+
+    dtick_val = 50_000_000
+    tick_vals = list(np.arange(nice_min, nice_max + dtick_val, dtick_val))
+    tick_text = [f"R$ {int(v / 1_000_000)}M" for v in tick_vals]
+
+    # Converter ano_mes para nomes de meses legíveis
+    df_growth_auc["mes_label"] = pd.to_datetime(df_growth_auc["ano_mes"]).dt.strftime('%b/%Y')
+    
+    # Criar rótulos espaçados para melhor visualização
+    total_months = len(df_growth_auc)
+    if total_months > 6:
+        # Mostrar apenas a cada 2 meses se tiver mais de 6 meses
+        step = 2
+        tick_vals = list(range(0, total_months, step))
+        tick_text = [df_growth_auc.iloc[i]["mes_label"] for i in tick_vals]
+    elif total_months > 3:
+        # Mostrar apenas a cada 1 mês se tiver entre 4 e 6 meses
+        step = 1
+        tick_vals = list(range(0, total_months, step))
+        tick_text = [df_growth_auc.iloc[i]["mes_label"] for i in tick_vals]
+    else:
+        # Mostrar todos se tiver 3 ou menos meses
+        tick_vals = list(range(total_months))
+        tick_text = df_growth_auc["mes_label"].tolist()
+    
+    fig_growth_auc = go.Figure()
+    
+    fig_growth_auc.add_trace(
+        go.Bar(
+            x=df_growth_auc["mes_label"],
+            y=df_growth_auc["clientes_positivo"],
+            name="Clientes Ativos",
+            marker_color="#948161",
+            opacity=0.9,
+            hovertemplate="<b>%{x}</b><br>Clientes Ativos: <b>%{y:,.0f}</b><extra></extra>",
+        )
+    )
+
+    # Não adiciona anotações para os valores de AUC
+    auc_annotations = []
+
+    fig_growth_auc.add_trace(
+        go.Scatter(
+            x=df_growth_auc["mes_label"],
+            y=df_growth_auc["Net_Em_M"],
+            name="AUC",
+            line=dict(color="#FFFFFF", width=2),
+            yaxis="y2",
+            mode="lines+markers",
+            hovertemplate="<b>%{x}</b><br>AUC: <b>R$ %{y:,.2f}</b><extra></extra>",
+        )
+    )
+
+    # Constantes para o layout dos cards
+    PLOT_TOP = 0.84       # até onde vai o "gráfico" de verdade (0..1 em paper)
+
+    fig_growth_auc.update_layout(
+        height=int(520 * TV_SCALE),  # Aumentado de 430 para 520 para dar mais espaço
+        margin=dict(l=30, r=160, t=25, b=35),  # Margens aumentadas para tooltips
+        annotations=auc_annotations,
+        title=dict(
+            text="<b>CRESCIMENTO AUC E CLIENTES ATIVOS</b>",
+            font=dict(size=16, color="white", family="Arial"),  # Aumentado de 12 para 16
+            x=0.0,  # Ajustado para alinhar mais à esquerda
+            y=0.87,  # Ajustado para compensar o aumento da fonte
+            xanchor="left",
+            yanchor="top",
+        ),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        xaxis=dict(
+            showgrid=False,
+            showline=True,
+            linecolor="rgba(255, 255, 255, 0.2)",
+            tickfont=dict(color="rgba(255, 255, 255, 0.5)", size=13, family="Arial"),  # Fonte aumentada de 11 para 13
+            title=None,
+            tickmode='array',  # Usar modo array para controle preciso
+            tickvals=tick_vals,  # Posições onde mostrar rótulos
+            ticktext=tick_text,  # Textos dos rótulos
+            tickangle=-45,  # Inclina os rótulos para melhor legibilidade
+            automargin=True,  # Ajusta automaticamente as margens
+        ),
+        yaxis=dict(
+            title="Clientes Ativos",
+            title_font=dict(color="#948161", size=12, family="Arial"),
+            tickfont=dict(color="#948161", size=11, family="Arial"),  # Aumentado de padrão para 11
+            showgrid=True,
+            gridcolor="rgba(255, 255, 255, 0.1)",
+            gridwidth=0.5,
+            showline=True,
+            linecolor="rgba(255, 255, 255, 0.2)",
+            zeroline=False,
+            domain=[0, PLOT_TOP],  # define o domínio do eixo y
+        ),
+        yaxis2=dict(
+            title=None,
+            overlaying="y",
+            side="right",
+            automargin=True,
+            tickfont=dict(color="white", size=12, family="Arial"),  # Aumentado de 10 para 12
+            showline=True,
+            linecolor="rgba(255, 255, 255, 0.2)",
+            gridcolor="rgba(255, 255, 255, 0.1)",
+            gridwidth=0.5,
+            tickmode="array",
+            tickvals=tick_vals,
+            ticktext=tick_text,
+            range=[nice_min, nice_max],
+            zeroline=False,
+            domain=[0, PLOT_TOP],  # define o domínio do eixo y2
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=0.845,  # posição ajustada para ficar na faixa livre
+            xanchor="center",
+            x=0.5,
+            font=dict(color="white", size=13, family="Arial"),  # Aumentado de 11 para 13
+            bgcolor="rgba(0,0,0,0.2)",
+            bordercolor="rgba(255, 255, 255, 0.2)",
+        ),
+        hoverlabel=dict(
+            font_size=14,  # Aumentado de 12 para 14
+            font_family="Arial",
+            font_color="white",
+            bgcolor="rgba(32, 53, 47, 0.9)",
+            bordercolor="rgba(255, 255, 255, 0.2)",
+        ),
+    )
+
+    return fig_growth_auc
+
+
+# =====================================================
+# CARDS COMO FRAGMENTOS (st.fragment)
+# =====================================================
+# Fontes usadas pelo preparo da execução completa (df_pos_f, df_obj, data_ref...)
+FONTES_EXECUCAO = ("positivador", "positivador_mtd", "transferencias", "objetivos_pj1")
+
+# Cada card: fontes das quais depende, intervalo de atualização (s) e se usa
+# os dados preparados na execução completa. Cards com dados próprios (NPS,
+# FeeBased) se recarregam sozinhos no rerun do fragmento; os demais pedem
+# um rerun do app quando alguma das suas fontes mudou.
+CARDS_PAINEL: Dict[str, Dict[str, Any]] = {
+    "crescimento_auc": {"fontes": ("positivador", "positivador_mtd"), "intervalo": 300, "dados_da_execucao": True},
+    "nps": {"fontes": ("nps",), "intervalo": 120, "dados_da_execucao": False},
+    "feebased": {"fontes": ("feebased",), "intervalo": 120, "dados_da_execucao": False},
+    "captacao_mes": {"fontes": FONTES_EXECUCAO, "intervalo": 60, "dados_da_execucao": True},
+    "captacao_ano": {"fontes": FONTES_EXECUCAO, "intervalo": 60, "dados_da_execucao": True},
+    "auc_2026": {"fontes": FONTES_EXECUCAO, "intervalo": 60, "dados_da_execucao": True},
+    "rumo_1bi": {"fontes": FONTES_EXECUCAO, "intervalo": 60, "dados_da_execucao": True},
+}
+
+
+def fragmento_card(nome: str):
+    """
+    Transforma a função de render de um card em st.fragment com o intervalo
+    de CARDS_PAINEL[nome]. A versão das fontes na execução completa vai como
+    argumento do fragmento; num rerun só do fragmento ela é comparada com a
+    versão vigente.
+    """
+    config = CARDS_PAINEL[nome]
+
+    def decorador(render: Callable[[], None]) -> Callable[[], None]:
+        @st.fragment(run_every=config["intervalo"])
+        def card(versao_execucao: str) -> None:
+            if config["dados_da_execucao"] and versao_fontes(*config["fontes"]) != versao_execucao:
+                st.rerun()  # os dados do card vêm do preparo da execução completa
+            if not config["dados_da_execucao"]:
+                atualizar(execucao)  # recalcula só os nós abaixo das fontes que mudaram
+            # Rerun só do fragmento: rastreado (e gravado no log) por conta própria
+            proprio = not rastreamento.ativo()
+            if proprio:
+                rastreamento.iniciar(f"Dashboard_Salão_Atualizado/{nome}")
+            try:
+                with secao(f"card {nome}", "render"):
+                    render()
+            finally:
+                if proprio:
+                    rastreamento.finalizar()
+
+        def chamar() -> None:
+            card(versao_fontes(*config["fontes"]))
+
+        return chamar
+
+    return decorador
+
+
+# =====================================================
+# AQUECIMENTO EM SEGUNDO PLANO (observador_bancos)
+# =====================================================
+def aquecer_caches() -> None:
+    """
+    Prepara a versão nova dos bancos antes de ela ser publicada para os reruns.
+    Roda na thread do observador, enxergando a versão nova: resolve todos os
+    nós compartilhados do PLANO_CARGA (KPIs, rankings e figuras, com as bases
+    de que dependem) e recarrega os caches usados pelos cards fora do plano.
+    Tenta todas as etapas e, se alguma falhou, levanta FalhaAquecimento com
+    as etapas e os erros.
+    """
+    raiz = Path(__file__).parent.parent
+    nova = montar_execucao()
+    etapas = [
+        (nome, lambda nome=nome: obter(nova, nome))
+        for nome, _construir, _depende, _fontes, compartilhado in PLANO_CARGA
+        if compartilhado
+    ]
+    etapas += [
+        ("transferencias", carregar_dados_transferencias),
+        ("cubo_transferencias", _obter_cubo_transferencias),
+        ("indices_transferencias", _obter_indices_transferencias),
+        ("nps", lambda: filtrar_nps_a_partir_de_junho(carregar_dados_nps())),
+        ("auc_mesa_rv", _load_auc_table),
+    ]
+    caminho_mtd = raiz / "DBV Capital_Positivador (MTD).db"
+    if caminho_mtd.exists():
+        etapas.append((caminho_mtd.name, lambda: carregar_dados_positivador(str(caminho_mtd), mtime_vigente(caminho_mtd))))
+
+    falhas = []
+    for nome, etapa in etapas:
+        try:
+            etapa()
+        except Exception as e:
+            falhas.append(f"{nome}: {e}")
+    if falhas:
+        raise FalhaAquecimento("; ".join(falhas))
+
+
+iniciar_observador(aquecer_caches)
+if ultima_falha():
+    st.sidebar.warning(f"⚠️ Falha ao aquecer a versão nova dos dados: {ultima_falha()}")
+
+
 # =====================================================
 # EXECUÇÃO PRINCIPAL - LOADS
 # =====================================================
-with st.spinner("Carregando dados..."):
+with st.spinner("Carregando dados..."), secao("carga inicial", "bloco"):
     try:
         # Carregar dados MTD
         st.sidebar.write("🔍 Carregando dados do Positivador MTD...")
-        df_pos_raw = carregar_dados_positivador_mtd()
+        df_pos_raw = obter(execucao, "positivador_mtd")
 
         if df_pos_raw is None or df_pos_raw.empty:
             st.error("❌ Dados do Positivador MTD estão vazios ou não puderam ser carregados")
@@ -4041,7 +3800,7 @@ with st.spinner("Carregando dados..."):
         st.sidebar.write(f"📊 Dados MTD brutos carregados: {len(df_pos_raw)} linhas, {len(df_pos_raw.columns)} colunas")
 
         st.sidebar.write("✅ Processando dados MTD...")
-        df_pos = tratar_dados_positivador_mtd(df_pos_raw)
+        df_pos = obter(execucao, "positivador_mtd_tratado")
 
         if df_pos is None or df_pos.empty:
             st.error("❌ Dados processados do Positivador MTD estão vazios")
@@ -4053,8 +3812,9 @@ with st.spinner("Carregando dados..."):
         st.sidebar.write("🔍 Carregando dados do Positivador FULL (YTD)...")
         _pos_full_path = Path(__file__).parent.parent / "DBV Capital_Positivador.db"
         if _pos_full_path.exists():
-            df_pos_full = carregar_dados_positivador(str(_pos_full_path), _pos_full_path.stat().st_mtime)
-            st.sidebar.write(f"✅ Dados FULL carregados: {len(df_pos_full) if df_pos_full is not None else 0} linhas")
+            df_pos_mensal = obter(execucao, "positivador_mensal")
+            st.sidebar.write(f"✅ Dados FULL carregados: {int(df_pos_mensal['linhas'].sum())} linhas")
+            df_pos_full = None if df_pos_mensal.empty else obter(execucao, "positivador_ytd")
         else:
             df_pos_full = None
             st.sidebar.warning("⚠️ Arquivo do Positivador FULL não encontrado. Usando MTD para YTD.")
@@ -4064,12 +3824,10 @@ with st.spinner("Carregando dados..."):
             df_pos_full = df_pos.copy()
             st.sidebar.warning("⚠️ Dados FULL vazios. Usando MTD para YTD.")
         else:
-            # Aplicar mesmo tratamento dos dados MTD
-            df_pos_full = tratar_dados_positivador_mtd(df_pos_full)
-            st.sidebar.write(f"✅ Dados FULL processados: {len(df_pos_full)} linhas")
+            st.sidebar.write(f"✅ Dados FULL do ano: {len(df_pos_full)} linhas")
 
         st.sidebar.write("🔍 Carregando dados de objetivos...")
-        df_obj = carregar_dados_objetivos()
+        df_obj = obter(execucao, "objetivos")
 
         if df_obj is None or df_obj.empty:
             st.warning("⚠️ Dados de objetivos estão vazios")
@@ -4090,39 +3848,12 @@ if df_obj is None or df_obj.empty:
 
 df_pos_f = df_pos.copy()
 
-# --- Positivador FULL (DB completo) para YTD ---
-_pos_full_path = Path(__file__).parent.parent / "DBV Capital_Positivador.db"
-df_pos_full = (
-    carregar_dados_positivador(str(_pos_full_path), _pos_full_path.stat().st_mtime)
-    if _pos_full_path.exists()
-    else pd.DataFrame()
-)
-
-# normaliza (garante colunas e tipos)
-if df_pos_full is not None and not df_pos_full.empty:
-    if "Data_Posicao" in df_pos_full.columns:
-        df_pos_full["Data_Posicao"] = pd.to_datetime(df_pos_full["Data_Posicao"], errors="coerce")
-    if "Captacao_Liquida_em_M" in df_pos_full.columns:
-        df_pos_full["Captacao_Liquida_em_M"] = pd.to_numeric(df_pos_full["Captacao_Liquida_em_M"], errors="coerce").fillna(0.0)
-
-# DataFrame auxiliar APENAS para Top 3 (captação) incluindo transferências como captação
-df_pos_mes_cap_top3 = preparar_df_para_top3_com_transferencias(df_pos_f)  # MTD para ranking do mês
-
-# Carregar dados do MTD para o ranking do ano
-mtd_path = Path(__file__).parent.parent / "DBV Capital_Positivador (MTD).db"
-if mtd_path.exists():
-    df_mtd = carregar_dados_positivador(str(mtd_path), mtd_path.stat().st_mtime)
-    if not df_mtd.empty:
-        df_mtd = tratar_dados_positivador_mtd(df_mtd)
-        df_pos_ano_cap_top3 = preparar_df_para_top3_com_transferencias(df_mtd)
-    else:
-        df_pos_ano_cap_top3 = preparar_df_para_top3_com_transferencias(df_pos_full)  # Fallback para FULL
-else:
-    df_pos_ano_cap_top3 = preparar_df_para_top3_com_transferencias(df_pos_full)  # Fallback para FULL
+# --- Positivador FULL (DB completo) para YTD, com colunas e tipos garantidos ---
+df_pos_full = obter(execucao, "positivador_ytd")
 
-data_atualizacao_bd = obter_ultima_data_posicao()
+data_atualizacao_bd = obter(execucao, "ultima_data_posicao")
 # Usar data de atualização real dos dados
-data_ref = pd.Timestamp(data_atualizacao_bd).normalize()
+data_ref = obter(execucao, "data_referencia")
 data_formatada = data_ref.strftime("%d/%m/%Y")
 
 # =====================================================
@@ -4286,283 +4017,26 @@ with st.container():
     # =====================================================
     col_upper_left, col_upper_right, col_upper_feebased = st.columns([2, 1, 1], gap="small")
 
-    with col_upper_left:
-        if not df_positivador.empty:
-            df_positivador["ano_mes"] = df_positivador["Data_Posicao"].dt.strftime("%Y-%m")
-            df_auc_mensal = df_positivador.groupby("ano_mes")["Net_Em_M"].sum().reset_index()
-
-            df_clientes_positivo = (
-                df_positivador[df_positivador["Net_Em_M"] > 0]
-                .groupby("ano_mes")
-                .size()
-                .reset_index(name="clientes_positivo")
-            )
-
-            df_growth_auc = pd.merge(df_auc_mensal, df_clientes_positivo, on="ano_mes", how="outer").fillna(0)
-            df_growth_auc["data"] = pd.to_datetime(df_growth_auc["ano_mes"] + "-01")
-            df_growth_auc = df_growth_auc.sort_values("data")
-
-            # =========================
-            # LÓGICA ESTRUTURADA DE UNIFICAÇÃO DE DADOS
-            # =========================
-            
-            # 1. Processar o Histórico (DBV Capital_Positivador.db)
-            df_historico = df_positivador.copy()
-            if not df_historico.empty and "Data_Posicao" in df_historico.columns:
-                df_historico["Data_Posicao"] = pd.to_datetime(df_historico["Data_Posicao"], errors="coerce")
-                df_historico["ano_mes"] = df_historico["Data_Posicao"].dt.strftime("%Y-%m")
-                
-                # Agrupar por Mês/Ano
-                df_historico_mensal = df_historico.groupby("ano_mes").agg({
-                    "Net_Em_M": "sum",
-                    "Cliente": "nunique"
-                }).reset_index()
-                df_historico_mensal.columns = ["ano_mes", "Net_Em_M", "clientes_unicos"]
-                
-                # Criar coluna de data para ordenação
-                df_historico_mensal["data"] = pd.to_datetime(df_historico_mensal["ano_mes"] + "-01")
-                df_historico_mensal = df_historico_mensal.sort_values("data")
-                
-                # Obter última data histórica
-                ultima_data_historica = df_historico_mensal["data"].max()
-            else:
-                df_historico_mensal = pd.DataFrame(columns=["ano_mes", "Net_Em_M", "clientes_unicos", "data"])
-                ultima_data_historica = pd.Timestamp.min
-            
-            # 2. Processar o Mês Atual (DBV Capital_Positivador (MTD).db)
-            mtd_path = Path(__file__).parent.parent / "DBV Capital_Positivador (MTD).db"
-            df_mtd_unificado = None
-            
-            if mtd_path.exists():
-                df_mtd = carregar_dados_positivador_mtd()
-                if not df_mtd.empty and "Net_Em_M" in df_mtd.columns:
-                    # Converter Net_Em_M para numérico, tratando erros
-                    df_mtd["Net_Em_M"] = pd.to_numeric(df_mtd["Net_Em_M"], errors="coerce")
-                    df_mtd["Net_Em_M"] = df_mtd["Net_Em_M"].fillna(0)
-                    
-                    # Calcular soma total de net_em_m (AUC Atual)
-                    auc_mtd = float(df_mtd["Net_Em_M"].sum())
-                    
-                    # Contar clientes únicos
-                    clientes_mtd = len(df_mtd["Cliente"].unique()) if "Cliente" in df_mtd.columns else 0
-                    
-                    # Definir Data de Referência (data de atualização do arquivo MTD)
-                    if "Data_Atualizacao" in df_mtd.columns:
-                        data_ref_mtd = pd.to_datetime(df_mtd["Data_Atualizacao"], errors="coerce").max()
-                        if pd.isna(data_ref_mtd):
-                            data_ref_mtd = pd.Timestamp.now()
-                    else:
-                        data_ref_mtd = pd.Timestamp.now()
-                    
-                    # Criar linha do MTD
-                    df_mtd_unificado = pd.DataFrame([{
-                        "ano_mes": data_ref_mtd.strftime("%Y-%m"),
-                        "Net_Em_M": auc_mtd,
-                        "clientes_unicos": clientes_mtd,
-                        "data": data_ref_mtd
-                    }])
-            
-            # 3. Regra de Unificação (O "Pulo do Gato")
-            df_final = df_historico_mensal.copy()
-            
-            if df_mtd_unificado is not None:
-                data_mtd = df_mtd_unificado["data"].iloc[0]
-                
-                # Verificar se data do MTD é posterior à última data histórica
-                if data_mtd > ultima_data_historica:
-                    # Anexar linha do MTD ao final do DataFrame Histórico
-                    df_final = pd.concat([df_final, df_mtd_unificado], ignore_index=True)
-                    df_final = df_final.sort_values("data")
-            
-            # 4. Preparar dados para plotagem
-            if not df_final.empty:
-                df_growth_auc = df_final.copy()
-                df_growth_auc["clientes_positivo"] = df_growth_auc["clientes_unicos"]
-            else:
-                df_growth_auc = df_positivador.copy()
-                if not df_growth_auc.empty:
-                    df_growth_auc["ano_mes"] = df_growth_auc["Data_Posicao"].dt.strftime("%Y-%m")
-                    df_growth_auc["clientes_positivo"] = df_growth_auc.groupby("ano_mes")["Cliente"].transform("nunique")
-                    df_growth_auc = df_growth_auc.groupby("ano_mes").agg({
-                        "Net_Em_M": "sum",
-                        "clientes_positivo": "first",
-                        "Data_Posicao": "first"
-                    }).reset_index()
-                    df_growth_auc["data"] = pd.to_datetime(df_growth_auc["ano_mes"] + "-01")
-            
-            df_growth_auc = df_growth_auc.sort_values("data")
-
-            # =========================
-            # KPIs do ponto MAIS RECENTE do gráfico
-            # =========================
-            ultima = df_growth_auc.iloc[-1] if not df_growth_auc.empty else None
-            auc_hoje = float(ultima.get("Net_Em_M", 0.0) or 0.0) if ultima is not None else 0.0
-            clientes_ativos_hoje = int(ultima.get("clientes_positivo", 0) or 0) if ultima is not None else 0
-            
-            auc_hoje_txt = formatar_valor_curto(auc_hoje)
-            clientes_hoje_txt = f"{clientes_ativos_hoje:,}".replace(",", ".")
-
-            min_auc = float(df_growth_auc["Net_Em_M"].min() or 0.0)
-            max_auc = float(df_growth_auc["Net_Em_M"].max() or 0.0)
-            if max_auc <= min_auc:
-                max_auc = min_auc + 50_000_000
-
-            nice_min = math.floor(min_auc / 50_000_000.0) * 50_000_000.0
-            nice_max = math.ceil(max_auc / 50_000_000.0) * 50_000_000.0
-            nice_max = max(nice_max, max_auc * 1.05)
-
-            dtick_val = 50_000_000
-            tick_vals = list(np.arange(nice_min, nice_max + dtick_val, dtick_val))
-            tick_text = [f"R$ {int(v / 1_000_000)}M" for v in tick_vals]
-
-            # Converter ano_mes para nomes de meses legíveis
-            df_growth_auc["mes_label"] = pd.to_datetime(df_growth_auc["ano_mes"]).dt.strftime('%b/%Y')
-            
-            # Criar rótulos espaçados para melhor visualização
-            total_months = len(df_growth_auc)
-            if total_months > 6:
-                # Mostrar apenas a cada 2 meses se tiver mais de 6 meses
-                step = 2
-                tick_vals = list(range(0, total_months, step))
-                tick_text = [df_growth_auc.iloc[i]["mes_label"] for i in tick_vals]
-            elif total_months > 3:
-                # Mostrar apenas a cada 1 mês se tiver entre 4 e 6 meses
-                step = 1
-                tick_vals = list(range(0, total_months, step))
-                tick_text = [df_growth_auc.iloc[i]["mes_label"] for i in tick_vals]
-            else:
-                # Mostrar todos se tiver 3 ou menos meses
-                tick_vals = list(range(total_months))
-                tick_text = df_growth_auc["mes_label"].tolist()
-            
-            fig_growth_auc = go.Figure()
-            
-            fig_growth_auc.add_trace(
-                go.Bar(
-                    x=df_growth_auc["mes_label"],
-                    y=df_growth_auc["clientes_positivo"],
-                    name="Clientes Ativos",
-                    marker_color="#948161",
-                    opacity=0.9,
-                    hovertemplate="<b>%{x}</b><br>Clientes Ativos: <b>%{y:,.0f}</b><extra></extra>",
-                )
-            )
-
-            auc_vals = pd.to_numeric(df_growth_auc["Net_Em_M"], errors="coerce").fillna(0.0)
-            auc_diff = auc_vals.diff().fillna(0.0)
-            auc_labels = [""] * int(len(auc_vals))
-            if len(auc_vals) > 0:
-                auc_labels[0] = f"R$ {auc_vals.iloc[0] / 1_000_000:.0f}M"
-            if len(auc_vals) > 1:
-                auc_labels[-1] = f"R$ {auc_vals.iloc[-1] / 1_000_000:.0f}M"
-
-            # Não adiciona anotações para os valores de AUC
-            auc_annotations = []
-
-            fig_growth_auc.add_trace(
-                go.Scatter(
-                    x=df_growth_auc["mes_label"],
-                    y=df_growth_auc["Net_Em_M"],
-                    name="AUC",
-                    line=dict(color="#FFFFFF", width=2),
-                    yaxis="y2",
-                    mode="lines+markers",
-                    hovertemplate="<b>%{x}</b><br>AUC: <b>R$ %{y:,.2f}</b><extra></extra>",
-                )
-            )
-
-            # Constantes para o layout dos cards
-            PLOT_TOP = 0.84       # até onde vai o "gráfico" de verdade (0..1 em paper)
-            CARDS_Y0 = 0.90       # início da faixa dos cards
-            CARDS_Y1 = 0.995      # fim da faixa dos cards
-
-            fig_growth_auc.update_layout(
-                height=int(520 * TV_SCALE),  # Aumentado de 430 para 520 para dar mais espaço
-                margin=dict(l=30, r=160, t=25, b=35),  # Margens aumentadas para tooltips
-                annotations=auc_annotations,
-                title=dict(
-                    text="<b>CRESCIMENTO AUC E CLIENTES ATIVOS</b>",
-                    font=dict(size=16, color="white", family="Arial"),  # Aumentado de 12 para 16
-                    x=0.0,  # Ajustado para alinhar mais à esquerda
-                    y=0.87,  # Ajustado para compensar o aumento da fonte
-                    xanchor="left",
-                    yanchor="top",
-                ),
-                plot_bgcolor="rgba(0,0,0,0)",
-                paper_bgcolor="rgba(0,0,0,0)",
-                xaxis=dict(
-                    showgrid=False,
-                    showline=True,
-                    linecolor="rgba(255, 255, 255, 0.2)",
-                    tickfont=dict(color="rgba(255, 255, 255, 0.5)", size=13, family="Arial"),  # Fonte aumentada de 11 para 13
-                    title=None,
-                    tickmode='array',  # Usar modo array para controle preciso
-                    tickvals=tick_vals,  # Posições onde mostrar rótulos
-                    ticktext=tick_text,  # Textos dos rótulos
-                    tickangle=-45,  # Inclina os rótulos para melhor legibilidade
-                    automargin=True,  # Ajusta automaticamente as margens
-                ),
-                yaxis=dict(
-                    title="Clientes Ativos",
-                    title_font=dict(color="#948161", size=12, family="Arial"),
-                    tickfont=dict(color="#948161", size=11, family="Arial"),  # Aumentado de padrão para 11
-                    showgrid=True,
-                    gridcolor="rgba(255, 255, 255, 0.1)",
-                    gridwidth=0.5,
-                    showline=True,
-                    linecolor="rgba(255, 255, 255, 0.2)",
-                    zeroline=False,
-                    domain=[0, PLOT_TOP],  # define o domínio do eixo y
-                ),
-                yaxis2=dict(
-                    title=None,
-                    overlaying="y",
-                    side="right",
-                    automargin=True,
-                    tickfont=dict(color="white", size=12, family="Arial"),  # Aumentado de 10 para 12
-                    showline=True,
-                    linecolor="rgba(255, 255, 255, 0.2)",
-                    gridcolor="rgba(255, 255, 255, 0.1)",
-                    gridwidth=0.5,
-                    tickmode="array",
-                    tickvals=tick_vals,
-                    ticktext=tick_text,
-                    range=[nice_min, nice_max],
-                    zeroline=False,
-                    domain=[0, PLOT_TOP],  # define o domínio do eixo y2
-                ),
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=0.845,  # posição ajustada para ficar na faixa livre
-                    xanchor="center",
-                    x=0.5,
-                    font=dict(color="white", size=13, family="Arial"),  # Aumentado de 11 para 13
-                    bgcolor="rgba(0,0,0,0.2)",
-                    bordercolor="rgba(255, 255, 255, 0.2)",
-                ),
-                hoverlabel=dict(
-                    font_size=14,  # Aumentado de 12 para 14
-                    font_family="Arial",
-                    font_color="white",
-                    bgcolor="rgba(32, 53, 47, 0.9)",
-                    bordercolor="rgba(255, 255, 255, 0.2)",
-                ),
-            )
+    @fragmento_card("crescimento_auc")
+    def card_crescimento_auc() -> None:
+        if not df_positivador_mensal.empty:
+            fig_growth_auc = obter(execucao, "grafico_crescimento_auc")
 
             st.plotly_chart(fig_growth_auc, width='stretch', config={"responsive": True, "displayModeBar": False})
         else:
             st.warning("Dados insuficientes para exibir o gráfico de Crescimento AUC e Clientes Ativos.")
 
-    with col_upper_right:
-        df_nps = carregar_dados_nps()
-        # Aplicar filtro de data (junho a maio)
-        df_nps, periodo_nps_label = filtrar_nps_a_partir_de_junho(df_nps)
-        
-        if not df_nps.empty:
+    with col_upper_left:
+        card_crescimento_auc()
+
+    @fragmento_card("nps")
+    def card_nps() -> None:
+        nps_painel = obter(execucao, "indicadores_nps")
+
+        if not nps_painel["vazio"]:
             nps_color = "#ffffff"
-            m_nps = _calcular_metricas_nps(df_nps)
-            top3_df = _top3_assessores_por_aderencia(df_nps)
+            m_nps = nps_painel["metricas"]
+            top3_df = nps_painel["top3"]
 
             if not top3_df.empty:
                 medals = ["🥇", "🥈", "🥉"]
@@ -4723,15 +4197,16 @@ with st.container():
 """
             st.markdown(dedent(empty_html), unsafe_allow_html=True)
 
+    with col_upper_right:
+        card_nps()
+
     # =====================================================
     # FEEBASED CARD (Layout Idêntico ao AUC)
     # =====================================================
-    with col_upper_feebased:
+    @fragmento_card("feebased")
+    def card_feebased() -> None:
         try:
-            META_FEEBASED = 200_000_000.0  # fixo
-            ANO_FEE = 2026
-
-            df_fb = carregar_dados_feebased()
+            realizado = obter(execucao, "feebased_realizado")
 
             # --- Layout do cabeçalho (igual ao AUC)
             st.markdown(
@@ -4747,7 +4222,7 @@ with st.container():
             )
             st.markdown("<div class='col-tv-inner'>", unsafe_allow_html=True)
 
-            if df_fb is None or df_fb.empty:
+            if realizado is None:
                 st.markdown(
                     "<div style='text-align:center; color:#aaa; font-size:0.85em; padding:20px;'>Banco não encontrado ou sem dados.</div>",
                     unsafe_allow_html=True
@@ -4758,39 +4233,23 @@ with st.container():
                 OBJETIVO_FINAL_FEEBASED = 250_000_000.0  # 250 milhões
                 VALOR_INICIAL_FEEBASED = 119_358_620.0  # Valor inicial fixo
                 
-                # Calcula o realizado: soma de P/L onde Status é 'Ativo'
-                if df_fb is None or df_fb.empty:
-                    realizado = 0.0
-                else:
-                    # Filtra apenas status ATIVO (já normalizado no loader)
-                    df_ativos = df_fb[df_fb["status_norm"].eq("ATIVO")]
-                    
-                    # Soma os valores de P/L (já tratados no carregamento)
-                    realizado = float(df_ativos["pl_value"].sum() if not df_ativos.empty else 0.0)
+                # Realizado: soma de P/L onde Status é 'Ativo' (nó feebased_realizado)
 
                 # Obtém a data de referência
                 data_atualizacao = pd.Timestamp(data_ref)
                 
-                # Calcular crescimento diário necessário (mesma lógica do Rumo a 1bi)
+                # Crescimento diário linear em dias corridos (mesma lógica do Rumo a 1bi)
                 dias_total_ano = 365
-                crescimento_diario = (OBJETIVO_FINAL_FEEBASED - VALOR_INICIAL_FEEBASED) / dias_total_ano if dias_total_ano > 0 else 0
                 
-                # Calcular dias decorridos desde início de 2026 até a data de referência
+                # Contar TODOS os dias de 2026 até a data de referência (0 antes de 2026)
                 inicio_2026 = pd.Timestamp(2026, 1, 1)
-                if data_ref < inicio_2026:
-                    dias_decorridos = 0
-                else:
-                    # Contar TODOS os dias do ano (365 dias), não apenas úteis
-                    dias_decorridos = 0
-                    current_date = inicio_2026
-                    while current_date <= data_ref:
-                        # Contar todos os dias (incluindo fins de semana)
-                        dias_decorridos += 1
-                        current_date += pd.Timedelta(days=1)
+                dias_decorridos = periodos_decorridos(inicio_2026, data_ref)
                 
                 # Calcular valor projetado (mesma lógica dos outros cards)
-                threshold_ano = VALOR_INICIAL_FEEBASED + (crescimento_diario * dias_decorridos)
-                threshold_ano = min(threshold_ano, OBJETIVO_FINAL_FEEBASED)
+                threshold_ano = valor_projetado(
+                    VALOR_INICIAL_FEEBASED, OBJETIVO_FINAL_FEEBASED, dias_total_ano, dias_decorridos,
+                    teto=OBJETIVO_FINAL_FEEBASED,
+                )
 
                 # --- Cálculos Visuais ---
                 pct_realizado = (realizado / OBJETIVO_FINAL_FEEBASED) * 100 if OBJETIVO_FINAL_FEEBASED > 0 else 0
@@ -4799,8 +4258,7 @@ with st.container():
                 fim_2026 = pd.Timestamp(2026, 12, 31)
                 dias_restantes = max(0, (fim_2026 - data_atualizacao).days)
 
-                diff_pace = realizado - threshold_ano
-                pct_diff_pace = (diff_pace / threshold_ano * 100) if threshold_ano > 0 else 0
+                diff_pace, pct_diff_pace = desvio_pace(realizado, threshold_ano)
 
                 if diff_pace >= 0:
                     diff_text = f"<span style='color:#2ecc7a'>{fmt_valor(diff_pace)} ({pct_diff_pace:+.1f}%) 🎯</span>"
@@ -4853,18 +4311,10 @@ with st.container():
                 # --- Top 3 (Se houver dados)
                 st.markdown("<div style='height: 12px;'></div>", unsafe_allow_html=True)
                 
-                # Prepara dados para o Top 3 Horizontal - Top 3 assessores por PL no FeeBased
-                if "assessor_code" in df_fb.columns and not df_fb.empty:
-                    # Filtra apenas ativos e com PL > 0
-                    df_ativos = df_fb[df_fb["status_norm"] == "ATIVO"]
-                    if not df_ativos.empty:
-                        # Agrupa por assessor e soma o PL
-                        top_assessores = df_ativos.groupby("assessor_code")["pl_value"] \
-                                               .sum() \
-                                               .sort_values(ascending=False) \
-                                               .head(3)
-                        # Formata para o componente de exibição
-                        items_fb = [(k, v) for k, v in top_assessores.items()]
+                # Top 3 assessores por PL no FeeBased (nó top3_feebased)
+                items_fb = obter(execucao, "top3_feebased")
+                if items_fb is not None:
+                    if items_fb:
                         _render_top3_horizontal(items_fb, header_text="Top 3 — AUC FeeBased")
                     else:
                         st.markdown("<div style='text-align:center; color:#888; font-size:0.8em;'>Nenhum assessor ativo encontrado</div>", unsafe_allow_html=True)
@@ -4877,20 +4327,20 @@ with st.container():
             st.error(f"Erro ao renderizar FeeBased: {str(e)}")
             st.markdown("</div>", unsafe_allow_html=True)
 
+    with col_upper_feebased:
+        card_feebased()
+
     # =====================================================
     # SEÇÃO INFERIOR: MÉTRICAS (4 COLUNAS)
     # =====================================================
-    df_objetivos = carregar_dados_objetivos()
+    df_objetivos = obter(execucao, "objetivos")
     if df_objetivos is None or df_objetivos.empty:
         st.warning("Dados de objetivos não encontrados. Algumas métricas podem não ser exibidas.")
         df_objetivos = pd.DataFrame()
 
-    mets = calcular_indicadores_objetivos(
-        df_pos=df_pos_f,  # MTD para cálculos do mês
-        df_obj=df_obj, 
-        hoje=data_ref,
-        df_pos_ytd=df_pos_full  # FULL para cálculos YTD
-    )
+    mets = obter(execucao, "indicadores")
+    # Debug no sidebar fica fora dos fragmentos dos cards
+    mostrar_debug_indicadores(mets)
 
     c1, c2, c3, c4 = st.columns(4)
     col1, col2, col3, col4 = c1, c2, c3, c4
@@ -4898,7 +4348,8 @@ with st.container():
     # --------------------------
     # COLUNA 1: CAPTAÇÃO MÊS
     # --------------------------
-    with col1:
+    @fragmento_card("captacao_mes")
+    def card_captacao_mes() -> None:
         st.markdown(
             """
             <div class="metric-card-kpi">
@@ -4913,7 +4364,7 @@ with st.container():
         st.markdown("<div class='col-tv-inner'>", unsafe_allow_html=True)
 
         # Carregar dados da Objetivos_PJ1
-        df_objetivos_pj1 = carregar_dados_objetivos_pj1()
+        df_objetivos_pj1 = obter(execucao, "objetivos_pj1")
         
         # NOVA LÓGICA: Usar dados da Objetivos_PJ1
         if df_objetivos_pj1 is not None and not df_objetivos_pj1.empty:
@@ -4931,7 +4382,6 @@ with st.container():
             fallback_cap = 152_700_000.0 if ano_atual == 2025 else 0.0
 
             meta_anual = obter_meta_objetivo(ano_meta=ano_atual, coluna="cap_objetivo_ano", fallback=fallback_cap)
-            v_ano = float(mets.get("capliq_ano", {}).get("valor", 0.0) or 0.0)
 
             # Usar meta mensal fixa (meta anual dividida por 12)
             obj_total_mes = (meta_anual or 0.0) / 12
@@ -4940,10 +4390,6 @@ with st.container():
             primeiro_dia_mes = pd.Timestamp(data_atualizacao.year, data_atualizacao.month, 1)
             ultimo_dia_mes = pd.Timestamp(data_atualizacao.year, data_atualizacao.month, 1) + pd.offsets.MonthEnd(1)
 
-            # Usar dias corridos como no cálculo do ano (para consistência)
-            total_dias_mes = (ultimo_dia_mes - primeiro_dia_mes).days + 1
-            dias_ate_atualizacao = (data_atualizacao - primeiro_dia_mes).days + 1
-
             # Calcular valor projetado (usar a mesma proporção exata do ano)
             primeiro_dia_ano = pd.Timestamp(data_ref.year, 1, 1)
             ultimo_dia_ano = pd.Timestamp(data_ref.year, 12, 31)
@@ -5018,18 +4464,20 @@ with st.container():
         st.markdown(cards_mes_html, unsafe_allow_html=True)
 
         st.markdown("<div style='height: 12px;'></div>", unsafe_allow_html=True)
-        # Obter transferências por assessor do mês
-        transferencias_mes = mets.get("capliq_mes", {}).get("transferencias_por_assessor", {})
-        items_mes, _ = top3_mes_cap(df_pos_mes_cap_top3, date_col="Data_Posicao", value_col="Captacao_Liquida_em_M", group_col="assessor_code", transferencias_por_assessor=transferencias_mes)
+        items_mes, _ = obter(execucao, "top3_captacao_mes")
         _render_top3_horizontal(items_mes, header_text="TOP 3 - Captação Mês")
 
         st.markdown("</div>", unsafe_allow_html=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
+    with col1:
+        card_captacao_mes()
+
     # --------------------------
     # COLUNA 2: CAPTAÇÃO ANO
     # --------------------------
-    with col2:
+    @fragmento_card("captacao_ano")
+    def card_captacao_ano() -> None:
         st.markdown(
             """
             <div class="metric-card-kpi">
@@ -5044,7 +4492,7 @@ with st.container():
         st.markdown("<div class='col-tv-inner'>", unsafe_allow_html=True)
 
         # Carregar dados da Objetivos_PJ1
-        df_objetivos_pj1 = carregar_dados_objetivos_pj1()
+        df_objetivos_pj1 = obter(execucao, "objetivos_pj1")
         
         # NOVA LÓGICA: Usar dados da Objetivos_PJ1
         if df_objetivos_pj1 is not None and not df_objetivos_pj1.empty:
@@ -5130,17 +4578,19 @@ with st.container():
         st.markdown(cards_ano_html_col, unsafe_allow_html=True)
 
         st.markdown("<div style='height: 12px;'></div>", unsafe_allow_html=True)
-        # Obter transferências por assessor do ano
-        transferencias_ano = mets.get("capliq_ano", {}).get("transferencias_por_assessor", {})
-        items_ano_col, _ = top3_ano_cap(df_pos_ano_cap_top3, transferencias_por_assessor=transferencias_ano)
+        items_ano_col, _ = obter(execucao, "top3_captacao_ano")
         _render_top3_horizontal(items_ano_col, header_text="Top 3 — Captação Ano")
 
         st.markdown("</div>", unsafe_allow_html=True)
 
+    with col2:
+        card_captacao_ano()
+
     # --------------------------
     # COLUNA 3: AUC - 2026
     # --------------------------
-    with col3:
+    @fragmento_card("auc_2026")
+    def card_auc_2026() -> None:
         st.markdown(
             """
             <div class="metric-card-kpi">
@@ -5156,7 +4606,7 @@ with st.container():
 
         try:
             # Carregar dados da Objetivos_PJ1
-            df_objetivos_pj1 = carregar_dados_objetivos_pj1()
+            df_objetivos_pj1 = obter(execucao, "objetivos_pj1")
             
             # NOVA LÓGICA: Usar dados da Objetivos_PJ1
             if df_objetivos_pj1 is not None and not df_objetivos_pj1.empty:
@@ -5243,7 +4693,7 @@ with st.container():
             st.markdown(cards_auc_html, unsafe_allow_html=True)
 
             st.markdown("<div style='height: 12px;'></div>", unsafe_allow_html=True)
-            items_auc, _ = top3_mes_cap(df_pos_f, value_col="Net_Em_M")
+            items_auc, _ = obter(execucao, "top3_auc")
             _render_top3_horizontal(items_auc, header_text="Top 3 — AUC")
 
         except Exception as e:
@@ -5251,10 +4701,14 @@ with st.container():
 
         st.markdown("</div>", unsafe_allow_html=True)
 
+    with col3:
+        card_auc_2026()
+
     # --------------------------
     # COLUNA 4: Rumo a 1Bi
     # --------------------------
-    with col4:
+    @fragmento_card("rumo_1bi")
+    def card_rumo_1bi() -> None:
         st.markdown(
             """
             <div class="metric-card-kpi">
@@ -5273,6 +4727,9 @@ with st.container():
         st.markdown("</div>", unsafe_allow_html=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
+    with col4:
+        card_rumo_1bi()
+
     # Data de atualização posicionada após o card "RUMO A 1BI"
     header_html = """
     <div style='text-align: center; margin: 10px auto; width: 100%; max-width: 500px; padding: 10px 0 2px 0;'>
@@ -5484,3 +4941,16 @@ with st.container():
     )
 
 
+
+# =====================================================
+# DEBUG — PLANO DE CARGA DA EXECUÇÃO
+# =====================================================
+with st.sidebar.expander("🧭 Plano de carga (esta execução)", expanded=False):
+    st.dataframe(pd.DataFrame(resumo(execucao)), hide_index=True)
+
+# =====================================================
+# DESEMPENHO — fim do rastreamento da execução
+# =====================================================
+registros_desempenho = rastreamento.finalizar()
+if overlay_desempenho:
+    rastreamento.mostrar_overlay(registros_desempenho)
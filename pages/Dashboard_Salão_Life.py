@@ -3,13 +3,20 @@
 import re
 import streamlit as st
 import pandas as pd
-import sqlite3
 from pathlib import Path
 from datetime import date
 import numpy as np
 import unicodedata
+import sys
 from textwrap import dedent
 
+sys.path.append(str(Path(__file__).parent.parent))
+from acesso_dados import carregar_produtos
+import rastreamento
+from rastreamento import rastrear
+from registro_versoes import verificar_alteracoes
+from tipos_compactos import aplicar_texto
+
 def st_html(html: str):
     """Helper function to clean HTML before rendering with st.markdown"""
     html = dedent(html).strip()
@@ -126,55 +133,20 @@ st.set_page_config(
     layout="wide",
 )
 
+# Rastreamento por seção desta execução (overlay com ?desempenho=1 ou pelo toggle na sidebar)
+rastreamento.iniciar("Dashboard_Salão_Life")
+overlay_desempenho = st.sidebar.toggle(
+    "⏱️ Overlay de desempenho", value=st.query_params.get("desempenho") == "1", key="overlay_desempenho"
+)
+
+# Invalida apenas os caches das fontes cujo .db mudou desde o último rerun
+verificar_alteracoes()
+
 def _norm_txt(x: object) -> str:
     s = "" if x is None else str(x)
     s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
     return s.strip().lower()
 
-def _parse_datas_robusto(serie):
-    import re
-    s = pd.Series(serie).copy()
-
-    def _parse_one(x):
-        t = ("" if x is None else str(x)).strip()
-        if t == "" or t.lower() in ("nat", "nan", "none", "-"):
-            return pd.NaT
-
-        # serial Excel
-        try:
-            test = t.replace(".", "", 1).replace("-", "", 1)
-            if test.isdigit():
-                v = float(t)
-                if 1 <= v <= 60000:
-                    return pd.to_datetime(v, origin="1899-12-30", unit="D", errors="coerce")
-        except Exception:
-            pass
-
-        # ISO estrito
-        if re.match(r"^\d{4}[-/]\d{2}[-/]\d{2}$", t):
-            return pd.to_datetime(t.replace("/", "-"), format="%Y-%m-%d", errors="coerce")
-
-        # MM/YYYY
-        mmyyyy = re.match(r"^(\d{1,2})/(\d{4})$", t)
-        if mmyyyy:
-            m, y = int(mmyyyy.group(1)), int(mmyyyy.group(2))
-            if 1 <= m <= 12:
-                return pd.to_datetime(f"{y:04d}-{m:02d}-01", format="%Y-%m-%d", errors="coerce")
-
-        # BR
-        if re.match(r"^\d{1,2}/\d{1,2}/\d{4}$", t) or re.match(r"^\d{1,2}-\d{1,2}-\d{4}$", t):
-            return pd.to_datetime(t, dayfirst=True, errors="coerce")
-
-        return pd.to_datetime(t, errors="coerce")
-
-    dt = s.apply(_parse_one)
-    dt = pd.to_datetime(dt, errors="coerce")
-    try:
-        dt = dt.dt.tz_localize(None).dt.normalize()
-    except Exception:
-        pass
-    return dt
-
 def formatar_moeda(valor: float) -> str:
     try:
         return f"R$ {float(valor):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
@@ -185,139 +157,10 @@ def formatar_moeda(valor: float) -> str:
 # =========================
 # CARREGAMENTO DO BANCO (ÚNICO)
 # =========================
-@st.cache_data(show_spinner=False, ttl=60)  # Cache de 60 segundos em vez de permanente
+@rastrear()
 def carregar_dados_produtos():
-    caminho_db = Path(__file__).parent.parent / "DBV Capital_Produtos.db"
-    if not caminho_db.exists():
-        st.error(f"Arquivo do banco de dados não encontrado em: {caminho_db}")
-        return pd.DataFrame(), "N/A"
-
-    conn = sqlite3.connect(str(caminho_db))
-    try:
-        # Verificar tabelas disponíveis
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tabelas = [t[0] for t in cursor.fetchall()]
-        
-        # Tentar encontrar a tabela correta
-        nome_tabela = next((t for t in tabelas if 'produtos' in t.lower() or 'planilha' in t.lower()), None)
-        
-        if not nome_tabela:
-            st.error("Nenhuma tabela de produtos encontrada no banco de dados.")
-            return pd.DataFrame(), "N/A"
-            
-        # Obter as colunas da tabela
-        cursor.execute(f"PRAGMA table_info(\"{nome_tabela}\")")
-        colunas = [col[1] for col in cursor.fetchall()]
-        
-        # Mapear colunas conhecidas com base nos nomes exatos fornecidos
-        mapeamento_colunas = {}
-        
-        # Mapear data
-        if 'Data' in colunas:
-            mapeamento_colunas['Data'] = 'data'
-        
-        # Mapear valor_negocio
-        if 'Valor Negócio (R$)' in colunas:
-            mapeamento_colunas['Valor Negócio (R$)'] = 'valor_negocio'
-        
-        # Mapear linha_receita
-        if 'Linha Receita' in colunas:
-            mapeamento_colunas['Linha Receita'] = 'linha_receita'
-        
-        # Mapear codigo_assessor
-        if 'Código Assessor' in colunas:
-            mapeamento_colunas['Código Assessor'] = 'codigo_assessor'
-        
-        # Se alguma coluna não foi encontrada, tentar encontrar por similaridade
-        if len(mapeamento_colunas) < 4:
-            for c in colunas:
-                c_lower = c.lower()
-                if 'data' in c_lower and 'data' not in [v.lower() for v in mapeamento_colunas.values()]:
-                    mapeamento_colunas[c] = 'data'
-                elif any(termo in c_lower for termo in ['valor', 'negocio', 'negócio']) and 'valor_negocio' not in [v.lower() for v in mapeamento_colunas.values()]:
-                    mapeamento_colunas[c] = 'valor_negocio'
-                elif 'linha receita' in c_lower and 'linha_receita' not in [v.lower() for v in mapeamento_colunas.values()]:
-                    mapeamento_colunas[c] = 'linha_receita'
-                elif 'código assessor' in c_lower and 'codigo_assessor' not in [v.lower() for v in mapeamento_colunas.values()]:
-                    mapeamento_colunas[c] = 'codigo_assessor'
-        
-        # Se ainda faltarem colunas, tentar encontrar por similaridade mais ampla
-        if len(mapeamento_colunas) < 4:
-            for c in colunas:
-                c_lower = c.lower()
-                if 'data' not in [v.lower() for v in mapeamento_colunas.values()] and ('data' in c_lower or 'dt' in c_lower):
-                    mapeamento_colunas[c] = 'data'
-                elif 'valor_negocio' not in [v.lower() for v in mapeamento_colunas.values()] and ('valor' in c_lower or 'venda' in c_lower):
-                    mapeamento_colunas[c] = 'valor_negocio'
-                elif 'linha_receita' not in [v.lower() for v in mapeamento_colunas.values()] and ('linha' in c_lower or 'receita' in c_lower or 'categoria' in c_lower):
-                    mapeamento_colunas[c] = 'linha_receita'
-                elif 'codigo_assessor' not in [v.lower() for v in mapeamento_colunas.values()] and ('cod' in c_lower or 'assessor' in c_lower):
-                    mapeamento_colunas[c] = 'codigo_assessor'
-        
-        # Verificar se encontramos todas as colunas necessárias
-        colunas_necessarias = {'data', 'valor_negocio', 'linha_receita', 'codigo_assessor'}
-        colunas_encontradas = set(v.lower() for v in mapeamento_colunas.values())
-        
-        if not colunas_necessarias.issubset(colunas_encontradas):
-            st.error(f"Não foi possível mapear todas as colunas necessárias. Colunas encontradas: {colunas}")
-            st.error(f"Colunas mapeadas: {mapeamento_colunas}")
-            return pd.DataFrame(), "N/A"
-        
-        # Construir a consulta SQL com as colunas mapeadas
-        sql_cols = ', '.join(f'"{c}" as "{v}"' for c, v in mapeamento_colunas.items())
-        query = f'SELECT {sql_cols} FROM "{nome_tabela}"'
-        
-        # Carregar os dados com as colunas renomeadas
-        df = pd.read_sql_query(query, conn)
-
-    except Exception as e:
-        st.error(f"Erro ao acessar o banco de dados: {str(e)}")
-        return pd.DataFrame(), "N/A"
-    finally:
-        conn.close()
-
-    if df.empty:
-        return df, "N/A"
-
-    # Verificar se todas as colunas necessárias estão presentes
-    colunas_necessarias = {'data', 'valor_negocio', 'codigo_assessor', 'linha_receita'}
-    colunas_faltando = colunas_necessarias - set(df.columns)
-    
-    if colunas_faltando:
-        st.warning(f"Aviso: As seguintes colunas não foram encontradas e serão criadas vazias: {', '.join(colunas_faltando)}")
-        for col in colunas_faltando:
-            df[col] = '' if col == 'linha_receita' else (0.0 if col == 'valor_negocio' else pd.NaT)
-
-    if "data" in df.columns:
-        df["data"] = _parse_datas_robusto(df["data"])
-        df = df.dropna(subset=["data"]).reset_index(drop=True)
-    else:
-        df["data"] = pd.NaT
-
-    if "valor_negocio" in df.columns:
-        df["valor_negocio"] = df["valor_negocio"].astype(str).str.replace(r"[^\d.-]", "", regex=True)
-        df["valor_negocio"] = pd.to_numeric(df["valor_negocio"], errors="coerce").fillna(0.0)
-    else:
-        df["valor_negocio"] = 0.0
-        st.warning("Coluna 'valor_negocio' não encontrada. Usando valor padrão 0.0")
-
-    if "linha_receita" not in df.columns:
-        df["linha_receita"] = ""
-
-    if "codigo_assessor" not in df.columns:
-        if "assessor" in df.columns:
-            df["codigo_assessor"] = df["assessor"]
-        else:
-            df["codigo_assessor"] = ""
-
-    data_mais_recente = (
-        df["data"].max().strftime("%d/%m/%Y")
-        if not df.empty and "data" in df.columns and not df["data"].empty
-        else "N/A"
-    )
-    return df, data_mais_recente
-
+    """Produtos com colunas canônicas (data, valor_negocio, linha_receita, codigo_assessor)."""
+    return carregar_produtos()
 
 # =========================
 # PÁGINA
@@ -655,6 +498,7 @@ def _pick_cols(df_: pd.DataFrame):
     ass_col = "codigo_assessor" if "codigo_assessor" in df_.columns else ("assessor" if "assessor" in df_.columns else None)
     return area_col, ass_col
 
+@rastrear()
 def _filter_area(df_: pd.DataFrame, area_values: list[str], card_title: str = None) -> pd.DataFrame:
     if df_.empty:
         return df_
@@ -663,7 +507,8 @@ def _filter_area(df_: pd.DataFrame, area_values: list[str], card_title: str = No
         return df_.iloc[0:0].copy()
 
     targets = {_norm_txt(v) for v in area_values}
-    s = df_[area_col].astype(str).apply(_norm_txt)
+    # Categórica: normaliza uma vez por categoria
+    s = aplicar_texto(df_[area_col], lambda c: c.astype(str).apply(_norm_txt))
     filtered = df_[s.isin(targets)].copy()
 
     # Removido o filtro que excluía "Câmbio Merc. Inter." conforme solicitado
@@ -734,6 +579,7 @@ def _period_year(df_area: pd.DataFrame):
     df2 = date(y, 12, 31)
     return di2, df2, "Ano", True
 
+@rastrear()
 def _calc_block(df_area: pd.DataFrame, di: date, df_: date):
     if df_area.empty or di is None or df_ is None:
         return 0.0, 0, [], []
@@ -812,6 +658,7 @@ def _render_top3_qtd(top3):
         )
     return "".join(rows)
 
+@rastrear(tipo="render", rotulo="card_title")
 def render_area_card(card_title: str, df_all: pd.DataFrame, area_values: list[str]):
     df_area = _filter_area(df_all, area_values, card_title)
     
@@ -956,3 +803,10 @@ with row2_col3:
     render_area_card("Crédito", df, AREA_MAP["Crédito"])
 
 st.markdown("<div style='height: calc(8px * var(--tv-scale));'></div>", unsafe_allow_html=True)
+
+# =========================
+# DESEMPENHO — fim do rastreamento da execução
+# =========================
+registros_desempenho = rastreamento.finalizar()
+if overlay_desempenho:
+    rastreamento.mostrar_overlay(registros_desempenho)
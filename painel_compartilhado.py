@@ -0,0 +1,74 @@
+"""
+Snapshot do painel compartilhado entre sessões.
+
+Cada navegador (as TVs do salão e os desktops) roda o script da página
+inteiro a cada rerun, mas os KPIs, rankings e figuras dependem só dos
+bancos e do dia: não há widgets nem parâmetros por sessão. Aqui esses
+resultados ficam num dicionário por (versão composta dos bancos, dia),
+guardado no processo e lido por todas as sessões.
+
+- snapshot_painel(): snapshot da versão vigente (cria na primeira chamada);
+  `grupo` separa snapshots com fontes diferentes (ex.: o card de NPS só
+  depende do NPS e não é refeito quando o Positivador muda);
+- item_compartilhado(snapshot, nome, construir): devolve o item já pronto
+  ou o constrói uma única vez (as demais sessões esperam no lock do item
+  em vez de recalcular).
+
+Os itens são somente leitura: quem consome não deve alterar DataFrames,
+dicts ou figuras devolvidos. Apenas as MAX_VERSOES versões mais recentes
+de cada grupo ficam em memória.
+"""
+
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from registro_versoes import versao_composta
+
+MAX_VERSOES = 2
+
+_LOCK = threading.Lock()
+_SNAPSHOTS: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+
+def chave_snapshot(
+    versao: Optional[str] = None, dia: Optional[date] = None, grupo: str = "painel"
+) -> Tuple[str, str, str]:
+    return (grupo, versao or versao_composta(), (dia or date.today()).isoformat())
+
+
+def snapshot_painel(
+    versao: Optional[str] = None, dia: Optional[date] = None, grupo: str = "painel"
+) -> Dict[str, Any]:
+    """Snapshot compartilhado da versão (padrão: versão vigente dos bancos, hoje)."""
+    chave = chave_snapshot(versao, dia, grupo)
+    with _LOCK:
+        snap = _SNAPSHOTS.get(chave)
+        if snap is None:
+            snap = {"chave": chave, "itens": {}, "locks": {}, "lock": threading.Lock()}
+            _SNAPSHOTS[chave] = snap
+            # Descarta as versões mais antigas do grupo (a ordem de inserção é a ordem de criação)
+            do_grupo = [c for c in _SNAPSHOTS if c[0] == grupo]
+            for antiga in do_grupo[:-MAX_VERSOES]:
+                del _SNAPSHOTS[antiga]
+        return snap
+
+
+def item_compartilhado(snapshot: Dict[str, Any], nome: str, construir: Callable[[], Any]) -> Any:
+    """Item `nome` do snapshot, construído uma única vez por versão."""
+    itens = snapshot["itens"]
+    if nome in itens:
+        return itens[nome]
+
+    with snapshot["lock"]:
+        lock_item = snapshot["locks"].setdefault(nome, threading.Lock())
+    with lock_item:
+        if nome not in itens:
+            itens[nome] = construir()
+    return itens[nome]
+
+
+def estatisticas() -> Dict[str, Any]:
+    """Versões em memória e itens prontos em cada uma (para o debug)."""
+    with _LOCK:
+        return {f"{g}:{v}@{d}": sorted(s["itens"]) for (g, v, d), s in _SNAPSHOTS.items()}
@@ -0,0 +1,124 @@
+"""
+Projeções de pace (projetado x realizado) em forma fechada.
+
+Todos os cards seguem o mesmo modelo:
+
+    projetado = valor_inicial + (objetivo - valor_inicial) / total * decorridos
+
+onde `decorridos` é o número de períodos (dias corridos ou dias úteis)
+entre o início da janela e a data de referência, contando as duas pontas.
+Em vez de laços dia a dia, os períodos decorridos saem de uma subtração de
+datas (corridos) ou da tabela de calendario_uteis (úteis), para uma data ou
+para um vetor de datas de uma vez.
+
+Uma curva opcional (fração decorrida -> fração do gap) permite metas com
+sazonalidade em vez do pace linear.
+"""
+
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from calendario_uteis import _escalar, _para_dia, dias_uteis_entre
+
+BASE_CORRIDOS = "corridos"
+BASE_UTEIS = "uteis"
+
+Curva = Callable[[np.ndarray], np.ndarray]
+
+
+# =====================================================
+# Períodos decorridos
+# =====================================================
+def periodos_decorridos(inicio: Any, datas: Any, base: str = BASE_CORRIDOS):
+    """
+    Períodos em [inicio, data] (as duas pontas contam); 0 quando data < inicio.
+    `datas` pode ser uma data ou um vetor (Series/Index/array).
+    """
+    ini, fim = _para_dia(inicio), _para_dia(datas)
+    if base == BASE_UTEIS:
+        return dias_uteis_entre(ini, fim)
+    if base != BASE_CORRIDOS:
+        raise ValueError(f"Base de pace desconhecida: {base!r}")
+    n = (fim - ini).astype(np.int64) + 1
+    return _escalar(np.maximum(n, 0))
+
+
+# =====================================================
+# Curvas de pace
+# =====================================================
+def curva_linear(frac: np.ndarray) -> np.ndarray:
+    return frac
+
+
+def curva_por_pesos(pesos: Sequence[float]) -> Curva:
+    """
+    Curva acumulada a partir de pesos por subperíodo (ex.: 12 pesos mensais).
+    Entre os pontos a curva é interpolada linearmente.
+    """
+    p = np.asarray(pesos, dtype="float64")
+    if p.size == 0 or p.sum() <= 0:
+        return curva_linear
+    xs = np.linspace(0.0, 1.0, p.size + 1)
+    ys = np.concatenate(([0.0], np.cumsum(p) / p.sum()))
+    return lambda frac: np.interp(frac, xs, ys)
+
+
+# =====================================================
+# Projetado x realizado
+# =====================================================
+def valor_projetado(
+    valor_inicial: float,
+    objetivo: float,
+    total_periodos: float,
+    decorridos: Any,
+    curva: Optional[Curva] = None,
+    piso: Optional[float] = None,
+    teto: Optional[float] = None,
+):
+    """
+    Valor esperado após `decorridos` períodos de um total de `total_periodos`.
+    Sem curva, o crescimento por período é constante (gap / total).
+    `piso`/`teto` limitam o resultado, como cada card já fazia.
+    """
+    dec = np.asarray(decorridos, dtype="float64")
+    gap = objetivo - valor_inicial
+    if total_periodos <= 0:
+        proj = np.full(dec.shape, float(valor_inicial))
+    elif curva is None:
+        proj = valor_inicial + (gap / total_periodos) * dec
+    else:
+        proj = valor_inicial + gap * np.asarray(curva(dec / total_periodos), dtype="float64")
+
+    if piso is not None:
+        proj = np.maximum(proj, piso)
+    if teto is not None:
+        proj = np.minimum(proj, teto)
+    return _escalar(proj)
+
+
+def projetar(
+    valor_inicial: float,
+    objetivo: float,
+    inicio: Any,
+    fim: Any,
+    datas: Any,
+    base: str = BASE_CORRIDOS,
+    curva: Optional[Curva] = None,
+    piso: Optional[float] = None,
+    teto: Optional[float] = None,
+):
+    """Atalho: total e decorridos contados na mesma base, entre `inicio` e `fim`."""
+    total = periodos_decorridos(inicio, fim, base)
+    dec = np.minimum(periodos_decorridos(inicio, datas, base), total)
+    return valor_projetado(valor_inicial, objetivo, total, dec, curva=curva, piso=piso, teto=teto)
+
+
+def desvio_pace(realizado: Any, projetado: Any) -> Tuple[Any, Any]:
+    """Diferença realizado - projetado e o percentual sobre o projetado (0 se projetado <= 0)."""
+    r = np.asarray(realizado, dtype="float64")
+    p = np.asarray(projetado, dtype="float64")
+    diff = r - p
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(p > 0, diff / p * 100, 0.0)
+    return _escalar(diff), _escalar(pct)
@@ -0,0 +1,284 @@
+"""
+Rastreamento por seção das execuções das páginas (tempo, linhas, cache e memória).
+
+Cada loader, transformação e bloco de render relevante abre uma seção:
+
+- @rastrear("nome", tipo="render"): função comum;
+- @cache_rastreado("nome"): no lugar de @st.cache_data(show_spinner=False)
+  (ou de @cache_por_versao, com cache=cache_por_versao); além do tempo,
+  registra se a chamada saiu do cache (hit) ou executou a função (miss);
+- with secao("nome", tipo): trecho de código.
+
+Por seção ficam: tempo de parede, linhas do primeiro DataFrame recebido e
+do DataFrame devolvido, hit/miss do cache e memória (rasa) do resultado.
+Seções aninhadas guardam a profundidade.
+
+Só há registro entre iniciar() e finalizar() na mesma thread (o script da
+sessão); fora disso (thread do observador, por exemplo) as seções não
+custam nada além de uma consulta ao thread-local. finalizar() grava uma
+linha JSON por seção em DBV_RASTREAMENTO_LOG (ou em
+logs/rastreamento.jsonl com DBV_RASTREAMENTO=1), e mostrar_overlay()
+desenha a tabela fixa no canto da tela.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+BASE_DIR = Path(__file__).resolve().parent
+LOG_PADRAO = BASE_DIR / "logs" / "rastreamento.jsonl"
+
+_LOCAL = threading.local()
+_LOCK_LOG = threading.Lock()
+
+
+# =====================================================
+# Execução rastreada
+# =====================================================
+def ativo() -> bool:
+    """Há uma execução rastreada em andamento nesta thread?"""
+    return getattr(_LOCAL, "aberta", False)
+
+
+def iniciar(pagina: str) -> None:
+    """Começa a registrar as seções desta thread (descarta qualquer registro anterior)."""
+    _LOCAL.registros = []
+    _LOCAL.pilha = []
+    _LOCAL.pagina = pagina
+    _LOCAL.id = uuid.uuid4().hex[:12]
+    _LOCAL.inicio = time.perf_counter()
+    _LOCAL.aberta = True
+
+
+def finalizar() -> List[Dict[str, Any]]:
+    """Encerra a execução rastreada, grava o log (se habilitado) e devolve as seções."""
+    registros: List[Dict[str, Any]] = getattr(_LOCAL, "registros", None) or []
+    if not ativo():
+        return registros
+    _LOCAL.aberta = False
+    total_ms = (time.perf_counter() - _LOCAL.inicio) * 1000
+    registros.append(_registro("execucao total", "execucao", total_ms, 0))
+    _gravar_log(registros)
+    return registros
+
+
+def caminho_log() -> Optional[Path]:
+    caminho = os.getenv("DBV_RASTREAMENTO_LOG", "").strip()
+    if caminho:
+        return Path(caminho)
+    if os.getenv("DBV_RASTREAMENTO", "").strip() in ("1", "true", "sim"):
+        return LOG_PADRAO
+    return None
+
+
+def _gravar_log(registros: List[Dict[str, Any]]) -> None:
+    caminho = caminho_log()
+    if caminho is None or not registros:
+        return
+    cabecalho = {
+        "execucao": _LOCAL.id,
+        "pagina": _LOCAL.pagina,
+        "quando": datetime.now().isoformat(timespec="seconds"),
+    }
+    try:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        linhas = "".join(json.dumps({**cabecalho, **r}, ensure_ascii=False) + "\n" for r in registros)
+        with _LOCK_LOG, open(caminho, "a", encoding="utf-8") as f:
+            f.write(linhas)
+    except OSError as e:
+        print(f"[rastreamento] Falha ao gravar {caminho}: {e}")
+
+
+# =====================================================
+# Seções
+# =====================================================
+def _linhas(valor: Any) -> Optional[int]:
+    df = _primeiro_dataframe(valor)
+    return None if df is None else int(len(df))
+
+
+def _primeiro_dataframe(valor: Any) -> Optional[pd.DataFrame]:
+    if isinstance(valor, pd.DataFrame):
+        return valor
+    if isinstance(valor, (tuple, list)):
+        for v in valor:
+            if isinstance(v, pd.DataFrame):
+                return v
+    return None
+
+
+def _memoria_mb(valor: Any) -> Optional[float]:
+    df = _primeiro_dataframe(valor)
+    if df is None:
+        return None
+    try:
+        return round(float(df.memory_usage(index=True, deep=False).sum()) / 1_048_576, 3)
+    except Exception:
+        return None
+
+
+def anotar_resultado(info: Dict[str, Any], valor: Any) -> None:
+    """Preenche linhas de saída e memória da seção a partir do valor devolvido."""
+    if info is not None and ativo():
+        info["linhas_saida"] = _linhas(valor)
+        info["memoria_mb"] = _memoria_mb(valor)
+
+
+def _registro(nome: str, tipo: str, ms: float, profundidade: int, **extra: Any) -> Dict[str, Any]:
+    return {"secao": nome, "tipo": tipo, "ms": round(ms, 2), "profundidade": profundidade, **extra}
+
+
+@contextmanager
+def secao(nome: str, tipo: str = "bloco", linhas_entrada: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Seção rastreada. O dicionário entregue aceita "linhas_saida", "memoria_mb"
+    e "cache" preenchidos por quem usa.
+    """
+    if not ativo():
+        yield {}
+        return
+    pilha = _LOCAL.pilha
+    info: Dict[str, Any] = {"linhas_entrada": linhas_entrada}
+    pilha.append(info)
+    inicio = time.perf_counter()
+    erro = None
+    try:
+        yield info
+    except BaseException as e:
+        erro = type(e).__name__
+        raise
+    finally:
+        ms = (time.perf_counter() - inicio) * 1000
+        pilha.pop()
+        extra = {k: v for k, v in info.items() if v is not None}
+        if erro:
+            extra["erro"] = erro
+        _LOCAL.registros.append(_registro(nome, tipo, ms, len(pilha), **extra))
+
+
+def _entrada(args: tuple, kwargs: dict) -> Optional[int]:
+    for v in list(args) + list(kwargs.values()):
+        if isinstance(v, pd.DataFrame):
+            return int(len(v))
+    return None
+
+
+def rastrear(nome: Optional[str] = None, tipo: str = "transformacao", rotulo: Optional[str] = None):
+    """
+    Decorador: rastreia cada chamada da função. `rotulo` é o nome de um
+    argumento cujo valor entra no nome da seção (ex.: o título do card).
+    """
+    def decorador(func: Callable) -> Callable:
+        base = nome or func.__name__
+        posicao = None
+        if rotulo:
+            posicao = list(inspect.signature(func).parameters).index(rotulo)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ativo():
+                return func(*args, **kwargs)
+            titulo = base
+            if rotulo:
+                valor = kwargs.get(rotulo, args[posicao] if posicao < len(args) else None)
+                titulo = f"{base} [{valor}]"
+            with secao(titulo, tipo, _entrada(args, kwargs)) as info:
+                resultado = func(*args, **kwargs)
+                anotar_resultado(info, resultado)
+            return resultado
+
+        return wrapper
+
+    return decorador
+
+
+def cache_rastreado(nome: Optional[str] = None, tipo: str = "loader", cache: Optional[Callable] = None, **kwargs):
+    """
+    Substitui @st.cache_data(show_spinner=False, **kwargs) (ou o decorador de
+    cache informado em `cache`, ex.: cache_por_versao) acrescentando a seção
+    e o hit/miss. O objeto devolvido mantém .clear() para o registro_versoes.
+    """
+    if cache is None:
+        kwargs.setdefault("show_spinner", False)
+        cache = st.cache_data
+
+    def decorador(func: Callable) -> Callable:
+        base = nome or func.__name__
+
+        @functools.wraps(func)
+        def executar(*args, **kw):
+            # Só roda quando o cache não tinha a entrada
+            if ativo() and _LOCAL.pilha:
+                _LOCAL.pilha[-1]["cache"] = "miss"
+            return func(*args, **kw)
+
+        cacheada = cache(**kwargs)(executar)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kw):
+            if not ativo():
+                return cacheada(*args, **kw)
+            with secao(base, tipo, _entrada(args, kw)) as info:
+                info["cache"] = "hit"
+                resultado = cacheada(*args, **kw)
+                anotar_resultado(info, resultado)
+            return resultado
+
+        wrapper.clear = cacheada.clear
+        return wrapper
+
+    return decorador
+
+
+# =====================================================
+# Overlay
+# =====================================================
+def resumo(registros: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Tabela das seções na ordem de término (a execução total por último)."""
+    colunas = ["secao", "tipo", "ms", "cache", "linhas_entrada", "linhas_saida", "memoria_mb", "profundidade"]
+    return pd.DataFrame(registros).reindex(columns=colunas)
+
+
+def mostrar_overlay(registros: List[Dict[str, Any]], limite: int = 15) -> None:
+    """Painel fixo no canto inferior direito com as seções mais lentas."""
+    if not registros:
+        return
+    total = next((r["ms"] for r in registros if r["tipo"] == "execucao"), None)
+    secoes = sorted((r for r in registros if r["tipo"] != "execucao"), key=lambda r: r["ms"], reverse=True)
+    linhas = []
+    for r in secoes[:limite]:
+        cache = r.get("cache", "")
+        linhas_df = "" if r.get("linhas_saida") is None else f"{r['linhas_saida']:,}".replace(",", ".")
+        memoria = "" if r.get("memoria_mb") is None else f"{r['memoria_mb']:.1f}"
+        linhas.append(
+            f"<tr><td>{escape(r['secao'])}</td><td>{escape(r['tipo'])}</td>"
+            f"<td style='text-align:right'>{r['ms']:.0f}</td><td>{escape(cache)}</td>"
+            f"<td style='text-align:right'>{linhas_df}</td><td style='text-align:right'>{memoria}</td></tr>"
+        )
+    titulo = f"⏱️ {total:.0f} ms" if total is not None else "⏱️"
+    st.markdown(
+        f"""
+<div style="position:fixed; right:12px; bottom:12px; z-index:99999; max-width:560px; max-height:45vh;
+overflow:auto; background:rgba(10,20,35,0.92); color:#e8f1ff; border:1px solid rgba(255,255,255,0.25);
+border-radius:8px; padding:8px 10px; font:11px/1.35 monospace;">
+<div style="font-weight:700; margin-bottom:4px;">{titulo} — {len(secoes)} seções</div>
+<table style="border-collapse:collapse; width:100%;">
+<tr><th align="left">seção</th><th align="left">tipo</th><th>ms</th><th>cache</th><th>linhas</th><th>MB</th></tr>
+{''.join(linhas)}
+</table>
+</div>
+""",
+        unsafe_allow_html=True,
+    )
@@ -0,0 +1,259 @@
+"""
+Registro central de versões dos bancos (DBV Capital_*.db) e barramento de invalidação.
+
+- impressoes_digitais(): tamanho + mtime_ns de cada fonte do FONTES (e de
+  qualquer outro "DBV Capital_*.db" da raiz), numa única passada de stat().
+- versao_composta(): um token curto que muda quando qualquer banco muda.
+- @depende_de("nps", ...): registra um cache (st.cache_data) como dependente
+  de uma ou mais fontes.
+- verificar_alteracoes(): compara com a última leitura e chama .clear()
+  apenas nos caches das fontes que mudaram. Caches chaveados por mtime já
+  erram sozinhos na nova versão (aqui só liberam memória); os que não têm
+  mtime na chave (ex.: Objetivos_PJ1) passam a ser recarregados.
+
+Quando o ETL atualiza só o NPS, os caches de Positivador e Transferências
+continuam quentes.
+
+Versão vigente: os loaders pegam o mtime/impressão da chave de cache por
+mtime_vigente()/versao_vigente(). Sem o observador (observador_bancos)
+é o stat() do arquivo; com ele, é a versão publicada, que só muda depois
+que os caches da versão nova foram aquecidos em segundo plano. Os loaders
+alcançados pelo aquecimento reportam erros por avisar_carga(), que na
+thread do observador levanta FalhaAquecimento em vez de desenhar na tela.
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+TODAS = "*"
+_AUSENTE = "ausente"
+
+_DEPENDENTES: Dict[str, List[Callable]] = {}
+_SEM_VERSAO: List[Callable] = []
+_VISTAS: Dict[str, str] = {}
+_LOCK = threading.Lock()
+
+# caminho resolvido -> (mtime, impressão); vazio enquanto o observador não roda
+_PUBLICADO: Dict[str, Tuple[float, str]] = {}
+_LOCAL = threading.local()
+
+
+# =====================================================
+# Registro de dependências
+# =====================================================
+def depende_de(*fontes: str, versionado: bool = True):
+    """
+    Decorador: registra o cache como dependente das fontes (sem fontes = de todas).
+    versionado=False marca caches cuja chave não inclui a versão do banco
+    (sem argumentos, por exemplo): esses precisam ser limpos a cada troca.
+    """
+    def decorador(func):
+        for fonte in fontes or (TODAS,):
+            _DEPENDENTES.setdefault(fonte, []).append(func)
+        if not versionado:
+            _SEM_VERSAO.append(func)
+        return func
+    return decorador
+
+
+# =====================================================
+# Impressões digitais
+# =====================================================
+def caminhos_fontes() -> Dict[str, Path]:
+    """Fonte -> arquivo .db encontrado; bancos fora do FONTES entram pelo nome do arquivo."""
+    from acesso_dados import BASE_DIR, FONTES, localizar_banco
+
+    caminhos: Dict[str, Path] = {}
+    for fonte in FONTES:
+        p = localizar_banco(fonte)
+        if p is not None:
+            caminhos[fonte] = p
+
+    conhecidos = {p.resolve() for p in caminhos.values()}
+    for p in sorted(BASE_DIR.glob("DBV Capital_*.db")):
+        if p.resolve() not in conhecidos:
+            caminhos[p.name] = p
+    return caminhos
+
+
+def impressoes_digitais() -> Dict[str, str]:
+    impressoes: Dict[str, str] = {}
+    for fonte, p in caminhos_fontes().items():
+        try:
+            impressoes[fonte] = versao_vigente(p)[1]
+        except OSError:
+            impressoes[fonte] = _AUSENTE
+    return impressoes
+
+
+def versao_composta(impressoes: Optional[Dict[str, str]] = None) -> str:
+    """Token único da versão de todos os bancos."""
+    if impressoes is None:
+        impressoes = impressoes_digitais()
+    texto = "|".join(f"{k}={v}" for k, v in sorted(impressoes.items()))
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:12]
+
+
+def versao_fontes(*fontes: str, impressoes: Optional[Dict[str, str]] = None) -> str:
+    """Token da versão apenas das fontes informadas (ex.: só o NPS para o card de NPS)."""
+    if impressoes is None:
+        impressoes = impressoes_digitais()
+    return versao_composta({f: impressoes.get(f, _AUSENTE) for f in fontes})
+
+
+# =====================================================
+# Estado dos arquivos
+# =====================================================
+def estado_arquivo(db_path: Path) -> Tuple[float, str]:
+    """(mtime, impressão digital) numa única chamada de stat()."""
+    st_ = Path(db_path).stat()
+    return st_.st_mtime, f"{st_.st_size}:{st_.st_mtime_ns}"
+
+
+def estados_fontes() -> Dict[str, Tuple[float, str]]:
+    """Caminho resolvido -> (mtime, impressão) de todas as fontes presentes."""
+    estados: Dict[str, Tuple[float, str]] = {}
+    for p in caminhos_fontes().values():
+        try:
+            estados[str(p.resolve())] = estado_arquivo(p)
+        except OSError:
+            continue
+    return estados
+
+
+# =====================================================
+# Versão vigente (usada nas chaves de cache)
+# =====================================================
+def versao_vigente(db_path: Path) -> Tuple[float, str]:
+    """
+    (mtime, impressão) que deve compor a chave de cache de `db_path`:
+    a versão em aquecimento (só na thread do observador), senão a publicada,
+    senão o stat() atual do arquivo.
+    """
+    p = Path(db_path)
+    pendente = getattr(_LOCAL, "pendente", None)
+    if pendente or _PUBLICADO:
+        chave = str(p.resolve())
+        if pendente and chave in pendente:
+            return pendente[chave]
+        publicado = _PUBLICADO.get(chave)
+        if publicado is not None:
+            return publicado
+    return estado_arquivo(p)
+
+
+def mtime_vigente(db_path: Path) -> float:
+    return versao_vigente(db_path)[0]
+
+
+def observador_ativo() -> bool:
+    return bool(_PUBLICADO)
+
+
+class FalhaAquecimento(RuntimeError):
+    """Falha de carga durante o aquecimento em segundo plano."""
+
+
+def aquecendo() -> bool:
+    """Esta thread está aquecendo uma versão nova (dentro de aquecer_versao)?"""
+    return getattr(_LOCAL, "pendente", None) is not None
+
+
+def avisar_carga(mensagem: str, exibir: Callable[[str], Any]) -> None:
+    """
+    Erro de um loader: no rerun vai para a tela por `exibir` (ex.: st.error);
+    na thread do observador levanta FalhaAquecimento, para que nada seja
+    desenhado na sessão cujo contexto a thread usa e o resultado vazio não
+    entre no cache da versão nova.
+    """
+    if aquecendo():
+        raise FalhaAquecimento(mensagem)
+    exibir(mensagem)
+
+
+def aquecer_versao(estados: Dict[str, Tuple[float, str]], aquecer: Callable[[], None]) -> None:
+    """Roda `aquecer` enxergando `estados` como versão vigente (apenas nesta thread)."""
+    _LOCAL.pendente = estados
+    try:
+        aquecer()
+    finally:
+        _LOCAL.pendente = None
+
+
+def publicar(estados: Dict[str, Tuple[float, str]]) -> List[str]:
+    """
+    Troca a versão publicada de uma vez (uma atribuição) e limpa os caches
+    sem versão na chave das fontes alteradas. Retorna as fontes alteradas.
+    """
+    global _PUBLICADO
+    impressoes = {
+        fonte: estados.get(str(p.resolve()), (0.0, _AUSENTE))[1]
+        for fonte, p in caminhos_fontes().items()
+    }
+    with _LOCK:
+        alteradas = sorted(
+            f for f in set(impressoes) | set(_VISTAS) if impressoes.get(f) != _VISTAS.get(f)
+        ) if _VISTAS else []
+        _PUBLICADO = dict(estados)
+        _VISTAS.clear()
+        _VISTAS.update(impressoes)
+
+    if alteradas:
+        invalidar(alteradas, apenas_sem_versao=True)
+    return alteradas
+
+
+def despublicar() -> None:
+    """Volta a usar o stat() atual dos arquivos (observador parado)."""
+    global _PUBLICADO
+    _PUBLICADO = {}
+
+
+# =====================================================
+# Invalidação
+# =====================================================
+def invalidar(fontes: Iterable[str], apenas_sem_versao: bool = False) -> int:
+    """
+    Limpa os caches dependentes das fontes informadas; retorna quantos foram limpos.
+    apenas_sem_versao=True preserva os caches chaveados pela versão (a entrada
+    nova já foi aquecida e a antiga deixa de ser consultada).
+    """
+    funcs: List[Callable] = []
+    for fonte in list(fontes) + [TODAS]:
+        funcs.extend(_DEPENDENTES.get(fonte, []))
+    if apenas_sem_versao:
+        funcs = [f for f in funcs if f in _SEM_VERSAO]
+
+    limpos = 0
+    for func in dict.fromkeys(funcs):
+        try:
+            func.clear()
+            limpos += 1
+        except Exception:
+            pass
+    return limpos
+
+
+def verificar_alteracoes() -> List[str]:
+    """
+    Relê as impressões digitais e invalida os caches das fontes alteradas.
+    A primeira chamada do processo só registra o estado atual.
+    Com o observador ativo não faz nada: a troca de versão é dele.
+    Retorna a lista de fontes alteradas.
+    """
+    if observador_ativo():
+        return []
+    atuais = impressoes_digitais()
+    with _LOCK:
+        if not _VISTAS:
+            _VISTAS.update(atuais)
+            return []
+        alteradas = sorted(f for f in set(atuais) | set(_VISTAS) if atuais.get(f) != _VISTAS.get(f))
+        _VISTAS.clear()
+        _VISTAS.update(atuais)
+
+    if alteradas:
+        invalidar(alteradas)
+    return alteradas
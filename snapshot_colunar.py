@@ -0,0 +1,111 @@
+"""
+Snapshot colunar (Arrow IPC) dos DataFrames já normalizados de cada fonte.
+
+Na primeira leitura de um banco, o DataFrame tipado produzido pelo loader é
+gravado ao lado do .db (ex.: "DBV Capital_NPS.db.nps.arrow"). Processos
+seguintes (restart do servidor, novos workers) fazem memory-map desse arquivo
+em vez de repetir SELECT * + parsing de datas e valores.
+
+O snapshot só é aceito quando a impressão digital do .db (tamanho + mtime_ns)
+e a VERSAO_SNAPSHOT gravadas nos metadados conferem com o arquivo atual.
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover - pyarrow vem com o streamlit
+    pa = None
+    pa_ipc = None
+
+# Incrementar sempre que o formato de saída de algum loader mudar
+VERSAO_SNAPSHOT = "3"
+
+_META_FINGERPRINT = b"dbv_fingerprint"
+_META_VERSAO = b"dbv_versao"
+
+
+def impressao_digital(db_path: Path) -> str:
+    """Impressão digital barata do arquivo: tamanho + mtime em nanossegundos."""
+    st_ = Path(db_path).stat()
+    return f"{st_.st_size}:{st_.st_mtime_ns}"
+
+
+def caminho_snapshot(db_path: Path, fonte: str) -> Path:
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.name}.{fonte}.arrow")
+
+
+def ler_snapshot(db_path: Path, fonte: str) -> Optional[pd.DataFrame]:
+    """Lê o snapshot via memory-map; retorna None se ausente, inválido ou desatualizado."""
+    if pa is None:
+        return None
+    snap = caminho_snapshot(db_path, fonte)
+    if not snap.exists():
+        return None
+    try:
+        with pa.memory_map(str(snap), "r") as source:
+            reader = pa_ipc.open_file(source)
+            meta = reader.schema.metadata or {}
+            if meta.get(_META_VERSAO) != VERSAO_SNAPSHOT.encode():
+                return None
+            if meta.get(_META_FINGERPRINT) != impressao_digital(db_path).encode():
+                return None
+            tabela = reader.read_all()
+        return tabela.to_pandas()
+    except Exception:
+        return None
+
+
+def gravar_snapshot(df: pd.DataFrame, db_path: Path, fonte: str) -> bool:
+    """Grava o snapshot de forma atômica (arquivo temporário + os.replace)."""
+    if pa is None or df is None or df.empty:
+        return False
+    snap = caminho_snapshot(db_path, fonte)
+    tmp = snap.with_name(f"{snap.name}.{os.getpid()}.tmp")
+    try:
+        tabela = pa.Table.from_pandas(df)
+        meta = dict(tabela.schema.metadata or {})
+        meta[_META_FINGERPRINT] = impressao_digital(db_path).encode()
+        meta[_META_VERSAO] = VERSAO_SNAPSHOT.encode()
+        tabela = tabela.replace_schema_metadata(meta)
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa_ipc.new_file(sink, tabela.schema) as writer:
+                writer.write_table(tabela)
+        os.replace(tmp, snap)
+        return True
+    except Exception:
+        # Colunas com tipos mistos, disco somente leitura etc.: segue sem snapshot
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def carregar_com_snapshot(
+    db_path_str: str,
+    mtime: float,
+    fonte: str,
+    construir: Callable[[str, float], pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    Devolve o DataFrame da fonte a partir do snapshot, se válido;
+    caso contrário executa `construir(db_path_str, mtime)` e grava o snapshot.
+    """
+    db_path = Path(db_path_str)
+    if not db_path.exists():
+        return construir(db_path_str, mtime)
+
+    df = ler_snapshot(db_path, fonte)
+    if df is not None:
+        return df
+
+    df = construir(db_path_str, mtime)
+    gravar_snapshot(df, db_path, fonte)
+    return df
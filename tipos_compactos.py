@@ -0,0 +1,219 @@
+"""
+Política de tipos compactos aplicada na carga das fontes.
+
+Cada worker do Streamlit segura várias cópias dos DataFrames das fontes
+(st.cache_data, snapshot do painel, valores da execução). Os loaders
+entregavam rótulos de baixa cardinalidade (assessor, status, segmento...)
+como texto linha a linha e IDs de cliente como texto; aqui cada fonte tem
+uma política por coluna, aplicada no fim do loader (antes do snapshot
+.arrow, que guarda os mesmos tipos):
+
+- "categoria": category, sempre (o tipo não depende dos dados da carga;
+  agrupamentos por essas colunas usam observed=True);
+- "id": inteiro (o menor que comporta os valores) quando todos os valores
+  são inteiros; senão texto, como antes;
+- "float32": float32 só se a conversão não perde nada (valores monetários
+  com centavos continuam float64 e as somas dos KPIs não mudam);
+- "texto": string Arrow ("string[pyarrow]", nulos continuam nulos).
+
+compactar() guarda, por fonte, o relatório de memória antes/depois (bytes
+profundos por coluna); relatorios() devolve os da última carga e
+`python tipos_compactos.py` carrega as fontes e imprime o relatório.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+_SIM_NAO = ("Fez Segundo Aporte?", "Ativou em M?", "Evadiu em M?", "Operou Bolsa?", "Operou Fundo?", "Operou Renda Fixa?")
+
+_POSITIVADOR: Dict[str, str] = {
+    "Assessor": "categoria",
+    "assessor_code": "categoria",
+    "Cliente": "id",
+    "Status": "categoria",
+    "Segmento": "categoria",
+    "Sexo": "categoria",
+    "Tipo_Pessoa": "categoria",
+    "Profissão": "categoria",
+    **{c: "categoria" for c in _SIM_NAO},
+    "Aplicação Financeira Declarada Ajustada": "float32",
+    "Aplicacao_Financeira_Declarada_Ajustada": "float32",
+}
+
+POLITICAS: Dict[str, Dict[str, str]] = {
+    "positivador": _POSITIVADOR,
+    "positivador_mtd": _POSITIVADOR,
+    "feebased": {
+        "status_raw": "categoria",
+        "status_norm": "categoria",
+        "assessor_raw": "categoria",
+        "assessor_code": "categoria",
+        "cliente": "id",
+    },
+    "transferencias": {
+        "Código Assessor Origem": "categoria",
+        "Nome Assessor Origem": "categoria",
+        "Código Assessor Destino": "categoria",
+        "Nome Assessor Destino": "categoria",
+        "Origem Solicitação": "categoria",
+        "Tipo": "categoria",
+        "Status": "categoria",
+    },
+    "nps": {
+        "status": "categoria",
+        "codigo_assessor": "categoria",
+        "pesquisa_relacionamento": "categoria",
+        "pesquisa_relacionamento_norm": "categoria",
+        "notificacao": "categoria",
+        "customer_id": "texto",
+        "survey_id": "texto",
+        "user_id": "texto",
+        **{f"Unnamed: {i}": "categoria" for i in range(4, 30)},
+    },
+    "produtos": {
+        "linha_receita": "categoria",
+        "codigo_assessor": "categoria",
+    },
+}
+
+_RELATORIOS: Dict[str, Dict[str, Any]] = {}
+
+
+# =====================================================
+# Conversões por coluna
+# =====================================================
+def _texto(s: pd.Series) -> pd.Series:
+    return s if isinstance(s.dtype, pd.StringDtype) else s.astype("string[pyarrow]")
+
+
+def _categoria(s: pd.Series) -> pd.Series:
+    return s if isinstance(s.dtype, pd.CategoricalDtype) else s.astype("category")
+
+
+def _id(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_integer_dtype(s.dtype):
+        return pd.to_numeric(s, downcast="integer")
+    num = pd.to_numeric(s, errors="coerce")
+    inteiro = num.notna().all() and len(num) > 0 and bool((num == np.floor(num)).all())
+    if not inteiro:
+        return _texto(s)
+    return pd.to_numeric(num.astype("int64"), downcast="integer")
+
+
+def _float32(s: pd.Series) -> pd.Series:
+    if s.dtype != "float64":
+        return s
+    f32 = s.astype("float32")
+    if np.array_equal(f32.to_numpy(dtype="float64"), s.to_numpy(), equal_nan=True):
+        return f32
+    return s
+
+
+_CONVERSORES: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    "categoria": _categoria,
+    "id": _id,
+    "float32": _float32,
+    "texto": _texto,
+}
+
+
+# =====================================================
+# API
+# =====================================================
+def memoria_por_coluna(df: pd.DataFrame) -> pd.Series:
+    """Bytes (profundos, inclui o texto) por coluna, sem o índice."""
+    return df.memory_usage(index=False, deep=True)
+
+
+def relatorio_memoria(antes: pd.DataFrame, depois: pd.DataFrame) -> pd.DataFrame:
+    """Tipo e MB por coluna antes/depois (somente as colunas que mudaram de tipo)."""
+    mem_antes, mem_depois = memoria_por_coluna(antes), memoria_por_coluna(depois)
+    linhas = [
+        {
+            "coluna": c,
+            "tipo_antes": str(antes[c].dtype),
+            "tipo_depois": str(depois[c].dtype),
+            "mb_antes": round(mem_antes[c] / 1_048_576, 3),
+            "mb_depois": round(mem_depois[c] / 1_048_576, 3),
+        }
+        for c in depois.columns
+        if c in antes.columns and str(antes[c].dtype) != str(depois[c].dtype)
+    ]
+    return pd.DataFrame(linhas, columns=["coluna", "tipo_antes", "tipo_depois", "mb_antes", "mb_depois"])
+
+
+def compactar(df: pd.DataFrame, fonte: str, politica: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Aplica a política da fonte (colunas ausentes são ignoradas) e registra o relatório de memória."""
+    if df is None or df.empty:
+        return df
+    politica = POLITICAS.get(fonte, {}) if politica is None else politica
+    out = df.copy(deep=False)
+    for coluna, tipo in politica.items():
+        if coluna in out.columns:
+            out[coluna] = _CONVERSORES[tipo](out[coluna])
+
+    mb_antes = float(memoria_por_coluna(df).sum()) / 1_048_576
+    mb_depois = float(memoria_por_coluna(out).sum()) / 1_048_576
+    _RELATORIOS[fonte] = {
+        "linhas": int(len(out)),
+        "mb_antes": round(mb_antes, 3),
+        "mb_depois": round(mb_depois, 3),
+        "colunas": relatorio_memoria(df, out),
+    }
+    return out
+
+
+def converter(s: pd.Series, tipo: str) -> pd.Series:
+    """Converte uma coluna segundo um tipo da política ("categoria", "id", "float32", "texto")."""
+    return _CONVERSORES[tipo](s)
+
+
+def aplicar_texto(s: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """
+    Aplica uma transformação de texto (Series -> Series, mesmo tamanho).
+    Numa coluna categórica roda uma vez por categoria e devolve categórica.
+    """
+    if not isinstance(s.dtype, pd.CategoricalDtype):
+        return func(s)
+    novos = func(pd.Series(s.cat.categories.astype(str))).to_numpy(dtype=object)
+    valores = np.append(novos, None)[s.cat.codes.to_numpy()]  # código -1 (nulo) -> None
+    return pd.Series(valores, index=s.index, name=s.name).astype("category")
+
+
+def relatorios() -> Dict[str, Dict[str, Any]]:
+    """Relatório da última compactação de cada fonte neste processo."""
+    return dict(_RELATORIOS)
+
+
+# =====================================================
+# Relatório pela linha de comando
+# =====================================================
+def main() -> None:
+    import acesso_dados
+    import tipos_compactos  # o módulo usado pelos loaders (este arquivo roda como __main__)
+
+    loaders = {
+        "positivador_mtd": acesso_dados._construir_positivador_mtd,
+        "feebased": acesso_dados._construir_feebased,
+        "transferencias": acesso_dados._construir_transferencias,
+        "nps": acesso_dados._construir_nps,
+    }
+    for fonte, construir in loaders.items():
+        dbp = acesso_dados.localizar_banco(fonte)
+        if dbp is None:
+            print(f"{fonte}: banco não encontrado")
+            continue
+        construir(str(dbp), dbp.stat().st_mtime)
+    acesso_dados.carregar_produtos()
+
+    for fonte, rel in tipos_compactos.relatorios().items():
+        ganho = (1 - rel["mb_depois"] / rel["mb_antes"]) * 100 if rel["mb_antes"] else 0.0
+        print(f"\n== {fonte}: {rel['linhas']:,} linhas, {rel['mb_antes']:.2f} MB -> {rel['mb_depois']:.2f} MB (-{ganho:.0f}%)")
+        if not rel["colunas"].empty:
+            print(rel["colunas"].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()